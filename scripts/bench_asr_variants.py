@@ -0,0 +1,162 @@
+"""Accuracy / speed of a quantized ASR variant vs the base model on a local sample set (CPU by default).
+
+The sample set is a directory of 16 kHz mono WAV files, each with a reference transcript in a
+same-named .txt next to it. Each model is loaded once (load time reported), every clip is decoded
+once after one untimed warmup clip, and the error rate (WER; CER for Chinese / Japanese / Korean)
+and real-time factor are compared. The verdict is stored in models/.asr_variants.json, where
+PRIVOX_ASR_VARIANT=auto reads it to decide whether the variant is used.
+
+    python scripts/bench_asr_variants.py --size qwen3-asr-0.6b --samples samples/
+    python scripts/bench_asr_variants.py --size distil-large-v3.5 --samples samples/
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import time
+import wave
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+import numpy as np  # noqa: E402
+
+import models_config  # noqa: E402
+import privox_asr_variants as variants  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def load_samples(folder: str) -> list:
+    out = []
+    for wav_path in sorted(glob.glob(os.path.join(folder, "*.wav"))):
+        txt_path = os.path.splitext(wav_path)[0] + ".txt"
+        if not os.path.isfile(txt_path):
+            continue
+        with wave.open(wav_path, "rb") as w:
+            if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+                print(f"skip {os.path.basename(wav_path)}: need 16 kHz mono 16-bit PCM")
+                continue
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        with open(txt_path, "r", encoding="utf-8") as f:
+            ref = f.read().strip()
+        out.append((os.path.basename(wav_path), pcm.astype(np.float32) / 32768.0, ref))
+    return out
+
+
+def _preset(size: str) -> dict:
+    for item in models_config.ASR_LIBRARY:
+        if item.get("whisper_model") == size:
+            return item
+    raise SystemExit(f"unknown ASR size {size!r} (see whisper_model in models_config.ASR_LIBRARY)")
+
+
+def _base_path(size: str, repo: str) -> str:
+    local = os.path.join(_ROOT, "models", f"whisper-{size}")
+    return local if os.path.isdir(local) else repo
+
+
+def whisper_loader(path: str, device: str):
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(path, device=device, compute_type="float16" if device == "cuda" else "int8", cpu_threads=4)
+
+    def transcribe(audio):
+        segments, _info = model.transcribe(audio, beam_size=5, vad_filter=True, condition_on_previous_text=False)
+        return " ".join(s.text for s in segments).strip()
+
+    return transcribe
+
+
+def qwen_loader(path: str, device: str, quantize: bool):
+    import torch
+    from qwen_asr import Qwen3ASRModel
+
+    dtype = torch.float32 if device == "cpu" else torch.float16
+    model = Qwen3ASRModel.from_pretrained(path, dtype=dtype, low_cpu_mem_usage=True)
+    if device != "cpu":
+        model.model.to(device)
+    if quantize:
+        model.model = variants.quantize_dynamic_int8(model.model, torch)
+
+    def transcribe(audio):
+        with torch.no_grad():
+            res = model.transcribe(audio=(audio, SAMPLE_RATE), language=None, return_time_stamps=False)
+        first = res[0] if res else ""
+        return (first.get("text", "") if isinstance(first, dict) else getattr(first, "text", str(first))).strip()
+
+    return transcribe
+
+
+def run(label: str, make, samples: list) -> dict:
+    t0 = time.perf_counter()
+    transcribe = make()
+    load_s = time.perf_counter() - t0
+    transcribe(samples[0][1])  # first-use cost is not what we are comparing
+    errors = ref_len = 0
+    decode_s = audio_s = 0.0
+    for name, audio, ref in samples:
+        t = time.perf_counter()
+        hyp = transcribe(audio)
+        decode_s += time.perf_counter() - t
+        audio_s += len(audio) / SAMPLE_RATE
+        e, n = variants.error_rate(ref, hyp)
+        errors += e
+        ref_len += n
+        print(f"  [{label}] {name}: {e}/{n} errors | {hyp[:80]!r}")
+    result = {
+        "error_rate": round(errors / max(1, ref_len), 4),
+        "rtf": round(decode_s / max(1e-6, audio_s), 4),
+        "load_s": round(load_s, 2),
+    }
+    print(f"{label}: error rate {result['error_rate']:.3f}, RTF {result['rtf']:.3f}, load {result['load_s']:.2f}s")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", required=True, help="whisper_model name from ASR_LIBRARY")
+    parser.add_argument("--samples", required=True, help="folder of 16 kHz mono .wav + .txt references")
+    parser.add_argument("--device", default="cpu", choices=("cpu", "cuda"))
+    parser.add_argument("--no-record", action="store_true", help="do not store the verdict")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples)
+    if not samples:
+        print("no usable samples (need <name>.wav + <name>.txt)")
+        return 1
+    preset = _preset(args.size)
+    backend = preset.get("backend", "whisper")
+    base_path = _base_path(args.size, preset.get("whisper_repo") or preset["repo"])
+    print(f"{len(samples)} samples, {sum(len(a) for _n, a, _r in samples) / SAMPLE_RATE:.0f}s of audio; {backend} on {args.device}")
+
+    if backend == "whisper":
+        variant = variants.INT8
+        variant_path = variants.whisper_int8_dir(_ROOT, args.size)
+        if not os.path.isfile(os.path.join(variant_path, "model.bin")):
+            print(f"no int8 build at {variant_path}; run: python src/privox_asr_variants.py build --size {args.size} --source <transformers checkpoint>")
+            return 1
+        base = run("base", lambda: whisper_loader(base_path, args.device), samples)
+        quant = run(variant, lambda: whisper_loader(variant_path, args.device), samples)
+    elif backend == "qwen_asr":
+        variant = variants.DYNINT8
+        base = run("base", lambda: qwen_loader(base_path, args.device, quantize=False), samples)
+        quant = run(variant, lambda: qwen_loader(base_path, args.device, quantize=True), samples)
+    else:
+        print(f"no variants for backend {backend!r}")
+        return 1
+
+    if args.no_record:
+        return 0
+    store = variants.VariantStore(os.path.join(_ROOT, "models", ".asr_variants.json"))
+    accepted = store.record_benchmark(variants.VariantStore.key(backend, args.size, variant), base, quant, len(samples))
+    print(f"{variant}: {'accepted' if accepted else 'rejected'} (max error delta {variants.MAX_ERROR_DELTA}, must be faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+"""Logging cost on the calling thread: stderr classifier and record writes, before / after.
+
+    classify    the previous LoggerWriter._stderr_downgrade / _is_llama_diagnostic chain (kept
+                here as the reference) vs privox_logging.classify_stderr, on llama.cpp / tqdm /
+                transformers stderr lines and real errors. Both must give the same level for
+                every line, including random combinations of rule keywords, before timings print.
+    record      logging.info() to a rotating log file on the caller vs the background writer
+                (QueueHandler), and a transcript preview built eagerly vs privox_logging.Preview
+                with transcript logging off.
+
+    python scripts/bench_logging.py
+    python scripts/bench_logging.py --lines 50000 --records 20000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+import privox_logging  # noqa: E402
+
+_LINES = [
+    "llama_model_loader: - kv  12:                       general.file_type u32              = 15",
+    "llama_kv_cache_unified:      CUDA0 KV buffer size =   448.00 MiB",
+    "llm_load_tensors: offloading 42 repeating layers to GPU",
+    "load_tensors: offloading output layer to GPU (llama)",
+    "ggml_cuda_init: found 1 CUDA devices:",
+    "  Device 0: NVIDIA GeForce RTX 4070, compute capability 8.9, VMM: yes",
+    "llama_context: graph nodes  = 1386",
+    "llama: token id 106 is not marked as EOG",
+    "print_info: token to piece cache size = 0.9700 MB",
+    "Loading checkpoint shards:  50%|█████     | 1/2 [00:03<00:03,  3.12s/it]",
+    "model.bin:  37%|███▋      | 553M/1.48G [00:12<00:20, 45.9MB/s]",
+    "tokenizer.json: 100%|██████████| 2.20M/2.20M [00:00<00:00, 11.2MB/s]",
+    "config.json: 100%|##########| 2.39k/2.39k [00:00<?, ?B/s]",
+    "Fetching 5 files: 100%|##########| 5/5 [00:00<00:00, 2500.48it/s]",
+    "model.safetensors [1.2G]",
+    "Setting `pad_token_id` to `eos_token_id`:None for open-end generation.",
+    "The following generation flags are not valid and may be ignored: ['temperature']",
+    "huggingface_hub/file_download.py:943: UserWarning: `resume_download` is deprecated",
+    "Using cache found in /home/u/.cache/torch/hub/snakers4_silero-vad_master",
+    "Traceback (most recent call last):",
+    '  File "voice_input.py", line 4120, in load_model',
+    "RuntimeError: CUDA error: out of memory",
+    "ValueError: could not convert string to float: 'abc'",
+    "AMD Radeon: device lost",
+]
+_KEYWORDS = [
+    "using cache found", "generation flags are not valid", "pad_token_id", "eos_token_id", "ggml_",
+    "gguf", "ggml_cuda_init", "device ", "nvidia", "amd", "compute capability", "vmm:",
+    "checkpoint shard", "userwarning", "huggingface", "%|", "mb/s", "it/s", "/1.", "/0.", "[12:30",
+    "[", "]", "config.json", "model.bin", ".safetensors", "llama", "llama_", "llm_", "cuda :",
+    "not marked as eog", "offloading", "kv buffer size", "graph nodes", "error", " ",
+]
+
+
+# --- previous classifier (reference) --------------------------------------------------------
+def _is_llama_diagnostic(message_lower):
+    noisy_prefixes = (
+        "llama_", "llm_", "ggml_", "gguf", "cuda :", "device ", "model metadata:",
+        "using gguf chat template:", "using chat eos_token:", "using chat bos_token:",
+    )
+    return (
+        "llama" in message_lower and (
+            message_lower.startswith(noisy_prefixes)
+            or "not marked as eog" in message_lower
+            or "offloading" in message_lower
+            or "kv buffer size" in message_lower
+            or "compute buffer size" in message_lower
+            or "graph nodes" in message_lower
+        )
+    )
+
+
+def _stderr_downgrade(message_lower):
+    if "using cache found" in message_lower:
+        return "info"
+    if "generation flags are not valid" in message_lower:
+        return "warning"
+    if "pad_token_id" in message_lower and "eos_token_id" in message_lower:
+        return "warning"
+    if message_lower.startswith(("ggml_", "gguf")) or "ggml_cuda_init" in message_lower:
+        return "info"
+    if message_lower.startswith("device ") and (
+        "nvidia" in message_lower
+        or "amd" in message_lower
+        or "compute capability" in message_lower
+        or "vmm:" in message_lower
+    ):
+        return "info"
+    if "loading checkpoint shards" in message_lower or "checkpoint shard" in message_lower:
+        return "info"
+    if "userwarning" in message_lower and "huggingface" in message_lower:
+        return "warning"
+    if "%|" in message_lower and any(
+        x in message_lower
+        for x in ("mb/s", "kb/s", "gb/s", "ib/s", "b/s", "it/s", "?b/s", "/1.", "/0.")
+    ):
+        return "info"
+    if re.search(r"\[\d+:\d+", message_lower) and (
+        "b/s" in message_lower or "it/s" in message_lower
+    ):
+        return "info"
+    if re.search(
+        r"(^|\s)(config|tokenizer|vocabulary|preprocessor_config)\.json|model\.bin|\.safetensors",
+        message_lower,
+    ) and "[" in message_lower and "]" in message_lower:
+        return "info"
+    return None
+
+
+def legacy_classify(msg: str) -> int:
+    ml = msg.lower()
+    tier = _stderr_downgrade(ml)
+    if tier == "info":
+        return logging.INFO
+    if tier == "warning":
+        return logging.WARNING
+    if _is_llama_diagnostic(ml):
+        return logging.INFO
+    return logging.ERROR
+
+
+# --- helpers --------------------------------------------------------------------------------
+def _us_per_call(fn, items) -> float:
+    t0 = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - t0) / max(len(items), 1) * 1e6
+
+
+def _fuzz_lines(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(_KEYWORDS) for _ in range(rng.randint(1, 6))) for _ in range(n)]
+
+
+def bench_classify(lines: int) -> int:
+    for line in _LINES + _fuzz_lines(20_000, seed=1):
+        if privox_logging.classify_stderr(line) != legacy_classify(line):
+            print(f"MISMATCH on {line!r}: {privox_logging.classify_stderr(line)} vs {legacy_classify(line)}")
+            return 1
+    rng = random.Random(0)
+    corpus = [rng.choice(_LINES) for _ in range(lines)]
+    before = _us_per_call(legacy_classify, corpus)
+    after = _us_per_call(privox_logging.classify_stderr, corpus)
+    print(f"classify  {lines} stderr lines: before {before:.2f} us/line, after {after:.2f} us/line "
+          f"({before / max(after, 1e-9):.1f}x)")
+    return 0
+
+
+def bench_records(records: int) -> None:
+    tmp = tempfile.mkdtemp(prefix="privox-logbench-")
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    try:
+        root.setLevel(logging.INFO)
+        results = {}
+        for label in ("sync", "background"):
+            for h in root.handlers[:]:
+                root.removeHandler(h)
+            handler = RotatingFileHandler(os.path.join(tmp, f"{label}.log"), maxBytes=5 * 1024 * 1024,
+                                          backupCount=3, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s"))
+            root.addHandler(handler)
+            if label == "background":
+                privox_logging.start_background_writer()
+            text = "ASR text preview " * 20
+            results[label] = _us_per_call(lambda i: root.info("Refiner output (%d chars): %r", i, text), range(records))
+            privox_logging.shutdown()
+            handler.close()
+        print(f"record    {records} logging.info calls: on caller {results['sync']:.1f} us, "
+              f"queued {results['background']:.1f} us ({results['sync'] / max(results['background'], 1e-9):.1f}x)")
+
+        transcript = "今日個 meeting 主要講 deployment pipeline 同埋 API latency。\n" * 40
+        root.setLevel(logging.WARNING)  # transcript logging off
+
+        def eager(_):
+            pv = transcript[:400].replace("\n", " ").strip()
+            if len(transcript) > 400:
+                pv += "..."
+            root.info(f"ASR text ({len(transcript)} chars, preview): {pv!r}")
+
+        def lazy(_):
+            root.info("ASR text (%d chars, preview): %r", len(transcript), privox_logging.Preview(transcript))
+
+        before = _us_per_call(eager, range(records))
+        after = _us_per_call(lazy, range(records))
+        print(f"preview   logging off: eager f-string {before:.2f} us, lazy Preview {after:.2f} us")
+    finally:
+        for h in root.handlers[:]:
+            root.removeHandler(h)
+        for h in saved[0]:
+            root.addHandler(h)
+        root.setLevel(saved[1])
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--records", type=int, default=10_000)
+    args = parser.parse_args()
+    code = bench_classify(args.lines)
+    if code:
+        return code
+    bench_records(args.records)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
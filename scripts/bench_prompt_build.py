@@ -0,0 +1,84 @@
+"""Refiner prompt-build time per request: compiled / memoized vs rebuilt from scratch.
+
+Times what GrammarChecker.correct() does before tokenization: get_effective_prompt() (transcript
+scans + Core Directive) and get_system_formatter_for_transcript() (few-shot + CRITICAL_RULES), on
+synthetic long transcripts in English, Chinese, code-mixed and Cantonese. "cold" clears the
+prompt caches before every build (the cost before privox_prompts); "warm" is the steady state.
+No model is loaded.
+
+    python scripts/bench_prompt_build.py
+    python scripts/bench_prompt_build.py --chars 4000 --iterations 500
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+# Engine mode: no tray / microphone / hotkey imports, nothing starts.
+os.environ.setdefault("PRIVOX_ENGINE_MODE", "1")
+
+import models_config  # noqa: E402
+import voice_input  # noqa: E402
+
+SAMPLES = {
+    "en": ("en", 0.95, "um so the plan for next week is we ship the build on monday and then uh "
+                       "we run the three load tests you know the ones with ten thousand users "),
+    "zh": ("zh", 0.9, "我哋下個禮拜要交報告，然後再同客戶開會講吓預算，大概係一千五百萬左右。"),
+    "mixed": ("zh", 0.6, "今日個 meeting 主要講 deployment pipeline 同埋 API latency 嘅問題，"),
+    "no-lang": (None, 0.0, "ok so basically the thing is that we need to refactor the parser before the release "),
+}
+
+
+def _clear_caches(checker) -> None:
+    checker.prompts.clear()
+    models_config.get_system_formatter.cache_clear()
+    models_config._get_long_transcript_formatter.cache_clear()
+
+
+def build(checker, language, prob, transcript: str) -> str:
+    directive = checker.get_effective_prompt(language=language, language_prob=prob, transcript=transcript)
+    return models_config.get_system_formatter_for_transcript(
+        language=language, transcript_char_len=len(transcript), persona_mission=directive, tone=checker.tone
+    )
+
+
+def measure(checker, language, prob, transcript: str, iterations: int, cold: bool) -> list:
+    out = []
+    for _ in range(iterations):
+        if cold:
+            _clear_caches(checker)
+        t0 = time.perf_counter()
+        build(checker, language, prob, transcript)
+        out.append((time.perf_counter() - t0) * 1e6)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=2000, help="transcript length")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    checker = voice_input.GrammarChecker(character="Writing Assistant", tone="Natural")
+    checker.custom_dictionary = ["Privox", "CTranslate2", "llama.cpp", "Kubernetes"]
+    print(f"{'transcript':<10}{'chars':>7}{'cold µs':>10}{'warm µs':>10}{'speedup':>9}  prefix")
+    for label, (language, prob, unit) in SAMPLES.items():
+        transcript = (unit * (args.chars // len(unit) + 1))[: args.chars]
+        cold = statistics.median(measure(checker, language, prob, transcript, args.iterations, cold=True))
+        build(checker, language, prob, transcript)
+        warm = statistics.median(measure(checker, language, prob, transcript, args.iterations, cold=False))
+        prefix = voice_input.privox_prompts.prefix_hash("llama", build(checker, language, prob, transcript))
+        print(f"{label:<10}{len(transcript):>7}{cold:>10.0f}{warm:>10.0f}{cold / max(warm, 1e-3):>8.1f}x  {prefix}")
+    print(f"prompt cache: {checker.prompts.describe()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""Transcript script heuristics: one privox_textscan pass vs the previous per-helper scans.
+
+Runs the set of heuristics one refiner request evaluates on a transcript (language guess, code-mix,
+Chinese substantial, Chinese variant, Cantonese) on 10k-character mixed CJK / Latin input. "legacy"
+is the previous implementation (five re.findall passes for the language guess plus one scan per
+helper); "profile" builds a ScriptProfile with the cache cleared before each request. Both must
+agree on every sample before timings are printed.
+
+    python scripts/bench_script_profile.py
+    python scripts/bench_script_profile.py --chars 2000 --iterations 500
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+import privox_textscan  # noqa: E402
+
+
+# --- previous implementation (reference) ------------------------------------------------------
+def _legacy_contains_cjk(s):
+    return any("一" <= c <= "鿿" for c in (s or ""))
+
+
+def _legacy_mixes(text):
+    if not re.search(r"[A-Za-z]{2,}", text):
+        return False
+    if _legacy_contains_cjk(text):
+        return True
+    return any(0x3040 <= ord(c) <= 0x30FF or 0xAC00 <= ord(c) <= 0xD7AF for c in text)
+
+
+def _legacy_substantial(s):
+    han = len(re.findall(r"[一-鿿㐀-䶿]", s))
+    if han < 2:
+        return False
+    if _legacy_mixes(s):
+        return True
+    lat = len(re.findall(r"[A-Za-z]", s))
+    return lat == 0 or han >= 8 or (han >= 3 and han >= lat * 0.4)
+
+
+def _legacy_language(text):
+    han = len(re.findall(r"[一-鿿㐀-䶿]", text))
+    hiragana = len(re.findall(r"[぀-ゟ]", text))
+    katakana = len(re.findall(r"[゠-ヿ]", text))
+    hangul = len(re.findall(r"[가-힯]", text))
+    latin = len(re.findall(r"[A-Za-z]", text))
+    total = han + hiragana + katakana + hangul + latin
+    if total == 0:
+        return None, 0.0
+    kana = hiragana + katakana
+    if latin >= 8 and latin >= han * 4 and latin >= total * 0.52:
+        return "en", 0.84
+    if hangul >= total * 0.22 and hangul >= max(han, kana):
+        return "ko", 0.88
+    if kana > 0 and (kana >= total * 0.12 or han <= kana * 3):
+        return "ja", 0.85
+    if han >= 3 and han >= total * 0.22:
+        return "zh", 0.9
+    if han >= 2 and han >= total * 0.34:
+        return "zh", 0.78
+    if latin >= total * 0.72:
+        return "en", 0.75
+    return None, 0.0
+
+
+def _legacy_variant(text):
+    t = sum(ch in privox_textscan.TRAD_DISTINCT for ch in text)
+    s = sum(ch in privox_textscan.SIMP_DISTINCT for ch in text)
+    if t == 0 and s == 0:
+        return None, 0.0
+    if t >= 2 and t >= s * 2:
+        return "traditional", min(0.95, 0.55 + 0.05 * min(t, 8))
+    if s >= 2 and s >= t * 2:
+        return "simplified", min(0.95, 0.55 + 0.05 * min(s, 8))
+    if t > s:
+        return "traditional", 0.6
+    if s > t:
+        return "simplified", 0.6
+    return None, 0.0
+
+
+def legacy(text):
+    # correct() guesses the language, then get_effective_prompt() rescans for each flag.
+    return (
+        _legacy_language(text), _legacy_mixes(text), _legacy_substantial(text),
+        _legacy_variant(text), any(ch in text for ch in privox_textscan.CANTONESE_ORAL_MARKERS),
+    )
+
+
+def profiled(text):
+    privox_textscan.profile.cache_clear()
+    p = privox_textscan.profile(text)
+    return p.infer_language(), p.mixes_cjk_and_latin(), p.cjk_substantial(), p.chinese_variant(), p.cantonese
+
+
+# --- inputs -----------------------------------------------------------------------------------
+_PIECES = [
+    "今日個 meeting 主要講 deployment pipeline 同埋 API latency 嘅問題，",
+    "我们下周要把这个报告交给客户，然后再开会讨论预算。",
+    "這個版本嘅 build 已經過咗 QA，",
+    "the rollout plan covers three regions and ten thousand users ",
+    "テストは明日の午後に実行します。",
+    "회의는 내일 오전에 있습니다 ",
+    "123, 456; ok. ",
+]
+
+
+def sample(chars: int, seed: int) -> str:
+    rng = random.Random(seed)
+    out = []
+    n = 0
+    while n < chars:
+        piece = rng.choice(_PIECES)
+        out.append(piece)
+        n += len(piece)
+    return "".join(out)[:chars]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = [sample(args.chars, seed) for seed in range(8)]
+    texts += [piece for piece in _PIECES] + ["", "hello", "嘅", "a 中"]
+    for text in texts:
+        if legacy(text) != profiled(text):
+            print(f"MISMATCH on {text[:60]!r}: legacy {legacy(text)} vs profile {profiled(text)}")
+            return 1
+
+    print(f"{args.chars} chars, {args.iterations} iterations per text (median µs per request)")
+    for label, fn in (("legacy", legacy), ("profile", profiled)):
+        times = []
+        for text in texts[:8]:
+            for _ in range(args.iterations):
+                t0 = time.perf_counter()
+                fn(text)
+                times.append((time.perf_counter() - t0) * 1e6)
+        print(f"  {label:<8}{statistics.median(times):10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
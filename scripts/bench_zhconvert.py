@@ -0,0 +1,88 @@
+"""Chinese output-script conversion: compiled privox_zhconvert table vs zhconv.convert.
+
+Converts synthetic long Cantonese transcripts (Traditional and Simplified input, some English
+code-mixing) to both targets. Both converters must produce the same text for every sample before
+timings are printed. "build" is the one-time table compile; the result cache of
+privox_zhconvert.convert() is bypassed, so the timings are the conversion itself. Needs zhconv.
+
+    python scripts/bench_zhconvert.py
+    python scripts/bench_zhconvert.py --chars 20000 --iterations 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+import privox_zhconvert  # noqa: E402
+
+_PIECES = [
+    "今日個 meeting 主要講 deployment pipeline 同埋 API latency 嘅問題，",
+    "我哋下個禮拜要交報告，然後再同客戶開會講吓預算，大概係一千五百萬左右。",
+    "呢個版本嘅 build 已經過咗 QA，聽日朝早九點發佈。",
+    "你记唔记得上次个系统升级？佢哋话网络同数据库都要重新设定。",
+    "唔该帮我将呢份文件转做简体，再发畀财务部。",
+    "OK 冇问题，我哋搞掂咗先话你知。",
+]
+
+
+def sample(chars: int, seed: int) -> str:
+    rng = random.Random(seed)
+    out = []
+    n = 0
+    while n < chars:
+        piece = rng.choice(_PIECES)
+        out.append(piece)
+        n += len(piece)
+    return "".join(out)[:chars]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    try:
+        import zhconv
+    except ImportError:
+        print("zhconv is not installed.")
+        return 2
+
+    texts = [sample(args.chars, seed) for seed in range(4)] + _PIECES + ["", "plain English only"]
+    print(f"{args.chars} chars, {args.iterations} iterations per text (median ms per conversion)")
+    print(f"{'target':<9}{'build':>9}{'zhconv':>10}{'compiled':>10}{'speedup':>9}")
+    for target in (privox_zhconvert.TRADITIONAL, privox_zhconvert.SIMPLIFIED):
+        zhconv.convert("", target)  # load zhconv's own tables outside the timings
+        privox_zhconvert.converter.cache_clear()
+        t0 = time.perf_counter()
+        conv = privox_zhconvert.converter(target)
+        build_ms = (time.perf_counter() - t0) * 1000
+        for text in texts:
+            if conv.convert(text) != zhconv.convert(text, target):
+                print(f"MISMATCH ({target}) on {text[:60]!r}")
+                return 1
+        timings = {}
+        for label, fn in (("zhconv", lambda t: zhconv.convert(t, target)), ("compiled", conv.convert)):
+            times = []
+            for text in texts[:4]:
+                for _ in range(args.iterations):
+                    t0 = time.perf_counter()
+                    fn(text)
+                    times.append((time.perf_counter() - t0) * 1000)
+            timings[label] = statistics.median(times)
+        speedup = timings["zhconv"] / max(timings["compiled"], 1e-6)
+        print(f"{target:<9}{build_ms:9.1f}{timings['zhconv']:10.2f}{timings['compiled']:10.2f}{speedup:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+"""Spawn-to-ready benchmark for the inference worker: fresh `python privox_worker.py` vs zygote fork (Linux).
+
+"Ready" means WARM-FRESH: the worker answers "ping" with prebuilt=True (voice_input imported and
+VoiceInputApp constructed, no models loaded). This is the cost _respawn_warm_worker pays after idle.
+
+    pixi run benchmark-worker-spawn --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+import privox_ipc  # noqa: E402
+import privox_zygote  # noqa: E402
+
+
+def _wait_prebuilt(sock, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        sock.settimeout(5.0)
+        privox_ipc.send_message(sock, {"cmd": "ping"})
+        resp = privox_ipc.recv_message(sock)
+        if resp is None:
+            return False
+        if resp[0].get("prebuilt"):
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _shutdown(sock, proc) -> None:
+    try:
+        privox_ipc.send_message(sock, {"cmd": "shutdown"})
+        privox_ipc.recv_message(sock)
+    except OSError:
+        pass
+    sock.close()
+    try:
+        proc.wait(timeout=10)
+    except Exception:
+        proc.kill()
+
+
+def _spawn_once(timeout: float) -> float | None:
+    parent, child = privox_ipc.child_socketpair()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(_SRC, "privox_worker.py"), "--fd", str(child.fileno())],
+        pass_fds=(child.fileno(),),
+    )
+    child.close()
+    ok = _wait_prebuilt(parent, timeout)
+    dt = time.perf_counter() - t0
+    _shutdown(parent, proc)
+    return dt if ok else None
+
+
+def _fork_once(server: privox_zygote.ForkServer, timeout: float) -> float | None:
+    parent, child = privox_ipc.child_socketpair()
+    t0 = time.perf_counter()
+    proc = server.fork_worker(child.fileno())
+    child.close()
+    if proc is None:
+        parent.close()
+        return None
+    ok = _wait_prebuilt(parent, timeout)
+    dt = time.perf_counter() - t0
+    _shutdown(parent, proc)
+    return dt if ok else None
+
+
+def _report(label: str, times: list) -> None:
+    ok = [t for t in times if t is not None]
+    if not ok:
+        print(f"{label:>8}: no successful runs")
+        return
+    print(
+        f"{label:>8}: n={len(ok)} median={statistics.median(ok) * 1000:.0f} ms "
+        f"min={min(ok) * 1000:.0f} ms max={max(ok) * 1000:.0f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-run ready timeout (s)")
+    args = parser.parse_args()
+
+    spawn_times = [_spawn_once(args.timeout) for _ in range(args.runs)]
+    _report("spawn", spawn_times)
+
+    if not sys.platform.startswith("linux"):
+        print("  zygote: skipped (Linux only)")
+        return 0
+    server = privox_zygote.ForkServer()
+    if not server.start():
+        print("  zygote: failed to start")
+        return 1
+    t0 = time.perf_counter()
+    first = _fork_once(server, args.timeout)  # includes the zygote's one-time imports
+    if first is not None:
+        print(f"  zygote: first fork (incl. pre-import) {first * 1000:.0f} ms")
+    fork_times = [_fork_once(server, args.timeout) for _ in range(args.runs)]
+    _report("zygote", fork_times)
+    server.stop()
+    print(f"total zygote session: {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+"""Startup import report for the tray process and the inference worker (python -X importtime).
+
+Each run imports the process's module graph in a fresh interpreter with -X importtime and sums
+the self time of every module imported:
+
+    main     import voice_input (tray process; no app started)
+    worker   PRIVOX_ENGINE_MODE=1: import privox_worker + voice_input
+
+The slowest top-level imports are listed so a regression points at its cause. The budgets and
+the modules each process must not import are asserted by tests/test_import_budget.py.
+
+    python scripts/check_import_budget.py
+    python scripts/check_import_budget.py --runs 5 --top 15
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(label: str) -> dict:
+    """One fresh interpreter: {"total_ms", "modules": {name: self_ms}, "top": [(cumulative_ms, name)]}."""
+    env = dict(os.environ)
+    env.pop("PRIVOX_ENGINE_MODE", None)
+    code = f"import sys; sys.path.insert(0, {_SRC!r})\n"
+    if label == "worker":
+        env["PRIVOX_ENGINE_MODE"] = "1"
+        code += "import privox_worker\n"
+    code += "import voice_input\nimport os; os._exit(0)\n"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=_ROOT, env=env, capture_output=True, text=True, timeout=300,
+    )
+    modules: dict = {}
+    top = []
+    for line in (proc.stderr or "").splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        modules[name] = self_us / 1000.0
+        # One space after the "|" marks a module imported directly by the probe.
+        if len(indent) == 1:
+            top.append((cumulative_us / 1000.0, name))
+    if proc.returncode != 0 or not modules:
+        raise RuntimeError(f"{label} import failed (exit {proc.returncode}):\n{(proc.stderr or '')[-2000:]}")
+    return {"total_ms": sum(modules.values()), "modules": modules, "top": sorted(top, reverse=True)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh imports per process; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    for label in ("main", "worker"):
+        # The fastest run is the least disturbed by disk cache and scheduler noise.
+        r = min((measure(label) for _ in range(max(1, args.runs))), key=lambda r: r["total_ms"])
+        print(f"{label:<7} {r['total_ms']:7.0f} ms, {len(r['modules'])} modules")
+        for cumulative_ms, name in r["top"][: args.top]:
+            print(f"         {cumulative_ms:7.0f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""Check that torch-free presets never import PyTorch (main tray process and inference worker).
+
+Each check runs in a fresh interpreter so sys.modules starts clean:
+
+    main     import voice_input (tray process module graph, no app started)
+    worker   PRIVOX_ENGINE_MODE=1: import privox_worker + voice_input, construct VoiceInputApp
+    --load   worker check also loads the models; torch must stay out only when the configured ASR
+             is faster-whisper (Qwen3-ASR / SenseVoice import it by design)
+
+Exit status 1 when torch shows up where it should not. Import time and peak RSS are reported so the
+saving is visible next to a torch-backed preset. The main / worker startup checks also run under
+pytest (tests/test_torch_free.py); this script adds --load and the timing report.
+
+    python scripts/check_torch_free.py
+    python scripts/check_torch_free.py --load
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+
+_PROBE = r"""
+import json, os, sys, time
+sys.path.insert(0, {src!r})
+t0 = time.perf_counter()
+if {worker!r}:
+    import privox_worker  # noqa: F401
+import voice_input
+imported_s = time.perf_counter() - t0
+app = None
+if {worker!r}:
+    app = voice_input.VoiceInputApp()
+if {load!r}:
+    app.load_heavy_models()
+try:
+    import resource
+    rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+except ImportError:
+    try:
+        import psutil
+        rss_mib = psutil.Process().memory_info().peak_wset / 1024 ** 2
+    except Exception:
+        rss_mib = 0.0
+print("PROBE " + json.dumps({{
+    "torch": "torch" in sys.modules,
+    "backend": voice_input.ASR_BACKEND,
+    "loaded": bool(app and app.heavy_models_loaded),
+    "import_s": round(imported_s, 2),
+    "total_s": round(time.perf_counter() - t0, 2),
+    "rss_mib": round(rss_mib),
+}}))
+os._exit(0)
+"""
+
+
+def probe(worker: bool, load: bool) -> dict:
+    env = dict(os.environ)
+    if worker:
+        env["PRIVOX_ENGINE_MODE"] = "1"
+    code = _PROBE.format(src=_SRC, worker=worker, load=load)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=_ROOT, env=env, capture_output=True, text=True, timeout=600)
+    for line in (proc.stdout or "").splitlines():
+        if line.startswith("PROBE "):
+            return json.loads(line[len("PROBE "):])
+    raise RuntimeError(f"probe failed (exit {proc.returncode}):\n{(proc.stderr or proc.stdout)[-2000:]}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--load", action="store_true", help="also load the configured models in the worker probe")
+    args = parser.parse_args()
+
+    failures = 0
+    for label, worker, load in (("main", False, False), ("worker", True, False), ("worker+load", True, True)):
+        if load and not args.load:
+            continue
+        r = probe(worker, load)
+        torch_expected = load and r["backend"] in ("qwen_asr", "sensevoice")
+        ok = torch_expected or not r["torch"]
+        failures += not ok
+        print(
+            f"{'ok  ' if ok else 'FAIL'} {label:<12} torch={'yes' if r['torch'] else 'no ':<3} "
+            f"(expected {'yes' if torch_expected else 'no'}, ASR={r['backend']})  import {r['import_s']:.2f}s  "
+            f"total {r['total_s']:.2f}s  peak RSS {r['rss_mib']} MiB"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""Replay a dictation-gap trace against the idle release policy with a simulated clock.
+
+Compares fixed timers (vram_timeout / PRIVOX_ASR_HOST_TIMEOUT / PRIVOX_WORKER_KILL_TIMEOUT) with the
+learned thresholds of privox_idle_policy on the same trace: mean wake latency vs mean idle memory
+(price-weighted GiB). No GPU, models or real time needed.
+
+    python scripts/simulate_idle_policy.py --days 5 --vram-timeout 60
+    python scripts/simulate_idle_policy.py --trace gaps.txt     # one idle gap (seconds) per line
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+import privox_idle_policy  # noqa: E402
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def synthetic_gaps(days: int, seed: int) -> list:
+    """Bursty office-day trace: runs of quick follow-ups, coffee-break pauses, and overnight gaps."""
+    rng = random.Random(seed)
+    gaps = []
+    for _day in range(days):
+        for _session in range(rng.randint(4, 9)):
+            for _ in range(rng.randint(2, 8)):
+                gaps.append(rng.uniform(8, 90))           # follow-up dictations
+            gaps.append(rng.uniform(300, 2400))            # meeting / break
+        gaps[-1] = rng.uniform(12 * 3600, 16 * 3600)       # overnight
+    return gaps
+
+
+def build_policy(clock, vram_timeout: float, host_timeout: float, kill_timeout: float, learn: bool):
+    resources = [
+        privox_idle_policy.IdleResource("engine_vram", gib=6.0, wake_s=3.0, fallback_after=vram_timeout),
+        privox_idle_policy.IdleResource(
+            "asr_host", gib=3.0, price=0.25, wake_s=8.0,
+            fallback_after=vram_timeout + host_timeout if host_timeout > 0 else 0,
+        ),
+        privox_idle_policy.IdleResource("warm_process", gib=0.8, price=0.25, wake_s=12.0, fallback_after=kill_timeout),
+    ]
+    return privox_idle_policy.IdlePolicy(resources, clock=clock, min_samples=8 if learn else 10 ** 9)
+
+
+def replay(policy, clock: SimClock, gaps: list) -> tuple:
+    """Returns (mean wake latency s, mean price-weighted GiB held while idle)."""
+    total_wake = 0.0
+    held_gib_s = 0.0
+    idle_s = 0.0
+    for gap in gaps:
+        th = policy.thresholds()
+        for r in policy.resources:
+            held_gib_s += r.gib * r.price * min(gap, th[r.name])
+        for name in policy.due(gap):
+            policy.mark_evicted(name)
+        deepest = max((r.wake_s for r in policy.resources if r.evicted), default=0.0)
+        clock.now += gap
+        idle_s += gap
+        policy.note_use(gap)
+        clock.now += deepest
+        policy.observe_wake()
+        total_wake += deepest
+        clock.now += 20.0  # the dictation itself
+    return total_wake / max(1, len(gaps)), held_gib_s / max(1.0, idle_s)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="file with one idle gap in seconds per line (default: synthetic)")
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--vram-timeout", type=float, default=60.0)
+    parser.add_argument("--host-timeout", type=float, default=600.0)
+    parser.add_argument("--kill-timeout", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.trace:
+        with open(args.trace, "r", encoding="utf-8") as f:
+            gaps = [float(x) for x in f.read().split() if x.strip()]
+    else:
+        gaps = synthetic_gaps(args.days, args.seed)
+    print(f"{len(gaps)} idle gaps, median {sorted(gaps)[len(gaps) // 2]:.0f}s")
+
+    for label, learn in (("timers", False), ("learned", True)):
+        clock = SimClock()
+        policy = build_policy(clock, args.vram_timeout, args.host_timeout, args.kill_timeout, learn)
+        wake, held = replay(policy, clock, gaps)
+        print(f"{label:>8}: mean wake {wake:.2f}s  mean idle memory {held:.2f} GiB-eq  | {policy.describe()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,7 @@
 Shared configuration for Privox AI model libraries and prompt templates.
 Ensures consistency between GUI and Background engine.
 """
+import functools
 
 # Keys removed from code paths; stripped from .user_prefs.json on load/save.
 OBSOLETE_USER_PREF_KEYS = frozenset(
@@ -478,6 +479,18 @@ Output: <refined>Use Western Arabic digits (0–9) for every numeric value, + 
 }
 
 
+_NUMBERS_FEW_SHOT_LANGS = frozenset(k for k in _NUMBERS_FEW_SHOT_BY_LANG if k != "_default")
+
+# Common structural example
+_STRUCT_EXAMPLE = {
+    "transcript": "our grocery list is apples and then some milk and also we need eggs and bread",
+    "output": "Our grocery list is:\n- Apples\n- Milk\n- Eggs\n- Bread"
+}
+
+
+# The formatters are pure functions of their (string) arguments and the refiner asks for the same
+# few combinations on every request, so the assembled text is cached.
+@functools.lru_cache(maxsize=64)
 def get_system_formatter(language=None, persona_mission=None, tone=None):
     """Generates a system prompt with a language-relevant few-shot example."""
     lang_key = language if language in LANGUAGE_EXAMPLES else "en"
@@ -495,14 +508,9 @@ def get_system_formatter(language=None, persona_mission=None, tone=None):
         "Be concise and remove exploratory fluff, but ensure the core technical substance is preserved."
     )
     
-    # Common structural example
-    struct_ex = {
-        "transcript": "our grocery list is apples and then some milk and also we need eggs and bread",
-        "output": "Our grocery list is:\n- Apples\n- Milk\n- Eggs\n- Bread"
-    }
+    struct_ex = _STRUCT_EXAMPLE
 
-    _num_keys = frozenset(k for k in _NUMBERS_FEW_SHOT_BY_LANG if k != "_default")
-    if language in _num_keys:
+    if language in _NUMBERS_FEW_SHOT_LANGS:
         numbers_ex = _NUMBERS_FEW_SHOT_BY_LANG[language]
     elif language is not None and language not in LANGUAGE_EXAMPLES:
         # Detected code (e.g. ru, it) with no localized few-shot — generic rules 10–11 hint only.
@@ -535,7 +543,11 @@ def get_system_formatter_for_transcript(language=None, transcript_char_len=0, pe
     """Shorter system prompt for long transcripts so prompt+text fits n_ctx; forbids summarization unless mission asks."""
     if transcript_char_len <= 300:
         return get_system_formatter(language=language, persona_mission=persona_mission, tone=tone)
-    
+    return _get_long_transcript_formatter(persona_mission, tone)
+
+
+@functools.lru_cache(maxsize=64)
+def _get_long_transcript_formatter(persona_mission=None, tone=None):
     mission_greeting = f"Your specific mission is: {persona_mission}" if persona_mission else "Refine the user's transcript per the Core Directive."
     
     # Logic to avoid contradiction: If the mission is to summarize/be concise, relax the "no-summarize" rule.
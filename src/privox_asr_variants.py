@@ -0,0 +1,257 @@
+"""
+Quantized ASR variants: build, cache and pick a faster derivative of an installed ASR model per device.
+
+    base      the installed model as today (GPU: float16 / bfloat16; CPU: CT2 int8 on the fly,
+              Qwen3-ASR float32)
+    int8      faster-whisper: a CTranslate2 conversion stored with int8 weights under
+              models/whisper-<size>-int8/. On CPU this loads without the per-load quantization
+              pass that compute_type="int8" does over the float16 checkpoint.
+    dynint8   Qwen3-ASR on CPU: torch dynamic int8 quantization of every nn.Linear (weights int8,
+              activations quantized per batch). Applied right after from_pretrained; it is
+              deterministic from the float weights, so only its benchmark verdict is cached.
+
+models/.asr_variants.json records every built variant (source, size on disk) and the last benchmark
+on the local sample set (scripts/bench_asr_variants.py): error rate and real-time factor for base
+vs variant. PRIVOX_ASR_VARIANT=auto (default) uses a variant on CPU only after its benchmark accepted
+it (error rate within MAX_ERROR_DELTA of base, and faster); until then, or when rejected, it loads
+base. base / int8 / dynint8 force a choice.
+GPUs keep the base model.
+
+    python src/privox_asr_variants.py list
+    python src/privox_asr_variants.py build --size distil-large-v3.5 --source distil-whisper/distil-large-v3.5
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+BASE = "base"
+INT8 = "int8"
+DYNINT8 = "dynint8"
+_MODES = ("auto", BASE, INT8, DYNINT8)
+
+# A variant may cost at most this much absolute error rate (WER / CER) on the local sample set.
+MAX_ERROR_DELTA = 0.02
+
+_CT2_COPY_FILES = ("tokenizer.json", "preprocessor_config.json")
+
+
+def variant_mode() -> str:
+    mode = (os.environ.get("PRIVOX_ASR_VARIANT") or "auto").strip().lower()
+    return mode if mode in _MODES else "auto"
+
+
+def _dir_bytes(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class VariantStore:
+    """models/.asr_variants.json: built variants and benchmark verdicts, keyed backend:size:variant."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f) or {}
+        except (OSError, ValueError):
+            self.data = {}
+
+    @staticmethod
+    def key(backend: str, size: str, variant: str) -> str:
+        return f"{backend}:{size}:{variant}"
+
+    def get(self, key: str) -> dict:
+        with self._lock:
+            return dict(self.data.get(key) or {})
+
+    def update(self, key: str, **fields) -> None:
+        with self._lock:
+            entry = self.data.setdefault(key, {})
+            entry.update(fields)
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.data, f, indent=2, sort_keys=True)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+    def record_benchmark(self, key: str, base: dict, variant: dict, samples: int) -> bool:
+        """Store a base-vs-variant result ({"error_rate", "rtf", "load_s"} each); returns the verdict."""
+        accepted = (
+            variant["error_rate"] <= base["error_rate"] + MAX_ERROR_DELTA
+            and variant["rtf"] < base["rtf"]
+        )
+        self.update(key, benchmark={
+            "at": time.time(),
+            "samples": samples,
+            "base": base,
+            "variant": variant,
+            "accepted": accepted,
+        })
+        return accepted
+
+    def accepted(self, key: str) -> Optional[bool]:
+        """True / False from the last benchmark, None if the variant was never benchmarked."""
+        bench = self.get(key).get("benchmark")
+        return None if not bench else bool(bench.get("accepted"))
+
+
+def whisper_int8_dir(base_dir: str, size: str) -> str:
+    return os.path.join(base_dir, "models", f"whisper-{size}-int8")
+
+
+def build_whisper_int8(base_dir: str, size: str, source: str, store: VariantStore, force: bool = False) -> str:
+    """Convert a Transformers Whisper checkpoint (HF repo id or local dir) to an int8 CT2 model.
+
+    The CT2 repos in ASR_LIBRARY ship float16 weights only and CTranslate2 cannot re-save a loaded
+    model, so the conversion starts from the original Transformers checkpoint (needs transformers +
+    torch once, at build time only).
+    """
+    import ctranslate2
+
+    out = whisper_int8_dir(base_dir, size)
+    tmp = out + ".building"
+    shutil.rmtree(tmp, ignore_errors=True)
+    t0 = time.perf_counter()
+    # Tokenizer / feature-extractor files go next to model.bin, as faster-whisper expects.
+    converter = ctranslate2.converters.TransformersConverter(
+        source, copy_files=list(_CT2_COPY_FILES), load_as_float16=True
+    )
+    converter.convert(tmp, quantization="int8", force=True)
+    if os.path.isdir(out):
+        if not force:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return out
+        shutil.rmtree(out, ignore_errors=True)
+    os.replace(tmp, out)
+    store.update(
+        VariantStore.key("whisper", size, INT8),
+        path=out,
+        source=source,
+        built_at=time.time(),
+        build_s=round(time.perf_counter() - t0, 1),
+        bytes=_dir_bytes(out),
+    )
+    return out
+
+
+def quantize_dynamic_int8(module, torch_mod):
+    """Dynamic int8 for every nn.Linear (CPU inference only; returns the quantized module)."""
+    quant = getattr(getattr(torch_mod, "ao", None), "quantization", None) or torch_mod.quantization
+    return quant.quantize_dynamic(module, {torch_mod.nn.Linear}, dtype=torch_mod.qint8)
+
+
+def select(backend: str, size: str, device: str, base_dir: str, store: VariantStore) -> tuple:
+    """(variant, path or None, reason) for loading this ASR model on device ("cuda" / "cpu")."""
+    mode = variant_mode()
+    if mode == BASE:
+        return BASE, None, "PRIVOX_ASR_VARIANT=base"
+    if device != "cpu" and mode == "auto":
+        return BASE, None, "GPU keeps the base model"
+
+    if backend == "whisper":
+        path = whisper_int8_dir(base_dir, size)
+        if mode not in ("auto", INT8):
+            return BASE, None, f"{mode} does not apply to faster-whisper"
+        if not os.path.isfile(os.path.join(path, "model.bin")):
+            return BASE, None, "no int8 build (python src/privox_asr_variants.py build ...)"
+        verdict = store.accepted(VariantStore.key(backend, size, INT8))
+        if mode == "auto" and verdict is not True:
+            return BASE, None, "int8 rejected by the last benchmark" if verdict is False else "int8 not benchmarked yet"
+        return INT8, path, "forced" if mode == INT8 else "benchmarked"
+
+    if backend == "qwen_asr":
+        if mode not in ("auto", DYNINT8):
+            return BASE, None, f"{mode} does not apply to Qwen3-ASR"
+        if device != "cpu":
+            return BASE, None, "dynamic int8 is CPU-only"
+        verdict = store.accepted(VariantStore.key(backend, size, DYNINT8))
+        if mode == "auto" and verdict is not True:
+            return BASE, None, (
+                "dynint8 rejected by the last benchmark" if verdict is False else "dynint8 not benchmarked yet"
+            )
+        return DYNINT8, None, "forced" if mode == DYNINT8 else "benchmarked"
+
+    return BASE, None, f"no variants for {backend}"
+
+
+# --- accuracy -------------------------------------------------------------------------------------
+def _tokens(text: str) -> list:
+    """Words for space-delimited scripts, single characters for CJK (so CER for Chinese / Japanese)."""
+    out, word = [], []
+    for ch in unicodedata.normalize("NFKC", text.lower()):
+        cjk = "㐀" <= ch <= "鿿" or "぀" <= ch <= "ヿ" or "가" <= ch <= "힯"
+        if cjk or not (ch.isalnum() or ch == "'"):
+            if word:
+                out.append("".join(word))
+                word = []
+            if cjk:
+                out.append(ch)
+        else:
+            word.append(ch)
+    if word:
+        out.append("".join(word))
+    return out
+
+
+def error_rate(reference: str, hypothesis: str) -> tuple:
+    """(edit distance, reference length) over _tokens(): sum both over a set, then divide."""
+    ref, hyp = _tokens(reference), _tokens(hypothesis)
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1], len(ref)
+
+
+def main() -> int:
+    import argparse
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="List or build quantized ASR variants under models/.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list")
+    b = sub.add_parser("build", help="convert a Transformers Whisper checkpoint to an int8 CT2 variant")
+    b.add_argument("--size", required=True, help="whisper_model name from ASR_LIBRARY, e.g. distil-large-v3.5")
+    b.add_argument("--source", required=True, help="Transformers checkpoint (HF repo id or local dir)")
+    b.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    store = VariantStore(os.path.join(root, "models", ".asr_variants.json"))
+    if args.cmd == "build":
+        out = build_whisper_int8(root, args.size, args.source, store, force=args.force)
+        print(f"built {out} ({_dir_bytes(out) / 1024 ** 2:.0f} MiB)")
+        return 0
+    if not store.data:
+        print("no ASR variants recorded")
+    for key, entry in sorted(store.data.items()):
+        bench = entry.get("benchmark") or {}
+        verdict = "not benchmarked"
+        if bench:
+            verdict = (
+                f"{'accepted' if bench.get('accepted') else 'rejected'}: error "
+                f"{bench['base']['error_rate']:.3f} -> {bench['variant']['error_rate']:.3f}, RTF "
+                f"{bench['base']['rtf']:.3f} -> {bench['variant']['rtf']:.3f} ({bench.get('samples')} samples)"
+            )
+        print(f"{key}: {entry.get('path') or '(load-time transform)'} | {verdict}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
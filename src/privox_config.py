@@ -0,0 +1,636 @@
+"""
+Config service: config.json / .user_prefs.json watched with OS file notifications, parsed once per
+change into an immutable snapshot, and published as a diff to subscribers.
+
+processing_loop used to poll .user_prefs.json between audio chunks: a stat every 0.35-0.75 s,
+then a full read + MD5 when the mtime moved, then load_config() reparsed both files. Config I/O
+sat inside the loop that consumes microphone audio. ConfigService moves all of it to one
+background thread:
+
+    notify      inotify on the install directory (Linux), FindFirstChangeNotification (Windows),
+                a stat poll elsewhere; only the two file names count
+    debounce    a save arrives as several events (truncate, writes, close); the service waits
+                until the directory is quiet for DEBOUNCE_S, then reads each file once
+    compare     content digest per file; a metadata touch or an unchanged rewrite publishes
+                nothing, and a half-written (invalid) file keeps the previous snapshot until the
+                next event or one retry RETRY_S later
+    publish     ConfigDiff(old, new) to each subscriber whose keys changed (keys=None: any)
+
+Each changed key maps to the narrowest action that applies it (ACTIONS): a tone edit re-reads the
+persona, a hotkey edit rebinds the hotkey, and only a refiner / ASR choice (or a key without an
+entry, "reload") goes through the full load_config() and a possible model reload. Usage counters
+map to no action at all.
+
+Privox's own .user_prefs.json updates (usage stats, migrations) go through PrefsWriter instead of
+a read-modify-write on the caller's thread: updates queue without blocking, and a background thread
+applies everything queued within WRITE_DELAY_S to one read of the file, then writes it once
+(temp file + os.replace, so readers never see a half-written file). The digest of the written
+content is registered with the service first, so the watcher adopts that change without
+publishing it: Privox's own writes never trigger a reload. When the file it merged into had
+changed since the service last read it (a settings GUI save the watcher has not picked up yet),
+the registration names the keys the updates touched, and the rest of that change is still
+published. Other direct writes (config.json
+migrations) call acknowledge() for the same effect.
+ConfigSnapshot is read-only: values are frozen (dict -> mapping proxy, list -> tuple); callers
+that need to mutate take prefs_dict() / config_dict(), which are fresh copies.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Callable, Iterable, Optional
+
+PREFS_FILE = ".user_prefs.json"
+CONFIG_FILE = "config.json"
+DEBOUNCE_S = 0.15
+RETRY_S = 0.5
+POLL_S = 0.75
+WRITE_DELAY_S = 1.0  # PrefsWriter: updates queued within this window share one write
+
+
+# Changed key -> action (None: nothing to apply). Keys not listed here map to "reload".
+ACTIONS = {
+    "hotkey": "hotkey",
+    "character": "persona",
+    "tone": "persona",
+    "custom_prompts": "persona",
+    "use_simplified_chinese_output": "persona",
+    "custom_dictionary": "dictionary",
+    "current_refiner": "refiner_model",
+    "whisper_model": "asr_model",
+    "config.whisper_repo": "asr_model",
+    "sound_enabled": "audio",
+    "auto_stop_enabled": "audio",
+    "silence_timeout_ms": "audio",
+    "vram_timeout": "policy",
+    "worker_kill_timeout": "policy",
+    "eager_model_load": "policy",
+    "model_usage_stats": None,
+    "model_cleanup_days": None,
+}
+# Actions an inference worker must also apply (hotkey / audio / policy live in the tray process).
+WORKER_ACTIONS = frozenset({"persona", "dictionary", "refiner_model", "asr_model", "reload"})
+# Actions that need the full load_config() path (model resolution, migrations).
+MODEL_ACTIONS = frozenset({"refiner_model", "asr_model", "reload"})
+
+
+def actions_for(keys: Iterable[str]) -> frozenset:
+    actions = (ACTIONS.get(key, "reload") for key in keys)
+    return frozenset(a for a in actions if a is not None)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class ConfigSnapshot:
+    """Parsed config.json + .user_prefs.json at one point in time (immutable)."""
+
+    __slots__ = ("prefs", "config", "prefs_digest", "config_digest", "loaded_at", "_prefs_raw", "_config_raw")
+
+    def __init__(self, prefs: dict, config: dict, prefs_digest: str = "", config_digest: str = ""):
+        for name, value in (
+            ("prefs", _freeze(prefs)),
+            ("config", _freeze(config)),
+            ("prefs_digest", prefs_digest),
+            ("config_digest", config_digest),
+            ("loaded_at", time.time()),
+            ("_prefs_raw", prefs),
+            ("_config_raw", config),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    def get(self, key: str, default=None):
+        return self.prefs.get(key, default)
+
+    def prefs_dict(self) -> dict:
+        return copy.deepcopy(self._prefs_raw)
+
+    def config_dict(self) -> dict:
+        return copy.deepcopy(self._config_raw)
+
+    # Typed views of the settings other components subscribe to.
+    @property
+    def hotkey(self) -> str:
+        return str(self.prefs.get("hotkey") or "").strip().lower()
+
+    @property
+    def character(self) -> str:
+        return str(self.prefs.get("character", "Writing Assistant"))
+
+    @property
+    def tone(self) -> str:
+        return str(self.prefs.get("tone", "Natural"))
+
+    @property
+    def custom_dictionary(self) -> tuple:
+        return tuple(self.prefs.get("custom_dictionary") or ())
+
+    @property
+    def current_refiner(self) -> Optional[str]:
+        return self.prefs.get("current_refiner")
+
+    @property
+    def whisper_model(self) -> Optional[str]:
+        return self.prefs.get("whisper_model")
+
+    @property
+    def use_simplified_chinese_output(self) -> bool:
+        return bool(self.prefs.get("use_simplified_chinese_output", False))
+
+
+class ConfigDiff:
+    """Top-level keys that differ between two snapshots; config.json keys are prefixed "config.".
+
+    prefs=False leaves .user_prefs.json out (its change was Privox's own write); skip leaves out
+    only those prefs keys (Privox's part of a write that also carried someone else's edit).
+    """
+
+    __slots__ = ("old", "new", "keys")
+
+    def __init__(self, old: ConfigSnapshot, new: ConfigSnapshot, prefs: bool = True, skip: Iterable[str] = ()):
+        self.old = old
+        self.new = new
+        keys = set()
+        if prefs and old.prefs_digest != new.prefs_digest:
+            skip = frozenset(skip)
+            keys.update(
+                k for k in set(old.prefs) | set(new.prefs) if k not in skip and old.prefs.get(k) != new.prefs.get(k)
+            )
+        if old.config_digest != new.config_digest:
+            keys.update(
+                "config." + k for k in set(old.config) | set(new.config) if old.config.get(k) != new.config.get(k)
+            )
+        self.keys = frozenset(keys)
+
+    def __bool__(self) -> bool:
+        return bool(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def touches(self, keys: Iterable[str]) -> bool:
+        return not self.keys.isdisjoint(keys)
+
+    @property
+    def actions(self) -> frozenset:
+        return actions_for(self.keys)
+
+    def describe(self) -> str:
+        return ", ".join(sorted(self.keys)) or "no changes"
+
+
+def _read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _parse(raw: Optional[bytes]) -> dict:
+    """{} for a missing or empty file; raises ValueError for invalid JSON."""
+    if raw is None:
+        return {}
+    text = raw.decode("utf-8-sig")
+    if not text.strip():
+        return {}
+    data = json.loads(text)
+    return data if isinstance(data, dict) else {}
+
+
+def _digest(raw: Optional[bytes]) -> str:
+    return "" if raw is None else hashlib.md5(raw).hexdigest()
+
+
+# --- change notification backends ------------------------------------------------------------
+class _PollNotifier:
+    """Fallback: stat the files every POLL_S (on the service thread, not the audio loop)."""
+
+    def __init__(self, paths: list):
+        self.paths = paths
+        self._last = self._stat()
+
+    def _stat(self):
+        out = []
+        for p in self.paths:
+            try:
+                st = os.stat(p)
+                out.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                out.append(None)
+        return out
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(min(timeout, POLL_S))
+        now = self._stat()
+        changed = now != self._last
+        self._last = now
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyNotifier:
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory: str, names: set):
+        import ctypes
+        import ctypes.util
+        import struct
+
+        self._struct = struct
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, "inotify_add_watch failed")
+        self.names = {os.fsencode(n) for n in names}
+
+    def wait(self, timeout: float) -> bool:
+        import select
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        hit = False
+        pos = 0
+        while pos + 16 <= len(buf):
+            _wd, _mask, _cookie, length = self._struct.unpack_from("iIII", buf, pos)
+            name = buf[pos + 16 : pos + 16 + length].rstrip(b"\0")
+            hit = hit or name in self.names
+            pos += 16 + length
+        return hit
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class _WindowsNotifier:
+    """FindFirstChangeNotification on the directory; the stat check filters unrelated files."""
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x01
+    FILE_NOTIFY_CHANGE_SIZE = 0x08
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x10
+    WAIT_OBJECT_0 = 0
+
+    def __init__(self, directory: str, paths: list):
+        import ctypes
+        from ctypes import wintypes
+
+        k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        k32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        k32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        k32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        k32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        k32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        k32.WaitForSingleObject.restype = wintypes.DWORD
+        self._k32 = k32
+        flags = self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE | self.FILE_NOTIFY_CHANGE_LAST_WRITE
+        self.handle = k32.FindFirstChangeNotificationW(directory, False, flags)
+        if not self.handle or self.handle == wintypes.HANDLE(-1).value:
+            raise OSError(ctypes.get_last_error(), "FindFirstChangeNotification failed")
+        self._stat = _PollNotifier(paths)
+
+    def wait(self, timeout: float) -> bool:
+        if self._k32.WaitForSingleObject(self.handle, int(timeout * 1000)) != self.WAIT_OBJECT_0:
+            return False
+        self._k32.FindNextChangeNotification(self.handle)
+        return self._stat.wait(0.0)
+
+    def close(self) -> None:
+        self._k32.FindCloseChangeNotification(self.handle)
+
+
+def _make_notifier(directory: str, paths: list):
+    try:
+        if sys.platform.startswith("linux"):
+            return _InotifyNotifier(directory, {os.path.basename(p) for p in paths}), "inotify"
+        if sys.platform == "win32":
+            return _WindowsNotifier(directory, paths), "change notification"
+    except Exception:
+        pass
+    return _PollNotifier(paths), f"poll {POLL_S:g}s"
+
+
+class ConfigService:
+    def __init__(self, base_dir: str, log: Callable[[str], None] = print, defer: Optional[Callable[[], bool]] = None):
+        self.base_dir = base_dir
+        self.prefs_path = os.path.join(base_dir, PREFS_FILE)
+        self.config_path = os.path.join(base_dir, CONFIG_FILE)
+        self.log = log
+        # While defer() is true (e.g. a model load), a detected change waits instead of applying.
+        self.defer = defer
+        self._lock = threading.RLock()
+        self._publish_lock = threading.Lock()
+        self._subscribers: list = []
+        self._current: Optional[ConfigSnapshot] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._reported_invalid: set = set()
+        # (digest, keys) of prefs content PrefsWriter wrote; keys=None: the whole change is ours
+        self._own_prefs: deque = deque(maxlen=8)
+
+    # --- snapshots --------------------------------------------------------------------------
+    @property
+    def current(self) -> ConfigSnapshot:
+        with self._lock:
+            if self._current is None:
+                self._current = self._read_snapshot(previous=None)
+            return self._current
+
+    def _read_snapshot(self, previous: Optional[ConfigSnapshot]) -> Optional[ConfigSnapshot]:
+        """Read both files. Unchanged files reuse the previous parse; invalid JSON -> None."""
+        parsed = []
+        for path, label, attr in (
+            (self.prefs_path, PREFS_FILE, "prefs"),
+            (self.config_path, CONFIG_FILE, "config"),
+        ):
+            raw = _read(path)
+            digest = _digest(raw)
+            if previous is not None and getattr(previous, f"{attr}_digest") == digest:
+                parsed.append((getattr(previous, f"_{attr}_raw"), digest))
+                continue
+            try:
+                data = _parse(raw)
+            except ValueError as e:
+                if digest not in self._reported_invalid:
+                    self._reported_invalid.add(digest)
+                    self.log(
+                        f"Invalid JSON in {label} ({path}): {e}. Fix the file (valid UTF-8, double-quoted "
+                        "keys, no trailing commas); keeping the previous settings."
+                    )
+                if previous is None:
+                    data = {}
+                else:
+                    return None
+            parsed.append((data, digest))
+        (prefs, prefs_digest), (config, config_digest) = parsed
+        return ConfigSnapshot(prefs, config, prefs_digest, config_digest)
+
+    def refresh(self, publish: bool = True) -> Optional[ConfigDiff]:
+        """Re-read the files; publish the diff (if any) unless publish=False. Returns the diff."""
+        with self._lock:
+            old = self.current
+            new = self._read_snapshot(previous=old)
+            if new is None:
+                return None
+            if new.prefs_digest == old.prefs_digest and new.config_digest == old.config_digest:
+                return None
+            self._current = new
+            own, skip = False, ()
+            if new.prefs_digest != old.prefs_digest:
+                for entry in self._own_prefs:
+                    if entry[0] == new.prefs_digest:
+                        self._own_prefs.remove(entry)
+                        own, skip = entry[1] is None, entry[1] or ()
+                        break
+            diff = ConfigDiff(old, new, prefs=not own, skip=skip)
+        # Subscribers run outside the snapshot lock: they may write prefs and acknowledge().
+        if publish and diff:
+            with self._publish_lock:
+                self._publish(diff)
+        return diff
+
+    def acknowledge(self) -> None:
+        """Adopt the files as they are now without publishing (after Privox's own writes)."""
+        self.refresh(publish=False)
+
+    def expect_prefs(self, raw: bytes, keys: Optional[Iterable[str]] = None) -> None:
+        """.user_prefs.json is about to be replaced with raw by Privox: adopt it, do not publish.
+
+        keys: only these prefs keys are Privox's change; other keys that differ from the adopted
+        snapshot are published (None: the whole change is Privox's).
+        """
+        with self._lock:
+            self._own_prefs.append((_digest(raw), None if keys is None else frozenset(keys)))
+
+    def forget_prefs(self, raw: bytes) -> None:
+        """Undo expect_prefs(raw): the replace failed, so a later file with that content is not ours."""
+        digest = _digest(raw)
+        with self._lock:
+            for entry in reversed(self._own_prefs):
+                if entry[0] == digest:
+                    self._own_prefs.remove(entry)
+                    break
+
+    # --- subscribers ------------------------------------------------------------------------
+    def subscribe(self, callback: Callable[[ConfigDiff], None], keys: Optional[Iterable[str]] = None) -> None:
+        with self._publish_lock:
+            self._subscribers.append((callback, frozenset(keys) if keys is not None else None))
+
+    def _publish(self, diff: ConfigDiff) -> None:
+        for callback, keys in list(self._subscribers):
+            if keys is not None and not diff.touches(keys):
+                continue
+            try:
+                callback(diff)
+            except Exception as e:
+                self.log(f"Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    # --- watcher thread ---------------------------------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.current  # baseline before the first event
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True, name="privox-config-watch")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _watch(self) -> None:
+        notifier, kind = _make_notifier(self.base_dir, [self.prefs_path, self.config_path])
+        self.log(f"Config watcher started ({kind}).")
+        retry_at = None
+        try:
+            while not self._stop.is_set():
+                changed = notifier.wait(1.0)
+                if not changed and (retry_at is None or time.monotonic() < retry_at):
+                    continue
+                while notifier.wait(DEBOUNCE_S):  # settle: wait out the rest of the save
+                    pass
+                while self.defer is not None and self.defer() and not self._stop.is_set():
+                    time.sleep(0.25)
+                before = self.current
+                try:
+                    self.refresh()
+                except Exception as e:
+                    self.log(f"Config reload failed: {e}")
+                # Unchanged snapshot after an event: either a metadata touch or a half-written
+                # file (invalid JSON); look once more shortly after.
+                retry_at = time.monotonic() + RETRY_S if changed and self.current is before else None
+        finally:
+            notifier.close()
+
+
+class PrefsWriter:
+    """Queued, coalesced read-modify-write of .user_prefs.json on a background thread."""
+
+    MAX_ATTEMPTS = 5  # an unreadable file (another process mid-save) is retried, then given up
+    # A file saved by someone else while we merged is merged again; that does not use up an attempt.
+
+    def __init__(
+        self,
+        service: ConfigService,
+        log: Callable[[str], None] = print,
+        normalize: Optional[Callable[[dict], object]] = None,
+        delay: float = WRITE_DELAY_S,
+    ):
+        self.service = service
+        self.path = service.prefs_path
+        self.log = log
+        self.normalize = normalize  # applied to the merged prefs before every write
+        self.delay = delay
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._pending: list = []
+        self._due: Optional[float] = None
+        self._writing = False
+        self._attempts = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def update(self, updater: Callable[[dict], object]) -> None:
+        """Queue updater(prefs) (mutates in place); returns immediately."""
+        with self._cond:
+            self._pending.append(updater)
+            if self._due is None:
+                self._due = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="privox-prefs-writer")
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write queued updates now (e.g. before exit); True when nothing is left pending."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if self._pending:
+                self._due = time.monotonic()
+                self._cond.notify_all()
+            while self._pending or self._writing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                while self._pending and self._due - time.monotonic() > 0:
+                    self._cond.wait(self._due - time.monotonic())
+                batch, self._pending = self._pending, []
+                self._due = None
+                self._writing = True
+            try:
+                done = self._write(batch)
+            except Exception as e:
+                self.log(f"Error updating user prefs: {e}")
+                done = True
+            with self._cond:
+                self._writing = False
+                if done is not None:
+                    self._attempts = 0 if done else self._attempts + 1
+                if done is None or (not done and self._attempts < self.MAX_ATTEMPTS):
+                    self._pending[:0] = batch
+                    self._due = time.monotonic() + RETRY_S
+                elif not done:
+                    self.log(
+                        f"Error updating user prefs: {PREFS_FILE} stayed unreadable after {self.MAX_ATTEMPTS} "
+                        f"attempts; dropped {len(batch)} update(s)."
+                    )
+                    self._attempts = 0
+                self._cond.notify_all()
+
+    def _write(self, batch: list) -> Optional[bool]:
+        """One read, every queued update, one atomic write.
+
+        False: the file is unreadable, retry later. None: it changed while we merged, merge again.
+        """
+        raw = _read(self.path)
+        try:
+            prefs = _parse(raw)
+        except ValueError:
+            return False
+        before = copy.deepcopy(prefs)
+        for updater in batch:
+            try:
+                updater(prefs)
+            except Exception as e:
+                self.log(f"Error updating user prefs: {e}")
+        if self.normalize is not None:
+            self.normalize(prefs)
+        data = json.dumps(prefs, indent=4).encode("utf-8")
+        if data == raw:
+            return True
+        if _read(self.path) != raw:  # saved by someone else while we merged: merge again
+            return None
+        fd, tmp = tempfile.mkstemp(prefix=PREFS_FILE + ".", suffix=".tmp", dir=os.path.dirname(self.path))
+        expected = False
+        replaced = False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Registered before the replace so a watcher refresh right after it is not published;
+            # forgotten again below if the replace fails.
+            if _digest(raw) == self.service.current.prefs_digest:
+                self.service.expect_prefs(data)
+            else:
+                # We merged into a save the service has not adopted yet (e.g. the settings GUI):
+                # only the keys our updates changed are ours; the rest is still published.
+                touched = {k for k in set(before) | set(prefs) if before.get(k) != prefs.get(k)}
+                self.service.expect_prefs(data, keys=touched)
+            expected = True
+            for attempt in range(5):
+                try:
+                    os.replace(tmp, self.path)
+                    replaced = True
+                    break
+                except PermissionError:  # Windows: a reader holds the file open
+                    if attempt == 4:
+                        raise
+                    time.sleep(0.05)
+        finally:
+            if expected and not replaced:
+                self.service.forget_prefs(data)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.writes += 1
+        return True
@@ -0,0 +1,263 @@
+"""
+Custom dictionary: compiled once, used to bias ASR and to correct its output before the refiner.
+
+The Settings word list used to reach only the refiner, joined whole into every system prompt as
+"Specific Jargon/Hints", and correct() lowercased the list again on each call. A list of a few
+hundred terms bloated every prompt, and the ASR still misspelled the words in the first place.
+
+compiled(terms) builds a CustomDictionary once per list (cached by content), with:
+
+    ASR bias       asr_hotwords(): the terms as a comma list within a character budget, for
+                   faster-whisper hotwords (initial_prompt on older builds) and the Qwen3-ASR
+                   context. Terms that recently matched come first when the list does not fit.
+    correction     correct(text): one pass over the Latin tokens of the transcript. Windows of
+                   2-3 tokens must match a term's spelling key exactly ("open ai" -> OpenAI,
+                   "node js" -> Node.js) and may not pull in a function word the term does not
+                   contain ("a pi" stays). Single tokens may also match by a phonetic key
+                   (consonant classes, vowels dropped) when the token is close on its own: same
+                   first letter, at least MIN_FUZZY_LEN letters, a length within
+                   MAX_FUZZY_LEN_DIFF (1 for terms under 8 letters, so "reddish" is not Redis)
+                   and a spelling ratio of FUZZY_RATIO ("kubernetis" -> Kubernetes). Case-only
+                   changes are applied only to terms whose casing carries information (PyTorch,
+                   iOS, GPT-4), never to plain capitalized words, and a single token that is a
+                   common English word is never rewritten (terms IT / US / AM leave "send it to
+                   us" and "I am at home" alone). CJK terms are hotwords only.
+    refiner hints  prompt_terms(): the whole list while it has at most PROMPT_ALL_TERMS terms, for
+                   the system prompt (the same for every request, so its KV prefix is reused).
+                   transcript_hints(text): for longer lists, the terms that occur in the
+                   transcript (one privox_patterns scan); they go in the user message.
+
+PRIVOX_DICTIONARY_CORRECT=0 turns the post-ASR correction off (ASR bias and hints stay).
+"""
+from __future__ import annotations
+
+import difflib
+import functools
+import os
+import re
+import threading
+from collections import Counter
+
+import privox_patterns
+
+PROMPT_ALL_TERMS = 24
+WHISPER_HOTWORD_CHARS = 200  # Whisper prompt window is ~224 tokens, shared with initial_prompt
+QWEN_CONTEXT_CHARS = 600
+MAX_WINDOW = 3
+MIN_FUZZY_LEN = 5
+FUZZY_RATIO = 0.8
+MAX_FUZZY_LEN_DIFF = 2  # 1 for terms shorter than 8 letters
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+(?:['.][A-Za-z0-9]+)*[+#]*")
+_GAP = re.compile(r"[ \t-]*")  # what may separate the tokens of one window
+_KEY_DROP = str.maketrans("", "", " -._'")
+_SOUND_DIGRAPHS = (("ph", "f"), ("ck", "k"), ("qu", "kw"), ("x", "ks"))
+_SOUND_CLASSES = str.maketrans("bdgvzcq", "ptkfskk")
+_SOUND_SILENT = str.maketrans("", "", "aeiouyhw")
+# Never merged into a multi-token term unless the term itself contains the word.
+_FUNCTION_WORDS = frozenset(
+    "a an the this that these those to of in on at for by with from and or but if is are was were be "
+    "it its i you he she we they me my your our their do does did not no so as up".split()
+)
+# Never rewritten as a single token, e.g. into an all-caps acronym (IT, US, AM, WHO).
+_COMMON_WORDS = _FUNCTION_WORDS | frozenset(
+    "am pm us go ok id ad all any can may will one new now use see set get way why how who what when "
+    "where here there him her his out off down over".split()
+)
+
+
+def correction_enabled() -> bool:
+    return (os.environ.get("PRIVOX_DICTIONARY_CORRECT") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _is_latin_term(term: str) -> bool:
+    return term.isascii() and any(ch.isalpha() for ch in term)
+
+
+def _key(text: str) -> str:
+    """Spelling key: lowercase, spacing and light punctuation removed ("Node.js" -> "nodejs")."""
+    return text.lower().translate(_KEY_DROP)
+
+
+def _collapse(s: str) -> str:
+    out = []
+    for ch in s:
+        if not out or out[-1] != ch:
+            out.append(ch)
+    return "".join(out)
+
+
+def sound_key(key: str) -> str:
+    """Rough phonetic key: voiced/unvoiced consonants merged, vowels after the first letter dropped."""
+    s = "".join(ch for ch in key if ch.isalnum())
+    for a, b in _SOUND_DIGRAPHS:
+        s = s.replace(a, b)
+    s = _collapse(s.translate(_SOUND_CLASSES))
+    if not s:
+        return ""
+    return _collapse(s[0] + s[1:].translate(_SOUND_SILENT))
+
+
+def _case_is_informative(term: str) -> bool:
+    """PyTorch / iOS / GPT-4 / OpenAI: yes. Rust / Kubernetes / swift: no."""
+    return term != term.lower() and term != term.capitalize()
+
+
+class CustomDictionary:
+    def __init__(self, terms):
+        seen = set()
+        cleaned = []
+        for term in terms or ():
+            term = str(term).strip()
+            if term and term.lower() not in seen:
+                seen.add(term.lower())
+                cleaned.append(term)
+        self.terms = tuple(cleaned)
+        self.lower_terms = frozenset(seen)
+        self._lock = threading.Lock()
+        self._hits: Counter = Counter()
+
+        self._exact: dict = {}  # spelling key -> term
+        self._sound: dict = {}  # sound key -> [(term, alnum key)]
+        self._words: dict = {}  # term -> its own lowercase words ("Bank of America": bank, of, america)
+        for term in self.terms:
+            if not _is_latin_term(term):
+                continue
+            key = _key(term)
+            self._exact.setdefault(key, term)
+            self._words[term] = frozenset(m.group().lower() for m in _TOKEN.finditer(term))
+            alnum = "".join(ch for ch in key if ch.isalnum())
+            if len(alnum) >= MIN_FUZZY_LEN:
+                self._sound.setdefault(sound_key(alnum), []).append((term, alnum))
+
+        self._matcher = privox_patterns.MultiPattern({"term": [t.lower() for t in self.terms]})
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    # --- ASR bias ---------------------------------------------------------------------------
+    def asr_hotwords(self, max_chars: int = WHISPER_HOTWORD_CHARS) -> str:
+        with self._lock:
+            hits = dict(self._hits)
+        order = sorted(range(len(self.terms)), key=lambda i: -hits.get(self.terms[i], 0))
+        out: list = []
+        used = 0
+        for i in order:
+            term = self.terms[i]
+            cost = len(term) + (2 if out else 0)
+            if used + cost > max_chars:
+                continue
+            out.append(term)
+            used += cost
+        return ", ".join(out)
+
+    # --- post-ASR correction ----------------------------------------------------------------
+    def _lookup(self, surface: str, words: tuple = ()) -> str | None:
+        """Term for one token (surface) or an exact multi-token window (words: its lowercase tokens)."""
+        if len(words) <= 1 and surface.lower() in _COMMON_WORDS:
+            return None
+        key = _key(surface)
+        term = self._exact.get(key)
+        if term is not None:
+            if surface == term:
+                return None
+            if surface.lower() == term.lower() and not _case_is_informative(term):
+                return None
+            if len(words) > 1 and any(w in _FUNCTION_WORDS and w not in self._words[term] for w in words):
+                return None
+            return term
+        if len(words) > 1:
+            return None
+        alnum = "".join(ch for ch in key if ch.isalnum())
+        if len(alnum) < MIN_FUZZY_LEN or alnum in self._exact:
+            return None
+        best, best_ratio = None, FUZZY_RATIO
+        for term, term_key in self._sound.get(sound_key(alnum), ()):
+            max_diff = MAX_FUZZY_LEN_DIFF if len(term_key) >= 8 else 1
+            if term_key[0] != alnum[0] or abs(len(term_key) - len(alnum)) > max_diff:
+                continue
+            ratio = difflib.SequenceMatcher(None, alnum, term_key).ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = term, ratio
+        return best
+
+    def correct(self, text: str) -> tuple:
+        """Return (text, [(heard, term), ...]) with dictionary spellings applied."""
+        if not text or not self._exact:
+            return text, []
+        tokens = list(_TOKEN.finditer(text))
+        if not tokens:
+            return text, []
+        out: list = []
+        changes: list = []
+        pos = 0
+        i = 0
+        while i < len(tokens):
+            replaced = False
+            for width in range(min(MAX_WINDOW, len(tokens) - i), 0, -1):
+                last = tokens[i + width - 1]
+                if width > 1 and any(
+                    not _GAP.fullmatch(text, tokens[j].end(), tokens[j + 1].start())
+                    for j in range(i, i + width - 1)
+                ):
+                    continue
+                start, end = tokens[i].start(), last.end()
+                surface = text[start:end]
+                words = tuple(tokens[j].group().lower() for j in range(i, i + width))
+                term = self._lookup(surface, words)
+                if term is None:
+                    continue
+                out.append(text[pos:start])
+                out.append(term)
+                changes.append((surface, term))
+                pos = end
+                i += width
+                replaced = True
+                break
+            if not replaced:
+                i += 1
+        if not changes:
+            return text, []
+        out.append(text[pos:])
+        with self._lock:
+            self._hits.update(term for _surface, term in changes)
+        return "".join(out), changes
+
+    # --- refiner hints ----------------------------------------------------------------------
+    def prompt_terms(self) -> tuple:
+        """Terms for the system prompt: the whole list when short, else none (see transcript_hints)."""
+        return self.terms if len(self.terms) <= PROMPT_ALL_TERMS else ()
+
+    def transcript_hints(self, text: str) -> tuple:
+        """Terms of a long list that occur in text, for the user message (short lists: none)."""
+        if len(self.terms) <= PROMPT_ALL_TERMS:
+            return ()
+        lower = (text or "").lower()
+        found = set()
+        for start, idx in self._matcher.scan(lower).occurrences("term"):
+            term = self.terms[idx]
+            if idx in found:
+                continue
+            end = start + len(term)
+            if _is_latin_term(term) and (
+                (start > 0 and lower[start - 1].isalnum()) or (end < len(lower) and lower[end].isalnum())
+            ):
+                continue
+            found.add(idx)
+        if found:
+            with self._lock:
+                self._hits.update(self.terms[i] for i in found)
+        return tuple(self.terms[i] for i in sorted(found))
+
+
+@functools.lru_cache(maxsize=8)
+def _compiled(terms: tuple) -> CustomDictionary:
+    return CustomDictionary(terms)
+
+
+def compiled(terms) -> CustomDictionary:
+    """CustomDictionary for a term list, built once per distinct list content."""
+    return _compiled(tuple(terms or ()))
@@ -0,0 +1,219 @@
+"""
+Idle eviction policy: when to release each idle resource, learned from the user's dictation gaps.
+
+Resources are released in a fixed nesting order (each step implies the ones before it):
+    engine_vram   refiner + ASR weights in VRAM (worker offload / kill, or unload_heavy_models)
+    asr_host      ASR weights parked in host RAM (privox_residency HOST -> EVICTED)
+    warm_process  the WARM-FRESH worker process (spawn + import)
+Each resource holds `gib` of memory at a relative `price` (VRAM 1.0, system RAM cheaper) and
+restoring everything up to it costs `wake_s` seconds of wake latency (measured, EMA-updated).
+
+Until enough gaps have been seen, every resource uses its fallback timer (vram_timeout,
+PRIVOX_ASR_HOST_TIMEOUT, PRIVOX_WORKER_KILL_TIMEOUT), exactly as before. After that the threshold T
+for each resource minimises the empirical expected cost over observed idle gaps g:
+    cost(T) = mean_g[ weight * gib * price * min(g, T)  +  wake_penalty * (g > T) ]
+The memory weight is anchored so that, with no history, the optimum for engine_vram IS
+vram_timeout; history then moves thresholds to where wakes actually happen (short gaps keep models
+resident, long gaps release them sooner) at the same price for idle memory. Thresholds stay within
+[fallback / 4, fallback * 4] so one odd week cannot produce surprising behaviour.
+
+Pure Python and clock-injectable: scripts/simulate_idle_policy.py replays gap traces against it,
+and tests/test_privox_idle_policy.py drives it with a fake clock.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+INF = math.inf
+MIN_THRESHOLD_S = 5.0
+
+
+class IdleResource:
+    """One releasable resource; wake_s is the total wake latency once it (and all before it) is gone."""
+
+    def __init__(self, name: str, gib: float, wake_s: float, fallback_after: float, price: float = 1.0):
+        self.name = name
+        self.gib = float(gib)
+        self.price = float(price)
+        self.wake_s = float(wake_s)
+        # <= 0 means "never release" (e.g. vram_timeout = 0): the policy then never evicts it.
+        self.fallback_after = float(fallback_after)
+        self.evicted = False
+
+
+class IdlePolicy:
+    def __init__(
+        self,
+        resources: list,
+        memory_weight: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        min_samples: int = 8,
+        max_samples: int = 200,
+    ):
+        self.resources = list(resources)
+        self.clock = clock
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self._gaps: list = []          # (timestamp, gap_s), oldest first
+        self._lock = threading.Lock()
+        self._thresholds: Optional[dict] = None
+        self._wake_started: Optional[float] = None
+        self._wake_resource: Optional[IdleResource] = None
+        self._memory_weight = memory_weight if memory_weight is not None else self._anchor_weight()
+
+    # --- observations -----------------------------------------------------------------------
+    def _anchor_weight(self) -> float:
+        raw = (os.environ.get("PRIVOX_IDLE_MEMORY_WEIGHT") or "").strip()
+        if raw:
+            try:
+                return float(raw)
+            except ValueError:
+                pass
+        for r in self.resources:
+            if r.fallback_after > 0 and r.gib > 0:
+                # Break-even of the first resource lands exactly on its fallback timer.
+                return r.wake_s / (r.gib * r.price * r.fallback_after)
+        return 0.0
+
+    def record_gap(self, gap_s: float) -> None:
+        """An idle period ended (the user started dictating after gap_s seconds of idle)."""
+        if gap_s <= 0:
+            return
+        with self._lock:
+            self._gaps.append((self.clock(), float(gap_s)))
+            del self._gaps[: max(0, len(self._gaps) - self.max_samples)]
+            self._thresholds = None
+
+    def gaps(self) -> list:
+        with self._lock:
+            return [g for _t, g in self._gaps]
+
+    def note_use(self, gap_s: float) -> None:
+        """The user is back after gap_s idle seconds: record the gap and start timing the wake."""
+        self.record_gap(gap_s)
+        deepest = None
+        for r in self.resources:
+            if r.evicted:
+                deepest = r
+        self._wake_resource = deepest
+        self._wake_started = self.clock() if deepest is not None else None
+        self.mark_restored()
+
+    def observe_wake(self) -> None:
+        """Engine is ready again. Updates wake_s of the deepest resource released before note_use()."""
+        self.mark_restored()
+        r, started = self._wake_resource, self._wake_started
+        self._wake_resource = self._wake_started = None
+        if r is None or started is None:
+            return
+        seconds = self.clock() - started
+        if seconds <= 0:
+            return
+        with self._lock:
+            r.wake_s += (seconds - r.wake_s) * 0.3
+            self._thresholds = None
+
+    def carry_over(self, old: "IdlePolicy") -> None:
+        """Keep gap history, measured wake costs and release state from a policy being replaced."""
+        with old._lock:
+            gaps = list(old._gaps)
+        with self._lock:
+            self._gaps = gaps[-self.max_samples:]
+            self._thresholds = None
+        for r in self.resources:
+            prev = old._get(r.name)
+            if prev is not None:
+                r.wake_s = prev.wake_s
+                r.evicted = prev.evicted
+
+    # --- decisions -----------------------------------------------------------------------------
+    def _optimal_threshold(self, gaps: list, hold_cost: float, penalty: float, fallback: float) -> float:
+        if penalty <= 0:
+            return max(MIN_THRESHOLD_S, fallback / 4.0)
+        lo, hi = max(MIN_THRESHOLD_S, fallback / 4.0), fallback * 4.0
+        candidates = {lo, hi, fallback} | {g for g in gaps if lo <= g <= hi}
+        n = len(gaps)
+        ordered = sorted(gaps)
+        prefix = [0.0]
+        for g in ordered:
+            prefix.append(prefix[-1] + g)
+        best_t, best_cost = fallback, INF
+        for t in sorted(candidates):
+            k = bisect.bisect_right(ordered, t)   # gaps ending before release: held for g
+            held = prefix[k] + t * (n - k)        # longer gaps: held for T, then a cold wake
+            cost = (hold_cost * held + penalty * (n - k)) / n
+            if cost < best_cost - 1e-12:
+                best_t, best_cost = t, cost
+        return best_t
+
+    def thresholds(self) -> dict:
+        """Idle seconds after which each resource is released (INF = never)."""
+        with self._lock:
+            if self._thresholds is not None:
+                return dict(self._thresholds)
+            gaps = [g for _t, g in self._gaps]
+            out = {}
+            prev_t, prev_wake = 0.0, 0.0
+            for r in self.resources:
+                if r.fallback_after <= 0:
+                    t = INF
+                elif len(gaps) < self.min_samples or self._memory_weight <= 0:
+                    t = r.fallback_after
+                else:
+                    t = self._optimal_threshold(
+                        gaps,
+                        self._memory_weight * r.gib * r.price,
+                        max(0.0, r.wake_s - prev_wake),
+                        r.fallback_after,
+                    )
+                t = max(t, prev_t)  # nested: never release an outer resource before an inner one
+                out[r.name] = t
+                prev_t, prev_wake = t, max(prev_wake, r.wake_s)
+            self._thresholds = out
+            return dict(out)
+
+    def due(self, idle_for: float) -> list:
+        """Names of resources that should be released now, in release order."""
+        th = self.thresholds()
+        return [r.name for r in self.resources if not r.evicted and idle_for > th[r.name]]
+
+    def predicted_remaining_idle(self, idle_for: float) -> Optional[float]:
+        """Median remaining idle given idle_for so far (None without enough history)."""
+        gaps = sorted(g for g in self.gaps() if g > idle_for)
+        if len(gaps) < max(3, self.min_samples // 2):
+            return None
+        return gaps[len(gaps) // 2] - idle_for
+
+    # --- state ---------------------------------------------------------------------------------
+    def _get(self, name: str) -> Optional[IdleResource]:
+        for r in self.resources:
+            if r.name == name:
+                return r
+        return None
+
+    def mark_evicted(self, name: str) -> None:
+        for r in self.resources:
+            r.evicted = True
+            if r.name == name:
+                break
+
+    def mark_restored(self) -> None:
+        for r in self.resources:
+            r.evicted = False
+
+    def is_evicted(self, name: str) -> bool:
+        r = self._get(name)
+        return bool(r and r.evicted)
+
+    def describe(self) -> str:
+        th = self.thresholds()
+        parts = [
+            f"{r.name}={'never' if th[r.name] == INF else f'{th[r.name]:.0f}s'}{'*' if r.evicted else ''}"
+            for r in self.resources
+        ]
+        return f"idle policy ({len(self.gaps())} gaps): " + ", ".join(parts)
@@ -11,14 +11,24 @@ The JSON header carries the control fields (cmd, fields, blob_dtype, ...).
 The optional binary blob carries raw audio (float32) without JSON overhead so
 multi-second recordings transfer cheaply.
 
+Transports (see preferred_transport):
+    unix -- AF_UNIX socketpair; the worker end is inherited as a file descriptor
+            (Linux/macOS). No port, no filesystem path, no connect retry.
+    pipe -- Windows named pipe with a random name; main listens, worker connects.
+    tcp  -- legacy 127.0.0.1 loopback (worker binds a port, main connects). Fallback.
+
 This module has no heavy dependencies so it can be imported by both the light
 main process and the CUDA-heavy worker process.
 """
 from __future__ import annotations
 
 import json
+import os
 import socket
 import struct
+import sys
+import threading
+import uuid
 from typing import Any, Optional, Tuple
 
 _LEN = struct.Struct(">I")
@@ -67,3 +77,111 @@ def recv_message(sock: socket.socket) -> Optional[Tuple[dict, bytes]]:
     except Exception:
         header = {}
     return header, blob
+
+
+# --- transports -----------------------------------------------------------
+
+TRANSPORTS = ("unix", "pipe", "tcp")
+
+
+def preferred_transport() -> str:
+    """Transport for the main <-> worker link. PRIVOX_IPC_TRANSPORT=unix|pipe|tcp overrides.
+
+    An override that the platform cannot provide falls back to the platform default.
+    """
+    default = "pipe" if sys.platform == "win32" else ("unix" if hasattr(socket, "AF_UNIX") else "tcp")
+    v = (os.environ.get("PRIVOX_IPC_TRANSPORT") or "").strip().lower()
+    if v == "tcp":
+        return "tcp"
+    if v == "unix" and hasattr(socket, "AF_UNIX") and sys.platform != "win32":
+        return "unix"
+    if v == "pipe" and sys.platform == "win32":
+        return "pipe"
+    return default
+
+
+def child_socketpair() -> Tuple[socket.socket, socket.socket]:
+    """(parent_end, child_end) AF_UNIX stream pair. Pass child_end.fileno() via Popen(pass_fds=...)."""
+    parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    return parent, child
+
+
+class PipeStream:
+    """Socket-like adapter over a multiprocessing named-pipe Connection.
+
+    Exposes just what send_message / recv_message and _WorkerClient use (sendall, recv,
+    settimeout, close) so the framing code is shared with the socket transports.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._buf = bytearray()
+        self._timeout: Optional[float] = None
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        self._timeout = timeout
+
+    def sendall(self, data: bytes) -> None:
+        try:
+            self._conn.send_bytes(data)
+        except (EOFError, BrokenPipeError) as e:
+            raise ConnectionError(str(e)) from e
+
+    def recv(self, n: int) -> bytes:
+        if not self._buf:
+            if self._timeout is not None and not self._conn.poll(self._timeout):
+                raise socket.timeout("timed out")
+            try:
+                self._buf.extend(self._conn.recv_bytes())
+            except (EOFError, BrokenPipeError):
+                return b""
+        chunk = bytes(self._buf[:n])
+        del self._buf[:n]
+        return chunk
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def new_pipe_address() -> str:
+    return rf"\\.\pipe\privox-{os.getpid()}-{uuid.uuid4().hex}"
+
+
+def open_pipe_listener(address: str):
+    from multiprocessing.connection import Listener
+
+    return Listener(address=address, family="AF_PIPE")
+
+
+def accept_pipe(listener, timeout: float) -> Optional[PipeStream]:
+    """Accept one named-pipe connection, or None after timeout (Listener.accept has no timeout)."""
+    box: dict = {}
+
+    def _accept():
+        try:
+            box["conn"] = listener.accept()
+        except Exception as e:
+            box["error"] = e
+
+    t = threading.Thread(target=_accept, daemon=True)
+    t.start()
+    t.join(timeout)
+    if "conn" in box:
+        return PipeStream(box["conn"])
+    return None
+
+
+def connect_pipe(address: str) -> PipeStream:
+    from multiprocessing.connection import Client
+
+    return PipeStream(Client(address, family="AF_PIPE"))
@@ -0,0 +1,235 @@
+"""
+Load-time profiler: nested timing spans for every stage of a wake, in Chrome trace-event JSON.
+
+load_heavy_models() used to log totals only ("ASR load time", "Grammar load time") plus the coarse
+[Wake timing] marks. Each wake now records spans for its sub-stages, e.g.
+
+    wake                             load_heavy_models, whole
+      asr                            ASR thread
+        asr.import / asr.discover / asr.weights / asr.device_transfer / asr.quantize
+      refiner                        refiner thread
+        refiner.discover             local models/ check, HF cache probe (or download)
+        refiner.import               llama_cpp import + runtime checks
+        refiner.plan                 GPU layer / context planning
+        refiner.weights              llama.cpp init: weight read + upload (per retry)
+      warmup.asr / warmup.refiner    graph build + first token (background, after ready)
+
+Spans are appended to load_trace.json (next to privox_app.log) as Chrome's JSON-array trace format
+(the closing bracket is optional, so every process can append lines): open it in
+chrome://tracing or https://ui.perfetto.dev. Main and worker processes share the file; pid is the
+OS process, and args.wake ties the spans of one wake together. PRIVOX_LOAD_TRACE=0 disables it.
+
+    python src/privox_loadtrace.py --last 10     # which sub-stage dominates on this machine
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Optional
+
+MAX_BYTES = 4 * 1024 * 1024
+
+
+def trace_enabled() -> bool:
+    return (os.environ.get("PRIVOX_LOAD_TRACE") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def default_path() -> str:
+    """load_trace.json in the install root (same rule as voice_input.BASE_DIR)."""
+    if getattr(sys, "frozen", False):
+        root = os.path.dirname(os.path.normpath(sys.executable))
+    else:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(root, "load_trace.json")
+
+
+class LoadTracer:
+    def __init__(self, path: Optional[str] = None, process_name: str = "privox"):
+        self.path = path or default_path()
+        self.process_name = process_name
+        self.enabled = trace_enabled()
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._wake: Optional[str] = None
+        self._wake_root = None
+        self._named_threads: set = set()
+        self._meta_written = False
+
+    @staticmethod
+    def _now_us() -> float:
+        return time.time() * 1e6
+
+    # --- wakes -------------------------------------------------------------------------------
+    def begin_wake(self, label: str = "wake", **args) -> Optional[str]:
+        """Start a new wake; spans until the next begin_wake() belong to it (incl. late warmup)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._seq += 1
+            self._wake = f"{os.getpid()}-{self._seq}"
+        self._wake_root = self.begin("wake", cat="wake", label=label, **args)
+        return self._wake
+
+    def end_wake(self, **args) -> None:
+        root, self._wake_root = self._wake_root, None
+        self.end(root, **args)
+
+    # --- spans -------------------------------------------------------------------------------
+    def begin(self, name: str, cat: str = "load", **args):
+        """Open a span on the calling thread; pass the handle to end(). None when disabled / no wake."""
+        if not self.enabled or self._wake is None:
+            return None
+        return (name, cat, self._now_us(), threading.get_ident(), threading.current_thread().name, self._wake, args)
+
+    def end(self, handle, **args) -> None:
+        if handle is None:
+            return
+        name, cat, ts, tid, tname, wake, start_args = handle
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(ts, 1),
+            "dur": round(self._now_us() - ts, 1),
+            "pid": os.getpid(),
+            "tid": tid,
+            "args": dict(start_args, wake=wake, **args),
+        }
+        self._write(event, tid, tname)
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = "load", **args):
+        handle = self.begin(name, cat, **args)
+        try:
+            yield
+        finally:
+            self.end(handle)
+
+    def _write(self, event: dict, tid: int, tname: str) -> None:
+        lines = []
+        with self._lock:
+            if not self._meta_written:
+                lines.append({"name": "process_name", "ph": "M", "pid": event["pid"], "args": {"name": self.process_name}})
+                self._meta_written = True
+            if tid not in self._named_threads:
+                lines.append({"name": "thread_name", "ph": "M", "pid": event["pid"], "tid": tid, "args": {"name": tname}})
+                self._named_threads.add(tid)
+            lines.append(event)
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) > MAX_BYTES:
+                    os.replace(self.path, self.path + ".1")
+                    self._meta_written = False
+                    self._named_threads = set()
+                new = not os.path.exists(self.path)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(("[\n" if new else "") + "".join(json.dumps(e) + ",\n" for e in lines))
+            except OSError:
+                pass
+
+
+_tracer: Optional[LoadTracer] = None
+
+
+def tracer() -> LoadTracer:
+    """Process-wide tracer (named after the worker role in engine mode)."""
+    global _tracer
+    if _tracer is None:
+        engine = (os.environ.get("PRIVOX_ENGINE_MODE") or "").strip().lower() in ("1", "true", "yes", "on")
+        role = (os.environ.get("PRIVOX_WORKER_ROLE") or "").strip()
+        name = f"privox worker{f' ({role})' if role else ''}" if engine else "privox main"
+        _tracer = LoadTracer(process_name=name)
+    return _tracer
+
+
+def span(name: str, cat: str = "load", **args):
+    return tracer().span(name, cat, **args)
+
+
+# --- summary ----------------------------------------------------------------------------------
+def read_events(path: str) -> list:
+    """Events from a JSON-array trace that may lack its closing bracket (as written above)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+    except OSError:
+        return []
+    if not text:
+        return []
+    if text.startswith("{"):
+        return json.loads(text).get("traceEvents", [])
+    text = text.rstrip(",")
+    if not text.endswith("]"):
+        text += "]"
+    try:
+        return json.loads(text)
+    except ValueError:
+        # A process died mid-line: keep every complete line.
+        out = []
+        for line in text.lstrip("[").splitlines():
+            line = line.strip().rstrip(",").rstrip("]")
+            if line:
+                try:
+                    out.append(json.loads(line))
+                except ValueError:
+                    pass
+        return out
+
+
+def summarize(events: list, last: int) -> str:
+    procs = {e["pid"]: e["args"]["name"] for e in events if e.get("ph") == "M" and e.get("name") == "process_name"}
+    spans = [e for e in events if e.get("ph") == "X"]
+    wakes = sorted((e for e in spans if e["name"] == "wake"), key=lambda e: e["ts"])[-last:]
+    if not wakes:
+        return "no wakes recorded"
+    by_wake: dict = {}
+    for e in spans:
+        by_wake.setdefault(e["args"].get("wake"), []).append(e)
+    lines = [f"last {len(wakes)} wakes:"]
+    stage_ms: dict = {}
+    stage_share: dict = {}
+    for w in wakes:
+        wid = w["args"].get("wake")
+        total = w["dur"] / 1000.0
+        stages = [e for e in by_wake.get(wid, []) if e["name"] != "wake"]
+        for e in stages:
+            stage_ms.setdefault(e["name"], []).append(e["dur"] / 1000.0)
+            stage_share.setdefault(e["name"], []).append(e["dur"] / max(1.0, w["dur"]))
+        # The dominant leaf: the longest span with no longer span nested under the same name prefix.
+        leaves = [e for e in stages if not any(o is not e and o["name"].startswith(e["name"] + ".") for o in stages)]
+        top = max(leaves, key=lambda e: e["dur"], default=None)
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(w["ts"] / 1e6))
+        lines.append(
+            f"  {when}  {procs.get(w['pid'], w['pid'])}: {total:8.0f} ms"
+            + (f"  dominant {top['name']} {top['dur'] / 1000.0:.0f} ms" if top else "")
+            + (f"  [{w['args']['label']}]" if w["args"].get("label") else "")
+        )
+    lines.append("")
+    lines.append(f"{'stage':<24}{'n':>4}{'median ms':>11}{'max ms':>9}{'of wake':>9}")
+    for name in sorted(stage_ms, key=lambda n: -statistics.median(stage_ms[n])):
+        ms = stage_ms[name]
+        lines.append(
+            f"{name:<24}{len(ms):>4}{statistics.median(ms):>11.0f}{max(ms):>9.0f}"
+            f"{statistics.median(stage_share[name]):>9.0%}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize recorded wake / model-load traces.")
+    parser.add_argument("--last", type=int, default=10, help="number of most recent wakes")
+    parser.add_argument("path", nargs="?", default=default_path())
+    args = parser.parse_args()
+    events = read_events(args.path + ".1") + read_events(args.path)
+    print(summarize(events, args.last))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+"""
+Log plumbing for development runs: lazy messages, a background writer, one stderr classifier.
+
+Every dictation used to pay for its own logging on the thread doing the work. log_print() went
+print -> sys.stdout (LoggerWriter) -> logging, and each record was formatted and written to
+privox_app.log (plus the console) before the call returned. The previews were built in the caller
+(raw_text[:400].replace(...)) whether or not transcript logging was on. llama.cpp, tqdm and
+transformers spam on stderr went through a chain of substring tests and two re.search calls
+per line just to pick a level.
+
+    lazy        log_print(fmt, *args) takes %-style args like logging and goes straight to the
+                root logger: the level is checked first and the message is formatted only when a
+                handler writes it. Preview(text, limit) stands in for a clipped, one-line copy
+                of a transcript and builds it only when formatted.
+    background  start_background_writer() moves the root handlers (rotating file, console)
+                behind a QueueHandler: callers enqueue the record, and a QueueListener thread
+                formats and writes it. Records whose args are not plain values (str, numbers,
+                Preview) are formatted before enqueueing, and tracebacks are rendered there too,
+                so a record never depends on objects the caller may still change.
+                shutdown() drains the queue (atexit, and before os._exit). The writer thread
+                is stopped around os.fork() (the worker zygote forks single-threaded) and
+                restarted in both processes.
+    stderr      classify_stderr(line) returns the level for one captured stderr line, with the
+                same rules and results as before: the rules that can return WARNING keep their
+                order, the INFO-only tail runs most frequent first (tqdm, llama.cpp), and its
+                two patterns are compiled once and tried only after a substring test passes.
+
+PRIVOX_LOG_SYNC=1 keeps the handlers on the calling thread. Use it when chasing a hard crash
+(e.g. inside llama.cpp), where records still in the queue would be lost.
+
+    python scripts/bench_logging.py     # stderr classifier and record cost, before / after
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# --- stderr classification ------------------------------------------------------------------
+_LOADER_PREFIXES = ("ggml_", "gguf")
+_DEVICE_HW = ("nvidia", "amd", "compute capability", "vmm:")
+_TQDM_RATES = ("b/s", "it/s", "/1.", "/0.")
+_LLAMA_PREFIXES = (
+    "llama_", "llm_", "ggml_", "gguf", "cuda :", "device ", "model metadata:",
+    "using gguf chat template:", "using chat eos_token:", "using chat bos_token:",
+)
+_LLAMA_DIAGNOSTICS = ("not marked as eog", "offloading", "kv buffer size", "compute buffer size", "graph nodes")
+_PROGRESS_TIME = re.compile(r"\[\d+:\d+")
+_MODEL_FILE = re.compile(r"(^|\s)(config|tokenizer|vocabulary|preprocessor_config)\.json|model\.bin|\.safetensors")
+
+
+def classify_stderr(line: str) -> int:
+    """Log level for a stderr line: third-party progress and diagnostics are not errors."""
+    ml = line.lower()
+    if "using cache found" in ml:
+        return logging.INFO
+    if "generation flags are not valid" in ml:
+        return logging.WARNING
+    if "pad_token_id" in ml and "eos_token_id" in ml:
+        return logging.WARNING
+    # llama.cpp / GGML often prints GPU discovery to stderr; not application failures.
+    if ml.startswith(_LOADER_PREFIXES) or "ggml_cuda_init" in ml:
+        return logging.INFO
+    if ml.startswith("device ") and any(x in ml for x in _DEVICE_HW):
+        return logging.INFO
+    # Transformers + tqdm emit weight-load progress to stderr; not failures.
+    if "checkpoint shard" in ml:
+        return logging.INFO
+    if "userwarning" in ml and "huggingface" in ml:
+        return logging.WARNING
+    # Only INFO rules below, so their order does not matter: most frequent first.
+    # faster-whisper / huggingface_hub download bars use tqdm on stderr (model.bin, tokenizer.json, ...).
+    if "%|" in ml and any(x in ml for x in _TQDM_RATES):
+        return logging.INFO
+    if "llama" in ml and (ml.startswith(_LLAMA_PREFIXES) or any(x in ml for x in _LLAMA_DIAGNOSTICS)):
+        return logging.INFO
+    if ("b/s" in ml or "it/s" in ml) and _PROGRESS_TIME.search(ml):
+        return logging.INFO
+    if "[" in ml and "]" in ml and _MODEL_FILE.search(ml):
+        return logging.INFO
+    return logging.ERROR
+
+
+# --- lazy message parts ---------------------------------------------------------------------
+class Preview:
+    """One-line preview of text, built only when the log record is formatted."""
+
+    __slots__ = ("text", "limit")
+
+    def __init__(self, text, limit: int = 400):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = str(self.text) if self.text is not None else ""
+        out = text[: self.limit].replace("\n", " ").strip()
+        return out + "..." if len(text) > self.limit else out
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+
+# --- background writer ----------------------------------------------------------------------
+_PLAIN_ARGS = (str, int, float, type(None), Preview)
+_listener: Optional[QueueListener] = None
+_owner: Optional[logging.Logger] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue the record as is (formatted on the listener thread), unless it is unsafe to defer."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(v, _PLAIN_ARGS) for v in values):
+                record.msg = record.getMessage()
+                record.args = None
+        if record.exc_info:
+            # Tracebacks reference live frames: render them now.
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def sync_requested() -> bool:
+    return (os.environ.get("PRIVOX_LOG_SYNC") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def start_background_writer(logger: Optional[logging.Logger] = None) -> bool:
+    """Move logger's handlers (root by default) to a writer thread. False when left synchronous."""
+    global _listener, _owner
+    logger = logger or logging.getLogger()
+    handlers = [h for h in logger.handlers if not isinstance(h, logging.NullHandler)]
+    if _listener is not None or not handlers or sync_requested():
+        return False
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(q, *handlers, respect_handler_level=True)
+    for h in handlers:
+        logger.removeHandler(h)
+    logger.addHandler(_DeferredQueueHandler(q))
+    listener.start()
+    _listener, _owner = listener, logger
+    return True
+
+
+def shutdown() -> None:
+    """Write everything still queued and stop the writer thread (safe to call more than once)."""
+    global _listener, _owner
+    listener, logger = _listener, _owner
+    _listener = _owner = None
+    if listener is None:
+        return
+    try:
+        listener.stop()
+    except Exception:
+        pass
+    # Late records (e.g. from daemon threads during exit) go straight to the handlers.
+    for h in list(logger.handlers):
+        if isinstance(h, _DeferredQueueHandler):
+            logger.removeHandler(h)
+    for h in listener.handlers:
+        logger.addHandler(h)
+
+
+def _stop_for_fork() -> None:
+    if _listener is not None:
+        _listener.stop()  # drains the queue and joins the thread
+
+
+def _restart_after_fork() -> None:
+    if _listener is not None:
+        _listener.start()
+
+
+atexit.register(shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_stop_for_fork, after_in_parent=_restart_after_fork, after_in_child=_restart_after_fork
+    )
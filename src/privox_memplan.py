@@ -0,0 +1,375 @@
+"""
+Memory-budget planner for refiner (llama.cpp GGUF) offload and ASR placement.
+
+Replaces the fixed "0.15 GiB per layer" / "reserve 42 % for ASR" guesses and the OOM trial-and-error
+layer plan with numbers read from the model files:
+  - GGUF metadata: block count, per-layer tensor bytes, KV width (heads x head dim), embedding size
+  - ASR checkpoint size on disk (models/whisper-<preset>)
+plan_placement() turns those plus a VRAM budget into n_gpu_layers, n_ctx, n_batch and the ASR
+max_memory cap in one pass. Measured VRAM after a load is persisted (MeasurementStore) and scales
+later plans for the same file, so estimates converge on the real footprint of each machine.
+
+Pure Python and deterministic: nothing here touches the GPU, so a plan for a fake device size can
+be computed on any machine:
+    python src/privox_memplan.py models/gemma-4-E4B-it-UD-Q4_K_XL.gguf --vram-gib 8 --asr-gib 1.5
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Optional
+
+GIB = 1024 ** 3
+
+# GGUF value types -> struct format (fixed-size scalars); 8 = string, 9 = array.
+_GGUF_SCALAR = {0: "<B", 1: "<b", 2: "<H", 3: "<h", 4: "<I", 5: "<i", 6: "<f", 7: "<?", 10: "<Q", 11: "<q", 12: "<d"}
+_GGUF_STRING = 8
+_GGUF_ARRAY = 9
+
+# Fixed costs (GiB) that do not scale with the model: CUDA context / driver reserve per process.
+CUDA_OVERHEAD_GIB = 0.5
+# Weight-to-VRAM factor and fixed workspace (GiB) per ASR backend.
+_ASR_FOOTPRINT = {
+    "qwen_asr": (1.10, 0.50),    # torch fp16/bf16 weights + activations / allocator slack
+    "sensevoice": (1.10, 0.40),
+    "whisper": (0.60, 0.50),     # CT2 float16 checkpoint loaded int8_float16 + decode workspace
+}
+# Legacy share of total VRAM reserved for ASR when its checkpoint is not on disk.
+_ASR_LEGACY_FRACTION = {"qwen_asr": 0.42, "sensevoice": 0.42, "whisper": 0.15}
+
+
+class _Reader:
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+
+    def unpack(self, fmt: str):
+        v = struct.unpack_from(fmt, self.buf, self.pos)[0]
+        self.pos += struct.calcsize(fmt)
+        return v
+
+    def string(self) -> str:
+        n = self.unpack("<Q")
+        s = bytes(self.buf[self.pos:self.pos + n]).decode("utf-8", errors="replace")
+        self.pos += n
+        return s
+
+    def skip_string(self) -> None:
+        n = self.unpack("<Q")
+        self.pos += n
+
+    def value(self, vtype: int, keep: bool):
+        if vtype in _GGUF_SCALAR:
+            return self.unpack(_GGUF_SCALAR[vtype])
+        if vtype == _GGUF_STRING:
+            if keep:
+                return self.string()
+            self.skip_string()
+            return None
+        if vtype == _GGUF_ARRAY:
+            etype = self.unpack("<I")
+            count = self.unpack("<Q")
+            if etype in _GGUF_SCALAR:
+                # Fixed-size elements: jump over the whole array (token scores, types, ...).
+                self.pos += count * struct.calcsize(_GGUF_SCALAR[etype])
+                return count
+            for _ in range(count):
+                self.value(etype, keep=False)  # token strings: skip without decoding
+            return count
+        raise ValueError(f"unknown GGUF value type {vtype}")
+
+
+def read_gguf_metadata(path: str) -> dict:
+    """Read the planner-relevant GGUF header fields and per-layer tensor byte sizes.
+
+    Tensor sizes are taken from consecutive data offsets, so no ggml quant-type table is needed.
+    """
+    file_bytes = os.path.getsize(path)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        r = _Reader(mm)
+        if bytes(mm[:4]) != b"GGUF":
+            raise ValueError(f"not a GGUF file: {path}")
+        r.pos = 4
+        version = r.unpack("<I")
+        if version < 2:
+            raise ValueError(f"unsupported GGUF version {version}")
+        n_tensors = r.unpack("<Q")
+        n_kv = r.unpack("<Q")
+        kv: dict = {}
+        for _ in range(n_kv):
+            key = r.string()
+            vtype = r.unpack("<I")
+            kv[key] = r.value(vtype, keep=not key.startswith("tokenizer."))
+        tensors = []
+        for _ in range(n_tensors):
+            name = r.string()
+            n_dims = r.unpack("<I")
+            r.pos += 8 * n_dims
+            r.unpack("<I")  # ggml type
+            tensors.append((r.unpack("<Q"), name))
+        alignment = int(kv.get("general.alignment") or 32)
+        data_start = (r.pos + alignment - 1) // alignment * alignment
+
+    arch = str(kv.get("general.architecture") or "")
+
+    def _arch(key, default=0):
+        v = kv.get(f"{arch}.{key}", default)
+        return int(v) if isinstance(v, (int, float)) else default
+
+    n_layer = _arch("block_count")
+    n_embd = _arch("embedding_length")
+    n_head = _arch("attention.head_count")
+    n_head_kv = _arch("attention.head_count_kv", n_head) or n_head
+    head_dim = (n_embd // n_head) if n_head else 0
+    key_len = _arch("attention.key_length", head_dim) or head_dim
+    value_len = _arch("attention.value_length", head_dim) or head_dim
+
+    tensors.sort()
+    layer_bytes = [0] * n_layer
+    other_bytes = 0
+    data_bytes = file_bytes - data_start
+    for i, (offset, name) in enumerate(tensors):
+        end = tensors[i + 1][0] if i + 1 < len(tensors) else data_bytes
+        size = max(0, end - offset)
+        if name.startswith("blk."):
+            try:
+                idx = int(name.split(".", 2)[1])
+            except ValueError:
+                idx = -1
+            if 0 <= idx < n_layer:
+                layer_bytes[idx] += size
+                continue
+        other_bytes += size
+
+    return {
+        "path": path,
+        "arch": arch,
+        "file_bytes": file_bytes,
+        "n_layer": n_layer,
+        "n_embd": n_embd,
+        "n_head": n_head,
+        "n_head_kv": n_head_kv,
+        "key_length": key_len,
+        "value_length": value_len,
+        "context_length": _arch("context_length"),
+        "layer_bytes": layer_bytes,
+        "other_bytes": other_bytes,
+    }
+
+
+def kv_bytes_per_token_per_layer(meta: dict, kv_type_bytes: int = 2) -> int:
+    """K + V cache bytes one token costs in one layer (f16 cache by default)."""
+    return int((meta["key_length"] + meta["value_length"]) * meta["n_head_kv"] * kv_type_bytes)
+
+
+def checkpoint_bytes(path: str) -> int:
+    """Weight bytes of a checkpoint file or directory (safetensors / bin / onnx / CT2 model.bin)."""
+    if not path or not os.path.exists(path):
+        return 0
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            if name.endswith((".safetensors", ".bin", ".pt", ".onnx", ".onnx_data", ".gguf")):
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+    return total
+
+
+def asr_gpu_need_gib(asr_bytes: int, backend: str) -> float:
+    factor, fixed = _ASR_FOOTPRINT.get(backend, _ASR_FOOTPRINT["whisper"])
+    return asr_bytes / GIB * factor + fixed
+
+
+class MeasurementStore:
+    """Persisted planned-vs-actual VRAM ratios, keyed per model file (JSON next to the models)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Optional[dict] = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f) or {}
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def correction(self, key: str) -> float:
+        """Multiplier for planned GiB (1.0 until measured); clamped so one bad sample cannot run away."""
+        with self._lock:
+            entry = self._load().get(key) or {}
+        ratio = float(entry.get("ratio") or 1.0)
+        return min(1.6, max(0.7, ratio))
+
+    def samples(self, key: str) -> int:
+        with self._lock:
+            return int((self._load().get(key) or {}).get("n") or 0)
+
+    def record(self, key: str, planned_gib: float, actual_gib: float) -> None:
+        if planned_gib <= 0 or actual_gib <= 0:
+            return
+        with self._lock:
+            data = self._load()
+            entry = data.get(key) or {}
+            n = int(entry.get("n") or 0)
+            ratio = actual_gib / planned_gib
+            prev = float(entry.get("ratio") or ratio)
+            # Exponential moving average: recent loads dominate, single outliers are damped.
+            entry.update(
+                ratio=round(prev + (ratio - prev) * (0.5 if n else 1.0), 4),
+                planned_gib=round(planned_gib, 3),
+                actual_gib=round(actual_gib, 3),
+                n=n + 1,
+            )
+            data[key] = entry
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+
+def _layers_that_fit(layer_bytes: list, per_layer_extra: float, budget: float) -> tuple:
+    """How many layers llama.cpp can offload (it offloads from the LAST layer down) and their bytes."""
+    used = 0.0
+    k = 0
+    for b in reversed(layer_bytes):
+        cost = b + per_layer_extra
+        if used + cost > budget:
+            break
+        used += cost
+        k += 1
+    return k, used
+
+
+def plan_placement(
+    vram_gib: float,
+    meta: dict,
+    asr_bytes: int = 0,
+    asr_backend: str = "whisper",
+    n_ctx: int = 4096,
+    n_batch: int = 512,
+    refiner_cap_gib: Optional[float] = None,
+    asr_cap_gib: Optional[float] = None,
+    store: Optional[MeasurementStore] = None,
+    refiner_key: str = "",
+    asr_key: str = "",
+) -> dict:
+    """One-pass placement for a device with vram_gib of memory (0 = CPU only).
+
+    Returns {"n_gpu_layers", "n_ctx", "n_batch", "asr_max_gpu_gib", "refiner_gpu_gib", "reason"}.
+    n_gpu_layers follows llama.cpp semantics: n_layer + 1 also offloads the output tensors.
+    """
+    n_layer = int(meta.get("n_layer") or 0)
+    plan = {
+        "n_gpu_layers": 0,
+        "n_ctx": int(n_ctx),
+        "n_batch": int(n_batch),
+        "asr_max_gpu_gib": 0.0,
+        "refiner_gpu_gib": 0.0,
+        "correction": 1.0,      # multipliers already applied; divide them out before record()
+        "asr_correction": 1.0,
+        "reason": "",
+    }
+    if vram_gib <= 0:
+        plan["reason"] = "cpu"
+        return plan
+
+    # --- ASR reservation (it shares the device with the refiner; ASR-only callers need just this) ---
+    if store is not None and asr_key:
+        plan["asr_correction"] = store.correction(asr_key)
+    if asr_cap_gib is not None:
+        asr_gib = float(asr_cap_gib)
+    elif asr_bytes > 0:
+        asr_gib = asr_gpu_need_gib(asr_bytes, asr_backend) * plan["asr_correction"]
+    else:
+        asr_gib = vram_gib * _ASR_LEGACY_FRACTION.get(asr_backend, 0.15)
+    plan["asr_max_gpu_gib"] = round(asr_gib, 2)
+    if n_layer <= 0:
+        plan["reason"] = "no layer metadata (ASR reservation only)"
+        return plan
+
+    # --- refiner budget ---
+    budget_gib = vram_gib - asr_gib - CUDA_OVERHEAD_GIB
+    if refiner_cap_gib is not None:
+        budget_gib = min(budget_gib, float(refiner_cap_gib))
+    corr = store.correction(refiner_key) if (store is not None and refiner_key) else 1.0
+    plan["correction"] = corr
+
+    if vram_gib <= 8.5:
+        plan["n_batch"] = min(plan["n_batch"], 128)
+    # Compute buffer: activations for one n_batch ubatch, dominated by n_batch x n_embd scratch.
+    compute_gib = 0.25 + plan["n_batch"] * max(1, meta.get("n_embd") or 0) * 4 * 16 / GIB
+
+    kv_tok = kv_bytes_per_token_per_layer(meta)
+    layer_bytes = [b * corr for b in meta["layer_bytes"]]
+    budget = (budget_gib - compute_gib) * GIB
+
+    best = None
+    ctx_candidates = [plan["n_ctx"]] + ([2048] if plan["n_ctx"] > 2048 else [])
+    for ctx in ctx_candidates:
+        k, used = _layers_that_fit(layer_bytes, kv_tok * ctx, budget)
+        full = k >= n_layer and used + meta["other_bytes"] * corr <= budget
+        cand = (k + (1 if full else 0), ctx, used + (meta["other_bytes"] * corr if full else 0))
+        # Keep the larger context unless the smaller one buys >= 4 more layers on the device.
+        if best is None or cand[0] >= best[0] + 4:
+            best = cand
+        if full:
+            break
+    layers, ctx, used = best
+    plan["n_gpu_layers"] = max(0, layers)
+    plan["n_ctx"] = ctx
+    plan["refiner_gpu_gib"] = round((used / GIB + compute_gib) if layers else 0.0, 2)
+    plan["reason"] = (
+        f"budget {budget_gib:.2f} GiB (vram {vram_gib:.1f} - asr {asr_gib:.2f} - overhead {CUDA_OVERHEAD_GIB}), "
+        f"compute {compute_gib:.2f} GiB, kv {kv_tok * ctx / GIB * 1024:.1f} MiB/layer @ n_ctx={ctx}, "
+        f"correction x{corr:.2f}"
+    )
+    return plan
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print a refiner/ASR placement plan for a GGUF file.")
+    parser.add_argument("gguf")
+    parser.add_argument("--vram-gib", type=float, required=True, help="device memory to plan for (fake sizes OK)")
+    parser.add_argument("--asr-gib", type=float, default=0.0, help="ASR checkpoint size on disk (GiB)")
+    parser.add_argument("--asr-backend", default="whisper", choices=sorted(_ASR_FOOTPRINT))
+    parser.add_argument("--n-ctx", type=int, default=4096)
+    parser.add_argument("--n-batch", type=int, default=512)
+    args = parser.parse_args()
+
+    meta = read_gguf_metadata(args.gguf)
+    print(
+        f"{os.path.basename(args.gguf)}: arch={meta['arch']} layers={meta['n_layer']} "
+        f"layer_avg={sum(meta['layer_bytes']) / max(1, meta['n_layer']) / GIB * 1024:.1f} MiB "
+        f"other={meta['other_bytes'] / GIB:.2f} GiB kv/token/layer={kv_bytes_per_token_per_layer(meta)} B"
+    )
+    plan = plan_placement(
+        args.vram_gib,
+        meta,
+        asr_bytes=int(args.asr_gib * GIB),
+        asr_backend=args.asr_backend,
+        n_ctx=args.n_ctx,
+        n_batch=args.n_batch,
+    )
+    print(json.dumps(plan, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
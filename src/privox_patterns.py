@@ -0,0 +1,124 @@
+"""
+Multi-pattern substring matcher (Aho–Corasick) for the refiner's output guards.
+
+The guards in GrammarChecker look for fixed phrases in the lowercased refiner output: prompt-echo
+fingerprints and assistant preambles (_validate_output), self-commentary lines
+(_strip_meta_commentary), prompt-echo markers (_looks_like_prompt_echo) and echoed prompt headers
+(_strip_critical_rules_echo). Each list used to be its own loop of `in` / find() over the text, so
+the cost grew with every phrase added.
+
+MultiPattern compiles all families into one automaton (goto + failure links folded into a DFA), and
+scan() walks the text once, reporting every occurrence of every pattern with its start position:
+the walk costs the same whatever the number of patterns. The walk is a Python loop, so it starts
+at the leftmost place any pattern can match, found by one search with the same trie as a regex
+(in C). Clean refiner output, the usual case, never enters the loop. Hits is a small view over the
+hit list for the questions the guards ask (any hit, first pattern in list order, first occurrence
+per pattern).
+"""
+from __future__ import annotations
+
+import itertools
+import re
+from collections import deque
+
+
+class Hits:
+    __slots__ = ("_hits",)
+
+    def __init__(self, hits: list):
+        self._hits = hits  # (start, family, pattern index), in order of end position
+
+    def __bool__(self) -> bool:
+        return bool(self._hits)
+
+    def any(self, family: str) -> bool:
+        return any(fam == family for _start, fam, _idx in self._hits)
+
+    def first_pattern(self, family: str, at: int | None = None) -> int | None:
+        """Lowest pattern index (list order) of family found anywhere, or starting at position `at`."""
+        found = [idx for start, fam, idx in self._hits if fam == family and (at is None or start == at)]
+        return min(found) if found else None
+
+    def occurrences(self, family: str) -> list:
+        """(start, pattern index) of every occurrence of family, in order of end position."""
+        return [(start, idx) for start, fam, idx in self._hits if fam == family]
+
+    def first_starts(self, family: str) -> dict:
+        """pattern index -> start of its first occurrence (what str.find() would return)."""
+        out: dict = {}
+        for start, fam, idx in self._hits:
+            if fam == family and (idx not in out or start < out[idx]):
+                out[idx] = start
+        return out
+
+
+def _trie_regex(goto: list, ends: set, state: int = 0) -> str:
+    """Regex matching where some word of the goto trie starts, factored by prefix: (?:a(?:b|c)|d...).
+
+    A word end stops the descent: the shorter word is already a match at that position.
+    """
+    if state in ends:
+        return ""
+    alts = [re.escape(ch) + _trie_regex(goto, ends, nxt) for ch, nxt in goto[state].items()]
+    return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+
+class MultiPattern:
+    def __init__(self, families: dict):
+        self.families = {name: list(patterns) for name, patterns in families.items()}
+        goto: list = [{}]
+        out: list = [[]]
+        ends: set = set()
+        for family, patterns in self.families.items():
+            for idx, pattern in enumerate(patterns):
+                if not pattern:
+                    continue
+                state = 0
+                for ch in pattern:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        out.append([])
+                    state = nxt
+                out[state].append((family, idx, len(pattern)))
+                ends.add(state)
+
+        # Breadth-first: failure link = longest proper suffix that is also a trie path. Folding it
+        # into the transitions gives a DFA, so scan() never follows failure links.
+        fail = [0] * len(goto)
+        delta: list = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            f = fail[state]
+            out[state] = out[state] + out[f]
+            trans = dict(delta[f])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[f].get(ch, 0)
+                trans[ch] = nxt
+                queue.append(nxt)
+            delta[state] = trans
+        self._delta = delta
+        self._out = [tuple(o) for o in out]
+        # No match can start before the leftmost one of this regex, so scan() starts there.
+        self._candidate = re.compile(_trie_regex(goto, ends)) if ends else None
+
+    def scan(self, text: str) -> Hits:
+        first = self._candidate.search(text) if self._candidate is not None else None
+        if first is None:
+            return Hits([])
+        delta, out = self._delta, self._out
+        state = 0
+        hits = []
+        start = first.start()
+        for i, ch in enumerate(itertools.islice(text, start, None), start):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                for family, idx, n in out[state]:
+                    hits.append((i - n + 1, family, idx))
+        return Hits(hits)
+
+    def pattern(self, family: str, idx: int) -> str:
+        return self.families[family][idx]
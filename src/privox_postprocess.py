@@ -0,0 +1,128 @@
+"""
+Refiner output post-processing as one pipeline of declared stages, with per-stage timing.
+
+GrammarChecker.correct() used to chain its finalization by hand: meta-commentary strip (20 finds on
+a lowercased copy), the hallucination validator (its own lowercased copy), then
+_finalize_refiner_text (filler regex + cleanup subs, English digit lists, zhconv). Every step ran
+on every output, and each one lowercased or rescanned the text again.
+
+A Stage pairs the transform with applies(view), a cheap test on the shared TextView:
+
+    view.text       current text
+    view.lower      lowercased text, computed once and reused until a stage changes the text
+    view.scan(m)    privox_patterns hits of matcher m over view.lower, same reuse rule
+    view.profile    privox_textscan.ScriptProfile (script counts, cached per string)
+    view.ctx        per-call values (e.g. the ASR transcript the validator compares against)
+
+A stage that only deletes text or rewrites ASCII declares keeps_profile: the profile taken before
+it still bounds what is left (e.g. no Han stays no Han), so later applies() tests do not rescan.
+Stages that are skipped cost one attribute test. Pipeline.run() times every stage; last_timings
+holds the latest call and describe() the running totals.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+import privox_textscan
+
+
+class TextView:
+    __slots__ = ("text", "ctx", "_lower", "_profile", "_scans")
+
+    def __init__(self, text: str, ctx: dict):
+        self.text = text
+        self.ctx = ctx
+        self._lower: Optional[str] = None
+        self._profile = None
+        self._scans: dict = {}
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def profile(self):
+        if self._profile is None:
+            self._profile = privox_textscan.profile(self.text)
+        return self._profile
+
+    def scan(self, matcher):
+        hits = self._scans.get(id(matcher))
+        if hits is None:
+            hits = self._scans[id(matcher)] = matcher.scan(self.lower)
+        return hits
+
+    def replace(self, text: str, keeps_profile: bool) -> None:
+        if text is self.text or text == self.text:
+            return
+        self.text = text
+        self._lower = None
+        self._scans = {}
+        if not keeps_profile:
+            self._profile = None
+
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[TextView], str],
+        applies: Optional[Callable[[TextView], bool]] = None,
+        keeps_profile: bool = False,
+    ):
+        self.name = name
+        self.run = run
+        self.applies = applies
+        self.keeps_profile = keeps_profile
+
+
+class Pipeline:
+    def __init__(self, name: str, stages: list):
+        self.name = name
+        self.stages = list(stages)
+        self._lock = threading.Lock()
+        # name -> [runs, skips, total seconds]
+        self.stats = {s.name: [0, 0, 0.0] for s in self.stages}
+        self.last_timings: dict = {}
+
+    def __add__(self, other: "Pipeline") -> "Pipeline":
+        return Pipeline(f"{self.name}+{other.name}", self.stages + other.stages)
+
+    def run(self, text: str, **ctx) -> str:
+        view = TextView(text, ctx)
+        timings = {}
+        for stage in self.stages:
+            if stage.applies is not None and not stage.applies(view):
+                timings[stage.name] = None
+                continue
+            t0 = time.perf_counter()
+            out = stage.run(view)
+            timings[stage.name] = time.perf_counter() - t0
+            view.replace(out if out is not None else "", stage.keeps_profile)
+        with self._lock:
+            for name, dt in timings.items():
+                entry = self.stats[name]
+                if dt is None:
+                    entry[1] += 1
+                else:
+                    entry[0] += 1
+                    entry[2] += dt
+            self.last_timings = timings
+        return view.text
+
+    @staticmethod
+    def format_timings(timings: dict) -> str:
+        return " | ".join(
+            f"{name} {'-' if dt is None else f'{dt * 1000:.2f}ms'}" for name, dt in timings.items()
+        )
+
+    def describe(self) -> str:
+        with self._lock:
+            return " | ".join(
+                f"{name} {runs} run/{skips} skip, {total / runs * 1e6 if runs else 0:.0f}us avg"
+                for name, (runs, skips, total) in self.stats.items()
+            )
@@ -0,0 +1,239 @@
+"""
+Predictive prewarm: start loading models shortly BEFORE a likely dictation instead of on hotkey-down.
+
+Today the hotkey only hides as much of the load as the user spends speaking. The first dictation of
+a session usually finds the engine released by the idle saver and waits for the rest. This module
+learns, from local history only (.prewarm_history.json next to .user_prefs.json):
+
+  - time-of-day / weekday patterns of session starts (first dictation after >= SESSION_GAP_S idle)
+    over the last HISTORY_DAYS days (weekday vs weekend weighted separately);
+  - in-session gaps via privox_idle_policy (is the next dictation of this session near?);
+  - the "hotkey lead": how long the user speaks before the engine is needed, which hides part of
+    the load. Only load time NOT covered by speech needs predicting ahead.
+
+should_prewarm() estimates P(dictation within [now + lead, now + lead + WINDOW_S]); the app prewarms
+at PRIVOX_PREWARM_THRESHOLD (default 0.5) and keeps the engine loaded until the window closes, even
+if the idle policy would release it earlier. A wasted prewarm backs off for one window. Loads are
+chosen within
+PRIVOX_PREWARM_BUDGET_GIB. Every prewarm is scored: hit (used while loaded), wasted (released
+unused), and miss (a session started cold with no prewarm). These stats persist so the threshold
+and budget can be tuned:
+    python src/privox_prewarm.py
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+SESSION_GAP_S = 900.0
+HISTORY_DAYS = 28
+WINDOW_S = 600.0  # how far ahead a prewarm covers (and how long it is held unused)
+MIN_HISTORY_DAYS = 3
+
+
+def prewarm_enabled() -> bool:
+    return (os.environ.get("PRIVOX_PREWARM") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def prewarm_threshold() -> float:
+    return _env_float("PRIVOX_PREWARM_THRESHOLD", 0.5)
+
+
+def prewarm_budget_gib() -> float:
+    return _env_float("PRIVOX_PREWARM_BUDGET_GIB", 8.0)
+
+
+class PrewarmPredictor:
+    def __init__(self, path: str, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.starts: list = []        # epoch seconds of dictation starts
+        self.stats = {"hits": 0, "misses": 0, "wasted": 0, "prewarms": 0}
+        self.speech_lead_s = 4.0      # EMA of hotkey-down -> engine needed (speech length)
+        self._active: Optional[dict] = None  # the outstanding prewarm, until used or released
+        self._cooldown_until = 0.0
+        self._dirty = False
+        self._load()
+
+    # --- persistence ---------------------------------------------------------------------------
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f) or {}
+        except (OSError, ValueError):
+            return
+        self.starts = [float(t) for t in data.get("starts", []) if isinstance(t, (int, float))]
+        self.stats.update({k: int(v) for k, v in (data.get("stats") or {}).items() if k in self.stats})
+        self.speech_lead_s = float(data.get("speech_lead_s") or self.speech_lead_s)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            cutoff = self.clock() - HISTORY_DAYS * 86400
+            self.starts = [t for t in self.starts if t >= cutoff]
+            data = {"starts": self.starts, "stats": dict(self.stats), "speech_lead_s": round(self.speech_lead_s, 2)}
+            self._dirty = False
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    # --- observations --------------------------------------------------------------------------
+    def note_dictation(self, engine_warm: bool) -> None:
+        """A dictation started. engine_warm: models were already loaded at hotkey time."""
+        now = self.clock()
+        with self._lock:
+            session_start = not self.starts or (now - self.starts[-1]) >= SESSION_GAP_S
+            self.starts.append(now)
+            if self._active is not None:
+                self.stats["hits"] += 1
+                self._active = None
+            elif session_start and not engine_warm:
+                self.stats["misses"] += 1
+            self._dirty = True
+
+    def note_speech(self, seconds: float) -> None:
+        """Hotkey-down -> stop: load time this long is already hidden behind the user speaking."""
+        if 0.2 <= seconds <= 120:
+            with self._lock:
+                self.speech_lead_s += (seconds - self.speech_lead_s) * 0.2
+                self._dirty = True
+
+    def note_prewarm(self, what: str, probability: float, until: float) -> None:
+        with self._lock:
+            self._active = {"what": what, "p": probability, "at": self.clock(), "until": until}
+            self.stats["prewarms"] += 1
+            self._dirty = True
+
+    def note_released(self) -> None:
+        """The idle saver released the engine; an unused prewarm was wasted."""
+        with self._lock:
+            if self._active is not None:
+                self.stats["wasted"] += 1
+                self._active = None
+                self._cooldown_until = self.clock() + WINDOW_S
+                self._dirty = True
+
+    @property
+    def active(self) -> bool:
+        return self._active is not None
+
+    def holding(self) -> bool:
+        """An unused prewarm whose predicted window is still open (idle release should wait)."""
+        a = self._active
+        return a is not None and self.clock() < a["until"]
+
+    def cooling_down(self) -> bool:
+        return self.clock() < self._cooldown_until
+
+    # --- prediction ----------------------------------------------------------------------------
+    def _session_starts(self) -> list:
+        out = []
+        prev = None
+        for t in self.starts:
+            if prev is None or (t - prev) >= SESSION_GAP_S:
+                out.append(t)
+            prev = t
+        return out
+
+    def session_start_probability(self, start: float, end: float) -> float:
+        """Share of past days (same day-type weighted higher) with a session start in [start, end) time-of-day."""
+        now_dt = datetime.fromtimestamp(start)
+        weekend_now = now_dt.weekday() >= 5
+        tod_lo = now_dt.hour * 3600 + now_dt.minute * 60 + now_dt.second
+        span = end - start
+        day_hit: dict = {}
+        days_seen: dict = {}
+        for t in self.starts:
+            d = datetime.fromtimestamp(t)
+            days_seen[d.date()] = d.weekday() >= 5
+        for t in self._session_starts():
+            d = datetime.fromtimestamp(t)
+            tod = d.hour * 3600 + d.minute * 60 + d.second
+            rel = (tod - tod_lo) % 86400
+            if rel < span:
+                day_hit[d.date()] = True
+        today = now_dt.date()
+        num = den = 0.0
+        for day, weekend in days_seen.items():
+            if day == today:
+                continue
+            w = 1.0 if weekend == weekend_now else 0.3
+            den += w
+            if day_hit.get(day):
+                num += w
+        if len([d for d in days_seen if d != today]) < MIN_HISTORY_DAYS or den <= 0:
+            return 0.0
+        return num / den
+
+    def should_prewarm(self, wake_s: float, idle_for: float, idle_policy=None) -> tuple:
+        """(probability, reason, hold_until) for starting a load now.
+
+        Only wake time not hidden behind speech counts as lead: a user who talks for 6 s hides a
+        6 s load, so that load need not be started ahead at all.
+        """
+        lead = max(0.0, wake_s - self.speech_lead_s)
+        now = self.clock()
+        if lead <= 0.5 or self.cooling_down():
+            return 0.0, "load hidden by speech" if lead <= 0.5 else "cooling down", now
+        window_end = now + lead + WINDOW_S
+        p_day = self.session_start_probability(now + lead, window_end)
+        p_session = 0.0
+        if idle_policy is not None and idle_for < SESSION_GAP_S:
+            remaining = idle_policy.predicted_remaining_idle(idle_for)
+            if remaining is not None and remaining <= lead + WINDOW_S:
+                p_session = 0.5 + 0.5 * (1.0 - remaining / (lead + WINDOW_S))
+        if p_session > p_day:
+            return p_session, f"in-session gap (lead {lead:.1f}s)", window_end
+        return p_day, f"time-of-day pattern (lead {lead:.1f}s)", window_end
+
+    def describe(self) -> str:
+        s = self.stats
+        scored = s["hits"] + s["wasted"]
+        precision = (s["hits"] / scored) if scored else 0.0
+        return (
+            f"prewarm: {s['prewarms']} loads, {s['hits']} hits, {s['wasted']} wasted, "
+            f"{s['misses']} cold session starts missed (precision {precision:.0%}, "
+            f"speech lead {self.speech_lead_s:.1f}s)"
+        )
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show predictive prewarm statistics and the learned daily pattern.")
+    parser.add_argument(
+        "--path",
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".prewarm_history.json"),
+    )
+    args = parser.parse_args()
+    p = PrewarmPredictor(args.path)
+    print(p.describe())
+    print(f"{len(p.starts)} dictations, {len(p._session_starts())} sessions in the last {HISTORY_DAYS} days")
+    now = time.time()
+    for h in range(0, 24):
+        t = datetime.fromtimestamp(now).replace(hour=h, minute=0, second=0).timestamp()
+        prob = p.session_start_probability(t, t + 3600)  # per hour of the day
+        print(f"  {h:02d}:00  {'#' * int(prob * 40):<40} {prob:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""
+Refiner prompt assembly: memoized directive blocks and a stable prefix hash.
+
+GrammarChecker.correct() used to rebuild the whole system prompt per request: the Core Directive
+(get_effective_prompt: script / language scans plus a dozen string concatenations), then the
+system formatter around it (few-shot examples + CRITICAL_RULES). Everything in that text is
+determined by a small key:
+
+    character, tone, user instructions, custom dictionary,  -> changes only from Settings
+    simplified / traditional Chinese
+    language bucket (non-English <lang> / English / inferred English / none),
+    code-mixing, Chinese present, Cantonese oral             -> a few flags per transcript
+
+so the text is compiled once per key and later requests only fill the transcript slot. The
+system prompt is the token prefix of every refiner call; prefix_hash() identifies it so the log
+shows when consecutive requests share it (llama.cpp then reuses the evaluated prefix from its
+KV cache instead of re-running prompt processing over ~1.5k tokens).
+
+    python scripts/bench_prompt_build.py     # per-request build time, long transcripts
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+MAX_ENTRIES = 128
+
+
+class PromptCompiler:
+    """Bounded LRU of compiled prompt text, keyed by everything the text depends on."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], str]) -> str:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+            self.misses += 1
+        text = build()
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def describe(self) -> str:
+        total = self.hits + self.misses
+        return f"{len(self._entries)} compiled, {self.hits}/{total} hits"
+
+
+def prefix_hash(*parts: str) -> str:
+    """Short stable id of a prompt prefix (same text -> same id across requests and restarts)."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"\0")
+    return h.hexdigest()[:12]
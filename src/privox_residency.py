@@ -0,0 +1,184 @@
+"""
+Three-state residency for the ASR engine: on-device -> host-resident -> evicted.
+
+    DEVICE   weights in VRAM, ready to decode.
+    HOST     weights parked in (pinned) system RAM; VRAM freed. Wake = one host->device copy.
+    EVICTED  weights dropped; wake = full from_pretrained / WhisperModel load from disk.
+
+Transitions are driven by idle time (privox_idle_policy): DEVICE -> HOST after the VRAM-saver
+timeout, HOST -> EVICTED after PRIVOX_ASR_HOST_TIMEOUT more seconds (default 600; 0 = skip HOST and
+evict straight away as before; negative = keep in host RAM until exit). Every move is timed, so the
+log shows the measured re-upload cost next to the cold-load cost it replaced.
+
+Torch backends (Qwen3-ASR, SenseVoice) move their nn.Module to CPU and pin its tensors
+(PRIVOX_ASR_PIN_HOST=0 keeps pageable memory). A device-mapped model (Qwen3-ASR loaded with
+device_map="auto" + max_memory) keeps its hf_device_map and is re-dispatched with it on wake
+(accelerate.dispatch_model), so layers capped off the GPU stay on the CPU instead of being pushed
+into VRAM by a whole-model .to("cuda"); a map with "disk" entries has no host copy to park and is
+evicted instead. faster-whisper uses CTranslate2's own unload_model(to_cpu=True) / load_model().
+The refiner (llama.cpp) cannot park weights on the host; its GGUF stays memory-mapped, so a
+reload reads from the page cache rather than from disk.
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Optional
+
+DEVICE = "device"
+HOST = "host"
+EVICTED = "evicted"
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def host_timeout() -> float:
+    """Seconds the ASR may stay host-resident before eviction (0 = no HOST state, <0 = never evict)."""
+    return _env_float("PRIVOX_ASR_HOST_TIMEOUT", 600.0)
+
+
+def pin_host_memory() -> bool:
+    return (os.environ.get("PRIVOX_ASR_PIN_HOST") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class Residency:
+    """Where one engine's weights live, when they got there, and what the last moves cost."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = EVICTED
+        self.since = time.time()
+        self.last_cold_load_s: Optional[float] = None
+        self.last_upload_s: Optional[float] = None
+        self.last_offload_s: Optional[float] = None
+
+    def set(self, state: str, seconds: Optional[float] = None, cold: bool = False) -> None:
+        if state == DEVICE and seconds is not None:
+            if cold:
+                self.last_cold_load_s = seconds
+            else:
+                self.last_upload_s = seconds
+        elif state == HOST and seconds is not None:
+            self.last_offload_s = seconds
+        self.state = state
+        self.since = time.time()
+
+    def host_enabled(self) -> bool:
+        return host_timeout() != 0
+
+    def describe(self) -> str:
+        def _fmt(v):
+            return "-" if v is None else f"{v:.2f}s"
+
+        return (
+            f"{self.name}: {self.state} for {time.time() - self.since:.0f}s "
+            f"(cold load {_fmt(self.last_cold_load_s)}, re-upload {_fmt(self.last_upload_s)}, "
+            f"offload {_fmt(self.last_offload_s)})"
+        )
+
+
+def _ct2_model(asr_model):
+    """The ctranslate2 model behind a faster-whisper WhisperModel (supports unload_model(to_cpu=True))."""
+    inner = getattr(asr_model, "model", None)
+    if inner is not None and hasattr(inner, "unload_model") and hasattr(inner, "load_model"):
+        return inner
+    return None
+
+
+def _torch_module(asr_model):
+    inner = getattr(asr_model, "model", None)
+    for m in (inner, asr_model):
+        if m is not None and hasattr(m, "parameters") and hasattr(m, "to"):
+            return m
+    return None
+
+
+def _device_map(module) -> Optional[dict]:
+    return getattr(module, "_privox_device_map", None) or getattr(module, "hf_device_map", None) or None
+
+
+def supports_host(asr_model) -> bool:
+    if asr_model is None:
+        return False
+    if _ct2_model(asr_model) is not None:
+        return True
+    module = _torch_module(asr_model)
+    if module is None:
+        return False
+    device_map = _device_map(module)
+    # Disk-offloaded layers are meta tensors here: nothing to park, evict instead.
+    return not (device_map and "disk" in {str(d) for d in device_map.values()})
+
+
+def offload_to_host(asr_model, torch_mod=None) -> Optional[float]:
+    """Move ASR weights from VRAM to host RAM. Returns seconds taken, or None if unsupported/failed."""
+    t0 = time.perf_counter()
+    ct2 = _ct2_model(asr_model)
+    if ct2 is not None:
+        try:
+            ct2.unload_model(to_cpu=True)
+        except Exception:
+            return None
+        return time.perf_counter() - t0
+    module = _torch_module(asr_model)
+    if module is None:
+        return None
+    try:
+        device_map = getattr(module, "hf_device_map", None)
+        if device_map:
+            # accelerate dispatch hooks pin layers to their devices; drop them so .cpu() moves
+            # everything, and keep the map for the re-dispatch in upload_to_device().
+            from accelerate.hooks import remove_hook_from_module
+
+            module._privox_device_map = dict(device_map)
+            remove_hook_from_module(module, recurse=True)
+        module.cpu()
+        if pin_host_memory() and torch_mod is not None and torch_mod.cuda.is_available():
+            # Page-locked host copies let the next .to("cuda", non_blocking=True) run at full DMA speed.
+            for t in list(module.parameters()) + list(module.buffers()):
+                if t.device.type == "cpu" and not t.is_pinned():
+                    t.data = t.data.pin_memory()
+        if torch_mod is not None and torch_mod.cuda.is_available():
+            torch_mod.cuda.empty_cache()
+    except Exception:
+        return None
+    return time.perf_counter() - t0
+
+
+def upload_to_device(asr_model, torch_mod=None, device: str = "cuda") -> Optional[float]:
+    """Copy host-resident ASR weights back to the GPU. Returns seconds taken, or None on failure."""
+    t0 = time.perf_counter()
+    ct2 = _ct2_model(asr_model)
+    if ct2 is not None:
+        try:
+            if not getattr(ct2, "model_is_loaded", False):
+                ct2.load_model()
+        except Exception:
+            return None
+        return time.perf_counter() - t0
+    module = _torch_module(asr_model)
+    if module is None:
+        return None
+    try:
+        device_map = getattr(module, "_privox_device_map", None)
+        if device_map:
+            # Same placement as the original load (max_memory cap): not a whole-model .to(device).
+            from accelerate import dispatch_model
+
+            dispatch_model(module, device_map=device_map)
+            module._privox_device_map = None
+        else:
+            module.to(device, non_blocking=True)
+        if torch_mod is not None and torch_mod.cuda.is_available():
+            torch_mod.cuda.synchronize()
+    except Exception:
+        return None
+    return time.perf_counter() - t0
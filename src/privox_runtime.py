@@ -1,6 +1,9 @@
 """
 Runtime toggles shared by voice_input: optional PyTorch-free mode (PRIVOX_NO_TORCH=1).
 
+PyTorch is never imported here as a side effect: the cuda_* probes use torch only once a backend
+has imported it (get_torch()), and fall back to nvidia-smi / ctranslate2 otherwise.
+
 When NO_TORCH is active:
 - No `import torch` (ASR: faster-whisper / CTranslate2 or Qwen3-ASR ONNX; PyTorch Qwen/SenseVoice disabled).
 - GPU presence for refiner/offload uses ctranslate2 or llama backend, not torch.cuda.
@@ -27,43 +30,66 @@ def get_torch():
     return _torch_module
 
 
+def loaded_torch():
+    """torch if some backend already imported it, else None (never triggers the import)."""
+    return None if NO_TORCH else _torch_module
+
+
+def _cuda_hidden() -> bool:
+    """True when CUDA_VISIBLE_DEVICES hides every GPU (e.g. a pool worker pinned to CPU)."""
+    cvd = os.environ.get("CUDA_VISIBLE_DEVICES")
+    return cvd is not None and cvd.strip() in ("", "-1")
+
+
+def _physical_gpu_index(index: int) -> int:
+    """Map a logical CUDA index to the nvidia-smi (physical) index under CUDA_VISIBLE_DEVICES."""
+    cvd = [x.strip() for x in (os.environ.get("CUDA_VISIBLE_DEVICES") or "").split(",") if x.strip()]
+    if 0 <= index < len(cvd) and cvd[index].isdigit():
+        return int(cvd[index])
+    return index
+
+
 def cuda_is_available() -> bool:
     """Non-invasive CUDA check to avoid triggering DLL context conflicts early."""
+    if _cuda_hidden():
+        return False
     # Check for NVIDIA driver / nvidia-smi as a passive heuristic FIRST.
     # This avoids importing torch (slow) or llama_cpp at the top-level during boot.
     import shutil
     if shutil.which("nvidia-smi"):
         return True
         
-    if not NO_TORCH:
-        t = get_torch()
-        if t is not None:
-            try: return bool(t.cuda.is_available())
-            except Exception: pass
-    
+    t = loaded_torch()
+    if t is not None:
+        try: return bool(t.cuda.is_available())
+        except Exception: pass
+    try:
+        import ctranslate2
+
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        pass
     return False
 
 
 def cuda_device_name(index: int = 0) -> str:
-    if not NO_TORCH:
-        t = get_torch()
-        if t is not None and t.cuda.is_available():
-            try:
-                return str(t.cuda.get_device_name(index))
-            except Exception:
-                pass
+    t = loaded_torch()
+    if t is not None and t.cuda.is_available():
+        try:
+            return str(t.cuda.get_device_name(index))
+        except Exception:
+            pass
     return "CUDA (no PyTorch)" if cuda_is_available() else "CPU"
 
 
 def cuda_device_total_memory_gib(index: int = 0) -> float:
     """VRAM for layer planning; without PyTorch uses nvidia-smi or env override."""
-    if not NO_TORCH:
-        t = get_torch()
-        if t is not None and t.cuda.is_available():
-            try:
-                return float(t.cuda.get_device_properties(index).total_memory) / (1024 ** 3)
-            except Exception:
-                pass
+    t = loaded_torch()
+    if t is not None and t.cuda.is_available():
+        try:
+            return float(t.cuda.get_device_properties(index).total_memory) / (1024 ** 3)
+        except Exception:
+            pass
     env = (os.environ.get("PRIVOX_GPU_MEM_GIB") or "").strip()
     if env:
         try:
@@ -81,8 +107,9 @@ def cuda_device_total_memory_gib(index: int = 0) -> float:
         )
         if r.returncode == 0 and (r.stdout or "").strip():
             lines = [x.strip() for x in r.stdout.strip().splitlines() if x.strip()]
-            if 0 <= index < len(lines):
-                return float(lines[index]) / 1024.0
+            phys = _physical_gpu_index(index)
+            if 0 <= phys < len(lines):
+                return float(lines[phys]) / 1024.0
     except Exception:
         pass
     try:
@@ -92,6 +119,29 @@ def cuda_device_total_memory_gib(index: int = 0) -> float:
             return 12.0
     except Exception:
         pass
+
+
+def cuda_device_used_memory_gib(index: int = 0) -> float:
+    """Device-wide VRAM in use (all processes, incl. llama.cpp / CT2) via nvidia-smi; 0.0 if unknown."""
+    try:
+        import subprocess
+
+        r = subprocess.run(
+            ["nvidia-smi", "--query-gpu=memory.used", "--format=csv,noheader,nounits"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if r.returncode == 0 and (r.stdout or "").strip():
+            lines = [x.strip() for x in r.stdout.strip().splitlines() if x.strip()]
+            phys = _physical_gpu_index(index)
+            if 0 <= phys < len(lines):
+                return float(lines[phys]) / 1024.0
+    except Exception:
+        pass
+    return 0.0
+
+
 def pre_load_cuda_dlls() -> bool:
     """Explicitly load critical CUDA DLLs to prevent native crashes in ONNX/CT2 on Windows."""
     import sys
@@ -0,0 +1,145 @@
+"""
+Single-pass script profile of a transcript, shared by every text heuristic in the refiner path.
+
+The language / script helpers in voice_input (_infer_language_from_transcript,
+_transcript_mixes_cjk_and_latin, _cjk_is_substantial_for_refiner, _contains_cjk_char,
+_infer_chinese_script_variant, _looks_like_cantonese_oral) each used to rescan the transcript, five
+re.findall passes for the language guess alone, and get_effective_prompt / correct /
+_refiner_language_hint call several of them on the same text. profile() counts the characters
+once (collections.Counter, in C), buckets the distinct characters by script and keeps the counts
+every heuristic needs:
+
+    han / han_ext        CJK Unified Ideographs / Extension A
+    hiragana / katakana / hangul
+    latin                A-Z letters; latin_word: some run of 2+ letters
+    trad / simp          distinctive Traditional / Simplified forms
+    cantonese            any spoken-Cantonese particle
+
+Profiles are cached per string (a handful of recent transcripts), so every helper called on the
+same transcript reuses the one pass.
+
+    python scripts/bench_script_profile.py     # 10k-char mixed CJK / Latin input
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import re
+
+# Distinctive Han forms: count to guess Traditional vs Simplified output (refiner often flips script).
+TRAD_DISTINCT = frozenset(
+    "這邊體廣門聽國學會還開長東車時來說話點過個們問間關頭員團選種總從應該計記訊議務質產親龍鳥魚馬風雲參與舊嚴據處樂極構樹機殺歲歸歷畢畫異當發盜盡監盤眾確碩礎顯題館鐵際線聲電腦裏經師場見覽觀討許訪評詳誤課講識讀變讓貓負貢貧貨購贊贈趕跡軌農釋鋼錄錯鍾險隱雖韓項順預領頻養餘騎鬆鹽麗點齊齡臺灣華書導師顯響腦腳臟與舊艱蘭號處術衛衝裝製複規視覺親覽覺觀計訊記訓託許訟訪評詞話該詳語誤說課謂講證識譯警護譽豐豫貓貝負貢貧貨販貪購賽贊贈趕趨跡跟路跳躍身軌軍農邊達遠遲郵鄉酒釋針鋼錄錯鍵鐘鐵鑽隊際險隱集雖電霧項順預領頻願類顯風飛餘餅騎體鬱魚鳥鹽麗麟齊齡"
+)
+SIMP_DISTINCT = frozenset(
+    "这边体广门听国学会还开长东车时点过来说边个们问间关头员团选种总从应该计记讯议务质产亲龙鸟鱼马云参与旧严据处乐极构树机杀岁归历毕画异当发盗尽监盘众确硕础显题馆铁际线声电脑里经师场见览观讨许访评详误课讲识读变让猫负贫货购赞赠赶迹轨农释钢录错钟险隐虽韩项顺预领频养余骑松盐丽点齐龄台湾华书导师显响脑脚脏与旧艰兰号处术卫冲装制复规视觉亲览觉观计讯记训托许讼访评词话该详语误说课谓讲证识译警护誉丰豫猫贝负贡贫货贩贪购赛赞赠赶趋迹跟路跳跃身轨军农边达远迟邮乡酒释针钢录错键钟铁钻队际险隐集虽电雾项顺预领频愿类显风飞余饼骑体郁鱼鸟盐丽麟齐龄"
+)
+# Spoken Cantonese particles / forms (preserve in refiner; do not 書面語化).
+CANTONESE_ORAL_MARKERS = frozenset(
+    "嘅咗唔佢冇啲囉咩喺乜咁咪喇喎噉囖吖嘛啱呃啫咋畀俾掂求其係嚟啱哋噃啩啲"
+)
+
+_LATIN_WORD = re.compile(r"[A-Za-z]{2,}")
+
+
+class ScriptProfile:
+    __slots__ = (
+        "han", "han_ext", "hiragana", "katakana", "hangul", "latin", "latin_word",
+        "trad", "simp", "cantonese",
+    )
+
+    def __init__(self, text: str):
+        # One pass in C: per-character frequencies. The script buckets are then summed over the
+        # distinct characters only (a few hundred even for long transcripts).
+        chars = collections.Counter(text)
+        han = han_ext = hiragana = katakana = hangul = latin = 0
+        for ch, n in chars.items():
+            if ch < "A":
+                continue
+            if "\u4e00" <= ch <= "\u9fff":
+                han += n
+            elif ch <= "z":
+                if ch <= "Z" or ch >= "a":
+                    latin += n
+            elif "\u3400" <= ch <= "\u4dbf":
+                han_ext += n
+            elif "\u3040" <= ch <= "\u309f":
+                hiragana += n
+            elif "\u30a0" <= ch <= "\u30ff":
+                katakana += n
+            elif "\uac00" <= ch <= "\ud7af":
+                hangul += n
+        self.han = han
+        self.han_ext = han_ext
+        self.hiragana = hiragana
+        self.katakana = katakana
+        self.hangul = hangul
+        self.latin = latin
+        self.latin_word = bool(latin) and _LATIN_WORD.search(text) is not None
+        self.trad = sum(chars[ch] for ch in TRAD_DISTINCT.intersection(chars))
+        self.simp = sum(chars[ch] for ch in SIMP_DISTINCT.intersection(chars))
+        self.cantonese = not CANTONESE_ORAL_MARKERS.isdisjoint(chars)
+    @property
+    def kana(self) -> int:
+        return self.hiragana + self.katakana
+
+    def mixes_cjk_and_latin(self) -> bool:
+        """Latin-letter words together with Han, Japanese kana or Korean Hangul."""
+        return self.latin_word and bool(self.han or self.kana or self.hangul)
+
+    def cjk_substantial(self) -> bool:
+        """See voice_input._cjk_is_substantial_for_refiner."""
+        han = self.han + self.han_ext
+        if han < 2:
+            return False
+        if self.mixes_cjk_and_latin():
+            return True
+        lat = self.latin
+        if lat == 0:
+            return True
+        if han >= 8:
+            return True
+        return han >= 3 and han >= lat * 0.4
+
+    def infer_language(self) -> tuple[str | None, float]:
+        """(code, confidence) from script counts; see voice_input._infer_language_from_transcript."""
+        han = self.han + self.han_ext
+        kana = self.kana
+        hangul = self.hangul
+        latin = self.latin
+        total = han + kana + hangul + latin
+        if total == 0:
+            return None, 0.0
+        # Latin-first: a few stray CJK characters in otherwise English ASR must not select "zh".
+        if latin >= 8 and latin >= han * 4 and latin >= total * 0.52:
+            return "en", 0.84
+        if hangul >= total * 0.22 and hangul >= max(han, kana):
+            return "ko", 0.88
+        if kana > 0 and (kana >= total * 0.12 or han <= kana * 3):
+            return "ja", 0.85
+        if han >= 3 and han >= total * 0.22:
+            return "zh", 0.9
+        if han >= 2 and han >= total * 0.34:
+            return "zh", 0.78
+        if latin >= total * 0.72:
+            return "en", 0.75
+        return None, 0.0
+
+    def chinese_variant(self) -> tuple[str | None, float]:
+        """('traditional'|'simplified', confidence) or (None, 0) if unclear."""
+        t, s = self.trad, self.simp
+        if t == 0 and s == 0:
+            return None, 0.0
+        if t >= 2 and t >= s * 2:
+            return "traditional", min(0.95, 0.55 + 0.05 * min(t, 8))
+        if s >= 2 and s >= t * 2:
+            return "simplified", min(0.95, 0.55 + 0.05 * min(s, 8))
+        if t > s:
+            return "traditional", 0.6
+        if s > t:
+            return "simplified", 0.6
+        return None, 0.0
+
+
+@functools.lru_cache(maxsize=16)
+def profile(text: str) -> ScriptProfile:
+    return ScriptProfile(text or "")
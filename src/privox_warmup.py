@@ -0,0 +1,166 @@
+"""
+Background warmup: pay first-inference JIT cost right after a load, not inside a real request.
+
+The first decode after a load builds CUDA graphs / cuDNN plans (CTranslate2, torch) and the first
+llama.cpp eval allocates its compute buffers; a freshly loaded engine is "ready (cold)" and the
+first dictation used to absorb that cost. EngineWarmup runs a short list of representative steps
+(a tiny ASR decode, a few refiner tokens) on a background thread under the engine's model lock:
+
+    ready (cold)   weights loaded; requests are accepted immediately
+    warming        a warmup step is running (holds the model lock for at most one step)
+    ready (warm)   every step ran; the next request pays no first-use cost
+
+A real request calls cancel() before it takes the model lock: the warmup stops at its next
+cancellation point (between steps, between refiner tokens) and never delays it by more than the
+step in flight. The real request then simply pays whatever was left, as before.
+A model that finishes loading later (an inference worker reports ready after its ASR while the
+refiner is still loading) joins with add(): its steps run in the same warmup, or on their own
+once that has finished.
+PRIVOX_WARMUP=0 disables the stage.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+COLD = "cold"
+WARMING = "warming"
+WARM = "warm"
+
+
+def warmup_enabled() -> bool:
+    return (os.environ.get("PRIVOX_WARMUP") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class EngineWarmup:
+    """One warmup run per load; cancel() makes the current run stop at its next check."""
+
+    def __init__(self, log: Callable[[str], None] = print):
+        self.log = log
+        self.state = COLD
+        self.loaded_at: Optional[float] = None
+        self.warm_after_s: Optional[float] = None   # load -> ready (warm)
+        self.steps: dict = {}                       # step name -> seconds of the last run
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[list] = None          # steps the current run has yet to take
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def warm(self) -> bool:
+        return self.state == WARM
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self, reason: str = "request") -> None:
+        """Stop the running warmup (a real request wants the engine). No-op when idle."""
+        with self._lock:
+            if self.state != WARMING or self._cancel.is_set():
+                return
+            self._cancel.set()
+        self.log(f"Warmup: cancelled ({reason}); remaining first-use cost moves into the request.")
+
+    def reset(self) -> None:
+        """Models were unloaded: the next load starts cold again."""
+        with self._lock:
+            self._cancel.set()
+            self._generation += 1
+            self.state = COLD
+            self.loaded_at = None
+
+    def start(self, steps: list, model_lock, loaded_at: Optional[float] = None) -> bool:
+        """Mark the engine ready (cold) and warm it up in the background.
+
+        steps: [(name, fn)] where fn(cancelled) runs one representative inference and may poll
+        cancelled() to stop early. Returns False when disabled or there is nothing to warm.
+        """
+        with self._lock:
+            self._generation += 1
+            gen = self._generation
+            self.loaded_at = loaded_at or time.time()
+            self.warm_after_s = None
+            self.state = COLD
+            if not steps or not warmup_enabled():
+                return False
+            self._cancel = threading.Event()
+            self.state = WARMING
+            cancel = self._cancel
+            self._queue = queue = list(steps)
+        self._thread = threading.Thread(
+            target=self._run, args=(gen, queue, model_lock, cancel), daemon=True, name="privox-warmup"
+        )
+        self._thread.start()
+        return True
+
+    def add(self, steps: list, model_lock) -> bool:
+        """Warm steps for a model loaded after start(). False when nothing is loaded (or disabled)."""
+        with self._lock:
+            if self.loaded_at is None or not steps:
+                return False  # never started, or unloaded since: the next start() covers it
+            if self.state == WARMING and self._queue is not None and not self._cancel.is_set():
+                self._queue.extend(steps)
+                return True
+            loaded_at = self.loaded_at
+        return self.start(steps, model_lock, loaded_at=loaded_at)
+
+    def _next(self, queue: list):
+        with self._lock:
+            if queue:
+                return queue.pop(0)
+            if queue is self._queue:
+                self._queue = None  # closed: a later add() starts its own run
+            return None
+
+    def _run(self, gen: int, queue: list, model_lock, cancel: threading.Event) -> None:
+        # Whoever loaded the models may still hold the lock; wait for it unless a request shows up.
+        while not cancel.is_set():
+            if model_lock.acquire(timeout=0.1):
+                break
+        else:
+            self._finish(gen, ok=False)
+            return
+        ok = True
+        try:
+            while True:
+                step = self._next(queue)
+                if step is None:
+                    break
+                name, fn = step
+                if cancel.is_set():
+                    ok = False
+                    break
+                t0 = time.perf_counter()
+                try:
+                    fn(cancel.is_set)
+                except Exception as e:
+                    if cancel.is_set():
+                        ok = False
+                        break
+                    # A failed warmup only means the real request pays the JIT cost; never fatal.
+                    self.log(f"Warmup: {name} step failed (non-fatal): {e}")
+                    continue
+                self.steps[name] = time.perf_counter() - t0
+            if cancel.is_set():
+                ok = False
+        finally:
+            model_lock.release()
+        self._finish(gen, ok)
+
+    def _finish(self, gen: int, ok: bool) -> None:
+        with self._lock:
+            if gen != self._generation:
+                return  # unloaded / reloaded meanwhile
+            self.state = WARM if ok else COLD
+            if ok and self.loaded_at is not None:
+                self.warm_after_s = time.time() - self.loaded_at
+        if ok:
+            self.log(f"Engine ready (warm): {self.describe()}")
+
+    def describe(self) -> str:
+        parts = ", ".join(f"{k} {v:.2f}s" for k, v in self.steps.items()) or "no steps"
+        after = f" {self.warm_after_s:.2f}s after load" if self.warm_after_s is not None else ""
+        return f"{self.state}{after} ({parts})"
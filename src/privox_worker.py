@@ -11,11 +11,19 @@ delegates only the audio -> refined-text inference to this worker over a local
 socket (see privox_ipc).
 
 Lifecycle:
-  - main spawns:  python privox_worker.py --port <N>
-  - worker binds 127.0.0.1:<N>, accepts ONE persistent connection from main
+  - main spawns:  python privox_worker.py --fd <N> | --pipe <name> | --port <N>
+      --fd    inherited AF_UNIX socketpair end (Linux/macOS; already connected)
+      --pipe  Windows named pipe created by main; the worker connects to it
+      --port  legacy TCP fallback: worker binds 127.0.0.1:<N>, accepts ONE connection
   - worker starts WARM-FRESH (no models loaded, ~0 VRAM); "ping" reports readiness
-  - "load" triggers background model load (hotkey-down warm-up); "ping" reports when ready
-  - "transcribe" runs ASR + refiner and returns text (lazy-loads if needed)
+  - "load" triggers background model load (hotkey-down warm-up); "ping" reports when ready, and
+    "warm" once the post-load warmup decode has run (privox_warmup); "prefetch" is main's
+    privox_pagecache snapshot of its refiner GGUF read: the worker does not read the file again and
+    logs the load as warm / cold from that snapshot
+  - "transcribe" runs ASR + refiner and returns text (lazy-loads if needed); it runs off the
+    read loop so a later "cancel" (no reply) can stop it at the next chunk / segment / token
+  - split engine (PRIVOX_WORKER_ROLE=asr|refiner): "asr" returns raw text + language hint,
+    "refine" turns that text into the refined output; each role loads only its own model
   - "shutdown" (or a dropped connection) exits the process -> VRAM freed by OS
 """
 from __future__ import annotations
@@ -37,7 +45,9 @@ if _THIS_DIR not in sys.path:
 
 import numpy as np  # noqa: E402
 
+import privox_config  # noqa: E402
 import privox_ipc  # noqa: E402
+import privox_loadtrace  # noqa: E402
 
 
 def _log(msg: str) -> None:
@@ -48,8 +58,10 @@ def _log(msg: str) -> None:
 
 
 class InferenceWorker:
-    def __init__(self, port: int):
+    def __init__(self, port: int | None = None, fd: int | None = None, pipe: str | None = None):
         self.port = port
+        self.fd = fd
+        self.pipe = pipe
         self.app = None
         self._ready = False
         self._load_error = ""
@@ -57,6 +69,8 @@ class InferenceWorker:
         self._load_thread = None
         self._load_thread_lock = threading.Lock()
         self._prebuild_done = threading.Event()
+        self._cancelled_upto = -1
+        self._refiner_prefetched = None  # last "load": main's prefetch snapshot of the refiner GGUF
 
     # --- model lifecycle -------------------------------------------------
     def _build_app(self):
@@ -73,13 +87,18 @@ class InferenceWorker:
     def _prebuild_app(self):
         """WARM-FRESH pre-pay: import voice_input + construct VoiceInputApp (NO model load).
 
-        This imports torch and builds the engine object (~3-4s) while holding ~0 VRAM, so a
-        subsequent 'load' only has to load the ASR + refiner weights, not the heavy imports.
+        This imports voice_input (torch only later, if the ASR backend needs it) and builds the
+        engine object while holding ~0 VRAM, so a subsequent 'load' only has to load the ASR +
+        refiner weights, not the heavy imports.
         """
         try:
             if self.app is None:
                 _log("pre-building engine (import voice_input, no models)...")
-                self._build_app()
+                tracer = privox_loadtrace.tracer()
+                tracer.begin_wake("prebuild")
+                with tracer.span("import voice_input + engine", cat="import"):
+                    self._build_app()
+                tracer.end_wake()
                 _log("engine pre-built (WARM-FRESH, ~0 VRAM).")
         except BaseException as e:
             _log(f"pre-build error: {type(e).__name__}: {e}\n{traceback.format_exc()}")
@@ -95,6 +114,9 @@ class InferenceWorker:
             try:
                 if self.app is None:
                     self._build_app()
+                gc_ = getattr(self.app, "grammar_checker", None)
+                if gc_ is not None:
+                    gc_.prefetched_elsewhere = self._refiner_prefetched
                 # Engine mode does not auto-start initial_load; trigger heavy load now.
                 self.app.load_heavy_models()
                 self._ready = bool(getattr(self.app, "heavy_models_loaded", False))
@@ -128,14 +150,45 @@ class InferenceWorker:
         return self._ready
 
     # --- request handlers ------------------------------------------------
+    def _is_cancelled(self, task_id) -> bool:
+        return isinstance(task_id, int) and task_id <= self._cancelled_upto
+
+    def _handle_cancel(self, header: dict) -> None:
+        task_id = header.get("task_id")
+        if not isinstance(task_id, int):
+            return
+        self._cancelled_upto = max(self._cancelled_upto, task_id)
+        if self.app is not None and hasattr(self.app, "cancel_inference"):
+            self.app.cancel_inference(task_id)
+        _log(f"cancel requested for task {task_id}")
+
     def _handle_transcribe(self, header: dict, blob: bytes) -> dict:
+        task_id = header.get("task_id")
+        if self._is_cancelled(task_id):
+            return {"cmd": "result", "ok": False, "reason": "cancelled"}
         if not self._ensure_ready():
             return {"cmd": "result", "ok": False, "reason": "no_model", "detail": self._load_error}
         try:
-            dtype = header.get("dtype", "float32")
-            audio = np.frombuffer(blob, dtype=np.dtype(dtype)).copy()
-            task_id = header.get("task_id")
-            result = self.app.run_inference(audio, task_id=task_id)
+            if hasattr(self.app, "cancel_inference"):
+                # A cancel may have arrived while the engine was still being built.
+                self.app.cancel_inference(self._cancelled_upto)
+            cmd = header.get("cmd")
+            if cmd == "refine":
+                # Split refiner worker (PRIVOX_WORKER_ROLE=refiner): ASR text in, refined text out.
+                result = self.app.run_refine(
+                    header.get("text") or "",
+                    language=header.get("language"),
+                    language_prob=float(header.get("language_prob") or 0.0),
+                    task_id=task_id,
+                )
+            else:
+                dtype = header.get("dtype", "float32")
+                audio = np.frombuffer(blob, dtype=np.dtype(dtype)).copy()
+                if cmd == "asr":
+                    # Split ASR worker (PRIVOX_WORKER_ROLE=asr): raw text + language hint only.
+                    result = self.app.run_asr(audio, task_id=task_id)
+                else:
+                    result = self.app.run_inference(audio, task_id=task_id)
             if not isinstance(result, dict):
                 return {"cmd": "result", "ok": False, "reason": "bad_result"}
             result.setdefault("cmd", "result")
@@ -144,16 +197,18 @@ class InferenceWorker:
             _log(f"Transcribe error: {e}\n{traceback.format_exc()}")
             return {"cmd": "result", "ok": False, "reason": "exception", "detail": str(e)}
 
-    def _handle_reload(self) -> dict:
+    def _handle_reload(self, header: dict) -> dict:
         try:
             asr_reload = False
-            if self.app is not None and hasattr(self.app, "load_config"):
+            actions = frozenset(header.get("actions") or ())
+            if self.app is not None and actions and not (actions & privox_config.MODEL_ACTIONS):
+                # Persona / dictionary only: no ASR preset check, no model reload.
+                self.app.config_service.refresh(publish=False)
+                self.app.apply_config_actions(self.app.config_service.current, actions)
+            elif self.app is not None and hasattr(self.app, "load_config"):
                 self.app.load_config()
                 if hasattr(self.app, "_reload_asr_if_preset_changed"):
                     asr_reload = bool(self.app._reload_asr_if_preset_changed())
-                # Refiner persona/dictionary live on the grammar checker; refresh them.
-                if hasattr(self.app, "_sync_refiner_from_config"):
-                    self.app._sync_refiner_from_config()
             if asr_reload:
                 self._ready = False
                 self._load_error = ""
@@ -162,46 +217,121 @@ class InferenceWorker:
         except Exception as e:
             return {"cmd": "ack", "ok": False, "detail": str(e)}
 
+    def _handle_offload(self) -> dict:
+        """Idle tier 1 without a kill: free VRAM, keep the ASR host-resident for a fast re-upload."""
+        with self._load_lock:
+            if self.app is None or not self._ready:
+                return {"cmd": "ack", "ok": False, "host_resident": False}
+            try:
+                self.app.unload_heavy_models()
+            except Exception as e:
+                _log(f"offload error: {e}\n{traceback.format_exc()}")
+                return {"cmd": "ack", "ok": False, "host_resident": False, "detail": str(e)}
+            self._ready = False
+            residency = self.app.asr_residency
+            _log(f"offloaded: {residency.describe()}")
+            return {
+                "cmd": "ack",
+                "ok": True,
+                "host_resident": residency.state == "host",
+                "offload_s": residency.last_offload_s,
+            }
+
+    @staticmethod
+    def _role() -> str:
+        """The role the engine loads for (voice_input reads it; a forked worker must see its own)."""
+        vi = sys.modules.get("voice_input")
+        if vi is not None:
+            return vi._worker_role()
+        return (os.environ.get("PRIVOX_WORKER_ROLE") or "all").strip().lower()
+
     def _dispatch(self, header: dict, blob: bytes):
         cmd = header.get("cmd")
-        if cmd == "transcribe":
+        if cmd in ("transcribe", "asr", "refine"):
             return self._handle_transcribe(header, blob)
         if cmd == "ping":
-            return {"cmd": "pong", "ready": self._ready, "error": self._load_error}
+            return {
+                "cmd": "pong",
+                "ready": self._ready,
+                # ready = weights loaded ("ready (cold)"); warm = the background warmup also ran.
+                "warm": bool(self._ready and self.app is not None and self.app.warmup.warm),
+                "prebuilt": self._prebuild_done.is_set(),
+                "role": self._role(),
+                "error": self._load_error,
+            }
         if cmd == "load":
             # Trigger background load (idempotent). Returns immediately; poll readiness via "ping".
+            prefetch = header.get("prefetch")
+            self._refiner_prefetched = prefetch if isinstance(prefetch, dict) else None
             self._start_load()
             return {"cmd": "ack", "ok": True, "ready": self._ready}
+        if cmd == "offload":
+            return self._handle_offload()
         if cmd == "reload_config":
-            return self._handle_reload()
+            return self._handle_reload(header)
         if cmd == "shutdown":
             return None  # signal to exit
         return {"cmd": "error", "detail": f"unknown cmd {cmd!r}"}
 
     # --- serve loop ------------------------------------------------------
-    def serve(self):
+    def _open_connection(self):
+        """Return the persistent link to main for the transport given on the command line."""
         import socket
 
+        # WARM-FRESH start: pre-build the engine (import voice_input + construct app) so the heavy
+        # imports are paid now, but do NOT load models. This holds ~0 VRAM (CUDA context is lazy),
+        # so an idle respawned worker stays at ~0 VRAM while a later 'load' only needs to load the
+        # ASR + refiner weights -> much faster wake.
+        prebuild = threading.Thread(target=self._prebuild_app, daemon=True)
+
+        if self.fd is not None:
+            conn = socket.socket(fileno=self.fd)
+            conn.settimeout(None)
+            prebuild.start()
+            _log(f"connected via inherited unix socket fd={self.fd} (WARM-FRESH; awaiting 'load')")
+            return conn
+
+        if self.pipe:
+            conn = privox_ipc.connect_pipe(self.pipe)
+            prebuild.start()
+            _log("connected via named pipe (WARM-FRESH; awaiting 'load')")
+            return conn
+
         srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         srv.bind(("127.0.0.1", self.port))
         srv.listen(1)
         srv.settimeout(120.0)
         _log(f"listening on 127.0.0.1:{self.port} (WARM-FRESH; awaiting 'load')")
-
-        # WARM-FRESH start: pre-build the engine (import voice_input + construct app) so the heavy
-        # imports are paid now, but do NOT load models. This holds ~0 VRAM (CUDA context is lazy),
-        # so an idle respawned worker stays at ~0 VRAM while a later 'load' only needs to load the
-        # ASR + refiner weights -> much faster wake.
-        threading.Thread(target=self._prebuild_app, daemon=True).start()
-
+        prebuild.start()
         try:
             conn, _addr = srv.accept()
         except socket.timeout:
             _log("no connection from main within 120s; exiting")
-            return
+            return None
+        finally:
+            srv.close()
         conn.settimeout(None)
         _log("main connected")
+        return conn
+
+    def _transcribe_and_reply(self, header: dict, blob: bytes, send) -> None:
+        reply = self._handle_transcribe(header, blob)
+        try:
+            send(reply)
+        except (ConnectionError, OSError):
+            _log("failed to send transcribe reply")
+
+    def serve(self):
+        conn = self._open_connection()
+        if conn is None:
+            return
+
+        send_lock = threading.Lock()
+
+        def send(msg: dict) -> None:
+            with send_lock:
+                privox_ipc.send_message(conn, msg)
 
         with conn:
             while True:
@@ -210,28 +340,66 @@ class InferenceWorker:
                     _log("connection closed by main; exiting")
                     break
                 header, blob = msg
+                cmd = header.get("cmd")
+                if cmd == "cancel":
+                    self._handle_cancel(header)  # fire-and-forget: no reply
+                    continue
+                if cmd in ("transcribe", "asr", "refine"):
+                    # Off the read loop so a "cancel" sent meanwhile is seen while ASR / refiner run.
+                    # main holds its request lock until this reply, so transcribes never overlap.
+                    threading.Thread(
+                        target=self._transcribe_and_reply, args=(header, blob, send), daemon=True
+                    ).start()
+                    continue
                 reply = self._dispatch(header, blob)
                 if reply is None:
                     _log("shutdown requested; exiting")
-                    privox_ipc.send_message(conn, {"cmd": "bye"})
+                    send({"cmd": "bye"})
                     break
                 try:
-                    privox_ipc.send_message(conn, reply)
+                    send(reply)
                 except (ConnectionError, OSError):
                     _log("failed to send reply; exiting")
                     break
 
 
+def _apply_cpu_affinity() -> None:
+    """Pin this worker to PRIVOX_WORKER_CPUS (e.g. "0-7,16"), set by a worker-pool slot. Linux only."""
+    spec = (os.environ.get("PRIVOX_WORKER_CPUS") or "").strip()
+    if not spec or not hasattr(os, "sched_setaffinity"):
+        return
+    cpus = set()
+    try:
+        for part in spec.split(","):
+            part = part.strip()
+            if "-" in part:
+                lo, hi = part.split("-", 1)
+                cpus.update(range(int(lo), int(hi) + 1))
+            elif part:
+                cpus.add(int(part))
+        os.sched_setaffinity(0, cpus)
+        _log(f"CPU affinity: {sorted(cpus)}")
+    except (ValueError, OSError) as e:
+        _log(f"ignoring PRIVOX_WORKER_CPUS={spec!r}: {e}")
+
+
 def main():
+    _apply_cpu_affinity()
     parser = argparse.ArgumentParser()
-    parser.add_argument("--port", type=int, required=True)
+    link = parser.add_mutually_exclusive_group(required=True)
+    link.add_argument("--fd", type=int, help="inherited AF_UNIX socket file descriptor")
+    link.add_argument("--pipe", help="Windows named pipe address to connect to")
+    link.add_argument("--port", type=int, help="TCP loopback port to listen on (fallback)")
     args = parser.parse_args()
-    worker = InferenceWorker(args.port)
+    worker = InferenceWorker(port=args.port, fd=args.fd, pipe=args.pipe)
     try:
         worker.serve()
     except Exception as e:
         _log(f"fatal: {e}\n{traceback.format_exc()}")
         sys.exit(1)
+    finally:
+        if worker.app is not None:
+            worker.app.prefs_writer.flush(timeout=2.0)  # queued usage stats
 
 
 if __name__ == "__main__":
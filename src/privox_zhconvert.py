@@ -0,0 +1,141 @@
+"""
+Traditional / Simplified Chinese conversion from a table compiled once per target.
+
+_apply_chinese_output_script used to call zhconv.convert() on every finalized output. zhconv walks
+the text one character at a time in Python, growing a slice and testing it against a prefix set
+at each position, so a long Cantonese transcript costs milliseconds even when nothing changes.
+
+ZhConverter compiles the same zhconv (MediaWiki) table for one target ("zh-hant" / "zh-hans"):
+
+    characters      sorted code-point arrays (zhconv maps one character to one character);
+                    the whole text is mapped with one numpy searchsorted
+    phrases         2-10 characters, tried longest first, only where the next two characters
+                    begin some phrase; those positions come from one vectorized lookup of every
+                    character pair in the sorted phrase heads, so Python runs only where a
+                    phrase can match and the result is zhconv's maximal forward match
+    short text      below VECTOR_MIN_CHARS the same tables are used as dicts (str.translate),
+                    with a fast path for text that has no convertible character at all
+
+converter(target) builds the table on first use (or during engine warmup) and keeps it; convert()
+also remembers its last few results, since a fallback path can finalize the same text twice.
+Without zhconv installed, text is returned unchanged, as before.
+
+    python scripts/bench_zhconvert.py     # vs zhconv.convert on long Cantonese transcripts
+"""
+from __future__ import annotations
+
+import functools
+from typing import Optional
+
+import numpy as np
+
+SIMPLIFIED = "zh-hans"
+TRADITIONAL = "zh-hant"
+VECTOR_MIN_CHARS = 96  # below this the dict path is faster than the numpy setup cost
+
+
+def _codes(text: str):
+    return np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+
+class ZhConverter:
+    def __init__(self, mapping: dict):
+        chars: dict = {}
+        phrases: dict = {}
+        lengths: dict = {}  # first two characters -> phrase lengths, longest first
+        for src, dst in mapping.items():
+            if len(src) == 1:
+                if src != dst:
+                    chars[ord(src)] = dst
+            elif src:
+                phrases[src] = dst
+                lengths.setdefault(src[:2], set()).add(len(src))
+        self._chars = chars
+        self._phrases = phrases
+        self._lengths = {head: tuple(sorted(ls, reverse=True)) for head, ls in lengths.items()}
+        self._convertible = frozenset(map(chr, chars)) | frozenset(head[0] for head in self._lengths)
+        # Compact tables for long text: sorted code points (zhconv maps one character to one).
+        src_codes = sorted(chars)
+        self._src = np.array(src_codes, dtype=np.uint32)
+        self._dst = np.array([ord(chars[c]) for c in src_codes], dtype=np.uint32)
+        self._heads = np.array(sorted((ord(h[0]) << 21) | ord(h[1]) for h in self._lengths), dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._chars) + len(self._phrases)
+
+    def convertible(self, text: str) -> bool:
+        return not self._convertible.isdisjoint(text)
+
+    @staticmethod
+    def _member(sorted_arr, values):
+        """(found mask, index) of values in a sorted array."""
+        idx = np.searchsorted(sorted_arr, values)
+        idx[idx == len(sorted_arr)] = 0
+        return sorted_arr[idx] == values, idx
+
+    def _phrase_starts(self, text: str, codes=None):
+        """Positions whose next two characters begin some phrase, in order."""
+        if codes is None:
+            return [i for i in range(len(text) - 1) if text[i:i + 2] in self._lengths]
+        if len(codes) < 2 or not len(self._heads):
+            return []
+        pairs = (codes[:-1].astype(np.uint64) << np.uint64(21)) | codes[1:]
+        return np.flatnonzero(self._member(self._heads, pairs)[0]).tolist()
+
+    def _chars_converted(self, text: str, codes=None) -> str:
+        if codes is None or not len(self._src):
+            return text.translate(self._chars)
+        hit, idx = self._member(self._src, codes)
+        if not hit.any():
+            return text
+        return np.where(hit, self._dst[idx], codes).astype("<u4").tobytes().decode("utf-32-le", "surrogatepass")
+
+    def convert(self, text: str) -> str:
+        if not text:
+            return text
+        if len(text) < VECTOR_MIN_CHARS:
+            if self._convertible.isdisjoint(text):
+                return text
+            codes = None
+        else:
+            codes = _codes(text)
+        phrases, lengths = self._phrases, self._lengths
+        matches = []
+        done = 0
+        for i in self._phrase_starts(text, codes):
+            if i < done:
+                continue
+            for n in lengths[text[i:i + 2]]:
+                hit = phrases.get(text[i:i + n])
+                if hit is not None:
+                    matches.append((i, i + n, hit))
+                    done = i + n
+                    break
+        converted = self._chars_converted(text, codes)
+        if not matches:
+            return converted
+        # Character mapping is one-to-one, so converted[a:b] is text[a:b] converted.
+        out = []
+        done = 0
+        for start, end, hit in matches:
+            out.append(converted[done:start])
+            out.append(hit)
+            done = end
+        out.append(converted[done:])
+        return "".join(out)
+
+
+@functools.lru_cache(maxsize=None)
+def converter(target: str) -> Optional[ZhConverter]:
+    """Compiled converter for "zh-hans" / "zh-hant" (None when zhconv is not installed)."""
+    try:
+        from zhconv import zhconv as _zhconv
+    except ImportError:
+        return None
+    return ZhConverter(_zhconv.getdict(target))
+
+
+@functools.lru_cache(maxsize=32)
+def convert(text: str, target: str) -> str:
+    conv = converter(target)
+    return conv.convert(text) if conv is not None else text
@@ -0,0 +1,271 @@
+"""
+Linux fork server ("zygote") for Privox inference workers.
+
+Spawning privox_worker.py from scratch re-imports voice_input, numpy, torch and transformers
+(~3-4 s and hundreds of MB of page faults) before the worker is even WARM-FRESH. The zygote
+pays those imports once, never touches CUDA, and fork()s a fresh worker on demand. A respawn
+then costs milliseconds, and the child shares the imported pages copy-on-write.
+
+Protocol over the control link (an AF_UNIX socketpair inherited by the zygote):
+    main -> zygote: {"cmd": "fork", "env": {...}} followed by ONE fd (SCM_RIGHTS) -- the
+                    worker end of a fresh socketpair; the child serves on it like --fd.
+    zygote -> main: {"cmd": "forked", "pid": N}, {"cmd": "refused", "detail": "..."} (this env
+                    cannot be honored by a fork; main spawns that worker instead) or
+                    {"cmd": "error", "detail": "..."}
+The zygote exits when the control link closes (main exited or stopped it).
+
+The child applies "env" before it starts serving, so it honors every setting read when the worker
+runs: PRIVOX_WORKER_ROLE, CUDA_VISIBLE_DEVICES (CUDA is initialised only after the fork),
+PRIVOX_WORKER_CPUS and the backend toggles read at load time. The settings in IMPORT_TIME_ENV are
+read while voice_input / privox_runtime / privox_logging are imported, i.e. in the zygote before
+any fork; a fork request that changes one of them is refused rather than silently running with
+the zygote's value.
+
+Enabled with PRIVOX_WORKER_ZYGOTE=1 on Linux; other platforms keep spawning workers.
+The fork happens in a single-threaded process with no CUDA context, which is what makes it
+safe: CUDA (and most thread pools) must not be initialised before fork().
+"""
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+if _THIS_DIR not in sys.path:
+    sys.path.insert(0, _THIS_DIR)
+
+import privox_ipc  # noqa: E402
+
+# Read at import time (module constants, logging setup): fixed in the zygote for every child.
+IMPORT_TIME_ENV = ("PRIVOX_ENGINE_MODE", "PRIVOX_NO_TORCH", "PRIVOX_PACKAGED_LAUNCH", "PRIVOX_LOG_SYNC")
+
+
+def frozen_overrides(env: dict, current: Optional[dict] = None) -> list:
+    """Keys of env that would change an IMPORT_TIME_ENV setting of the (zygote) process."""
+    current = os.environ if current is None else current
+    return sorted(
+        str(k) for k, v in env.items() if str(k) in IMPORT_TIME_ENV and current.get(str(k)) != str(v)
+    )
+
+
+def zygote_enabled() -> bool:
+    if not sys.platform.startswith("linux") or not hasattr(socket, "send_fds"):
+        return False
+    return (os.environ.get("PRIVOX_WORKER_ZYGOTE") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ForkedProcess:
+    """Popen-like handle (poll / wait / kill) for a worker forked by the zygote.
+
+    The worker is the zygote's child, not ours; the zygote reaps it (SIGCHLD ignored), so
+    liveness is probed with signal 0.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, 0)
+            except ProcessLookupError:
+                self.returncode = 0
+            except PermissionError:
+                pass
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(f"pid {self.pid}", timeout)
+            time.sleep(0.02)
+        return self.returncode
+
+    def kill(self) -> None:
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class ForkServer:
+    """Main-process handle to the zygote process."""
+
+    def __init__(self):
+        self.proc = None
+        self.sock = None
+        self._lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None and self.sock is not None
+
+    def start(self) -> bool:
+        parent, child = privox_ipc.child_socketpair()
+        try:
+            self.proc = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--control-fd", str(child.fileno())],
+                env=os.environ.copy(),
+                pass_fds=(child.fileno(),),
+            )
+        except Exception as e:
+            print(f"ForkServer: failed to spawn zygote: {e}", flush=True)
+            parent.close()
+            self.proc = None
+            return False
+        finally:
+            child.close()
+        self.sock = parent
+        return True
+
+    def fork_worker(self, worker_fd: int, env: Optional[dict] = None, timeout: float = 90.0):
+        """Fork a worker serving on worker_fd. Returns a ForkedProcess, or None on failure.
+
+        The first call waits for the zygote's one-time imports; later calls return in ms.
+        """
+        with self._lock:
+            if not self.is_alive() and not self.start():
+                return None
+            try:
+                self.sock.settimeout(timeout)
+                privox_ipc.send_message(self.sock, {"cmd": "fork", "env": dict(env or {})})
+                socket.send_fds(self.sock, [b"F"], [worker_fd])
+                resp = privox_ipc.recv_message(self.sock)
+                self.sock.settimeout(None)
+            except OSError as e:
+                print(f"ForkServer: fork request failed: {e}", flush=True)
+                resp = None
+            if resp is not None and resp[0].get("cmd") == "refused":
+                print(f"ForkServer: {resp[0].get('detail')}; spawning this worker instead.", flush=True)
+                return None
+            if resp is None or resp[0].get("cmd") != "forked":
+                detail = resp[0].get("detail") if resp else "no reply"
+                print(f"ForkServer: zygote could not fork a worker ({detail}); stopping it.", flush=True)
+                self._stop_locked()
+                return None
+            return ForkedProcess(int(resp[0]["pid"]))
+
+    def _stop_locked(self) -> None:
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except Exception:
+                pass
+            self.sock = None
+        if self.proc is not None:
+            try:
+                self.proc.wait(timeout=3)
+            except Exception:
+                try:
+                    self.proc.kill()
+                except Exception:
+                    pass
+            self.proc = None
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop_locked()
+
+
+_fork_server: Optional[ForkServer] = None
+_fork_server_lock = threading.Lock()
+
+
+def get_fork_server() -> Optional[ForkServer]:
+    """Process-wide zygote handle (started lazily), or None when zygote mode is off."""
+    global _fork_server
+    if not zygote_enabled():
+        return None
+    with _fork_server_lock:
+        if _fork_server is None:
+            _fork_server = ForkServer()
+        return _fork_server
+
+
+# --- zygote side ---------------------------------------------------------------------------
+
+def _run_forked_child(control: socket.socket, worker_fd: int, env: dict) -> None:
+    """In the forked child: become a normal inference worker on worker_fd. Never returns."""
+    code = 0
+    try:
+        control.close()
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # subprocess.run() in the worker needs waitpid
+        os.environ.update({str(k): str(v) for k, v in env.items()})
+        import privox_worker
+
+        privox_worker._apply_cpu_affinity()
+        privox_worker.InferenceWorker(fd=worker_fd).serve()
+    except BaseException as e:
+        print(f"[privox-zygote] forked worker error: {type(e).__name__}: {e}", flush=True)
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+        except Exception:
+            pass
+        os._exit(code)
+
+
+def serve_zygote(control_fd: int) -> None:
+    control = socket.socket(fileno=control_fd)
+    t0 = time.time()
+    # Pay the heavy imports once. privox_worker sets PRIVOX_ENGINE_MODE before voice_input is
+    # imported; nothing here creates a CUDA context (CUDA_MODULE_LOADING=LAZY, no VoiceInputApp).
+    import privox_worker  # noqa: F401
+    import voice_input  # noqa: F401
+
+    print(f"[privox-zygote] pre-imported engine in {time.time() - t0:.2f}s; ready to fork.", flush=True)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # auto-reap forked workers
+
+    with control:
+        while True:
+            msg = privox_ipc.recv_message(control)
+            if msg is None:
+                break
+            header, _blob = msg
+            if header.get("cmd") != "fork":
+                privox_ipc.send_message(control, {"cmd": "error", "detail": f"unknown cmd {header.get('cmd')!r}"})
+                continue
+            try:
+                _data, fds, _flags, _addr = socket.recv_fds(control, 1, 1)
+            except OSError as e:
+                privox_ipc.send_message(control, {"cmd": "error", "detail": f"recv_fds: {e}"})
+                continue
+            if not fds:
+                privox_ipc.send_message(control, {"cmd": "error", "detail": "no worker fd attached"})
+                continue
+            worker_fd = fds[0]
+            env = header.get("env") or {}
+            frozen = frozen_overrides(env)
+            if frozen:
+                os.close(worker_fd)
+                privox_ipc.send_message(
+                    control, {"cmd": "refused", "detail": f"{', '.join(frozen)} is read at import time"}
+                )
+                continue
+            pid = os.fork()
+            if pid == 0:
+                _run_forked_child(control, worker_fd, env)
+            os.close(worker_fd)
+            privox_ipc.send_message(control, {"cmd": "forked", "pid": pid})
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--control-fd", type=int, required=True)
+    args = parser.parse_args()
+    serve_zygote(args.control_fd)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
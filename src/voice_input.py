@@ -18,17 +18,6 @@ site.ENABLE_USER_SITE = False
 def _sanitize_user_site_paths():
     """Remove user-level site-packages from sys.path to avoid package shadowing."""
     sanitized = []
-    
-# --- Prevent Windows Background Throttling ---
-try:
-    if sys.platform == "win32":
-        import psutil
-        p = psutil.Process(os.getpid())
-        # Set to HIGH_PRIORITY_CLASS to prevent Windows 11 Efficiency Mode / EcoQoS throttling
-        # on background processes (since pythonw has no visible console window).
-        p.nice(psutil.HIGH_PRIORITY_CLASS)
-except Exception:
-    pass
     removed = []
     # Identify the pixi environment root to avoid removing it
     pixi_root = os.environ.get("CONDA_PREFIX", ".pixi").replace("\\", "/").lower()
@@ -54,6 +43,17 @@ except Exception:
     sys.path[:] = sanitized
     return removed
 
+# --- Prevent Windows Background Throttling ---
+try:
+    if sys.platform == "win32":
+        import psutil
+        p = psutil.Process(os.getpid())
+        # Set to HIGH_PRIORITY_CLASS to prevent Windows 11 Efficiency Mode / EcoQoS throttling
+        # on background processes (since pythonw has no visible console window).
+        p.nice(psutil.HIGH_PRIORITY_CLASS)
+except Exception:
+    pass
+
 
 _removed_user_site_paths = _sanitize_user_site_paths()
 
@@ -120,7 +120,7 @@ import queue
 import time
 import re
 import gc
-import hashlib
+import contextlib
 import concurrent.futures
 import subprocess
 import importlib
@@ -131,11 +131,38 @@ from privox_runtime import (
     cuda_is_available,
     cuda_device_name,
     cuda_device_total_memory_gib,
+    cuda_device_used_memory_gib,
 )
 
-torch = get_torch()
-if torch is not None:
-    torch.set_num_threads(2)  # Constrain underlying OpenMP/MKL to avoid CPU spikes on start
+# PyTorch is backend-scoped: bound by _require_torch() the first time the selected ASR backend
+# (Qwen3-ASR / SenseVoice) or the Silero VAD needs it. A faster-whisper + llama.cpp engine never
+# imports it, so the worker skips ~1-2 s of import and several hundred MB of RSS.
+torch = None
+
+
+def _require_torch():
+    """Import torch on first use (None under PRIVOX_NO_TORCH); logs the diagnostics once."""
+    global torch
+    if torch is None and not NO_TORCH:
+        torch = get_torch()  # also caps OpenMP/MKL threads to avoid CPU spikes
+        log_print(f"PyTorch {torch.__version__} imported on demand ({getattr(torch, '__file__', 'Unknown')})")
+        log_print(f"CUDA Available: {torch.cuda.is_available()} | CUDA Version: {torch.version.cuda} | "
+                  f"CuDNN Version: {torch.backends.cudnn.version()}")
+        if torch.cuda.is_available():
+            log_print(f"Current Device: {torch.cuda.get_device_name(0)}")
+        else:
+            log_print("CUDA NOT AVAILABLE to PyTorch (CPU build, missing CUDA DLLs in PATH, or driver issues).")
+    return torch
+
+
+def _asr_backend_needs_torch(backend=None) -> bool:
+    return (backend or ASR_BACKEND) in ("qwen_asr", "sensevoice")
+
+
+def _use_webrtc_vad() -> bool:
+    """WebRTC VAD (no PyTorch) under PRIVOX_NO_TORCH or PRIVOX_VAD=webrtc; Silero otherwise."""
+    return NO_TORCH or (os.environ.get("PRIVOX_VAD") or "silero").strip().lower() == "webrtc"
+
 
 def log_vram_usage(stage_name):
     try:
@@ -159,8 +186,24 @@ for _msg in (
     warnings.filterwarnings("ignore", message=_msg, category=UserWarning)
 from datetime import datetime, timedelta
 import models_config
+import privox_asr_variants
+import privox_config
+import privox_dictionary
 import privox_ipc
-from huggingface_hub import HfApi
+import privox_idle_policy
+import privox_loadtrace
+import privox_logging
+import privox_memplan
+import privox_patterns
+import privox_pagecache
+import privox_postprocess
+import privox_prewarm
+import privox_prompts
+import privox_textscan
+import privox_residency
+import privox_warmup
+import privox_zygote
+import privox_zhconvert
 if sys.platform == 'win32':
     import winreg
     import ctypes
@@ -227,93 +270,31 @@ def setup_logging():
     for _h in logging.root.handlers:
         _h.addFilter(_ThirdPartyNoiseFilter())
 
+    # Handlers run on a writer thread (privox_logging); PRIVOX_LOG_SYNC=1 keeps them inline.
+    if not (is_frozen or is_packaged_launch):
+        privox_logging.start_background_writer()
+
     # Redirect stdout/stderr
     class LoggerWriter:
-        def __init__(self, level):
+        def __init__(self, level, classify=None):
             self.level = level
-
-        @staticmethod
-        def _is_llama_diagnostic(message_lower):
-            noisy_prefixes = (
-                "llama_", "llm_", "ggml_", "gguf", "cuda :", "device ", "model metadata:",
-                "using gguf chat template:", "using chat eos_token:", "using chat bos_token:",
-            )
-            return (
-                "llama" in message_lower and (
-                    message_lower.startswith(noisy_prefixes)
-                    or "not marked as eog" in message_lower
-                    or "offloading" in message_lower
-                    or "kv buffer size" in message_lower
-                    or "compute buffer size" in message_lower
-                    or "graph nodes" in message_lower
-                )
-            )
-
-        @staticmethod
-        def _stderr_downgrade(message_lower: str) -> str | None:
-            """Map stderr lines that third parties print as 'errors' to a real log level name."""
-            if "using cache found" in message_lower:
-                return "info"
-            if "generation flags are not valid" in message_lower:
-                return "warning"
-            if "pad_token_id" in message_lower and "eos_token_id" in message_lower:
-                return "warning"
-            # llama.cpp / GGML often prints GPU discovery to stderr; not application failures.
-            if message_lower.startswith(("ggml_", "gguf")) or "ggml_cuda_init" in message_lower:
-                return "info"
-            if message_lower.startswith("device ") and (
-                "nvidia" in message_lower
-                or "amd" in message_lower
-                or "compute capability" in message_lower
-                or "vmm:" in message_lower
-            ):
-                return "info"
-            # Transformers + tqdm emit weight-load progress to stderr; not failures.
-            if "loading checkpoint shards" in message_lower or "checkpoint shard" in message_lower:
-                return "info"
-            # faster-whisper / huggingface_hub download bars use tqdm on stderr (model.bin, tokenizer.json, …).
-            if "userwarning" in message_lower and "huggingface" in message_lower:
-                return "warning"
-            if "%|" in message_lower and any(
-                x in message_lower
-                for x in ("mb/s", "kb/s", "gb/s", "ib/s", "b/s", "it/s", "?b/s", "/1.", "/0.")
-            ):
-                return "info"
-            if re.search(r"\[\d+:\d+", message_lower) and (
-                "b/s" in message_lower or "it/s" in message_lower
-            ):
-                return "info"
-            if re.search(
-                r"(^|\s)(config|tokenizer|vocabulary|preprocessor_config)\.json|model\.bin|\.safetensors",
-                message_lower,
-            ) and "[" in message_lower and "]" in message_lower:
-                return "info"
-            return None
+            # stderr: third parties print progress and diagnostics there (privox_logging.classify_stderr).
+            self.classify = classify
+            self._logger = logging.getLogger()
 
         def write(self, message):
             msg = message.strip()
             if not msg:
                 return
-            if self.level == logging.error:
-                ml = msg.lower()
-                tier = LoggerWriter._stderr_downgrade(ml)
-                if tier == "info":
-                    logging.info(msg)
-                    return
-                if tier == "warning":
-                    logging.warning(msg)
-                    return
-                if self._is_llama_diagnostic(ml):
-                    logging.info(msg)
-                    return
-            self.level(msg)
+            level = self.classify(msg) if self.classify is not None else self.level
+            self._logger.log(level, msg)
 
         def flush(self):
             pass
 
     if not (is_frozen or is_packaged_launch):
-        sys.stdout = LoggerWriter(logging.info)
-        sys.stderr = LoggerWriter(logging.error)
+        sys.stdout = LoggerWriter(logging.INFO)
+        sys.stderr = LoggerWriter(logging.ERROR, classify=privox_logging.classify_stderr)
 
 # Silence noisy external loggers
 logging.getLogger("PIL").setLevel(logging.WARNING)
@@ -322,14 +303,28 @@ logging.getLogger("huggingface_hub").setLevel(logging.WARNING)
 
 # Initialize logging IMMEDIATELY to catch import errors
 setup_logging()
+_root_logger = logging.getLogger()
 
-def log_print(msg, **kwargs):
-    """Dev: print → LoggerWriter → logging + log file. Packaged exe: no log file and no stdout capture."""
-    if getattr(sys, "frozen", False):
+_LOG_PRINT_ENABLED = not getattr(sys, "frozen", False) and (
+    (os.environ.get("PRIVOX_PACKAGED_LAUNCH") or "").strip().lower() not in ("1", "true", "yes", "on")
+)
+
+
+def log_print(msg, *args, **kwargs):
+    """Dev: logging + log file (written off-thread). Packaged exe: no log file and no stdout capture.
+
+    args are %-style, as in logging: the message is formatted only when the record is written, so
+    pass transcript previews as privox_logging.Preview instead of slicing them here. kwargs
+    (print's flush / end) are accepted and ignored.
+    """
+    if not _LOG_PRINT_ENABLED:
         return
-    if (os.environ.get("PRIVOX_PACKAGED_LAUNCH") or "").strip().lower() in ("1", "true", "yes", "on"):
+    if args:
+        _root_logger.info(msg.strip(), *args)
         return
-    print(msg, **kwargs)
+    text = str(msg).strip()
+    if text:
+        _root_logger.info(text)
 
 
 _cached_transcription_log: bool | None = None
@@ -375,9 +370,9 @@ def transcription_logging_enabled() -> bool:
     return _cached_transcription_log
 
 
-def log_transcription(msg, **kwargs):
+def log_transcription(msg, *args, **kwargs):
     if transcription_logging_enabled():
-        log_print(msg, **kwargs)
+        log_print(msg, *args)
 
 
 def _safe_json_load(path: str, label: str) -> dict:
@@ -401,54 +396,38 @@ def _safe_json_load(path: str, label: str) -> dict:
         return {}
 
 
+# The script helpers below share one cached pass over the text (privox_textscan.profile).
 def _contains_cjk_char(s: str) -> bool:
-    return any("\u4e00" <= c <= "\u9fff" for c in (s or ""))
+    return bool(s) and privox_textscan.profile(s).han > 0
 
 
 def _cjk_is_substantial_for_refiner(s: str) -> bool:
     """Enough Han characters to apply Chinese script rules — avoids 1–2 stray CJK glitches on English ASR."""
     if not (s and str(s).strip()):
         return False
-    han = len(re.findall(r"[\u4e00-\u9fff\u3400-\u4dbf]", s))
-    if han < 2:
-        return False
-    if _transcript_mixes_cjk_and_latin(s):
-        return True
-    lat = len(re.findall(r"[A-Za-z]", s))
-    if lat == 0:
-        return True
-    if han >= 8:
-        return True
-    return han >= 3 and han >= lat * 0.4
+    return privox_textscan.profile(s).cjk_substantial()
 
 
 def _transcript_mixes_cjk_and_latin(text: str | None) -> bool:
     """True when ASR mixes Latin-letter words with CJK, Japanese kana, or Korean Hangul."""
     if not (text and str(text).strip()):
         return False
-    if not re.search(r"[A-Za-z]{2,}", text):
-        return False
-    if _contains_cjk_char(text):
-        return True
-    for c in text:
-        o = ord(c)
-        if 0x3040 <= o <= 0x30FF or 0xAC00 <= o <= 0xD7AF:  # Hiragana/Katakana, Hangul syllables
-            return True
-    return False
+    return privox_textscan.profile(text).mixes_cjk_and_latin()
 
 
 def _apply_chinese_output_script(text: str | None, use_simplified: bool) -> str:
-    """Normalize Chinese in final text: Traditional by default, or Simplified when user opts in (zhconv)."""
+    """Normalize Chinese in final text: Traditional by default, or Simplified when user opts in.
+
+    Uses the zhconv table, compiled once per target (privox_zhconvert).
+    """
     if not (text and str(text).strip()):
         return text or ""
     if not _contains_cjk_char(text):
         return text
     try:
-        import zhconv
-    except ImportError:
-        return text
-    try:
-        return zhconv.convert(text, "zh-hans" if use_simplified else "zh-hant")
+        return privox_zhconvert.convert(
+            text, privox_zhconvert.SIMPLIFIED if use_simplified else privox_zhconvert.TRADITIONAL
+        )
     except Exception:
         return text
 
@@ -544,7 +523,13 @@ def _remove_spoken_fillers(text: str) -> str:
     """Hardcoded strip of common English hesitation fillers (um, uh, ah, er, hmm, erm)."""
     if not text:
         return text
-    t = _SPOKEN_FILLER_RE.sub('', text)
+    return _tidy_after_filler_strip(_SPOKEN_FILLER_RE.sub('', text))
+
+
+def _tidy_after_filler_strip(t: str) -> str:
+    """Commas / spacing / leading capital left behind by _SPOKEN_FILLER_RE."""
+    if not t:
+        return t
     t = re.sub(r',\s*,', ',', t)
     t = re.sub(r'^\s*,\s*', '', t)
     t = re.sub(r'\s*,\s*$', '', t)
@@ -567,13 +552,30 @@ def _strip_asr_spoken_fillers(text: str) -> str:
     return stripped
 
 
+# Fillers and digit words are ASCII-only, so those stages skip outputs without Latin letters; the
+# zhconv stage skips outputs without Han. All three keep the script profile (see privox_postprocess).
+_FINALIZE_STAGES = privox_postprocess.Pipeline("finalize", [
+    privox_postprocess.Stage(
+        "fillers", lambda v: _SPOKEN_FILLER_RE.sub('', v.text),
+        applies=lambda v: v.profile.latin > 0, keeps_profile=True,
+    ),
+    privox_postprocess.Stage("tidy", lambda v: _tidy_after_filler_strip(v.text), keeps_profile=True),
+    privox_postprocess.Stage(
+        "digits", lambda v: _convert_english_spoken_digit_lists(v.text),
+        applies=lambda v: v.profile.latin >= 3, keeps_profile=True,
+    ),
+    privox_postprocess.Stage(
+        "zh_script", lambda v: _apply_chinese_output_script(v.text, v.ctx.get("use_simplified_zh", False)),
+        applies=lambda v: v.profile.han > 0,
+    ),
+])
+
+
 def _finalize_refiner_text(text: str | None, use_simplified_zh: bool) -> str:
-    """Spoken English number lists → digits, then Chinese script normalization."""
+    """Fillers stripped, spoken English number lists → digits, then Chinese script normalization."""
     if text is None:
         return ""
-    cleaned = _remove_spoken_fillers(str(text))
-    t = _convert_english_spoken_digit_lists(cleaned)
-    return _apply_chinese_output_script(t, use_simplified_zh)
+    return _FINALIZE_STAGES.run(str(text), use_simplified_zh=use_simplified_zh)
 
 
 _numpy_metadata_shim_installed = False
@@ -778,48 +780,57 @@ def show_modern_error(title, message, subtext=""):
             import ctypes
             ctypes.windll.user32.MessageBoxW(0, f"{message}\n\n{subtext}", title, 0x10)
 
+# --- Worker isolation flags --------------------------------------------------
+# ENGINE_MODE: this process is the inference worker (privox_worker.py). It only
+# owns the ASR + refiner engine; no tray / microphone / hotkey / auto-load.
+ENGINE_MODE = (os.environ.get("PRIVOX_ENGINE_MODE") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _worker_role() -> str:
+    """Engine mode: "all" = ASR + refiner in one worker; "asr" / "refiner" = one half of the split
+    engine (PRIVOX_SPLIT_WORKERS), each loading only its own model.
+
+    Read per call, not at import: a worker forked by the zygote (privox_zygote) inherits this
+    module already imported and gets its role in the environment only after the fork.
+    """
+    if not ENGINE_MODE:
+        return "all"
+    return (os.environ.get("PRIVOX_WORKER_ROLE") or "all").strip().lower()
+
+
 try:
     log_print("Importing core utilities...")
     log_print(f"DEBUG: sys.path is: {sys.path}")
     import wave
     import traceback
-    import sounddevice as sd
     import numpy as np
-    from pynput import keyboard
-    import pystray
-    from PIL import Image, ImageDraw
-    import pyperclip
-    from huggingface_hub import hf_hub_download, snapshot_download
+    if ENGINE_MODE:
+        # The worker never opens the microphone, tray, hotkey listener or clipboard; those imports
+        # (PortAudio, pynput's display / hook backend, Pillow, pystray) are ~a third of its startup.
+        sd = keyboard = pystray = Image = ImageDraw = pyperclip = winsound = None
+    else:
+        import sounddevice as sd
+        from pynput import keyboard
+        import pystray
+        from PIL import Image, ImageDraw
+        import pyperclip
     
-    log_print(f"--- TORCH DIAGNOSTICS ---")
     log_print(f"Python Version: {sys.version}")
-    if torch is not None:
-        log_print(f"Torch Version: {torch.__version__}")
-        log_print(f"Torch Path: {getattr(torch, '__file__', 'Unknown')}")
-        log_print(f"CUDA Available: {torch.cuda.is_available()}")
-        log_print(f"CUDA Version: {torch.version.cuda}")
-        log_print(f"CuDNN Version: {torch.backends.cudnn.version()}")
-        if torch.cuda.is_available():
-            log_print(f"Current Device: {torch.cuda.get_device_name(0)}")
-        else:
-            log_print("CUDA NOT AVAILABLE. Possible reasons:")
-            log_print("1. CPU version of Torch installed (check version above)")
-            log_print("2. Missing CUDA DLLs in PATH")
-            log_print("3. GPU driver issues")
-            if sys.platform == "win32" and not getattr(sys, "frozen", False):
-                pass
-    else:
+    if NO_TORCH:
         log_print(
             "PRIVOX_NO_TORCH=1: PyTorch not loaded (WebRTC VAD; ASR: faster-whisper and/or Qwen ONNX)."
         )
+    else:
+        log_print("PyTorch: imported on first use (Qwen3-ASR / SenseVoice / Silero VAD only).")
     # Before any thread imports faster_whisper/transformers (numpy metadata quirks on mixed conda/pip).
     ensure_numpy_version_visible_to_metadata()
 
     # Windows Sound
-    try:
-        import winsound
-    except ImportError:
-        winsound = None
+    if not ENGINE_MODE:
+        try:
+            import winsound
+        except ImportError:
+            winsound = None
 
     log_print("Core imports successful.")
 except Exception as e:
@@ -830,6 +841,19 @@ except Exception as e:
     show_modern_error("Privox Fatal Error", str(e), f"Traceback:\n{err_stack[:500]}...")
     sys.exit(1)
 
+
+# huggingface_hub (requests, tqdm, filelock, fsspec...) is only needed to find / fetch a model that
+# is not under models/ yet, so it is imported on first use rather than on every start.
+def hf_hub_download(*args, **kwargs):
+    from huggingface_hub import hf_hub_download as _hf_hub_download
+    return _hf_hub_download(*args, **kwargs)
+
+
+def _hf_api():
+    from huggingface_hub import HfApi
+    return HfApi()
+
+
 # --- 2. Programmatic Console Hiding (Fail-safe for Windows) ---
 if sys.platform == "win32":
     # If launched via python.exe (creating a console), hide it immediately.
@@ -846,10 +870,6 @@ if sys.platform == "win32":
 SAMPLE_RATE = 16000
 BLOCK_SIZE = 512
 
-# --- Worker isolation flags --------------------------------------------------
-# ENGINE_MODE: this process is the inference worker (privox_worker.py). It only
-# owns the ASR + refiner engine; no tray / microphone / hotkey / auto-load.
-ENGINE_MODE = (os.environ.get("PRIVOX_ENGINE_MODE") or "").strip().lower() in ("1", "true", "yes", "on")
 
 
 def _worker_isolation_enabled() -> bool:
@@ -869,6 +889,111 @@ def _worker_isolation_enabled() -> bool:
     if getattr(sys, "frozen", False):
         return False
     return (os.environ.get("PRIVOX_WORKER_ISOLATION") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _split_workers_enabled() -> bool:
+    """Separate ASR and refiner worker processes, each with its own idle timeout and readiness.
+
+    PRIVOX_SPLIT_WORKERS=1 (with worker isolation). The VRAM saver (vram_timeout) then releases only
+    the multi-GB refiner; the ASR worker follows PRIVOX_ASR_IDLE_TIMEOUT (default: vram_timeout).
+    """
+    if not _worker_isolation_enabled():
+        return False
+    return (os.environ.get("PRIVOX_SPLIT_WORKERS") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _memplan_enabled() -> bool:
+    """Size refiner offload / ASR cap from GGUF metadata + measured footprints (PRIVOX_MEMPLAN=0 disables)."""
+    return (os.environ.get("PRIVOX_MEMPLAN") or "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+_memplan_store = None
+# Bumped when an in-process ASR load starts and when it ends (odd = loading). A refiner VRAM
+# measurement taken across a change would count ASR allocations as refiner footprint.
+_asr_load_epoch = 0
+_asr_load_epoch_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _asr_load_window():
+    global _asr_load_epoch
+    with _asr_load_epoch_lock:
+        _asr_load_epoch += 1
+    try:
+        yield
+    finally:
+        with _asr_load_epoch_lock:
+            _asr_load_epoch += 1
+
+
+def _memplan_measurements():
+    global _memplan_store
+    if _memplan_store is None:
+        _memplan_store = privox_memplan.MeasurementStore(os.path.join(BASE_DIR, "models", ".memplan.json"))
+    return _memplan_store
+
+
+_asr_variant_store = None
+
+
+def _asr_variants():
+    global _asr_variant_store
+    if _asr_variant_store is None:
+        _asr_variant_store = privox_asr_variants.VariantStore(os.path.join(BASE_DIR, "models", ".asr_variants.json"))
+    return _asr_variant_store
+
+
+def _asr_checkpoint_bytes() -> int:
+    """On-disk size of the selected ASR preset (models/whisper-<preset>); 0 when only in the HF cache."""
+    return privox_memplan.checkpoint_bytes(os.path.join(BASE_DIR, "models", f"whisper-{WHISPER_SIZE}"))
+
+
+def _env_gib(name: str):
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def _plan_device_memory(vram_gib, gguf_path=None, n_ctx=4096, n_batch=512):
+    """privox_memplan placement for this device, or None (planner off / unreadable GGUF).
+
+    Without a GGUF (ASR-only callers) only asr_max_gpu_gib is meaningful.
+    """
+    if not _memplan_enabled() or not vram_gib:
+        return None
+    meta = {"n_layer": 0}
+    if gguf_path:
+        try:
+            meta = privox_memplan.read_gguf_metadata(gguf_path)
+        except Exception as e:
+            log_print(f"Memory planner: could not read GGUF metadata ({e}); using heuristic offload.")
+            return None
+    asr_backend = ASR_BACKEND if ASR_BACKEND in ("qwen_asr", "sensevoice") else "whisper"
+    # A refiner-only worker shares the GPU with a separate ASR worker: still reserve for it.
+    asr_bytes = _asr_checkpoint_bytes()
+    store = _memplan_measurements()
+    plan = privox_memplan.plan_placement(
+        vram_gib,
+        meta,
+        asr_bytes=asr_bytes,
+        asr_backend=asr_backend,
+        n_ctx=n_ctx,
+        n_batch=n_batch,
+        refiner_cap_gib=_env_gib("PRIVOX_REFINER_MAX_GPU_GIB"),
+        asr_cap_gib=_env_gib("PRIVOX_ASR_MAX_GPU_GIB"),
+        store=store,
+        refiner_key=f"refiner:{os.path.basename(gguf_path)}" if gguf_path else "",
+        asr_key=f"asr:{WHISPER_SIZE}",
+    )
+    if gguf_path and meta.get("n_layer"):
+        plan["meta"] = meta
+    return plan
+
+
 # Bound only the short callback backlog; the recording buffer itself remains unbounded.
 AUDIO_QUEUE_MAX_CHUNKS = 256  # ~8 seconds at 16 kHz / 512-sample blocks
 # Silero probability threshold; lower = more sensitive (helps quiet mics / distant speech).
@@ -942,34 +1067,42 @@ def _infer_language_from_transcript(text: str) -> tuple[str | None, float]:
     """Guess ISO-ish language for refiner prompts when ASR has no LID (e.g. qwen_asr). Returns (code, confidence)."""
     if not text or not text.strip():
         return None, 0.0
-    han = len(re.findall(r"[\u4e00-\u9fff\u3400-\u4dbf]", text))
-    hiragana = len(re.findall(r"[\u3040-\u309f]", text))
-    katakana = len(re.findall(r"[\u30a0-\u30ff]", text))
-    hangul = len(re.findall(r"[\uac00-\ud7af]", text))
-    latin = len(re.findall(r"[A-Za-z]", text))
-    total = han + hiragana + katakana + hangul + latin
-    if total == 0:
-        return None, 0.0
-    kana = hiragana + katakana
-    # Latin-first: a few stray CJK characters in otherwise English ASR must not select "zh"
-    # (that used to trigger "PROVIDE A CLEAN CHINESE VERSION" and looked like spontaneous translation).
-    if latin >= 8 and latin >= han * 4 and latin >= total * 0.52:
-        return "en", 0.84
-    if hangul >= total * 0.22 and hangul >= max(han, kana):
-        return "ko", 0.88
-    if kana > 0 and (kana >= total * 0.12 or han <= kana * 3):
-        return "ja", 0.85
-    if han >= 3 and han >= total * 0.22:
-        return "zh", 0.9
-    if han >= 2 and han >= total * 0.34:
-        return "zh", 0.78
-    if latin >= total * 0.72:
-        return "en", 0.75
-    return None, 0.0
-
-
-def _build_faster_whisper_transcribe_kwargs(audio_data) -> dict:
-    """Build faster-whisper transcribe() kwargs (shared by in-process and worker inference)."""
+    # Latin-first rule inside: a few stray CJK characters in otherwise English ASR must not select
+    # "zh" (that used to trigger "PROVIDE A CLEAN CHINESE VERSION" and looked like spontaneous translation).
+    return privox_textscan.profile(text).infer_language()
+
+
+_ASR_MIX_CONTEXT = "Transcript may mix English and Chinese; keep each language in its usual spelling."
+_WHISPER_HOTWORDS_SUPPORTED = None
+
+
+def _whisper_supports_hotwords() -> bool:
+    """faster-whisper >= 1.0.2 takes hotwords=; older builds only initial_prompt."""
+    global _WHISPER_HOTWORDS_SUPPORTED
+    if _WHISPER_HOTWORDS_SUPPORTED is None:
+        try:
+            import inspect
+            from faster_whisper import WhisperModel
+            _WHISPER_HOTWORDS_SUPPORTED = "hotwords" in inspect.signature(WhisperModel.transcribe).parameters
+        except Exception:
+            _WHISPER_HOTWORDS_SUPPORTED = False
+    return _WHISPER_HOTWORDS_SUPPORTED
+
+
+def _qwen_asr_context(dictionary=None) -> str:
+    """Qwen3-ASR context: the code-mix hint, plus the custom dictionary as a vocabulary list."""
+    if not dictionary:
+        return _ASR_MIX_CONTEXT
+    terms = dictionary.asr_hotwords(privox_dictionary.QWEN_CONTEXT_CHARS)
+    return f"{_ASR_MIX_CONTEXT} Vocabulary: {terms}." if terms else _ASR_MIX_CONTEXT
+
+
+def _build_faster_whisper_transcribe_kwargs(audio_data, dictionary=None) -> dict:
+    """Build faster-whisper transcribe() kwargs (shared by in-process and worker inference).
+
+    dictionary (privox_dictionary.CustomDictionary) biases decoding toward its terms: hotwords=
+    where faster-whisper supports it, otherwise appended to initial_prompt.
+    """
     _asr_kw: dict = dict(
         audio=np.asarray(audio_data, dtype=np.float32),
         task="transcribe",
@@ -983,7 +1116,7 @@ def _build_faster_whisper_transcribe_kwargs(audio_data) -> dict:
     _mix_prompt = (
         models_config.WHISPER_CODE_MIX_PROMPT
         if WHISPER_CODE_MIX
-        else "Transcript may mix English and Chinese; keep each language in its usual spelling."
+        else _ASR_MIX_CONTEXT
     )
     if WHISPER_CODE_MIX:
         # Always use per-segment LID for code-mix presets (do not pin yue for the whole whole clip).
@@ -994,6 +1127,12 @@ def _build_faster_whisper_transcribe_kwargs(audio_data) -> dict:
     elif _use_per_segment_lang:
         _asr_kw["multilingual"] = True
         _asr_kw["initial_prompt"] = _mix_prompt
+    if dictionary:
+        _hot = dictionary.asr_hotwords(privox_dictionary.WHISPER_HOTWORD_CHARS)
+        if _hot and _whisper_supports_hotwords():
+            _asr_kw["hotwords"] = _hot
+        elif _hot:
+            _asr_kw["initial_prompt"] = f"{_asr_kw.get('initial_prompt') or ''} {_hot}".strip()
         
     try:
         import time
@@ -1019,47 +1158,21 @@ def _refiner_language_hint(
     return whisper_lang, whisper_prob
 
 
-# Distinctive Han forms: count to guess Traditional vs Simplified output (refiner often flips script).
-_TRAD_DISTINCT = frozenset(
-    "這邊體廣門聽國學會還開長東車時來說話點過個們問間關頭員團選種總從應該計記訊議務質產親龍鳥魚馬風雲參與舊嚴據處樂極構樹機殺歲歸歷畢畫異當發盜盡監盤眾確碩礎顯題館鐵際線聲電腦裏經師場見覽觀討許訪評詳誤課講識讀變讓貓負貢貧貨購贊贈趕跡軌農釋鋼錄錯鍾險隱雖韓項順預領頻養餘騎鬆鹽麗點齊齡臺灣華書導師顯響腦腳臟與舊艱蘭號處術衛衝裝製複規視覺親覽覺觀計訊記訓託許訟訪評詞話該詳語誤說課謂講證識譯警護譽豐豫貓貝負貢貧貨販貪購賽贊贈趕趨跡跟路跳躍身軌軍農邊達遠遲郵鄉酒釋針鋼錄錯鍵鐘鐵鑽隊際險隱集雖電霧項順預領頻願類顯風飛餘餅騎體鬱魚鳥鹽麗麟齊齡"
-)
-_SIMP_DISTINCT = frozenset(
-    "这边体广门听国学会还开长东车时点过来说边个们问间关头员团选种总从应该计记讯议务质产亲龙鸟鱼马云参与旧严据处乐极构树机杀岁归历毕画异当发盗尽监盘众确硕础显题馆铁际线声电脑里经师场见览观讨许访评详误课讲识读变让猫负贫货购赞赠赶迹轨农释钢录错钟险隐虽韩项顺预领频养余骑松盐丽点齐龄台湾华书导师显响脑脚脏与旧艰兰号处术卫冲装制复规视觉亲览觉观计讯记训托许讼访评词话该详语误说课谓讲证识译警护誉丰豫猫贝负贡贫货贩贪购赛赞赠赶趋迹跟路跳跃身轨军农边达远迟邮乡酒释针钢录错键钟铁钻队际险隐集虽电雾项顺预领频愿类显风飞余饼骑体郁鱼鸟盐丽麟齐龄"
-)
-# Spoken Cantonese particles / forms (preserve in refiner; do not 書面語化).
-_CANTONESE_ORAL_MARKERS = frozenset(
-    "嘅咗唔佢冇啲囉咩喺乜咁咪喇喎噉囖吖嘛啱呃啫咋畀俾掂求其係嚟啱哋噃啩啲"
-)
-
-
 def _infer_chinese_script_variant(text: str) -> tuple[str | None, float]:
     """Return ('traditional'|'simplified', confidence) or (None, 0) if unclear."""
     if not text:
         return None, 0.0
-    t = 0
-    s = 0
-    for ch in text:
-        if ch in _TRAD_DISTINCT:
-            t += 1
-        if ch in _SIMP_DISTINCT:
-            s += 1
-    if t == 0 and s == 0:
-        return None, 0.0
-    if t >= 2 and t >= s * 2:
-        return "traditional", min(0.95, 0.55 + 0.05 * min(t, 8))
-    if s >= 2 and s >= t * 2:
-        return "simplified", min(0.95, 0.55 + 0.05 * min(s, 8))
-    if t > s:
-        return "traditional", 0.6
-    if s > t:
-        return "simplified", 0.6
-    return None, 0.0
+    return privox_textscan.profile(text).chinese_variant()
 
 
 def _looks_like_cantonese_oral(text: str) -> bool:
     if not text:
         return False
-    return any(ch in text for ch in _CANTONESE_ORAL_MARKERS)
+    return privox_textscan.profile(text).cantonese
+
+
+class InferenceCancelled(Exception):
+    """Raised at a cooperative cancellation point when the running task was superseded."""
 
 
 # --- Persona & Tone Logic (Moved to models_config.py) ---
@@ -1083,6 +1196,21 @@ class GrammarChecker:
         self.context_buffer = "" # Max 2000 chars of conversation history
         self._has_loaded_once = False  # Instance-level: tracks if we've loaded before (for verbose control)
         self.lock = threading.RLock()
+        self._cancel_check = None  # Set per correct() call; polled in the token streaming loops
+        self.prompts = privox_prompts.PromptCompiler()  # compiled Core Directives (get_effective_prompt)
+        self.prompt_prefix_hash = None  # privox_prompts.prefix_hash of the last refiner system prompt
+        self.prefetched_elsewhere = None  # worker: main's prefetch_snapshot of this GGUF (page cache is shared)
+        # Refined-output post-processing: meta strip + hallucination guard, then _finalize_refiner_text.
+        self.postprocess = privox_postprocess.Pipeline("refined", [
+            privox_postprocess.Stage(
+                "meta_strip", lambda v: self._strip_meta_commentary(v.text, v.scan(self._GUARD_PATTERNS)),
+                applies=lambda v: "\n" in v.text,  # every pattern starts a new line
+                keeps_profile=True,
+            ),
+            privox_postprocess.Stage(
+                "validate", lambda v: self._validate_output(v.ctx["original"], v.text, v.scan(self._GUARD_PATTERNS)),
+            ),
+        ]) + _FINALIZE_STAGES
 
     def load_model(self, attempts=0):
         with self.lock:
@@ -1106,6 +1234,7 @@ class GrammarChecker:
             )
     
             # --- Optimization 3: Skip HF cache probe if local file already exists ---
+            _discover_span = privox_loadtrace.tracer().begin("refiner.discover", file=file_name)
             local_model_path = os.path.join(BASE_DIR, "models", file_name)
             if os.path.exists(local_model_path):
                 if not is_reload:
@@ -1158,8 +1287,11 @@ class GrammarChecker:
                          self.icon.notify(f"Error: Could not download refiner ({file_name}). Check internet or place in 'models' folder.", "Privox Error")
                     return False
     
+            privox_loadtrace.tracer().end(_discover_span, path=model_path)
+
             try:
                 # --- Optimization 2: Cache llama_cpp import, skip diagnostics on reload ---
+                _import_span = privox_loadtrace.tracer().begin("refiner.import", cached=GrammarChecker._llama_imported)
                 if not GrammarChecker._llama_imported:
                     log_print("Importing llama_cpp...")
                     try:
@@ -1211,6 +1343,7 @@ class GrammarChecker:
                             return False
                 
                 Llama = GrammarChecker._Llama
+                privox_loadtrace.tracer().end(_import_span)
     
                 # Keep llama.cpp stdout/stderr noise minimal unless explicitly requested per profile.
                 use_verbose = bool(self.profile.get("llama_verbose", False))
@@ -1231,7 +1364,10 @@ class GrammarChecker:
                         # self.model(prompt) does not — causes <unused*> degeneracy on Gemma 4 GGUF.
                         if (self.profile.get("prompt_type") or "").lower() == "gemma":
                             _llama_kw["chat_format"] = "gemma"
-                        return Llama(**_llama_kw)
+                        _llama_kw.update(privox_pagecache.llama_kwargs())
+                        # Weight read (mmap page-in) + GPU upload + KV / compute buffer allocation.
+                        with privox_loadtrace.span("refiner.weights", n_gpu_layers=n_gpu_layers, n_ctx=n_ctx):
+                            return Llama(**_llama_kw)
                     except (AssertionError, RuntimeError, ValueError) as e:
                         last_init_error_text = str(e)
                         err_msg = str(e).lower()
@@ -1251,7 +1387,16 @@ class GrammarChecker:
                                 except: pass
                         return None
     
+                # Page cache: after a long idle the GGUF pages are usually gone; read the file
+                # sequentially. A worker skips it when main already did on hotkey-down (its "load"
+                # carries its prefetch): the page cache is shared, a second read only costs disk time.
+                load_started_at = time.time()
+                prefetched_by_main, self.prefetched_elsewhere = self.prefetched_elsewhere, None
+                if not prefetched_by_main:
+                    privox_pagecache.prefetch_async(model_path)
+
                 # Assertive GPU Offloading
+                _plan_span = privox_loadtrace.tracer().begin("refiner.plan")
                 is_gpu = cuda_is_available()
                 turboquant = bool(self.profile.get("turboquant", False))
     
@@ -1297,13 +1442,48 @@ class GrammarChecker:
                             f"grammar budget {_grammar_budget_gib:.1f} GiB → max {_layer_cap_budget} layers "
                             f"(effective cap: {preferred_layers})"
                         )
+                    # Explicit refiner VRAM budget (e.g. split ASR / refiner workers sharing one GPU).
+                    _ref_cap_env = (os.environ.get("PRIVOX_REFINER_MAX_GPU_GIB") or "").strip()
+                    if _ref_cap_env:
+                        try:
+                            _ref_layer_cap = max(0, int(float(_ref_cap_env) / 0.15))
+                            preferred_layers = min(preferred_layers, _ref_layer_cap)
+                            log_print(
+                                f"Refiner VRAM budget {_ref_cap_env} GiB (PRIVOX_REFINER_MAX_GPU_GIB) "
+                                f"→ max {preferred_layers} layers"
+                            )
+                        except ValueError:
+                            pass
                     layer_plan = [preferred_layers, 24, 16, 0]
                 else:
                     layer_plan = [0]
-    
+
+                # Measured placement (GGUF per-layer bytes + KV width + ASR checkpoint size) replaces the
+                # per-layer guess above in one pass; the heuristic plan stays as the fallback.
+                mem_plan = _plan_device_memory(gpu_mem_gb, model_path, n_ctx, n_batch) if is_gpu else None
+                vram_before_gib = 0.0
+                asr_epoch_before = _asr_load_epoch
+                if mem_plan is not None and mem_plan.get("meta"):
+                    planned_layers = mem_plan["n_gpu_layers"]
+                    if "n_gpu_layers" in self.profile:
+                        planned_layers = min(planned_layers, int(self.profile["n_gpu_layers"]))
+                    n_ctx, n_batch = mem_plan["n_ctx"], mem_plan["n_batch"]
+                    layer_plan = [planned_layers, max(0, planned_layers - 4), planned_layers // 2, 0]
+                    log_print(f"Memory planner: n_gpu_layers={planned_layers}/{mem_plan['meta']['n_layer'] + 1}; {mem_plan['reason']}")
+                    # The device-wide delta is only the refiner's when no ASR loads meanwhile: not
+                    # during an in-process ASR load, and never in the refiner-role worker (the ASR
+                    # worker may be loading in another process).
+                    if (
+                        _memplan_measurements().samples(f"refiner:{os.path.basename(model_path)}") < 3
+                        and asr_epoch_before % 2 == 0
+                        and _worker_role() != "refiner"
+                    ):
+                        vram_before_gib = cuda_device_used_memory_gib(0)
+
                 # Deduplicate while preserving order
                 seen = set()
                 layer_plan = [x for x in layer_plan if not (x in seen or seen.add(x))]
+                privox_loadtrace.tracer().end(_plan_span, layers=layer_plan, n_ctx=n_ctx, n_batch=n_batch)
     
                 log_print(
                     f"Loading Llama (GPU={is_gpu}, vram_gb={gpu_mem_gb:.1f}, turboquant={turboquant}, n_ctx={n_ctx}, n_batch={n_batch}, layers_plan={layer_plan})"
@@ -1359,10 +1539,30 @@ class GrammarChecker:
     
                 self._has_loaded_once = True
                 log_print(f"Done. (GPU Acceleration: {'ENABLED' if is_gpu else 'DISABLED'})")
+                _load_s = time.time() - load_started_at
+                _cache_state, _cache_detail = (
+                    privox_pagecache.classify_remote_load(prefetched_by_main, load_started_at)
+                    if prefetched_by_main
+                    else privox_pagecache.classify_load(model_path, load_started_at)
+                )
+                log_print(
+                    f"Refiner load {_load_s:.2f}s [{_cache_state} page cache, {_cache_detail}, "
+                    f"mode={privox_pagecache.load_mode()}]{privox_pagecache.record_load(model_path, _load_s, _cache_state)}"
+                )
+                if vram_before_gib and n_gpu_layers == layer_plan[0] and _asr_load_epoch == asr_epoch_before:
+                    # Feed the real footprint back so later plans for this GGUF converge on it.
+                    actual_gib = cuda_device_used_memory_gib(0) - vram_before_gib
+                    if actual_gib > 0.05:
+                        _memplan_measurements().record(
+                            f"refiner:{os.path.basename(model_path)}",
+                            mem_plan["refiner_gpu_gib"] / mem_plan["correction"],
+                            actual_gib,
+                        )
+                        log_print(f"Memory planner: refiner planned {mem_plan['refiner_gpu_gib']:.2f} GiB, measured {actual_gib:.2f} GiB")
 
-                # --- CUDA Graph Warmup (Deferred) ---
-                # Skipping LLM graph warmup here saves ~0.5s of wake latency.
-                # The first transcription will handle the JIT compilation organically.
+                # --- CUDA Graph Warmup (Background) ---
+                # Not run here (it would add ~0.5s of wake latency): once both models are loaded,
+                # _start_engine_warmup() runs a few tokens off the critical path (privox_warmup).
 
                 return True
             except Exception as e:
@@ -1387,13 +1587,37 @@ class GrammarChecker:
         Layer 1: Core Safety/Format (Hidden)
         Layer 2: User Instructions (Visible in GUI)
         Layer 3: Late-Binding Overrides (Hidden, conditional)
+
+        The text depends only on the settings and a few transcript flags, so it is compiled once per
+        combination (privox_prompts) and reused.
         """
-        key = f"{self.character}|{self.tone}"
-        user_text = self.custom_prompts.get(key, "").strip()
         sample = (transcript or "").strip()
-        _inf_lang, _inf_prob = _infer_language_from_transcript(sample) if sample else (None, 0.0)
-        _mixed_cjk_lat = _transcript_mixes_cjk_and_latin(sample) if sample else False
+        mixed_cjk_lat = _transcript_mixes_cjk_and_latin(sample) if sample else False
+        # Language bucket, in the precedence the directive applies it.
+        if language and language not in ("en",) and language_prob > 0.4:
+            lang_mode = "other"
+        elif language == "en" and language_prob > 0.4:
+            lang_mode, language = "en", None
+        else:
+            language = None
+            inf_lang, inf_prob = _infer_language_from_transcript(sample) if sample else (None, 0.0)
+            lang_mode = "en_inferred" if inf_lang == "en" and inf_prob >= 0.72 else None
+        has_zh = bool(sample) and (
+            (language == "zh" and language_prob > 0.4) or _cjk_is_substantial_for_refiner(sample)
+        )
+        cantonese = bool(sample) and _looks_like_cantonese_oral(sample)
+
+        user_text = self.custom_prompts.get(f"{self.character}|{self.tone}", "").strip()
+        key = (
+            self.character, self.tone, user_text, privox_dictionary.compiled(self.custom_dictionary).prompt_terms(),
+            bool(self.use_simplified_chinese_output), lang_mode, language, mixed_cjk_lat, has_zh, cantonese,
+        )
+        return self.prompts.get(key, lambda: self._compile_effective_prompt(*key))
 
+    @staticmethod
+    def _compile_effective_prompt(character, tone, user_text, dictionary, simplified, lang_mode, language,
+                                  mixed_cjk_lat, has_zh, cantonese):
+        """Directive text for one get_effective_prompt() key (see there for the layers)."""
         # Layer 1: Core System Directives (Global Critical Rules)
         directive = (
             "REFINE TRANSCRIPT: Provide a clean, accurate version of the ASR input in its ORIGINAL LANGUAGE(S). "
@@ -1401,7 +1625,7 @@ class GrammarChecker:
             "Whenever the utterance refers to a numeric value (counts, amounts, dates, math, lists, etc.), "
             "write it with Western Arabic digits (0–9); this applies in every supported language (CRITICAL RULE 6)."
         )
-        if _mixed_cjk_lat:
+        if mixed_cjk_lat:
             directive += (
                 "\nCODE-MIXING (same utterance): Latin (English, etc.) appears with Chinese characters, "
                 "Japanese kana, and/or Korean Hangul in one sentence. Preserve that mix: do NOT rewrite "
@@ -1420,11 +1644,11 @@ class GrammarChecker:
             "large numbers → locale-appropriate grouping/unit words (e.g. 萬/億, 万/億, 만/억, lakh/crore, millions). "
             "Never invent unstated results or round beyond what was spoken."
         )
-        if language and language not in ("en",) and language_prob > 0.4:
+        if lang_mode == "other":
             lang_name = models_config.ISO_LANGUAGE_MAP.get(language, language)
             # Do not replace the whole directive with "CLEAN <LANG>" when the utterance mixes CJK + Latin —
             # that wording pushes the model to translate English into Chinese (etc.).
-            if sample and _transcript_mixes_cjk_and_latin(sample):
+            if mixed_cjk_lat:
                 directive += (
                     f"\nCODE-MIXING ({lang_name} + Latin/English): The transcript mixes {lang_name} with embedded "
                     "English or other Latin-script words. Preserve that mix: keep Latin segments as spoken "
@@ -1436,26 +1660,21 @@ class GrammarChecker:
             else:
                 directive = f"REFINE TRANSCRIPT: PROVIDE A CLEAN {lang_name.upper()} VERSION. DO NOT TRANSLATE TO ENGLISH."
                 directive += _non_en_numbers_block
-        elif language == "en" and language_prob > 0.4:
+        elif lang_mode == "en":
             directive += (
                 "\nENGLISH SPOKEN NUMBERS & MATH: Same global policy as all languages (CRITICAL RULE 6): "
                 "any numeric meaning → Western Arabic digits (0–9)—cardinal lists ('one, two, three, four' → '1, 2, 3, 4'), "
                 "including space-separated runs like 'one two three'. "
                 "Spoken arithmetic (plus, minus, times, multiplied by, divided by, equals) → +, −, ×, ÷, = with digits per CRITICAL RULE 10 (choose − vs - and ÷ vs / by context)."
             )
-            if _mixed_cjk_lat:
+            if mixed_cjk_lat:
                 directive += (
                     "\nASR tagged English but text mixes CJK: Follow CODE-MIXING above—do NOT translate "
                     "Chinese/Japanese/Korean fragments into English; polish each script in place."
                 )
-        elif (
-            sample
-            and _inf_lang == "en"
-            and _inf_prob >= 0.72
-            and not (language and language != "en" and language_prob > 0.4)
-        ):
+        elif lang_mode == "en_inferred":
             # Qwen ASR etc.: no whisper info.* — inferred English for Latin-heavy text; do not imply "all English".
-            if _mixed_cjk_lat:
+            if mixed_cjk_lat:
                 directive += (
                     "\nMIXED SCRIPT (inferred Latin-primary): Keep all CJK phrases unchanged in meaning; "
                     "Apply CRITICAL RULE 12 (filler removal) to Latin/English parts only. Never translate CJK to English "
@@ -1467,49 +1686,47 @@ class GrammarChecker:
                 )
 
         # Chinese script: user chooses Simplified vs Traditional for all Chinese output (default: Traditional).
-        if sample:
-            _has_zh = (language == "zh" and language_prob > 0.4) or _cjk_is_substantial_for_refiner(sample)
-            if _has_zh:
-                if self.use_simplified_chinese_output:
-                    if _mixed_cjk_lat:
-                        directive += (
-                            "\nUSER PREFERENCE (MANDATORY): Chinese characters MUST use Simplified (简体中文). "
-                            "Latin/English words and phrases stay as in the transcript (code-mixing); do not translate them to Chinese."
-                        )
-                    else:
-                        directive += (
-                            "\nUSER PREFERENCE (MANDATORY): Output MUST be Simplified Chinese (简体中文) only. "
-                            "Convert all Traditional forms to standard Simplified characters "
-                            "(e.g. use 体/这/们/还/点/过/说/电/学/开/门/时/来/个/国/会/长/东/车; do not leave 體/這/們/還/點/過/說/電/學/開/門/時/來/個/國/會/長/東/車 when a Simplified form exists). "
-                            "Apply this regardless of whether the transcript was Traditional or Simplified."
-                        )
+        if has_zh:
+            if simplified:
+                if mixed_cjk_lat:
+                    directive += (
+                        "\nUSER PREFERENCE (MANDATORY): Chinese characters MUST use Simplified (简体中文). "
+                        "Latin/English words and phrases stay as in the transcript (code-mixing); do not translate them to Chinese."
+                    )
                 else:
-                    if _mixed_cjk_lat:
-                        directive += (
-                            "\nUSER PREFERENCE (MANDATORY): Chinese characters MUST use Traditional (繁體中文). "
-                            "Latin/English words and phrases stay as in the transcript (code-mixing); do not translate them to Chinese."
-                        )
-                    else:
-                        directive += (
-                            "\nUSER PREFERENCE (MANDATORY): Output MUST be Traditional Chinese (繁體中文) only. "
-                            "Convert all Simplified forms to standard Traditional characters "
-                            "(e.g. use 體/這/們/還/點/過/說/電/學/開/門/時/來/個/國/會/長/東/車; never 体/这/们/还/点/过/说/电/学/开/门/时/来/个/国/会/长/东/车). "
-                            "Apply this regardless of whether the transcript was Traditional or Simplified."
-                        )
-            if _looks_like_cantonese_oral(sample):
-                directive += (
-                    "\nCANTONESE ORAL (廣東話口語): The transcript reads as spoken Cantonese. "
-                    "Preserve colloquial particles and wording (e.g. 嘅、咗、唔、佢、冇、啲、喺、係、乜、點、咁、咪、喇、囉、咩). "
-                    "Do not rewrite into formal Written Chinese / Mandarin book style (書面語) unless ADDITIONAL USER INSTRUCTIONS explicitly request formal writing. "
-                    "Fix only clear dictation/ASR errors and punctuation; keep the spoken Cantonese voice."
-                )
+                    directive += (
+                        "\nUSER PREFERENCE (MANDATORY): Output MUST be Simplified Chinese (简体中文) only. "
+                        "Convert all Traditional forms to standard Simplified characters "
+                        "(e.g. use 体/这/们/还/点/过/说/电/学/开/门/时/来/个/国/会/长/东/车; do not leave 體/這/們/還/點/過/說/電/學/開/門/時/來/個/國/會/長/東/車 when a Simplified form exists). "
+                        "Apply this regardless of whether the transcript was Traditional or Simplified."
+                    )
+            else:
+                if mixed_cjk_lat:
+                    directive += (
+                        "\nUSER PREFERENCE (MANDATORY): Chinese characters MUST use Traditional (繁體中文). "
+                        "Latin/English words and phrases stay as in the transcript (code-mixing); do not translate them to Chinese."
+                    )
+                else:
+                    directive += (
+                        "\nUSER PREFERENCE (MANDATORY): Output MUST be Traditional Chinese (繁體中文) only. "
+                        "Convert all Simplified forms to standard Traditional characters "
+                        "(e.g. use 體/這/們/還/點/過/說/電/學/開/門/時/來/個/國/會/長/東/車; never 体/这/们/还/点/过/说/电/学/开/门/时/来/个/国/会/长/东/车). "
+                        "Apply this regardless of whether the transcript was Traditional or Simplified."
+                    )
+        if cantonese:
+            directive += (
+                "\nCANTONESE ORAL (廣東話口語): The transcript reads as spoken Cantonese. "
+                "Preserve colloquial particles and wording (e.g. 嘅、咗、唔、佢、冇、啲、喺、係、乜、點、咁、咪、喇、囉、咩). "
+                "Do not rewrite into formal Written Chinese / Mandarin book style (書面語) unless ADDITIONAL USER INSTRUCTIONS explicitly request formal writing. "
+                "Fix only clear dictation/ASR errors and punctuation; keep the spoken Cantonese voice."
+            )
 
         # NEW: Inject direct formatting instruction right to the core directive layer
         directive += "\nCRITICAL FORMATTING: Whenever the user dictates a list, sequence of items, or steps, you MUST format your output as a clear bulleted or numbered list. Add paragraphs where logical."
 
         prompt = f"{directive}\n\n{models_config.CRITICAL_RULES}"
         
-        dict_str = ", ".join(self.custom_dictionary)
+        dict_str = ", ".join(dictionary)
         if dict_str:
             prompt += f"Specific Jargon/Hints: {dict_str}\n"
 
@@ -1524,13 +1741,13 @@ class GrammarChecker:
         # Layer 3: Late-Binding Overrides (Ensures Dropdown Priority)
         # We append these LAST so they win any conflicts in the LLM's attention.
         overrides = ""
-        if self.character != "Custom":
-            lens = models_config.CHARACTER_LENSES.get(self.character, "")
+        if character != "Custom":
+            lens = models_config.CHARACTER_LENSES.get(character, "")
             if lens:
                 overrides += f"\n[STRICT IDENTITY OVERRIDE]: {lens}"
         
-        if self.tone != "Custom":
-            overlay = models_config.TONE_OVERLAYS.get(self.tone, "")
+        if tone != "Custom":
+            overlay = models_config.TONE_OVERLAYS.get(tone, "")
             if overlay:
                 overrides += f"\n[STRICT STYLE OVERRIDE]: {overlay}"
         
@@ -1580,6 +1797,7 @@ class GrammarChecker:
         acc = ""  # Initialize before loop so time guard on first iteration doesn't NameError
         
         for chunk in stream:
+            self._raise_if_cancelled()
             # 1. Time Guard: Stop if generation takes too long (>15s for short bursts)
             if time.time() - start_t > 15.0 and len(acc) > input_len:
                 log_transcription(" Gemma: Time guard triggered (>15s). Aborting.")
@@ -1629,6 +1847,7 @@ class GrammarChecker:
         parts: list[str] = []
         # stream= must not appear in gen_kw — same kw twice raises TypeError on Llama.__call__.
         for out in self.model(prompt, stream=True, **gen_kw):
+            self._raise_if_cancelled()
             chunk = out["choices"][0]["text"]
             parts.append(chunk)
             acc = "".join(parts)
@@ -1662,19 +1881,42 @@ class GrammarChecker:
             seed=42,
         )
 
-        output = self.model(prompt, stream=False, **gen_kw)
-        text = (output["choices"][0]["text"] or "").strip()
+        # Streamed (same sampling, same result) so a superseded request can stop between tokens.
+        parts: list[str] = []
+        for out in self.model(prompt, stream=True, **gen_kw):
+            self._raise_if_cancelled()
+            parts.append(out["choices"][0]["text"] or "")
+        text = "".join(parts).strip()
         return text, False
 
-    def correct(self, text, is_command=False, language=None, language_prob=0.0):
+    def _raise_if_cancelled(self) -> None:
+        if self._cancel_check is not None and self._cancel_check():
+            log_transcription(" Refiner: generation cancelled (superseded request).")
+            raise InferenceCancelled()
+
+    def warmup(self, cancel_check=None, max_tokens: int = 8) -> int:
+        """A few greedy tokens so llama.cpp allocates its compute buffers before the first real request."""
         with self.lock:
+            if not self.model:
+                return 0
+            n = 0
+            for _out in self.model("Fix grammar: hello world, this is a test.", max_tokens=max_tokens,
+                                   stream=True, temperature=0.0, echo=False):
+                n += 1
+                if cancel_check is not None and cancel_check():
+                    break
+            return n
+
+    def correct(self, text, is_command=False, language=None, language_prob=0.0, cancel_check=None):
+        with self.lock:
+            self._cancel_check = cancel_check
             # 1. Pre-processing Guardrail: Skip LLM for very short or empty inputs
             # (Unless it's a known keyword in the custom dictionary)
             clean_text = text.strip()
             if not self.model or not clean_text:
                 return _finalize_refiner_text(text, self.use_simplified_chinese_output)
                 
-            if len(clean_text) < 8 and clean_text.lower() not in [d.lower() for d in self.custom_dictionary]:
+            if len(clean_text) < 8 and clean_text.lower() not in privox_dictionary.compiled(self.custom_dictionary).lower_terms:
                 log_transcription(f" [Short Input Skip] Input too short ({len(clean_text)} chars). Mirroring.")
                 return _finalize_refiner_text(text, self.use_simplified_chinese_output)
     
@@ -1711,8 +1953,17 @@ class GrammarChecker:
                         persona_mission=core_directive,
                         tone=self.tone
                     )
+                    prefix_id = privox_prompts.prefix_hash(prompt_type, system_prompt)
+                    if prefix_id != self.prompt_prefix_hash:
+                        log_transcription(
+                            f" Refiner prompt prefix {prefix_id} (new; {self.prompts.describe()})"
+                        )
+                        self.prompt_prefix_hash = prefix_id
+                    # Per-transcript dictionary hints (long lists) stay out of the cached system prompt.
+                    hints = privox_dictionary.compiled(self.custom_dictionary).transcript_hints(clean_text)
+                    hints_line = f"Specific Jargon/Hints: {', '.join(hints)}\n" if hints else ""
                     user_content = (
-                        f"[Transcript]: {text}\n"
+                        f"{hints_line}[Transcript]: {text}\n"
                         "Do not repeat instructions or examples. Write only the opening tag <refined>, the refined transcript, and </refined>.\n"
                         "Output: "
                     )
@@ -1813,11 +2064,9 @@ class GrammarChecker:
                     result = match.group(1).strip()
                     result = re.sub(r"<\s*/?\s*refined\s*>", "", result, flags=re.IGNORECASE).strip()
                     if result:
-                        pv_n = min(320, len(result))
-                        pv_tail = "..." if len(result) > pv_n else ""
                         log_transcription(
-                            f" <refined> inner preview ({len(result)} chars; paste also runs digit/zh finalize): "
-                            f"'{result[:pv_n]}{pv_tail}'"
+                            " <refined> inner preview (%d chars; paste also runs digit/zh finalize): '%s'",
+                            len(result), privox_logging.Preview(result, 320),
                         )
                 else:
                     log_transcription(" Warning: Model failed to use <refined> tags.")
@@ -1854,13 +2103,17 @@ class GrammarChecker:
                     else:
                         result = stripped
     
-                # 3a. Strip trailing meta-commentary ("Note:", "I've preserved...", etc.)
-                result = self._strip_meta_commentary(result)
-    
-                # 3b. Post-generation Hallucination Validator
-                result = self._validate_output(clean_text, result)
-    
-                return _finalize_refiner_text(result, self.use_simplified_chinese_output)
+                # 3. Strip trailing meta-commentary ("Note:", "I've preserved...", etc.), run the
+                # hallucination validator, then finalize (fillers, digit lists, Chinese script).
+                result = self.postprocess.run(
+                    result, original=clean_text, use_simplified_zh=self.use_simplified_chinese_output
+                )
+                log_transcription(
+                    f" [Post-process] {privox_postprocess.Pipeline.format_timings(self.postprocess.last_timings)}"
+                )
+                return result
+            except InferenceCancelled:
+                raise
             except Exception as e:
                 log_print(f"Grammar Check Error: {e}")
                 return _finalize_refiner_text(text, self.use_simplified_chinese_output)
@@ -1882,16 +2135,19 @@ class GrammarChecker:
         "\nexplanation:",
     ]
 
-    def _strip_meta_commentary(self, text):
-        """Remove trailing LLM self-commentary that leaks inside <refined> tags."""
+    def _strip_meta_commentary(self, text, hits=None):
+        """Remove trailing LLM self-commentary that leaks inside <refined> tags.
+
+        hits: _GUARD_PATTERNS.scan() of text.lower(), when the caller already has it.
+        """
         if not text:
             return text
 
-        text_lower = text.lower()
+        if hits is None:
+            hits = self._GUARD_PATTERNS.scan(text.lower())
         earliest_cut = len(text)
 
-        for pattern in self._META_COMMENTARY_PATTERNS:
-            idx = text_lower.find(pattern)
+        for idx in hits.first_starts("meta").values():
             if idx > 0 and idx < earliest_cut:
                 earliest_cut = idx
 
@@ -1907,6 +2163,9 @@ class GrammarChecker:
         s = (s or "").strip()
         if not s:
             return s
+        # Every block removed below starts with one of the "rules_echo" headers.
+        if not self._GUARD_PATTERNS.scan(s.lower()).any("rules_echo"):
+            return s
         lines = s.split("\n")
         out: list[str] = []
         i, n = 0, len(lines)
@@ -1957,25 +2216,33 @@ class GrammarChecker:
                 return "\n".join(s_lines[ri:]).strip()
         return s
 
+    _PROMPT_ECHO_MARKERS = (
+        "[core directive]",
+        "[transcript]",
+        "must wrap your final",
+        "do not output anything outside",
+        "<example_",
+        "### system overrides",
+        "### additional user instructions",
+        "you are a precise text-processing api",
+        "output only the processed text",
+        "critical rules:",
+        "conservative refinement:",
+        "fluent refinement:",
+    )
+
+    # Line headers _strip_critical_rules_echo removes.
+    _RULES_ECHO_HEADERS = (
+        "[core directive]",
+        "### system overrides",
+        "### additional user instructions",
+        "critical rules",
+    )
+
     def _looks_like_prompt_echo(self, s: str) -> bool:
         if not s:
             return True
-        sl = s.lower()
-        markers = (
-            "[core directive]",
-            "[transcript]",
-            "must wrap your final",
-            "do not output anything outside",
-            "<example_",
-            "### system overrides",
-            "### additional user instructions",
-            "you are a precise text-processing api",
-            "output only the processed text",
-            "critical rules:",
-            "conservative refinement:",
-            "fluent refinement:",
-        )
-        return any(m in sl for m in markers)
+        return self._GUARD_PATTERNS.scan(s.lower()).any("echo")
 
     # Gemma chat templates may emit turn delimiters inside or instead of <refined>…</refined> body.
     _GEMMA_TURN_MARKUP_RE = re.compile(
@@ -2122,8 +2389,20 @@ class GrammarChecker:
         "absolutely,", "absolutely!", "no problem",
     ]
 
-    def _validate_output(self, original, refined):
-        """Post-generation hallucination check. Returns original if output looks fabricated."""
+    # Every guard phrase list above in one automaton: one pass over the output answers them all.
+    _GUARD_PATTERNS = privox_patterns.MultiPattern({
+        "meta": _META_COMMENTARY_PATTERNS,
+        "echo": _PROMPT_ECHO_MARKERS,
+        "rules_echo": _RULES_ECHO_HEADERS,
+        "fingerprint": _PROMPT_FINGERPRINTS,
+        "prefix": _ASSISTANT_PREFIXES,
+    })
+
+    def _validate_output(self, original, refined, hits=None):
+        """Post-generation hallucination check. Returns original if output looks fabricated.
+
+        hits: _GUARD_PATTERNS.scan() of refined.lower(), when the caller already has it.
+        """
         if not refined:
             return original
 
@@ -2136,17 +2415,20 @@ class GrammarChecker:
             return original
 
         # Check 2: Prompt-echo detection (output contains system prompt fragments)
-        refined_lower = refined.lower()
-        for fp in self._PROMPT_FINGERPRINTS:
-            if fp in refined_lower:
-                log_transcription(f" [Hallucination Guard] Prompt echo detected: '{fp}'. Returning original.")
-                return original
+        if hits is None:
+            hits = self._GUARD_PATTERNS.scan(refined.lower())
+        fp = hits.first_pattern("fingerprint")
+        if fp is not None:
+            fp = self._GUARD_PATTERNS.pattern("fingerprint", fp)
+            log_transcription(f" [Hallucination Guard] Prompt echo detected: '{fp}'. Returning original.")
+            return original
 
         # Check 3: Assistant-behavior detection (output starts with chatbot preambles)
-        for prefix in self._ASSISTANT_PREFIXES:
-            if refined_lower.startswith(prefix):
-                log_transcription(f" [Hallucination Guard] Assistant preamble detected: '{prefix}'. Returning original.")
-                return original
+        prefix = hits.first_pattern("prefix", at=0)
+        if prefix is not None:
+            prefix = self._GUARD_PATTERNS.pattern("prefix", prefix)
+            log_transcription(f" [Hallucination Guard] Assistant preamble detected: '{prefix}'. Returning original.")
+            return original
 
         # Check 4: Character-level repetition guard (e.g., "GGGGGGGG")
         # Matches any non-whitespace character repeated 4 or more times
@@ -2223,11 +2505,15 @@ class _WorkerClient:
     Killing the process (stop) returns ALL VRAM (incl. CUDA context) to the OS.
     """
 
-    def __init__(self):
+    def __init__(self, env_overrides: dict | None = None, label: str = "worker"):
         self.proc = None
         self.sock = None
         self.port = None
-        self._io_lock = threading.Lock()
+        self.transport = None
+        self.env_overrides = dict(env_overrides or {})
+        self.label = label
+        self._io_lock = threading.Lock()  # one request/response exchange at a time
+        self._send_lock = threading.Lock()  # frame writes (request + fire-and-forget notify)
 
     def is_alive(self) -> bool:
         return (
@@ -2236,56 +2522,136 @@ class _WorkerClient:
             and self.sock is not None
         )
 
-    def start(self, connect_timeout: float = 25.0) -> bool:
-        import socket as _socket
-
-        # Reserve a free localhost port, release it, then let the worker bind it.
-        probe = _socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)
-        probe.bind(("127.0.0.1", 0))
-        port = probe.getsockname()[1]
-        probe.close()
-
+    def _spawn(self, link_args: list, pass_fds: tuple = ()) -> bool:
         worker_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "privox_worker.py")
         creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
         try:
             self.proc = subprocess.Popen(
-                [sys.executable, worker_path, "--port", str(port)],
-                env=os.environ.copy(),
+                [sys.executable, worker_path, *link_args],
+                env={**os.environ, **self.env_overrides},
                 creationflags=creationflags,
+                pass_fds=pass_fds,
             )
         except Exception as e:
             log_print(f"WorkerClient: failed to spawn worker: {e}")
             self.proc = None
             return False
-        self.port = port
+        return True
 
-        deadline = time.time() + connect_timeout
-        while time.time() < deadline:
-            if self.proc.poll() is not None:
-                log_print("WorkerClient: worker process exited before accepting a connection.")
-                self.proc = None
-                return False
-            try:
-                c = _socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)
-                c.settimeout(2.0)
-                c.connect(("127.0.0.1", port))
-                c.settimeout(None)
-                self.sock = c
-                log_print(f"WorkerClient: connected to worker on port {port}.")
-                return True
-            except OSError:
+    def _start_unix(self) -> bool:
+        # Connected socketpair; the child end is inherited by fd, so there is no port to race
+        # for and no connect loop -- the link is usable the moment Popen returns.
+        parent, child = privox_ipc.child_socketpair()
+        try:
+            ok = self._spawn(["--fd", str(child.fileno())], pass_fds=(child.fileno(),))
+        finally:
+            child.close()
+        if not ok:
+            parent.close()
+            return False
+        self.sock = parent
+        log_print("WorkerClient: connected to worker via unix socketpair.")
+        return True
+
+    def _start_forked(self) -> bool:
+        # Zygote mode (Linux): the pre-imported fork server forks the worker, so a WARM-FRESH
+        # respawn skips the ~3-4 s of re-imports. Same socketpair link as _start_unix.
+        server = privox_zygote.get_fork_server()
+        if server is None:
+            return False
+        parent, child = privox_ipc.child_socketpair()
+        try:
+            proc = server.fork_worker(child.fileno(), env=self.env_overrides)
+        finally:
+            child.close()
+        if proc is None:
+            parent.close()
+            return False
+        self.proc = proc
+        self.sock = parent
+        log_print(f"WorkerClient: forked worker pid {proc.pid} from zygote.")
+        return True
+
+    def _start_pipe(self, connect_timeout: float) -> bool:
+        address = privox_ipc.new_pipe_address()
+        try:
+            listener = privox_ipc.open_pipe_listener(address)
+        except Exception as e:
+            log_print(f"WorkerClient: could not create named pipe: {e}")
+            return False
+        try:
+            if not self._spawn(["--pipe", address]):
+                return False
+            conn = privox_ipc.accept_pipe(listener, connect_timeout)
+            if conn is None:
+                log_print("WorkerClient: timed out waiting for worker on named pipe.")
+                self.stop()
+                return False
+            self.sock = conn
+            log_print("WorkerClient: connected to worker via named pipe.")
+            return True
+        finally:
+            try:
+                listener.close()
+            except Exception:
+                pass
+
+    def _start_tcp(self, connect_timeout: float) -> bool:
+        import socket as _socket
+
+        # Reserve a free localhost port, release it, then let the worker bind it.
+        probe = _socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+
+        if not self._spawn(["--port", str(port)]):
+            return False
+        self.port = port
+
+        deadline = time.time() + connect_timeout
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                log_print("WorkerClient: worker process exited before accepting a connection.")
+                self.proc = None
+                return False
+            try:
+                c = _socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)
+                c.settimeout(2.0)
+                c.connect(("127.0.0.1", port))
+                c.settimeout(None)
+                self.sock = c
+                log_print(f"WorkerClient: connected to worker on port {port}.")
+                return True
+            except OSError:
                 time.sleep(0.1)
         log_print("WorkerClient: timed out connecting to worker.")
         self.stop()
         return False
 
+    def start(self, connect_timeout: float = 25.0) -> bool:
+        self.transport = privox_ipc.preferred_transport()
+        if self.transport == "unix":
+            ok = (privox_zygote.zygote_enabled() and self._start_forked()) or self._start_unix()
+        elif self.transport == "pipe":
+            ok = self._start_pipe(connect_timeout)
+        else:
+            ok = self._start_tcp(connect_timeout)
+        if ok or self.transport == "tcp":
+            return ok
+        log_print(f"WorkerClient: {self.transport} transport failed; falling back to TCP loopback.")
+        self.stop()
+        self.transport = "tcp"
+        return self._start_tcp(connect_timeout)
+
     def request(self, header: dict, blob: bytes = b"", timeout: float | None = None):
         with self._io_lock:
             if self.sock is None:
                 return None
             try:
                 self.sock.settimeout(timeout)
-                privox_ipc.send_message(self.sock, header, blob)
+                with self._send_lock:
+                    privox_ipc.send_message(self.sock, header, blob)
                 resp = privox_ipc.recv_message(self.sock)
                 self.sock.settimeout(None)
                 if resp is None:
@@ -2295,6 +2661,19 @@ class _WorkerClient:
                 log_print(f"WorkerClient: request failed: {e}")
                 return None
 
+    def notify(self, header: dict) -> bool:
+        """Send a message that has no reply (e.g. "cancel") without waiting on a pending request."""
+        sock = self.sock
+        if sock is None:
+            return False
+        try:
+            with self._send_lock:
+                privox_ipc.send_message(sock, header)
+            return True
+        except (OSError, ConnectionError) as e:
+            log_print(f"WorkerClient: notify failed: {e}")
+            return False
+
     def ping(self, timeout: float = 5.0) -> dict:
         return self.request({"cmd": "ping"}, timeout=timeout) or {}
 
@@ -2302,7 +2681,8 @@ class _WorkerClient:
         with self._io_lock:
             if self.sock is not None:
                 try:
-                    privox_ipc.send_message(self.sock, {"cmd": "shutdown"})
+                    with self._send_lock:
+                        privox_ipc.send_message(self.sock, {"cmd": "shutdown"})
                 except Exception:
                     pass
                 try:
@@ -2321,14 +2701,224 @@ class _WorkerClient:
                 self.proc = None
 
 
+def _refiner_model_key(profile) -> tuple:
+    """Refiner profile fields the loader reads: equal keys mean the loaded model can stay."""
+    profile = profile or {}
+    return tuple(profile.get(k) for k in ("repo_id", "file_name", "prompt_type", "turboquant", "n_ctx", "n_gpu_layers"))
+
+
+def _parse_worker_pool_slots(config_pool=None) -> list:
+    """Worker-pool slot specs; fewer than two slots means the classic single-worker mode.
+
+    PRIVOX_WORKER_POOL=N starts N identical workers. Otherwise config.json "worker_pool" may list
+    slot objects, e.g. [{"device": "cuda:0"}, {"device": "cuda:1"}, {"device": "cpu", "cpus": "0-7",
+    "env": {"PRIVOX_NO_TORCH": "1"}}]. "device" pins via CUDA_VISIBLE_DEVICES ("cpu" hides all GPUs),
+    "cpus" sets the worker's CPU affinity (Linux), "env" pins backend toggles per worker.
+    """
+    raw = (os.environ.get("PRIVOX_WORKER_POOL") or "").strip()
+    if raw:
+        try:
+            n = int(raw)
+        except ValueError:
+            log_print(f"Ignoring PRIVOX_WORKER_POOL={raw!r} (expected an integer).")
+            n = 0
+        return [{} for _ in range(n)] if n >= 2 else []
+    if not isinstance(config_pool, list):
+        return []
+    slots = [dict(x) for x in config_pool if isinstance(x, dict)]
+    return slots if len(slots) >= 2 else []
+
+
+def _worker_slot_env(slot: dict) -> dict:
+    env = {str(k): str(v) for k, v in (slot.get("env") or {}).items()}
+    device = str(slot.get("device") or "auto").strip().lower()
+    if device == "cpu":
+        env["CUDA_VISIBLE_DEVICES"] = ""
+    elif device.startswith("cuda:"):
+        env["CUDA_VISIBLE_DEVICES"] = device.split(":", 1)[1]
+    cpus = str(slot.get("cpus") or "").strip()
+    if cpus:
+        env["PRIVOX_WORKER_CPUS"] = cpus
+    return env
+
+
+class _PoolMember:
+    def __init__(self, index: int, slot: dict, extra_env: dict | None = None):
+        self.index = index
+        self.slot = slot
+        env = {**_worker_slot_env(slot), **(extra_env or {})}
+        self.client = _WorkerClient(env, label=f"worker[{index}]")
+        self.inflight = 0
+        self.tasks = set()  # task_ids of the requests in flight on this worker
+        self.ready = False
+        self.respawns = 0
+
+
+class _WorkerPool:
+    """N inference workers behind the _WorkerClient interface (start/request/notify/ping/stop).
+
+    "transcribe" goes to one worker: model-resident before cold, then fewest in-flight requests.
+    Recordings run side by side (one per worker) and paste in recording order; a new recording
+    does not cancel the ones already dispatched. Control commands ("load", "reload_config") are
+    broadcast; "cancel" goes only to the workers running a task it supersedes. A worker that dies
+    or drops a request is respawned WARM-FRESH in the background, and the request is retried once
+    elsewhere.
+    """
+
+    def __init__(self, slots: list, extra_env: dict | None = None):
+        self.members = [_PoolMember(i, slot, extra_env) for i, slot in enumerate(slots)]
+        self._lock = threading.Lock()
+        self._warn_shared_gpus(slots)
+
+    @staticmethod
+    def _warn_shared_gpus(slots: list) -> None:
+        """Every worker loads a full ASR + refiner: unpinned slots stack those copies on one GPU."""
+        per_device = {}
+        for slot in slots:
+            device = str(slot.get("device") or "auto").strip().lower()
+            if device != "cpu":
+                per_device[device] = per_device.get(device, 0) + 1
+        for device, n in per_device.items():
+            if n < 2:
+                continue
+            where = "the default GPU" if device == "auto" else device
+            log_print(
+                f"WorkerPool: {n} workers share {where} and each loads its own ASR + refiner there "
+                f"({n} copies in VRAM). Pin a \"device\" per slot in config.json \"worker_pool\" "
+                "unless that GPU holds them all."
+            )
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    def is_alive(self) -> bool:
+        return any(m.client.is_alive() for m in self.members)
+
+    def start(self, connect_timeout: float = 25.0) -> bool:
+        started = 0
+        for m in self.members:
+            if m.client.is_alive() or m.client.start(connect_timeout):
+                started += 1
+        log_print(f"WorkerPool: {started}/{self.size} workers started.")
+        return started > 0
+
+    def _pick(self, exclude=(), task_id=None):
+        with self._lock:
+            alive = [m for m in self.members if m not in exclude and m.client.is_alive()]
+            if not alive:
+                return None
+            m = min(alive, key=lambda x: (not x.ready, x.inflight, x.index))
+            m.inflight += 1
+            if task_id is not None:
+                m.tasks.add(task_id)
+            return m
+
+    def _respawn_member(self, m: _PoolMember) -> None:
+        def _run():
+            try:
+                m.client.stop()
+            except Exception:
+                pass
+            m.ready = False
+            m.respawns += 1
+            if m.client.start():
+                log_print(f"WorkerPool: {m.client.label} respawned (#{m.respawns}).")
+            else:
+                log_print(f"WorkerPool: {m.client.label} respawn failed.")
+
+        threading.Thread(target=_run, daemon=True, name=f"privox-pool-respawn-{m.index}").start()
+
+    def _dispatch_one(self, header: dict, blob: bytes, timeout):
+        tried = []
+        task_id = header.get("task_id")
+        for _attempt in range(2):
+            m = self._pick(exclude=tried, task_id=task_id)
+            if m is None:
+                return None
+            tried.append(m)
+            try:
+                resp = m.client.request(header, blob, timeout=timeout)
+            finally:
+                with self._lock:
+                    m.inflight -= 1
+                    m.tasks.discard(task_id)
+            if resp is not None:
+                return resp
+            log_print(f"WorkerPool: {m.client.label} dropped a transcribe request; respawning.")
+            self._respawn_member(m)
+        return None
+
+    def request(self, header: dict, blob: bytes = b"", timeout: float | None = None):
+        if header.get("cmd") in ("transcribe", "asr", "refine"):
+            return self._dispatch_one(header, blob, timeout)
+        replies = []
+        for m in self.members:
+            if not m.client.is_alive():
+                continue
+            r = m.client.request(header, blob, timeout=timeout)
+            if r is not None:
+                replies.append(r)
+        if not replies:
+            return None
+        merged = dict(replies[0])
+        merged["ok"] = all(r.get("ok", True) for r in replies)
+        merged["ready"] = any(r.get("ready") for r in replies)
+        merged["asr_reload"] = any(r.get("asr_reload") for r in replies)
+        merged["host_resident"] = any(r.get("host_resident") for r in replies)
+        return merged
+
+    def notify(self, header: dict) -> bool:
+        targets = [m for m in self.members if m.client.is_alive()]
+        task_id = header.get("task_id")
+        if header.get("cmd") == "cancel" and isinstance(task_id, int):
+            with self._lock:
+                targets = [m for m in targets if any(isinstance(t, int) and t <= task_id for t in m.tasks)]
+        return any([m.client.notify(header) for m in targets])
+
+    def ping(self, timeout: float = 5.0) -> dict:
+        ready = False
+        warm = True
+        errors = []
+        for m in self.members:
+            if not m.client.is_alive():
+                if m.client.proc is not None or m.ready:
+                    log_print(f"WorkerPool: {m.client.label} is not alive; respawning.")
+                    self._respawn_member(m)
+                m.ready = False
+                continue
+            pong = m.client.ping(timeout=timeout)
+            m.ready = bool(pong.get("ready"))
+            ready = ready or m.ready
+            warm = warm and (not m.ready or bool(pong.get("warm")))
+            if pong.get("error"):
+                errors.append(f"{m.client.label}: {pong['error']}")
+        return {
+            "cmd": "pong",
+            "ready": ready,
+            "warm": ready and warm,
+            "error": "; ".join(errors),
+            "workers": [{"index": m.index, "ready": m.ready, "inflight": m.inflight} for m in self.members],
+        }
+
+    def stop(self):
+        for m in self.members:
+            try:
+                m.client.stop()
+            except Exception as e:
+                log_print(f"WorkerPool: {m.client.label} stop error: {e}")
+            m.ready = False
+
+
 class VoiceInputApp:
     def __init__(self):
         log_print("Initializing Voice Input Application...")
         
-        self.keyboard_controller = keyboard.Controller()
+        # Engine mode has no pynput (see the core imports); it never types or listens.
+        self.keyboard_controller = keyboard.Controller() if keyboard is not None else None
         
         # Load Config
-        self.hotkey = keyboard.Key.f8 # Default
+        self.hotkey = keyboard.Key.f8 if keyboard is not None else None # Default
         self.sound_enabled = True
         self.auto_stop_enabled = True
         self.silence_timeout_ms = 10000
@@ -2359,7 +2949,16 @@ class VoiceInputApp:
         self.loading_status = "Initializing..."
         self.ui_state = "LOADING"
         self._transcribe_task_id = 0
+        # Worker side: highest superseded task_id ("cancel" cmd). Main side: tasks awaiting a worker
+        # (more than one in worker-pool mode).
+        self._cancelled_task_upto = -1
+        self._worker_inflight_task_ids = set()
+        # Split engine (PRIVOX_SPLIT_WORKERS): the refiner worker, separate from self._worker (ASR).
+        self._refiner_worker = None
+        self._refiner_worker_ready = False
+        self._refiner_worker_lock = threading.Lock()
         self._transcribe_in_progress = False
+        self._transcribe_active = 0
         self._transcribe_state_lock = threading.Lock()
         self._pending_transcribe = None
         
@@ -2384,17 +2983,27 @@ class VoiceInputApp:
         self.heavy_models_loaded = False
         self._asr_loaded_key = None  # (ASR_BACKEND, WHISPER_SIZE) after successful ASR load
         self._asr_held_key = None   # (ASR_BACKEND, WHISPER_SIZE) representing model currently resident in RAM
+        # device / host (pinned RAM, VRAM freed) / evicted; with worker isolation this mirrors the worker.
+        self.asr_residency = privox_residency.Residency("asr")
+        self.warmup = privox_warmup.EngineWarmup(log=log_print)
+        # Learns when dictations happen and loads the engine shortly before (privox_prewarm).
+        self.prewarm = privox_prewarm.PrewarmPredictor(os.path.join(BASE_DIR, ".prewarm_history.json"))
+        self._listen_started_at = None
         self.model_lock = threading.RLock()
-        self._usage_write_lock = threading.Lock()  # serialize .user_prefs.json writes (parallel model load)
         self._paste_clipboard_lock = threading.Lock()
         self._paste_anchor_lock = threading.Lock()
         self._paste_anchor_timer = None  # threading.Timer for deferred HWND capture
         self._paste_anchor_hwnd = None
+        # Worker-pool mode: end-of-recording HWND per task (recordings overlap), and the tasks
+        # that have started transcribing but not delivered yet (pastes go in recording order).
+        self._paste_anchors = {}
+        self._undelivered_tasks = set()
+        self._delivery_cond = threading.Condition()
         self.vram_timeout = 60 # Seconds before unloading
-        # Two-tier idle (worker isolation): at vram_timeout we kill the LOADED worker (frees ALL
-        # VRAM incl. CUDA context) and immediately respawn a WARM-FRESH one (~0 VRAM) so the next
-        # wake skips spawn+import. Tier 2 (optional) kills the warm worker after extended idle;
-        # we respawn warm again right after so wake stays fast (brief RAM dip only).
+        # Idle release (worker isolation): at vram_timeout the LOADED worker frees its VRAM (offload or
+        # kill + WARM-FRESH respawn) so the next wake skips spawn+import. worker_kill_timeout (optional)
+        # is the fallback timer for stopping the warm worker too; privox_idle_policy may move both
+        # thresholds once it has seen enough dictation gaps.
         try:
             _wkt = os.environ.get("PRIVOX_WORKER_KILL_TIMEOUT", "0").strip()
             self.worker_kill_timeout = max(0, int(_wkt)) if _wkt else 0
@@ -2426,12 +3035,20 @@ class VoiceInputApp:
         self.settings_process = None
         self.last_toggle_time = 0 # Hotkey de-bounce timer
         self._hotkey_primary_down = False  # True while primary key held; blocks OS key-repeat (phantom stop→start)
-        self.last_config_reload_time = 0 # Cooldown for config polling
-        self._last_prefs_hash = None # Hash-based change detection
-        self._last_prefs_poll_mono = 0.0  # throttle prefs hot-reload (mic still fills queue when not listening)
+        self.last_config_reload_time = 0
         self._last_listener_watchdog_time = 0.0 # watchdog for keyboard listener
         self._hf_repo_verify_cache = {}  # repo_id -> (monotonic_ts, ok: bool); avoids HF spam on reload
 
+        # Settings files are watched off the audio loop and parsed once per change (privox_config);
+        # the watcher thread starts in run(), so the inference worker only reads them on request.
+        self.config_service = privox_config.ConfigService(
+            BASE_DIR, log=log_print, defer=lambda: getattr(self, "_heavy_model_load_in_progress", False)
+        )
+        self.config_service.subscribe(self._on_config_changed)
+        self.prefs_writer = privox_config.PrefsWriter(
+            self.config_service, log=log_print, normalize=models_config.scrub_obsolete_user_pref_keys
+        )
+
         # Load Config (FINAL STEP of init to prevent overwriting by defaults)
         self.load_config()
         
@@ -2585,7 +3202,7 @@ class VoiceInputApp:
         return int(min(3500, max(550, st // 5)))
 
     def load_vad(self):
-        if NO_TORCH:
+        if _use_webrtc_vad():
             log_print("Loading WebRTC VAD (no PyTorch)...", end="", flush=True)
             try:
                 from webrtc_vad_adapter import WebRtcVadAdapter
@@ -2619,6 +3236,7 @@ class VoiceInputApp:
         # 1. Load VAD Model (Silero)
         log_print("Loading Silero VAD...", end="", flush=True)
         try:
+            _require_torch()
             _ensure_packaging_for_silero()
             # Force Torch Hub to use the local models folder for VAD
             hub_dir = os.path.join(BASE_DIR, "models", "hub")
@@ -2734,6 +3352,7 @@ class VoiceInputApp:
 
     def _unload_asr_model_only(self):
         """Drop the resident ASR weights without unloading the refiner."""
+        self.warmup.reset()
         if self.asr_model is None:
             self._asr_held_key = None
             return
@@ -2759,6 +3378,7 @@ class VoiceInputApp:
         self.asr_model = None
         self._asr_held_key = None
         self._asr_loaded_key = None
+        self.asr_residency.set(privox_residency.EVICTED)
         import gc
         gc.collect()
         if torch is not None:
@@ -2790,6 +3410,9 @@ class VoiceInputApp:
                 self._reload_asr_if_preset_changed()
 
             self._heavy_model_load_in_progress = True
+            privox_loadtrace.tracer().begin_wake(
+                "engine" if ENGINE_MODE else "in-process", asr=f"{ASR_BACKEND}:{WHISPER_SIZE}"
+            )
             try:
                 log_print("Loading Heavy Models (Wake up)...")
                 if not ENGINE_MODE:
@@ -2858,7 +3481,8 @@ class VoiceInputApp:
                     try:
                         self.model_load_stage = "loading_grammar"
                         t0 = time.time()
-                        success = self.grammar_checker.load_model()
+                        with privox_loadtrace.span("refiner"):
+                            success = self.grammar_checker.load_model()
                         dt = time.time() - t0
                         log_print(f"Grammar load time: {dt:.2f}s (success={success})")
                         if success:
@@ -2875,11 +3499,14 @@ class VoiceInputApp:
                     try:
                         self.model_load_stage = "loading_asr"
                         t0 = time.time()
-                        if NO_TORCH and ASR_BACKEND in ("qwen_asr", "sensevoice"):
+                        if NO_TORCH and _asr_backend_needs_torch():
                             raise RuntimeError(
                                 f"ASR backend '{ASR_BACKEND}' requires PyTorch. "
                                 "Unset PRIVOX_NO_TORCH or switch ASR to faster-whisper in Settings."
                             )
+                        if _asr_backend_needs_torch():
+                            with privox_loadtrace.span("asr.import_torch"):
+                                _require_torch()
                         is_gpu = cuda_is_available()
                         device_str = "cuda" if is_gpu else "cpu"
 
@@ -2911,6 +3538,7 @@ class VoiceInputApp:
                                 pass
                             self.asr_model = None
                             self._asr_held_key = None
+                            self.asr_residency.set(privox_residency.EVICTED)
                             import gc
                             gc.collect()
                             if is_gpu and torch is not None:
@@ -2919,6 +3547,22 @@ class VoiceInputApp:
                                 except:
                                     pass
 
+                        # Host-resident from the last idle: wake is a host->device copy, not a disk load.
+                        if (
+                            self.asr_model is not None
+                            and self.asr_residency.state == privox_residency.HOST
+                            and self._asr_held_key == current_key
+                        ):
+                            with privox_loadtrace.span("asr.device_transfer", source="host"):
+                                dt = privox_residency.upload_to_device(self.asr_model, torch) if is_gpu else 0.0
+                            if dt is not None:
+                                self.asr_residency.set(privox_residency.DEVICE, dt)
+                                self._asr_loaded_key = current_key
+                                log_print(f"ASR re-uploaded from host RAM in {dt:.2f}s ({self.asr_residency.describe()})")
+                                return True
+                            log_print("ASR re-upload from host RAM failed; reloading from disk.")
+                            self._unload_asr_model_only()
+
                         if ASR_BACKEND == "sensevoice":
                             if self.asr_model is not None and getattr(self, "_asr_held_key", None) == (ASR_BACKEND, WHISPER_SIZE):
                                 log_print("Reusing SenseVoice model from RAM...")
@@ -2933,7 +3577,8 @@ class VoiceInputApp:
                                 sense_dir = os.path.join(BASE_DIR, "models", "SenseVoiceSmall")
                                 log_print(f"ASR Diagnostic - Initializing SenseVoiceSmall on {device_str}...")
                                 try:
-                                    from funasr import AutoModel
+                                    with privox_loadtrace.span("asr.import"):
+                                        from funasr import AutoModel
                                 except ImportError as e:
                                     log_print(
                                         "SenseVoice requires the `funasr` package (not bundled by default). "
@@ -2942,11 +3587,12 @@ class VoiceInputApp:
                                     raise RuntimeError(
                                         "ASR backend 'sensevoice' needs funasr. Add it to your env or switch ASR in Settings."
                                     ) from e
-                                self.asr_model = AutoModel(
-                                    model=sense_dir if os.path.exists(sense_dir) else "iic/SenseVoiceSmall",
-                                    device=device_str,
-                                    disable_update=True
-                                )
+                                with privox_loadtrace.span("asr.weights"):
+                                    self.asr_model = AutoModel(
+                                        model=sense_dir if os.path.exists(sense_dir) else "iic/SenseVoiceSmall",
+                                        device=device_str,
+                                        disable_update=True
+                                    )
                                 log_print(f"SenseVoice initialized successfully.")
 
                         elif ASR_BACKEND == "qwen_asr":
@@ -2958,11 +3604,13 @@ class VoiceInputApp:
                                     log_print(f"Qwen3ASRModel transferred to GPU in {time.time() - t_offload:.2f}s.")
                             else:
                                 log_print(f"ASR Diagnostic - Initializing Qwen3ASRModel ({WHISPER_REPO}) on {device_str}...")
-                                from qwen_asr import Qwen3ASRModel
+                                with privox_loadtrace.span("asr.import"):
+                                    from qwen_asr import Qwen3ASRModel
 
                                 if is_gpu:
                                     cap_env = (os.environ.get("PRIVOX_ASR_MAX_GPU_GIB") or "").strip()
                                     cap_gib = None
+                                    asr_plan = None
                                     if cap_env:
                                         try:
                                             cap_gib = float(cap_env)
@@ -2973,7 +3621,11 @@ class VoiceInputApp:
                                             total_gib = torch.cuda.get_device_properties(0).total_memory / (1024 ** 3)
                                         except Exception:
                                             total_gib = 12.0
-                                        if total_gib <= 8.5:
+                                        asr_plan = _plan_device_memory(total_gib) if _asr_checkpoint_bytes() else None
+                                        if asr_plan is not None:
+                                            # Sized from the checkpoint on disk (+ measured correction), not a VRAM fraction.
+                                            cap_gib = min(total_gib - 0.5, asr_plan["asr_max_gpu_gib"])
+                                        elif total_gib <= 8.5:
                                             cap_gib = max(2.25, total_gib * 0.38)
                                         elif total_gib <= 13.0:
                                             cap_gib = max(3.0, total_gib * 0.42)
@@ -3002,6 +3654,7 @@ class VoiceInputApp:
                                     local_files_only=True if os.path.isdir(local_qwen) else False,
                                 )
                                 _used_device_map = False
+                                _weights_span = privox_loadtrace.tracer().begin("asr.weights", path=model_path)
                                 if is_gpu and max_mem is not None:
                                     # Pass device_map + max_memory so transformers distributes layers
                                     # respecting the VRAM cap instead of loading all to CPU then OOM-ing
@@ -3026,9 +3679,31 @@ class VoiceInputApp:
                                         model_path,
                                         **_from_pretrained_kwargs,
                                     )
+                                    privox_loadtrace.tracer().end(_weights_span, device_map=False)
+                                    _weights_span = None
                                     if is_gpu:
-                                        self.asr_model.model.to("cuda")
+                                        with privox_loadtrace.span("asr.device_transfer"):
+                                            self.asr_model.model.to("cuda")
+                                privox_loadtrace.tracer().end(_weights_span, device_map=True)
+                                _variant, _vpath, _vwhy = privox_asr_variants.select(
+                                    ASR_BACKEND, WHISPER_SIZE, device_str, BASE_DIR, _asr_variants()
+                                )
+                                if _variant == privox_asr_variants.DYNINT8:
+                                    _tq = time.time()
+                                    with privox_loadtrace.span("asr.quantize", variant=_variant):
+                                        self.asr_model.model = privox_asr_variants.quantize_dynamic_int8(
+                                            self.asr_model.model, torch
+                                        )
+                                    log_print(f"Qwen3-ASR: dynamic int8 on CPU in {time.time() - _tq:.2f}s ({_vwhy}).")
                                 log_print("Qwen3ASRModel initialized successfully.")
+                                if is_gpu and asr_plan is not None:
+                                    try:
+                                        _measured = torch.cuda.memory_reserved() / (1024 ** 3)
+                                        _memplan_measurements().record(
+                                            f"asr:{WHISPER_SIZE}", asr_plan["asr_max_gpu_gib"] / asr_plan["asr_correction"], _measured
+                                        )
+                                    except Exception:
+                                        pass
                         else:
                             # float16 eliminates on-the-fly quantization overhead, loading in < 1s vs 6s.
                             compute_type = "float16" if is_gpu else "int8"
@@ -3036,16 +3711,29 @@ class VoiceInputApp:
                                 with open("scratch/asr_debug.log", "a", encoding="utf-8") as f:
                                     f.write(f"ASR Init: is_gpu={is_gpu}, device={device_str}, compute_type={compute_type}\n")
                             except Exception: pass
-                            from faster_whisper import WhisperModel
+                            with privox_loadtrace.span("asr.import"):
+                                from faster_whisper import WhisperModel
+                            _discover_span = privox_loadtrace.tracer().begin("asr.discover")
                             local_whisper = os.path.join(BASE_DIR, "models", f"whisper-{WHISPER_SIZE}")
                             model_path = local_whisper if os.path.exists(os.path.join(local_whisper, "model.bin")) else WHISPER_REPO
+                            _variant, _vpath, _vwhy = privox_asr_variants.select(
+                                ASR_BACKEND, WHISPER_SIZE, device_str, BASE_DIR, _asr_variants()
+                            )
+                            if _variant == privox_asr_variants.INT8:
+                                # Pre-quantized CT2 weights: no per-load float16 -> int8 pass.
+                                model_path = _vpath
+                                compute_type = "int8_float16" if is_gpu else "int8"
+                                log_print(f"ASR variant: int8 CT2 build at {_vpath} ({_vwhy}).")
+                            privox_loadtrace.tracer().end(_discover_span, path=model_path)
                             log_print(
                                 f"ASR Diagnostic - Initializing WhisperModel ({WHISPER_SIZE}) on {device_str}, compute_type={compute_type}..."
                             )
                             try:
-                                self.asr_model = WhisperModel(
-                                    model_path, device=device_str, compute_type=compute_type, cpu_threads=4
-                                )
+                                # CT2 reads, converts and uploads in one call: weights + device transfer.
+                                with privox_loadtrace.span("asr.weights", compute_type=compute_type):
+                                    self.asr_model = WhisperModel(
+                                        model_path, device=device_str, compute_type=compute_type, cpu_threads=4
+                                    )
                             except Exception as e1:
                                 if is_gpu and compute_type == "int8_float16":
                                     log_print(f"Whisper int8_float16 failed ({e1}); retrying float16...")
@@ -3056,16 +3744,17 @@ class VoiceInputApp:
                                     raise
                             log_print("WhisperModel initialized successfully.")
 
-                        # --- ASR CUDA Graph Warmup (Deferred) ---
+                        # --- ASR CUDA Graph Warmup (Background) ---
                         # Previously this ran synchronously, blocking the "Ready" state and "wake beep".
-                        # Now we skip it on init to drastically improve wake-up speed. The first
-                        # transcription handles lazy initialization automatically.
+                        # It now runs after "Ready" in _start_engine_warmup() and is cancelled by the
+                        # first real request, so neither the wake nor a dictation waits on it.
 
                         # Track ASR model usage here instead of in load_config
                         self.track_model_usage(getattr(self, 'active_asr_name', WHISPER_SIZE))
                         self._asr_held_key = (ASR_BACKEND, WHISPER_SIZE)
                         self._asr_loaded_key = (ASR_BACKEND, WHISPER_SIZE)
                         dt = time.time() - t0
+                        self.asr_residency.set(privox_residency.DEVICE, dt, cold=True)
                         log_print(f"ASR load time: {dt:.2f}s (backend={ASR_BACKEND})")
                         return True
                     except Exception as e:
@@ -3096,9 +3785,24 @@ class VoiceInputApp:
                     except Exception:
                         return False
 
+                # Split refiner worker: the refiner is this process's only model.
+                if _worker_role() == "refiner":
+                    log_print("Worker (refiner role): loading refiner only...")
+                    g_ok = load_grammar()
+                    self.heavy_models_loaded = bool(g_ok)
+                    self.model_load_stage = "idle"
+                    self.loading_status = "Ready" if g_ok else "Refiner Error"
+                    if g_ok:
+                        self._start_engine_warmup()
+                    return
+
                 # Worker: parallel ASR + refiner; report ready as soon as ASR finishes.
                 if ENGINE_MODE:
-                    log_print("Worker: parallel ASR + refiner load (ready after ASR)...")
+                    log_print(
+                        "Worker (ASR role): loading ASR only..."
+                        if _worker_role() == "asr"
+                        else "Worker: parallel ASR + refiner load (ready after ASR)..."
+                    )
                     self._wake_timing_mark("worker-load-start")
 
                     def _finish_grammar():
@@ -3106,16 +3810,20 @@ class VoiceInputApp:
                             g_ok = load_grammar()
                             if g_ok:
                                 log_print("Worker: refiner load finished.")
+                                # No-op until the ASR is ready; its warmup then includes the refiner.
+                                self._add_refiner_warmup()
                             else:
                                 log_print("Worker: refiner load failed (ASR still available).")
                         except Exception as _g_err:
                             log_print(f"Worker: refiner background load error: {_g_err}")
 
-                    threading.Thread(
-                        target=_finish_grammar, daemon=True, name="privox-worker-grammar"
-                    ).start()
+                    if _worker_role() != "asr":
+                        threading.Thread(
+                            target=_finish_grammar, daemon=True, name="privox-worker-grammar"
+                        ).start()
                     _asr_t0 = time.time()
-                    res_asr = _do_load_models()
+                    with _asr_load_window():
+                        res_asr = _do_load_models()
                     if not res_asr:
                         return
                     self.heavy_models_loaded = True
@@ -3123,13 +3831,14 @@ class VoiceInputApp:
                     self.loading_status = "Ready"
                     log_print(f"Worker: ASR ready in {time.time() - _asr_t0:.2f}s (refiner still loading).")
                     self._wake_timing_mark("worker-asr-ready")
+                    self._start_engine_warmup()
                     log_vram_usage("Post-ASR (refiner loading in background)")
                     return
 
                 use_parallel = _parallel_load_enabled()
 
                 old_threads = 4  # Fallback
-                _t = get_torch()
+                _t = _require_torch() if _asr_backend_needs_torch() else torch
                 if _t is not None:
                     try:
                         old_threads = _t.get_num_threads()
@@ -3145,7 +3854,11 @@ class VoiceInputApp:
 
                         def _load_runner(name, fn):
                             try:
-                                _load_results[name] = fn()
+                                if name == "asr":
+                                    with privox_loadtrace.span("asr"), _asr_load_window():
+                                        _load_results[name] = fn()
+                                else:
+                                    _load_results[name] = fn()
                             except Exception as e:
                                 log_print(f"Parallel load thread error ({name}): {e}")
                                 _load_results[name] = False
@@ -3165,11 +3878,12 @@ class VoiceInputApp:
                         res_grammar = _load_results.get("grammar", False)
                     else:
                         log_print("Using Sequential Load Strategy (ASR first, then refiner)...")
-                        res_asr = _do_load_models()
+                        with privox_loadtrace.span("asr"), _asr_load_window():
+                            res_asr = _do_load_models()
                         if not res_asr:
                             res_grammar = False
                         else:
-                            _t2 = get_torch()
+                            _t2 = torch
                             if _t2 is not None:
                                 try:
                                     import gc as _gc
@@ -3199,17 +3913,15 @@ class VoiceInputApp:
                     self.heavy_models_loaded = True
                     self.model_load_stage = "idle"
                     self.loading_status = "Ready"
+                    log_print(f"Engine ready (cold) in {time.time() - self.model_load_started_at:.2f}s")
+                    self._start_engine_warmup()
                     self.update_status("RECORDING" if self.is_listening else "READY")
                     self._refresh_tray_ready_state()
             finally:
-                # track_model_usage() updates .user_prefs.json during load; align poll baseline
-                # so we do not spuriously run load_config() right after wake (log noise + extra work).
-                try:
-                    self._sync_prefs_poll_from_disk()
-                except Exception:
-                    pass
                 self._heavy_model_load_in_progress = False
+                privox_loadtrace.tracer().end_wake(loaded=bool(getattr(self, "heavy_models_loaded", False)))
                 if getattr(self, "heavy_models_loaded", False):
+                    self._idle_policy().observe_wake()
                     self._try_complete_wake_feedback()
                 elif self.pending_wakeup:
                     self.pending_wakeup = False
@@ -3226,15 +3938,74 @@ class VoiceInputApp:
                     if getattr(self, "heavy_models_loaded", False):
                         self._try_complete_wake_feedback()
 
+    def _engine_warmup_steps(self, asr: bool = True) -> list:
+        def _traced(name, fn):
+            def _step(cancelled):
+                with privox_loadtrace.span(f"warmup.{name}", cat="warmup"):
+                    fn(cancelled)
+            return (name, _step)
+
+        steps = []
+        if asr and self.asr_model is not None:
+            steps.append(_traced("asr", self._warmup_asr_decode))
+        gc_ = getattr(self, "grammar_checker", None)
+        if gc_ is not None and getattr(gc_, "model", None) is not None:
+            steps.append(_traced("refiner", lambda cancelled: gc_.warmup(cancel_check=cancelled)))
+            _zh_target = (
+                privox_zhconvert.SIMPLIFIED if self.use_simplified_chinese_output else privox_zhconvert.TRADITIONAL
+            )
+            steps.append(_traced("zh_table", lambda cancelled: privox_zhconvert.converter(_zh_target)))
+        return steps
+
+    def _start_engine_warmup(self) -> None:
+        """Ready (cold) -> background ASR decode + refiner tokens -> ready (warm)."""
+        self.warmup.start(self._engine_warmup_steps(), self.model_lock, loaded_at=time.time())
+
+    def _add_refiner_warmup(self) -> None:
+        """Refiner loaded after the engine reported ready (worker): warm it in the same warmup."""
+        self.warmup.add(self._engine_warmup_steps(asr=False), self.model_lock)
+
+    def _warmup_asr_decode(self, cancelled) -> None:
+        """One short decode through the live backend (same kernels / beam as a real request)."""
+        # Faint noise rather than zeros: some kernels short-circuit on an all-zero input.
+        audio = (np.random.default_rng(0).standard_normal(SAMPLE_RATE) * 0.003).astype(np.float32)
+        with torch.no_grad() if torch is not None else contextlib.nullcontext():
+            if ASR_BACKEND == "sensevoice":
+                self.asr_model.generate(input=audio, cache={}, language="auto", use_itn=True, batch_size_s=60)
+            elif ASR_BACKEND == "qwen_asr":
+                self.asr_model.transcribe(audio=(audio, SAMPLE_RATE), language=None, return_time_stamps=False)
+            else:
+                kw = _build_faster_whisper_transcribe_kwargs(audio)
+                kw["vad_filter"] = False  # the VAD would drop the clip and skip the decoder entirely
+                segments, _info = self.asr_model.transcribe(**kw)
+                for _seg in segments:
+                    if cancelled():
+                        break
+
     def unload_heavy_models(self):
+        self.warmup.reset()
         with self.model_lock:
             if not self.heavy_models_loaded:
                 return
             
             idle_time = time.time() - self.last_activity_time
             log_print(f"Unloading Models (VRAM Saver - Idle for {idle_time:.1f}s)...")
-            
-            if self.asr_model is not None:
+
+            if (
+                self.asr_model is not None
+                and self.asr_residency.host_enabled()
+                and privox_residency.supports_host(self.asr_model)
+            ):
+                # Park the ASR in host RAM so a short idle wakes with a copy instead of a reload.
+                dt = privox_residency.offload_to_host(self.asr_model, torch) if cuda_is_available() else 0.0
+                if dt is not None:
+                    self.asr_residency.set(privox_residency.HOST, dt)
+                    log_print(
+                        f"ASR parked in host RAM in {dt:.2f}s (VRAM freed; evicted after "
+                        f"{privox_residency.host_timeout():.0f}s, PRIVOX_ASR_HOST_TIMEOUT)."
+                    )
+
+            if self.asr_model is not None and self.asr_residency.state != privox_residency.HOST:
 
                 # Targeted internal model cleanup.
                 try:
@@ -3260,6 +4031,7 @@ class VoiceInputApp:
 
                 self.asr_model = None
                 self._asr_held_key = None
+                self.asr_residency.set(privox_residency.EVICTED)
                 log_print("ASR model reference destroyed (VRAM completely freed).")
             
             self.grammar_checker.unload_model()
@@ -3275,7 +4047,7 @@ class VoiceInputApp:
             log_vram_usage("Post-Unload (Idle)")
             log_print("VRAM Saver: Garbage collection forced.")
 
-            if self.vad_model is not None and not NO_TORCH and not _privox_vad_prefers_cuda():
+            if self.vad_model is not None and torch is not None and not _privox_vad_prefers_cuda():
                 try:
                     # WebRTC fallback uses a non-module sentinel; only real Silero nn.Module supports .cpu().
                     if hasattr(self.vad_model, "cpu"):
@@ -3292,7 +4064,7 @@ class VoiceInputApp:
                     log_print(f"VAD idle CPU refresh: {_vad_idle_err}")
 
             # Flush CUDA and Force Garbage Collection
-            _t = get_torch()
+            _t = torch
             try:
                 if _t is not None and _t.cuda.is_available():
                     _t.cuda.synchronize()
@@ -3317,32 +4089,9 @@ class VoiceInputApp:
             self.update_status("SLEEP") # Trigger flat line animation
             log_print("Models Unloaded. VRAM released.")
 
-    def _sync_prefs_poll_from_disk(self):
-        """Refresh hot-reload snapshot so internal prefs writes do not trigger load_config."""
-        prefs_path = os.path.join(BASE_DIR, ".user_prefs.json")
-        if os.path.exists(prefs_path):
-            self._last_prefs_mtime = os.path.getmtime(prefs_path)
-            with open(prefs_path, "rb") as f:
-                self._last_prefs_hash = hashlib.md5(f.read()).hexdigest()
-
     def _update_user_prefs(self, updater) -> None:
-        """Read-modify-write .user_prefs.json under lock (prevents hotkey etc. being clobbered)."""
-        prefs_path = os.path.join(BASE_DIR, ".user_prefs.json")
-        try:
-            with self._usage_write_lock:
-                prefs = (
-                    _safe_json_load(prefs_path, ".user_prefs.json")
-                    if os.path.exists(prefs_path)
-                    else {}
-                )
-                if not isinstance(prefs, dict):
-                    prefs = {}
-                updater(prefs)
-                models_config.scrub_obsolete_user_pref_keys(prefs)
-                with open(prefs_path, "w", encoding="utf-8") as f:
-                    json.dump(prefs, f, indent=4)
-        except Exception as e:
-            log_print(f"Error updating user prefs: {e}")
+        """Queue a read-modify-write of .user_prefs.json (privox_config.PrefsWriter); never blocks on file I/O."""
+        self.prefs_writer.update(updater)
 
     def track_model_usage(self, model_name):
         """Update last_used timestamp for the given model in hidden prefs."""
@@ -3357,19 +4106,159 @@ class VoiceInputApp:
         except Exception as e:
             log_print(f"Error tracking usage: {e}")
 
-    def load_config(self):
-        """Unified configuration loader with split protection and migration."""
+    def _on_config_changed(self, diff) -> None:
+        """Config service subscriber: a settings file changed on disk (Settings GUI or manual edit)."""
+        actions = diff.actions
+        if not actions:
+            return
+        log_print(f"Configuration change detected ({diff.describe()}): {', '.join(sorted(actions))}.")
+        self.apply_config_actions(diff.new, actions)
+        log_print(f"Reload complete. Hotkey: {self.hotkey_str}")
+        # Push persona/model/dictionary changes to the worker so they take effect without waiting
+        # for the next idle respawn; it applies the same actions (hotkey / audio stay here).
+        worker_actions = actions & privox_config.WORKER_ACTIONS
+        if worker_actions and _worker_isolation_enabled():
+            for _w in (self._worker, self._refiner_worker):
+                if _w is not None and _w.is_alive():
+                    try:
+                        _w.request({"cmd": "reload_config", "actions": sorted(worker_actions)}, timeout=10.0)
+                    except Exception:
+                        pass
+
+    def apply_config_actions(self, snapshot, actions) -> None:
+        """Apply a settings change with the narrowest actions it needs (privox_config.ACTIONS).
+
+        Model changes and keys without a dedicated action go through load_config(), which reloads
+        a model only when the resolved model differs from the one loaded.
+        """
+        if actions & privox_config.MODEL_ACTIONS:
+            self.load_config(snapshot)
+            return
+        prefs = snapshot.prefs_dict()
+        if "hotkey" in actions:
+            self._apply_hotkey_prefs(prefs)
+            self.update_tray_tooltip()
+        if "audio" in actions:
+            self._apply_audio_prefs(prefs)
+        if "policy" in actions:
+            self._apply_policy_prefs(prefs, snapshot.config)
+        if "persona" in actions:
+            self._apply_persona_prefs(prefs)
+        if "dictionary" in actions:
+            self._apply_dictionary_prefs(prefs)
+        if actions & {"persona", "dictionary"} and hasattr(self, "grammar_checker"):
+            self._sync_grammar_checker_prefs()
+        self.last_config_reload_time = time.time()
+
+    def _apply_hotkey_prefs(self, prefs) -> None:
+        """Hotkey from prefs, updated in place (the listener reads target_mods / target_key)."""
+        # Parse hotkey_str (e.g. "ctrl+shift+k"). Only default to f8 when the key is absent —
+        # do not overwrite an in-memory hotkey if a concurrent prefs write dropped the field.
+        _disk_hotkey = (prefs.get("hotkey") or "").strip().lower()
+        if _disk_hotkey:
+            new_hotkey_str = _disk_hotkey
+        else:
+            new_hotkey_str = (getattr(self, "hotkey_str", None) or "f8").lower()
+        hotkey_changed = new_hotkey_str != getattr(self, 'hotkey_str', '')
+        self.hotkey_str = new_hotkey_str
+
+        parts = [p.strip() for p in self.hotkey_str.split('+')]
+        self.target_mods = set([p for p in parts if p in ["ctrl", "shift", "alt"]])
+        self.target_key = parts[-1] if parts else "f8"
+        log_print(f"Parsed Hotkey: Mods={self.target_mods}, Key={self.target_key}")
+
+        # UPDATE HOTKEY IN-PLACE (No listener restart)
+        if hotkey_changed:
+            log_print(f"Hotkey changed ({getattr(self, 'hotkey_str_old', 'None')} -> {self.hotkey_str}). Updating in-place...")
+            self.hotkey_str_old = self.hotkey_str
+            # Listener already uses target_mods/target_key, so updating them is enough
+            # We also clear active_mods to prevent "stuck" combinations during the transition
+            self.active_mods.clear()
+
+    def _apply_audio_prefs(self, prefs) -> None:
+        """Sounds and Auto-Stop; rebuilds the VAD iterator only when the timeout changed."""
+        self.sound_enabled = prefs.get("sound_enabled", True)
+        if hasattr(self, "sound_manager"):
+            self.sound_manager.set_enabled(self.sound_enabled)
+        self.auto_stop_enabled = prefs.get("auto_stop_enabled", True)
+        old_silence = getattr(self, "silence_timeout_ms", 10000)
+        # Backend Clamping: Min 5s
+        self.silence_timeout_ms = max(5000, prefs.get("silence_timeout_ms", 10000))
+
+        # Dynamic VAD Re-initialization if timeout changed
+        if self.vad_model and self.silence_timeout_ms != old_silence:
+            log_print(f"Applying new Auto-Stop Timeout: {self.silence_timeout_ms}ms")
+            if _use_webrtc_vad():
+                from webrtc_vad_adapter import WebRtcVadAdapter
+
+                self.vad_iterator = WebRtcVadAdapter(
+                    aggressiveness=2,
+                    sample_rate=SAMPLE_RATE,
+                    min_silence_duration_ms=self._vad_end_silence_ms(),
+                    speech_pad_ms=SPEECH_PAD_MS,
+                )
+            elif hasattr(self, "VADIterator") and self.VADIterator is not None:
+                self.vad_iterator = self.VADIterator(
+                    self.vad_model,
+                    threshold=VAD_THRESHOLD,
+                    sampling_rate=SAMPLE_RATE,
+                    min_silence_duration_ms=self._vad_end_silence_ms(),
+                    speech_pad_ms=SPEECH_PAD_MS,
+                )
+
+    def _apply_policy_prefs(self, prefs, config) -> None:
+        """VRAM saver, worker kill timer and eager load."""
+        v_val = prefs.get("vram_timeout", 60)
+        self.vram_timeout = 0 if v_val == 0 else max(5, v_val)
+        try:
+            _k_val = int(prefs.get("worker_kill_timeout", self.worker_kill_timeout))
+            self.worker_kill_timeout = max(0, _k_val)
+        except (TypeError, ValueError):
+            pass
+        # Eager load defaults to True for a premium "ready-to-go" experience
+        self.eager_model_load = bool(prefs.get("eager_model_load", config.get("eager_model_load", True)))
+
+    def _apply_persona_prefs(self, prefs) -> None:
+        """Persona, tone, user instructions and Chinese output script (refiner prompt inputs)."""
+        self.use_simplified_chinese_output = bool(prefs.get("use_simplified_chinese_output", False))
+        self.character = prefs.get("character", "Writing Assistant")
+        self.tone = prefs.get("tone", "Natural")
+        self.custom_prompts = prefs.get("custom_prompts", {})
+
+    def _apply_dictionary_prefs(self, prefs) -> None:
+        """Custom dictionary; its compiled index is built here, not on the first dictation."""
+        self.custom_dictionary = prefs.get("custom_dictionary", [])
+        privox_dictionary.compiled(self.custom_dictionary)
+
+    def _sync_grammar_checker_prefs(self) -> None:
+        """Copy the refiner prompt inputs onto the grammar checker (prompt caches key on them)."""
+        # Clear context cache if personality/tone changes abruptly to prevent bleed
+        if self.grammar_checker.character != self.character or self.grammar_checker.tone != self.tone:
+             self.grammar_checker.context_buffer = ""
+
+        self.grammar_checker.character = self.character
+        self.grammar_checker.tone = self.tone
+        self.grammar_checker.custom_prompts = self.custom_prompts
+        self.grammar_checker.custom_dictionary = self.custom_dictionary
+        self.grammar_checker.use_simplified_chinese_output = self.use_simplified_chinese_output
+
+    def load_config(self, snapshot=None):
+        """Unified configuration loader with split protection and migration.
+
+        snapshot: privox_config.ConfigSnapshot already parsed by the config watcher; without one,
+        the service re-reads the files (unchanged files are not parsed again).
+        """
         global _cached_transcription_log
         try:
             _cached_transcription_log = None  # re-read log_transcription / env on hot-reload
             config_path = os.path.join(BASE_DIR, "config.json")
-            prefs_path = os.path.join(BASE_DIR, ".user_prefs.json")
-            
-            # --- 1. Load Technical Config (Static/Public) ---
-            config = _safe_json_load(config_path, "config.json") if os.path.exists(config_path) else {}
 
-            # --- 2. Load User Preferences (Hidden/Private) ---
-            prefs = _safe_json_load(prefs_path, ".user_prefs.json") if os.path.exists(prefs_path) else {}
+            # --- 1/2. Technical Config (Static/Public) + User Preferences (Hidden/Private) ---
+            if snapshot is None:
+                self.config_service.refresh(publish=False)
+                snapshot = self.config_service.current
+            config = snapshot.config_dict()
+            prefs = snapshot.prefs_dict()
             if prefs and models_config.scrub_obsolete_user_pref_keys(prefs):
                 self._update_user_prefs(lambda p: models_config.scrub_obsolete_user_pref_keys(p))
 
@@ -3440,87 +4329,25 @@ class VoiceInputApp:
                 with open(config_path, "w", encoding="utf-8") as f:
                     json.dump(config, f, indent=4)
             
-            # Update mtime tracker immediately to avoid self-triggering polish loop
-            if os.path.exists(prefs_path):
-                self._last_prefs_mtime = os.path.getmtime(prefs_path)
+            # config.json migrations above were written directly; do not report them back as changes
+            # (prefs migrations go through the prefs writer, which registers its own writes).
+            self.config_service.acknowledge()
 
             # --- 4. Apply Settings ---
-            # Parse hotkey_str (e.g. "ctrl+shift+k"). Only default to f8 when the key is absent —
-            # do not overwrite an in-memory hotkey if a concurrent prefs write dropped the field.
-            _disk_hotkey = (prefs.get("hotkey") or "").strip().lower()
-            if _disk_hotkey:
-                new_hotkey_str = _disk_hotkey
-            else:
-                new_hotkey_str = (getattr(self, "hotkey_str", None) or "f8").lower()
-            hotkey_changed = new_hotkey_str != getattr(self, 'hotkey_str', '')
-            self.hotkey_str = new_hotkey_str
-            
-            parts = [p.strip() for p in self.hotkey_str.split('+')]
-            self.target_mods = set([p for p in parts if p in ["ctrl", "shift", "alt"]])
-            self.target_key = parts[-1] if parts else "f8"
-            log_print(f"Parsed Hotkey: Mods={self.target_mods}, Key={self.target_key}")
-            
-            # UPDATE HOTKEY IN-PLACE (No listener restart)
-            if hotkey_changed:
-                log_print(f"Hotkey changed ({getattr(self, 'hotkey_str_old', 'None')} -> {self.hotkey_str}). Updating in-place...")
-                self.hotkey_str_old = self.hotkey_str
-                # Listener already uses target_mods/target_key, so updating them is enough
-                # We also clear active_mods to prevent "stuck" combinations during the transition
-                self.active_mods.clear()
+            self._apply_hotkey_prefs(prefs)
             
             # Update Tray ToolTip context
             self.update_tray_tooltip()
 
+            self.worker_pool_slots = _parse_worker_pool_slots(config.get("worker_pool"))
+
             self.last_config_reload_time = time.time()
-            # Update hash tracker and mtime after all potential logic is done
-            if os.path.exists(prefs_path):
-                 with open(prefs_path, "rb") as f:
-                     self._last_prefs_hash = hashlib.md5(f.read()).hexdigest()
-                 self._last_prefs_mtime = os.path.getmtime(prefs_path)
-
-            self.sound_enabled = prefs.get("sound_enabled", True)
-            if hasattr(self, "sound_manager"):
-                self.sound_manager.set_enabled(self.sound_enabled)
-            self.auto_stop_enabled = prefs.get("auto_stop_enabled", True)
-            old_silence = getattr(self, "silence_timeout_ms", 10000)
-            # Backend Clamping: Min 5s
-            self.silence_timeout_ms = max(5000, prefs.get("silence_timeout_ms", 10000))
-            
-            # Dynamic VAD Re-initialization if timeout changed
-            if self.vad_model and self.silence_timeout_ms != old_silence:
-                log_print(f"Applying new Auto-Stop Timeout: {self.silence_timeout_ms}ms")
-                if NO_TORCH:
-                    from webrtc_vad_adapter import WebRtcVadAdapter
-
-                    self.vad_iterator = WebRtcVadAdapter(
-                        aggressiveness=2,
-                        sample_rate=SAMPLE_RATE,
-                        min_silence_duration_ms=self._vad_end_silence_ms(),
-                        speech_pad_ms=SPEECH_PAD_MS,
-                    )
-                elif hasattr(self, "VADIterator") and self.VADIterator is not None:
-                    self.vad_iterator = self.VADIterator(
-                        self.vad_model,
-                        threshold=VAD_THRESHOLD,
-                        sampling_rate=SAMPLE_RATE,
-                        min_silence_duration_ms=self._vad_end_silence_ms(),
-                        speech_pad_ms=SPEECH_PAD_MS,
-                    )
 
-            self.custom_dictionary = prefs.get("custom_dictionary", [])
-            v_val = prefs.get("vram_timeout", 60)
-            self.vram_timeout = 0 if v_val == 0 else max(5, v_val)
-            try:
-                _k_val = int(prefs.get("worker_kill_timeout", self.worker_kill_timeout))
-                self.worker_kill_timeout = max(0, _k_val)
-            except (TypeError, ValueError):
-                pass
-            self.use_simplified_chinese_output = bool(prefs.get("use_simplified_chinese_output", False))
-            # Eager load defaults to True for a premium "ready-to-go" experience
-            self.eager_model_load = bool(prefs.get("eager_model_load", config.get("eager_model_load", True)))
-            self.character = prefs.get("character", "Writing Assistant")
-            self.tone = prefs.get("tone", "Natural")
-            self.custom_prompts = prefs.get("custom_prompts", {})
+            self._apply_audio_prefs(prefs)
+
+            self._apply_dictionary_prefs(prefs)
+            self._apply_policy_prefs(prefs, config)
+            self._apply_persona_prefs(prefs)
             old_refiner = getattr(self, "current_refiner", "")
             self.current_refiner = models_config.migrate_refiner_display_name(
                 prefs.get("current_refiner", models_config.DEFAULT_LLM)
@@ -3574,25 +4401,20 @@ class VoiceInputApp:
             
             if hasattr(self, 'grammar_checker'):
                 # --- Refiner Model Hot-Reload ---
+                # Only a different model file / load profile costs a reload; a renamed entry or a
+                # profile field the loader does not read just updates the profile.
+                _old_model = _refiner_model_key(self.grammar_checker.profile)
                 if self.current_refiner != old_refiner:
                     log_print(f"Refiner change detected: {old_refiner} -> {self.current_refiner}")
                     self.grammar_checker.profile = profile
-                    if self.heavy_models_loaded:
+                    if self.heavy_models_loaded and _refiner_model_key(profile) != _old_model:
                         log_print("Hot-swapping Grammar Model...")
                         self.grammar_checker.unload_model()
                         self.grammar_checker.load_model()
                 else:
                     self.grammar_checker.profile = profile
-                
-                # Clear context cache if personality/tone changes abruptly to prevent bleed
-                if self.grammar_checker.character != self.character or self.grammar_checker.tone != self.tone:
-                     self.grammar_checker.context_buffer = ""
-                     
-                self.grammar_checker.character = self.character
-                self.grammar_checker.tone = self.tone
-                self.grammar_checker.custom_prompts = self.custom_prompts
-                self.grammar_checker.custom_dictionary = self.custom_dictionary
-                self.grammar_checker.use_simplified_chinese_output = self.use_simplified_chinese_output
+
+                self._sync_grammar_checker_prefs()
             
             # ASR Model resolution
             global WHISPER_SIZE, WHISPER_REPO, ASR_BACKEND, WHISPER_TRANSCRIBE_LANGUAGE, WHISPER_CODE_MIX
@@ -3769,7 +4591,7 @@ class VoiceInputApp:
             if hit is not None and (now - hit[0]) < ttl:
                 return hit[1]
             try:
-                HfApi().repo_info(repo_id=repo)
+                _hf_api().repo_info(repo_id=repo)
                 self._hf_repo_verify_cache[repo] = (now, True)
                 return True
             except Exception:
@@ -4198,29 +5020,40 @@ class VoiceInputApp:
     def _deferred_capture_paste_anchor(self, task_id: int):
         """Run ~120ms after stop: foreground often stabilizes after hotkey release."""
         try:
-            if getattr(self, "_transcribe_task_id", -1) != task_id:
+            pool = self._transcribe_concurrency() > 1
+            if not pool and getattr(self, "_transcribe_task_id", -1) != task_id:
                 return
             hwnd = int(ctypes.windll.user32.GetForegroundWindow() or 0) or None
             if hwnd:
                 with self._paste_anchor_lock:
-                    self._paste_anchor_hwnd = hwnd
+                    if pool:
+                        self._paste_anchors[task_id] = hwnd
+                    if task_id == self._transcribe_task_id:
+                        self._paste_anchor_hwnd = hwnd
                 log_print(f"Paste focus guard: deferred anchor HWND={hwnd}")
         except Exception:
             pass
         finally:
             self._paste_anchor_timer = None
 
-    def _wait_paste_anchor_hwnd(self, timeout_s: float):
-        """Poll for deferred anchor (do not hold clipboard lock while waiting)."""
+    def _wait_paste_anchor_hwnd(self, timeout_s: float, task_id=None):
+        """Poll for deferred anchor (do not hold clipboard lock while waiting).
+
+        task_id (worker-pool mode): the anchor of that recording, which may not be the latest.
+        """
+        def _get():
+            with self._paste_anchor_lock:
+                if task_id is not None:
+                    return self._paste_anchors.pop(task_id, None)
+                return self._paste_anchor_hwnd
+
         deadline = time.monotonic() + timeout_s
         while time.monotonic() < deadline:
-            with self._paste_anchor_lock:
-                h = self._paste_anchor_hwnd
+            h = _get()
             if h:
                 return int(h)
             time.sleep(0.02)
-        with self._paste_anchor_lock:
-            h = self._paste_anchor_hwnd
+        h = _get()
         return int(h) if h else None
 
     def _models_loading_for_session(self) -> bool:
@@ -4282,6 +5115,19 @@ class VoiceInputApp:
         with self._paste_anchor_lock:
             self._paste_anchor_hwnd = None
         self._transcribe_task_id += 1
+        if _worker_isolation_enabled() and self._transcribe_concurrency() == 1:
+            # Worker-pool mode keeps dispatched recordings running side by side; only a pending,
+            # not yet dispatched one is replaced (_queue_transcribe).
+            self._cancel_superseded_worker_task()
+        self._idle_policy().note_use(time.time() - self.last_activity_time)
+        self.prewarm.note_dictation(
+            engine_warm=self._worker_ready if _worker_isolation_enabled() else bool(self.heavy_models_loaded)
+        )
+        self._listen_started_at = time.time()
+        engine_loaded = self._worker_ready if _worker_isolation_enabled() else bool(self.heavy_models_loaded)
+        if not engine_loaded:
+            # Warm the page cache for the refiner while the user speaks (shared with the worker process).
+            privox_pagecache.prefetch_async(self._refiner_gguf_path())
         self.last_activity_time = time.time()
         self._last_loud_chunk_time = time.time()
         self.is_listening = True
@@ -4317,6 +5163,9 @@ class VoiceInputApp:
     def stop_listening(self):
         log_print(" [Stopped]", flush=True)
         self._wake_timing_mark("stop-listening")
+        if self._listen_started_at is not None:
+            self.prewarm.note_speech(time.time() - self._listen_started_at)
+            self._listen_started_at = None
         was_deferred = self._defer_recording_feedback
         self._defer_recording_feedback = False
         self._awaiting_wake_ready_chime = False
@@ -4358,13 +5207,46 @@ class VoiceInputApp:
         self.audio_buffer = []
         self.last_activity_time = time.time()
 
+    def _transcribe_concurrency(self) -> int:
+        """Transcriptions allowed in flight: the pool size in worker-pool mode, else one."""
+        slots = getattr(self, "worker_pool_slots", None) or []
+        return len(slots) if slots and _worker_isolation_enabled() else 1
+
+    def _task_superseded(self, task_id) -> bool:
+        """A newer recording replaces this one (single engine). Worker-pool mode never drops a
+        dispatched recording: each runs on its own worker and is delivered in order."""
+        if task_id is None or self._transcribe_concurrency() > 1:
+            return False
+        return task_id != getattr(self, "_transcribe_task_id", 0)
+
+    def _wait_for_turn_to_deliver(self, task_id, timeout_s: float = 200.0) -> None:
+        """Worker-pool mode: paste only after every older recording has delivered (or given up)."""
+        if task_id is None or self._transcribe_concurrency() == 1:
+            return
+        deadline = time.monotonic() + timeout_s
+        with self._delivery_cond:
+            while any(t < task_id for t in self._undelivered_tasks):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    log_print(f"Delivery of task {task_id}: older recordings still running; pasting anyway.")
+                    return
+                self._delivery_cond.wait(remaining)
+
+    def _task_delivered(self, task_id) -> None:
+        with self._delivery_cond:
+            self._undelivered_tasks.discard(task_id)
+            self._delivery_cond.notify_all()
+        with self._paste_anchor_lock:
+            self._paste_anchors.pop(task_id, None)
+
     def _queue_transcribe(self, audio_segment, task_id):
-        """Run one transcription at a time; keep only the newest pending recording."""
+        """Run one transcription per worker; keep only the newest pending (not yet dispatched) recording."""
         with self._transcribe_state_lock:
-            if self._transcribe_in_progress:
+            if self._transcribe_active >= self._transcribe_concurrency():
                 self._pending_transcribe = (audio_segment, task_id)
                 log_print("Transcription already running; queued latest recording and replaced older pending audio.")
                 return
+            self._transcribe_active += 1
             self._transcribe_in_progress = True
         threading.Thread(target=self.transcribe, args=(audio_segment, task_id), daemon=True).start()
 
@@ -4375,7 +5257,8 @@ class VoiceInputApp:
                 next_job = self._pending_transcribe
                 self._pending_transcribe = None
             else:
-                self._transcribe_in_progress = False
+                self._transcribe_active = max(0, self._transcribe_active - 1)
+                self._transcribe_in_progress = self._transcribe_active > 0
         if next_job is not None:
             audio_segment, task_id = next_job
             threading.Thread(target=self.transcribe, args=(audio_segment, task_id), daemon=True).start()
@@ -4412,7 +5295,9 @@ class VoiceInputApp:
     def _ensure_worker_impl(self, wait_ready: bool = False, ready_timeout: float = 90.0):
         with self._worker_lock:
             if self._worker is None:
-                self._worker = _WorkerClient()
+                slots = getattr(self, "worker_pool_slots", None) or []
+                role_env = {"PRIVOX_WORKER_ROLE": "asr"} if _split_workers_enabled() else {}
+                self._worker = _WorkerPool(slots, role_env) if slots else _WorkerClient(role_env)
             if not self._worker.is_alive():
                 self.loading_status = "Starting engine..."
                 self.update_tray_tooltip()
@@ -4434,7 +5319,7 @@ class VoiceInputApp:
             self.loading_status = "Loading engine..."
             self.update_tray_tooltip()
             try:
-                client.request({"cmd": "load"}, timeout=10.0)
+                client.request(self._worker_load_header(), timeout=10.0)
                 self._wake_timing_mark("worker-load-cmd-sent")
             except Exception as e:
                 log_print(f"Worker load command failed: {e}")
@@ -4448,8 +5333,10 @@ class VoiceInputApp:
             pong = client.ping()
             if pong.get("ready"):
                 if not self._worker_ready:
-                    log_print("Worker is ready (models loaded).")
+                    log_print(f"Worker is ready ({'warm' if pong.get('warm') else 'cold; warmup running'}).")
                 self._worker_ready = True
+                self.asr_residency.set(privox_residency.DEVICE)
+                self._idle_policy().observe_wake()
                 self._refresh_tray_ready_state()
                 self._wake_timing_mark("worker-ready")
                 # Start the idle countdown from readiness, not from spawn, so a slow load
@@ -4470,12 +5357,17 @@ class VoiceInputApp:
             w = self._worker
             self._worker = None
             self._worker_ready = False
+            self.asr_residency.set(privox_residency.EVICTED)
         if w is not None:
             try:
                 w.stop()
             except Exception as e:
                 log_print(f"Worker shutdown error: {e}")
 
+    def _worker_load_header(self) -> dict:
+        """"load" command; prefetch is main's read of the refiner GGUF (the worker skips its own)."""
+        return {"cmd": "load", "prefetch": privox_pagecache.prefetch_snapshot(self._refiner_gguf_path())}
+
     def _schedule_worker_load(self):
         """Single background load after idle (hotkey-down / start_listening); avoids duplicate polls."""
         if not _worker_isolation_enabled() or self._worker_ready:
@@ -4506,6 +5398,7 @@ class VoiceInputApp:
                 name="privox-worker-spawn",
             ).start()
         self._schedule_worker_load()
+        self._schedule_refiner_worker_load()
 
     def _ensure_warm_worker_spawned(self):
         """Spawn/connect a WARM-FRESH worker (no model load). Idempotent."""
@@ -4543,7 +5436,7 @@ class VoiceInputApp:
 
     def _transcribe_via_worker(self, audio_data, task_id):
         """Delegate ASR + refiner to the worker process, then paste in the main process."""
-        if task_id is not None and task_id != getattr(self, "_transcribe_task_id", 0):
+        if self._task_superseded(task_id):
             log_transcription(" [Skip transcribe: superseded recording session]")
             return
         self._wake_timing_mark("transcribe-begin")
@@ -4559,13 +5452,21 @@ class VoiceInputApp:
             self.loading_status = "ASR Error"
             return
         audio = np.asarray(audio_data, dtype=np.float32).reshape(-1)
+        split = _split_workers_enabled()
         header = {
-            "cmd": "transcribe",
+            "cmd": "asr" if split else "transcribe",
             "task_id": task_id,
             "dtype": "float32",
             "sample_rate": SAMPLE_RATE,
         }
-        resp = client.request(header, audio.tobytes(), timeout=200.0)
+        self._worker_inflight_task_ids.add(task_id)
+        try:
+            resp = client.request(header, audio.tobytes(), timeout=200.0)
+            if split and resp is not None and resp.get("ok"):
+                self._wake_timing_mark("transcribe-asr-response")
+                resp = self._refine_via_worker(resp, task_id)
+        finally:
+            self._worker_inflight_task_ids.discard(task_id)
         self._wake_timing_mark("transcribe-worker-response")
         if resp is None:
             log_print("Worker request failed (no response); tearing down for respawn.")
@@ -4575,6 +5476,9 @@ class VoiceInputApp:
         if not resp.get("ok"):
             _reason = resp.get("reason", "")
             _detail = resp.get("detail", "")
+            if _reason == "cancelled":
+                log_transcription(" [Worker stopped superseded transcription]")
+                return
             log_print(f"Worker inference not ok: {_reason} {_detail}")
             if _reason == "asr_error":
                 self.loading_status = "ASR Error"
@@ -4586,21 +5490,349 @@ class VoiceInputApp:
         if final_text is None or not str(final_text).strip():
             log_transcription(" [Skip paste: empty refined output]")
             return
-        if task_id is not None and task_id != getattr(self, "_transcribe_task_id", 0):
+        if self._task_superseded(task_id):
             log_transcription(" [Skip paste: superseded recording session]")
             return
+        self._wait_for_turn_to_deliver(task_id)
         ft = str(final_text)
-        cap = 500
-        log_transcription(
-            f" [Pasted text preview] ({len(ft)} chars): "
-            f"'{ft[:cap]}{'...' if len(ft) > cap else ''}'"
-        )
+        log_transcription(" [Pasted text preview] (%d chars): '%s'", len(ft), privox_logging.Preview(ft, 500))
         try:
-            self.paste_text(final_text)
+            self.paste_text(final_text, task_id=task_id if self._transcribe_concurrency() > 1 else None)
         except Exception as e:
             log_print(f"Typing Error: {e}")
             self.sound_manager.play_error()
 
+    def _ensure_refiner_worker(self, wait_ready: bool = False, ready_timeout: float = 90.0):
+        """Split engine: spawn (if needed) and optionally wait for the refiner-only worker."""
+        with self._refiner_worker_lock:
+            if self._refiner_worker is None or not self._refiner_worker.is_alive():
+                w = _WorkerClient({"PRIVOX_WORKER_ROLE": "refiner"}, label="refiner-worker")
+                if not w.start():
+                    log_print("Could not start refiner worker.")
+                    self._refiner_worker = None
+                    return None
+                self._refiner_worker = w
+                self._refiner_worker_ready = False
+            client = self._refiner_worker
+
+        if not wait_ready or self._refiner_worker_ready:
+            return client
+        try:
+            client.request(self._worker_load_header(), timeout=10.0)
+        except Exception as e:
+            log_print(f"Refiner worker load command failed: {e}")
+        deadline = time.time() + ready_timeout
+        while time.time() < deadline:
+            if not client.is_alive():
+                log_print("Refiner worker died while waiting for readiness.")
+                return None
+            pong = client.ping()
+            if pong.get("ready"):
+                if not self._refiner_worker_ready:
+                    log_print("Refiner worker is ready.")
+                    self._wake_timing_mark("refiner-worker-ready")
+                self._refiner_worker_ready = True
+                return client
+            if pong.get("error"):
+                log_print(f"Refiner worker reported load error: {pong['error']}")
+                return client
+            time.sleep(0.15)
+        log_print("Refiner worker not ready within timeout; returning handle anyway.")
+        return client
+
+    def _shutdown_refiner_worker(self):
+        with self._refiner_worker_lock:
+            w = self._refiner_worker
+            self._refiner_worker = None
+            self._refiner_worker_ready = False
+        if w is not None:
+            try:
+                w.stop()
+            except Exception as e:
+                log_print(f"Refiner worker shutdown error: {e}")
+
+    def _schedule_refiner_worker_load(self):
+        if not _split_workers_enabled() or self._refiner_worker_ready:
+            return
+        threading.Thread(
+            target=lambda: self._ensure_refiner_worker(wait_ready=True),
+            daemon=True,
+            name="privox-refiner-worker-load",
+        ).start()
+
+    def _refine_via_worker(self, asr_resp: dict, task_id) -> dict:
+        """Split engine: send the ASR text to the refiner worker. Falls back to the raw ASR text."""
+        raw_text = asr_resp.get("raw_text") or ""
+        fallback = {"ok": True, "raw_text": raw_text, "final_text": raw_text}
+        if self._task_superseded(task_id):
+            return {"ok": False, "reason": "cancelled"}
+        refiner = self._ensure_refiner_worker(wait_ready=True)
+        if refiner is None:
+            log_print("Refiner worker unavailable; pasting unrefined ASR text.")
+            return fallback
+        resp = refiner.request(
+            {
+                "cmd": "refine",
+                "task_id": task_id,
+                "text": raw_text,
+                "language": asr_resp.get("language"),
+                "language_prob": asr_resp.get("language_prob", 0.0),
+            },
+            timeout=120.0,
+        )
+        self._wake_timing_mark("transcribe-refiner-response")
+        if resp is None:
+            log_print("Refiner worker request failed; tearing it down and pasting unrefined ASR text.")
+            self._shutdown_refiner_worker()
+            return fallback
+        if not resp.get("ok") and resp.get("reason") != "cancelled":
+            log_print(f"Refiner worker not ok: {resp.get('reason', '')} {resp.get('detail', '')}")
+            return fallback
+        return resp
+
+    def _offload_worker_to_host(self) -> bool:
+        """Tier 1 with host residency: the worker frees VRAM but keeps the ASR in pinned host RAM."""
+        w = self._worker
+        if w is None:
+            return False
+        resp = w.request({"cmd": "offload"}, timeout=30.0)
+        if not resp or not resp.get("ok") or not resp.get("host_resident"):
+            return False
+        self._worker_ready = False
+        self.asr_residency.set(privox_residency.HOST, resp.get("offload_s"))
+        log_print(f"Idle (tier 1): worker parked ASR in host RAM; refiner unloaded ({self.asr_residency.describe()}).")
+        return True
+
+    def _idle_policy(self):
+        """Idle release policy for the current timers; rebuilt (keeping gap history) when they change."""
+        vram_after = float(self._asr_idle_timeout())
+        host_after = privox_residency.host_timeout()
+        isolated = _worker_isolation_enabled()
+        key = (vram_after, host_after, isolated, self.worker_kill_timeout)
+        policy = getattr(self, "_idle_policy_obj", None)
+        if policy is not None and getattr(self, "_idle_policy_key", None) == key:
+            return policy
+        resources = [privox_idle_policy.IdleResource("engine_vram", gib=6.0, wake_s=3.0, fallback_after=vram_after)]
+        if host_after != 0:
+            resources.append(
+                privox_idle_policy.IdleResource(
+                    "asr_host",
+                    gib=3.0,
+                    price=0.25,  # system RAM is cheaper to hold than VRAM
+                    wake_s=8.0,
+                    fallback_after=vram_after + host_after if (vram_after > 0 and host_after > 0) else 0,
+                )
+            )
+        if isolated:
+            resources.append(
+                privox_idle_policy.IdleResource(
+                    "warm_process", gib=0.8, price=0.25, wake_s=12.0, fallback_after=self.worker_kill_timeout
+                )
+            )
+        new_policy = privox_idle_policy.IdlePolicy(resources)
+        if policy is not None:
+            new_policy.carry_over(policy)
+        self._idle_policy_obj = new_policy
+        self._idle_policy_key = key
+        log_print(new_policy.describe())
+        return new_policy
+
+    def _release_idle_resource(self, resource: str, idle_for: float) -> bool:
+        """Release one idle resource. False = not possible yet (e.g. a load is running); retry later."""
+        policy = self._idle_policy()
+        if _worker_isolation_enabled():
+            worker_alive = self._worker is not None and self._worker.is_alive()
+            if resource == "engine_vram" and self.prewarm.holding():
+                return False  # predicted dictation window still open
+            if resource == "engine_vram":
+                # Only act on a READY worker — never interrupt an in-progress load.
+                if worker_alive and not self._worker_ready and self._worker_load_in_progress:
+                    return False
+                if worker_alive and self._worker_ready:
+                    if not (self.asr_residency.host_enabled() and self._offload_worker_to_host()):
+                        # Kill the LOADED worker (frees ALL VRAM incl. CUDA context); a WARM-FRESH one
+                        # (~0 VRAM, spawn+import pre-paid) is respawned so the next wake only reloads models.
+                        log_print(f"Idle ({idle_for:.0f}s): killing LOADED worker; respawning WARM-FRESH.")
+                        self._shutdown_worker()
+                        threading.Thread(target=self._respawn_warm_worker, daemon=True).start()
+                    self.loading_status = "Idle (VRAM Free)"
+                    self.update_tray_tooltip()
+                    self.update_status("SLEEP")
+            elif resource == "asr_host":
+                if worker_alive and self.asr_residency.state == privox_residency.HOST:
+                    log_print(f"Idle ({idle_for:.0f}s): evicting host-resident ASR worker ({self.asr_residency.describe()}).")
+                    self._shutdown_worker()
+                    threading.Thread(target=self._respawn_warm_worker, daemon=True).start()
+            elif resource == "warm_process":
+                if getattr(self, "_warm_respawn_in_progress", False):
+                    return False
+                if worker_alive and not self._worker_ready:
+                    log_print(f"Idle ({idle_for:.0f}s): stopping WARM-FRESH worker (respawned on next hotkey).")
+                    self._shutdown_worker()
+        elif resource == "engine_vram":
+            if self.prewarm.holding():
+                return False
+            if self.heavy_models_loaded:
+                self.unload_heavy_models()
+        elif resource == "asr_host":
+            self._evict_host_asr()
+        if resource == "engine_vram":
+            self.prewarm.note_released()
+        policy.mark_evicted(resource)
+        return True
+
+    def _refiner_gguf_path(self):
+        """On-disk path of the selected refiner GGUF (models/ or the HF cache), or None if not downloaded."""
+        profile = self.grammar_checker.profile
+        file_name = profile.get("file_name", GRAMMAR_FILE)
+        local = os.path.join(BASE_DIR, "models", file_name)
+        if os.path.exists(local):
+            return local
+        try:
+            from huggingface_hub import try_to_load_from_cache
+
+            cached = try_to_load_from_cache(profile.get("repo_id", GRAMMAR_REPO), file_name)
+            return cached if isinstance(cached, str) else None
+        except Exception:
+            return None
+
+    def _prewarm_costs_gib(self) -> tuple:
+        """(ASR, refiner) VRAM a prewarm would occupy, from the files on disk (rough when not local)."""
+        asr_bytes = _asr_checkpoint_bytes()
+        backend = ASR_BACKEND if ASR_BACKEND in ("qwen_asr", "sensevoice") else "whisper"
+        asr_gib = privox_memplan.asr_gpu_need_gib(asr_bytes, backend) if asr_bytes else 2.0
+        gguf = self._refiner_gguf_path()
+        refiner_gib = os.path.getsize(gguf) / privox_memplan.GIB if gguf else 3.0
+        return asr_gib, refiner_gib
+
+    def _prewarm_loop(self):
+        """Every 30 s, off the audio loop: persist the dictation history, then check for a prewarm."""
+        while self.running:
+            time.sleep(30.0)
+            try:
+                self.prewarm.save()
+                self._maybe_predictive_prewarm()
+            except Exception as e:
+                log_print(f"Predictive prewarm check failed: {e}")
+
+    def _maybe_predictive_prewarm(self):
+        """Load the engine ahead of a likely dictation (privox_prewarm), within PRIVOX_PREWARM_BUDGET_GIB."""
+        if not privox_prewarm.prewarm_enabled() or self.is_listening or self._transcribe_in_progress:
+            return
+        now = time.time()
+        isolated = _worker_isolation_enabled()
+        loaded = self._worker_ready if isolated else self.heavy_models_loaded
+        if loaded or self.prewarm.active or self._models_loading_for_session():
+            return
+        policy = self._idle_policy()
+        if policy.thresholds().get("engine_vram", privox_idle_policy.INF) == privox_idle_policy.INF:
+            return  # VRAM saver off: nothing gets released, so nothing to predict
+        wake_s = max((r.wake_s for r in policy.resources if r.evicted), default=0.0)
+        p, why, hold_until = self.prewarm.should_prewarm(wake_s, now - self.last_activity_time, policy)
+        if p < privox_prewarm.prewarm_threshold():
+            return
+        budget = privox_prewarm.prewarm_budget_gib()
+        asr_gib, refiner_gib = self._prewarm_costs_gib()
+        if asr_gib + refiner_gib <= budget:
+            what = "engine"
+        elif _split_workers_enabled() and asr_gib <= budget:
+            what = "asr"  # the refiner worker still loads on hotkey-down
+        else:
+            log_print(f"Predictive prewarm skipped: needs {asr_gib + refiner_gib:.1f} GiB > budget {budget:.1f} GiB.")
+            return
+        log_print(f"Predictive prewarm ({what}, p={p:.2f}, {why}). {self.prewarm.describe()}")
+        self.prewarm.note_prewarm(what, p, hold_until)
+        if isolated:
+            self._schedule_worker_load()
+            if what == "engine":
+                self._schedule_refiner_worker_load()
+        else:
+            threading.Thread(target=self.load_heavy_models, daemon=True, name="privox-prewarm-load").start()
+
+    def _evict_host_asr(self):
+        """In-process engine: drop host-resident ASR weights after PRIVOX_ASR_HOST_TIMEOUT."""
+        with self.model_lock:
+            if self.heavy_models_loaded or self.asr_residency.state != privox_residency.HOST:
+                return
+            log_print(f"Idle: evicting host-resident ASR ({self.asr_residency.describe()}).")
+            self._unload_asr_model_only()
+
+    def _asr_idle_timeout(self) -> float:
+        """Tier-1 idle for the (ASR) worker. Split engine: PRIVOX_ASR_IDLE_TIMEOUT, 0 = keep resident."""
+        if _split_workers_enabled():
+            raw = (os.environ.get("PRIVOX_ASR_IDLE_TIMEOUT") or "").strip()
+            if raw:
+                try:
+                    return float(raw)
+                except ValueError:
+                    pass
+        return self.vram_timeout
+
+    def _maybe_release_idle_refiner_worker(self):
+        """Split engine: VRAM saver for the refiner only; a WARM-FRESH refiner is respawned (~0 VRAM)."""
+        if self.vram_timeout <= 0 or self.is_listening or self._transcribe_in_progress:
+            return
+        w = self._refiner_worker
+        if w is None or not w.is_alive() or not self._refiner_worker_ready:
+            return
+        if (time.time() - self.last_activity_time) <= self.vram_timeout:
+            return
+        log_print("Idle: releasing LOADED refiner worker (ASR worker keeps its own idle timeout).")
+        self._shutdown_refiner_worker()
+        if self.running:
+            threading.Thread(
+                target=lambda: self._ensure_refiner_worker(wait_ready=False),
+                daemon=True,
+                name="privox-refiner-warm-respawn",
+            ).start()
+
+    def _cancel_superseded_worker_task(self):
+        """Tell the worker to abandon in-flight transcriptions that a new recording supersedes."""
+        superseded = [t for t in list(self._worker_inflight_task_ids) if isinstance(t, int)]
+        if not superseded:
+            return
+        # "cancel" covers task_id and every older task; a pool sends it only to their workers.
+        inflight = max(superseded)
+        for client in (self._worker, self._refiner_worker):
+            if client is not None and client.notify({"cmd": "cancel", "task_id": inflight}):
+                log_transcription(f" [Cancel sent for superseded task {inflight}]")
+
+    def cancel_inference(self, task_id) -> None:
+        """Mark task_id and all older tasks as superseded (worker side).
+
+        A running run_inference() stops at its next cancellation point: between Qwen chunks,
+        between faster-whisper segments, before the refiner, or between refiner tokens.
+        """
+        try:
+            tid = int(task_id)
+        except (TypeError, ValueError):
+            return
+        if tid > self._cancelled_task_upto:
+            self._cancelled_task_upto = tid
+
+    def _inference_cancelled(self, task_id) -> bool:
+        return task_id is not None and task_id <= self._cancelled_task_upto
+
+    def _raise_if_inference_cancelled(self, task_id) -> None:
+        if self._inference_cancelled(task_id):
+            raise InferenceCancelled()
+
+    def _asr_dictionary(self):
+        """Compiled custom dictionary (rebuilt only when the Settings word list changes)."""
+        return privox_dictionary.compiled(self.custom_dictionary)
+
+    def _apply_custom_dictionary(self, raw_text: str) -> str:
+        """Post-ASR: rewrite misheard dictionary terms before the refiner sees the transcript."""
+        if not raw_text or not self.custom_dictionary or not privox_dictionary.correction_enabled():
+            return raw_text
+        fixed, changes = self._asr_dictionary().correct(raw_text)
+        if changes:
+            log_transcription(
+                f" [Dictionary] {len(changes)} correction(s): "
+                + ", ".join(f"'{heard}' -> '{term}'" for heard, term in changes[:8])
+            )
+        return fixed
+
     def run_inference(self, audio_data, task_id=None):
         """Pure audio -> refined-text inference (ASR + refiner). No paste / tray side effects.
 
@@ -4610,168 +5842,231 @@ class VoiceInputApp:
 
         Returns:
           {"ok": True, "raw_text": str, "final_text": str, "asr_time": float, "grammar_time": float}
-          {"ok": False, "reason": "no_model" | "empty"}
+          {"ok": False, "reason": "no_model" | "empty" | "cancelled"}
         """
-        with self.model_lock:
-            # Ensure models are loaded before transcribing
-            if not self.heavy_models_loaded:
-                log_print("Waiting for models to load...")
-                self.load_heavy_models()
-                if not self.asr_model:
-                    log_print("ASR Model still missing after lazy load attempt.")
-                    return {"ok": False, "reason": "no_model"}
-
-            _asr_label = getattr(self, "active_asr_name", None) or (
-                WHISPER_SIZE if ASR_BACKEND == "whisper" else WHISPER_REPO
-            )
-            log_transcription(f" Transcribing Using Backend: {ASR_BACKEND} (Model: {_asr_label})...", flush=True)
-            t0 = time.time()
+        try:
+            return self._run_inference(audio_data, task_id)
+        except InferenceCancelled:
+            log_print(f"Inference for task {task_id} cancelled (superseded recording).")
+            return {"ok": False, "reason": "cancelled"}
 
-            raw_text = ""
-            info = None
-            if ASR_BACKEND == "sensevoice":
-                def _sv_gen():
+    def _run_inference(self, audio_data, task_id):
+        self.warmup.cancel(f"task {task_id}")
+        with self.model_lock:
+            asr = self._run_asr(audio_data, task_id)
+            if not asr.get("ok"):
+                return asr
+            ref = self._run_refine(asr["raw_text"], asr.get("language"), asr.get("language_prob", 0.0), task_id)
+            if ref.get("ok"):
+                ref["asr_time"] = asr["asr_time"]
+                log_transcription(f" [Total Time: {asr['asr_time'] + ref['grammar_time']:.3f}s]")
+            return ref
+
+    def run_asr(self, audio_data, task_id=None):
+        """ASR half of run_inference (PRIVOX_WORKER_ROLE=asr worker).
+
+        Returns {"ok": True, "raw_text", "language", "language_prob", "asr_time"} or
+        {"ok": False, "reason": ...}; the language hint is what the refiner needs next.
+        """
+        self.warmup.cancel(f"task {task_id}")
+        try:
+            with self.model_lock:
+                return self._run_asr(audio_data, task_id)
+        except InferenceCancelled:
+            log_print(f"ASR for task {task_id} cancelled (superseded recording).")
+            return {"ok": False, "reason": "cancelled"}
+
+    def run_refine(self, raw_text, language=None, language_prob=0.0, task_id=None):
+        """Refiner half of run_inference (PRIVOX_WORKER_ROLE=refiner worker)."""
+        self.warmup.cancel(f"task {task_id}")
+        try:
+            with self.model_lock:
+                if not self.heavy_models_loaded:
+                    log_print("Waiting for refiner to load...")
+                    self.load_heavy_models()
+                    self.warmup.cancel("request waited on the load")
+                return self._run_refine(raw_text, language, language_prob, task_id)
+        except InferenceCancelled:
+            log_print(f"Refine for task {task_id} cancelled (superseded recording).")
+            return {"ok": False, "reason": "cancelled"}
+
+    def _run_asr(self, audio_data, task_id):
+        self._raise_if_inference_cancelled(task_id)
+        # Ensure models are loaded before transcribing
+        if not self.heavy_models_loaded:
+            log_print("Waiting for models to load...")
+            self.load_heavy_models()
+            self.warmup.cancel("request waited on the load")
+            if not self.asr_model:
+                log_print("ASR Model still missing after lazy load attempt.")
+                return {"ok": False, "reason": "no_model"}
+
+        _asr_label = getattr(self, "active_asr_name", None) or (
+            WHISPER_SIZE if ASR_BACKEND == "whisper" else WHISPER_REPO
+        )
+        log_transcription(f" Transcribing Using Backend: {ASR_BACKEND} (Model: {_asr_label})...", flush=True)
+        t0 = time.time()
+
+        raw_text = ""
+        info = None
+        if ASR_BACKEND == "sensevoice":
+            def _sv_gen():
+                with torch.no_grad():
+                    return self.asr_model.generate(
+                        input=audio_data.flatten().astype(np.float32),
+                        cache={},
+                        language="auto",
+                        use_itn=True,
+                        batch_size_s=60,
+                        merge_vad=True,
+                        merge_length_s=15,
+                    )
+            results = self._run_with_timeout(_sv_gen, timeout_s=120, label="ASR generate")
+            if results and len(results) > 0:
+                raw_text = results[0].get('text', '')
+                raw_text = re.sub(r'<\|.*?\|>', '', raw_text).strip()
+            log_transcription(" SenseVoice Result - Raw: '%s'", raw_text)
+
+        elif ASR_BACKEND == "qwen_asr":
+            if cuda_is_available():
+                inner_model = getattr(self.asr_model, "model", None)
+                _has_device_map = bool(getattr(inner_model, "hf_device_map", None))
+                if not _has_device_map:
+                    _dev_type = getattr(getattr(inner_model, "device", None), "type", "cpu")
+                    if _dev_type != "cuda":
+                        inner_model.to("cuda")
+
+            CHUNK_SIZE = 30 * 16000
+            audio_np = audio_data.astype(np.float32)
+            chunks = [audio_np[i:i + CHUNK_SIZE] for i in range(0, len(audio_np), CHUNK_SIZE)]
+            seg_texts = []
+            for idx, chunk in enumerate(chunks):
+                self._raise_if_inference_cancelled(task_id)
+                if len(chunks) > 1:
+                    log_transcription(f"  Transcribing chunk {idx+1}/{len(chunks)}...")
+                def _qwen_gen(c=chunk):
                     with torch.no_grad():
-                        return self.asr_model.generate(
-                            input=audio_data.flatten().astype(np.float32),
-                            cache={},
-                            language="auto",
-                            use_itn=True,
-                            batch_size_s=60,
-                            merge_vad=True,
-                            merge_length_s=15,
+                        return self.asr_model.transcribe(
+                            audio=(c, 16000),
+                            context=_qwen_asr_context(self._asr_dictionary()),
+                            language=None,
+                            return_time_stamps=False,
                         )
-                results = self._run_with_timeout(_sv_gen, timeout_s=120, label="ASR generate")
+                results = self._run_with_timeout(
+                    _qwen_gen, timeout_s=120, label=f"ASR transcribe chunk {idx+1}"
+                )
                 if results and len(results) > 0:
-                    raw_text = results[0].get('text', '')
-                    raw_text = re.sub(r'<\|.*?\|>', '', raw_text).strip()
-                log_transcription(f" SenseVoice Result - Raw: '{raw_text}'")
+                    txt = results[0].get('text', '') if isinstance(results[0], dict) else getattr(results[0], 'text', str(results[0]))
+                    if txt:
+                        seg_texts.append(txt)
+            raw_text = " ".join(seg_texts).strip()
+            log_transcription(" Qwen3-ASR Result: '%s'", raw_text)
 
-            elif ASR_BACKEND == "qwen_asr":
-                if cuda_is_available():
-                    inner_model = getattr(self.asr_model, "model", None)
-                    _has_device_map = bool(getattr(inner_model, "hf_device_map", None))
-                    if not _has_device_map:
-                        _dev_type = getattr(getattr(inner_model, "device", None), "type", "cpu")
-                        if _dev_type != "cuda":
-                            inner_model.to("cuda")
-
-                CHUNK_SIZE = 30 * 16000
-                audio_np = audio_data.astype(np.float32)
-                chunks = [audio_np[i:i + CHUNK_SIZE] for i in range(0, len(audio_np), CHUNK_SIZE)]
-                seg_texts = []
-                for idx, chunk in enumerate(chunks):
-                    if len(chunks) > 1:
-                        log_transcription(f"  Transcribing chunk {idx+1}/{len(chunks)}...")
-                    def _qwen_gen(c=chunk):
-                        with torch.no_grad():
-                            return self.asr_model.transcribe(
-                                audio=(c, 16000),
-                                context="Transcript may mix English and Chinese; keep each language in its usual spelling.",
-                                language=None,
-                                return_time_stamps=False,
-                            )
-                    results = self._run_with_timeout(
-                        _qwen_gen, timeout_s=120, label=f"ASR transcribe chunk {idx+1}"
-                    )
-                    if results and len(results) > 0:
-                        txt = results[0].get('text', '') if isinstance(results[0], dict) else getattr(results[0], 'text', str(results[0]))
-                        if txt:
-                            seg_texts.append(txt)
-                raw_text = " ".join(seg_texts).strip()
-                log_transcription(f" Qwen3-ASR Result: '{raw_text}'")
-
-            else:
-                _asr_kw = _build_faster_whisper_transcribe_kwargs(audio_data)
-                try:
-                    segments, info = self._run_with_timeout(
-                        lambda kw=_asr_kw: self.asr_model.transcribe(**kw),
-                        timeout_s=120,
-                        label="ASR transcribe",
-                    )
-                except Exception as _asr_err:
-                    log_print(f"ASR transcribe failed: {_asr_err}")
-                    return {"ok": False, "reason": "asr_error", "detail": str(_asr_err)}
-                log_transcription(f" ASR Result - Language Detected: {info.language} ({info.language_probability:.2f})")
-                seg_results = []
-                for segment in segments:
-                    log_transcription(f"  Segment: [{segment.start:.2f}s -> {segment.end:.2f}s] ({len(segment.text)} chars)")
-                    seg_results.append(segment.text)
-                raw_text = " ".join(seg_results).strip()
-
-            raw_text = _strip_asr_spoken_fillers(raw_text)
-
-            t1 = time.time()
-            log_transcription(f" [ASR Total Time: {t1 - t0:.3f}s] Result: {len(raw_text)} chars")
-            _asr_pv = raw_text[:400].replace("\n", " ").strip()
-            if len(raw_text) > 400:
-                _asr_pv += "..."
-            log_print(f"ASR text ({len(raw_text)} chars, preview): {_asr_pv!r}")
-
-            if not raw_text:
-                log_transcription(" [Empty Transcription Result]")
-                return {"ok": False, "reason": "empty"}
-
-            is_command = False
-            command_text = raw_text
-
-            if (os.environ.get("PRIVOX_GC_AFTER_ASR") or "").strip().lower() in ("1", "true", "yes", "on"):
-                gc.collect()
+        else:
+            _asr_kw = _build_faster_whisper_transcribe_kwargs(audio_data, self._asr_dictionary())
+            try:
+                segments, info = self._run_with_timeout(
+                    lambda kw=_asr_kw: self.asr_model.transcribe(**kw),
+                    timeout_s=120,
+                    label="ASR transcribe",
+                )
+            except Exception as _asr_err:
+                log_print(f"ASR transcribe failed: {_asr_err}")
+                return {"ok": False, "reason": "asr_error", "detail": str(_asr_err)}
+            log_transcription(f" ASR Result - Language Detected: {info.language} ({info.language_probability:.2f})")
+            seg_results = []
+            # faster-whisper decodes lazily per segment, so this is also a cancellation point.
+            for segment in segments:
+                self._raise_if_inference_cancelled(task_id)
+                log_transcription("  Segment: [%.2fs -> %.2fs] (%d chars)", segment.start, segment.end, len(segment.text))
+                seg_results.append(segment.text)
+            raw_text = " ".join(seg_results).strip()
+
+        raw_text = _strip_asr_spoken_fillers(raw_text)
+        raw_text = self._apply_custom_dictionary(raw_text)
+        self._raise_if_inference_cancelled(task_id)
+
+        t1 = time.time()
+        log_transcription(" [ASR Total Time: %.3fs] Result: %d chars", t1 - t0, len(raw_text))
+        log_print("ASR text (%d chars, preview): %r", len(raw_text), privox_logging.Preview(raw_text))
+
+        if not raw_text:
+            log_transcription(" [Empty Transcription Result]")
+            return {"ok": False, "reason": "empty"}
+
+        if (os.environ.get("PRIVOX_GC_AFTER_ASR") or "").strip().lower() in ("1", "true", "yes", "on"):
+            gc.collect()
 
-            if getattr(self, "current_refiner", ""):
-                self.grammar_checker.load_model()
+        detected_lang = info.language if (info and ASR_BACKEND == 'whisper') else None
+        detected_prob = info.language_probability if (info and ASR_BACKEND == 'whisper') else 0.0
+        if ASR_BACKEND == "whisper":
+            detected_lang, detected_prob = _refiner_language_hint(
+                raw_text, detected_lang, detected_prob or 0.0
+            )
+        return {
+            "ok": True,
+            "raw_text": raw_text,
+            "language": detected_lang,
+            "language_prob": float(detected_prob or 0.0),
+            "asr_time": t1 - t0,
+        }
 
-            log_transcription(f" Refining format ({self.current_refiner})...")
-            t2 = time.time()
-            detected_lang = info.language if (info and ASR_BACKEND == 'whisper') else None
-            detected_prob = info.language_probability if (info and ASR_BACKEND == 'whisper') else 0.0
-            if ASR_BACKEND == "whisper":
-                detected_lang, detected_prob = _refiner_language_hint(
-                    raw_text, detected_lang, detected_prob or 0.0
-                )
-            final_text = self._run_with_timeout(
-                lambda: self.grammar_checker.correct(
-                    command_text,
-                    is_command=is_command,
-                    language=detected_lang,
-                    language_prob=detected_prob,
-                ),
-                timeout_s=90,
-                label="Refiner processing",
+    def _run_refine(self, raw_text, detected_lang, detected_prob, task_id):
+        self._raise_if_inference_cancelled(task_id)
+        is_command = False
+        command_text = raw_text
+
+        if getattr(self, "current_refiner", ""):
+            self.grammar_checker.load_model()
+
+        log_transcription(f" Refining format ({self.current_refiner})...")
+        t2 = time.time()
+        final_text = self._run_with_timeout(
+            lambda: self.grammar_checker.correct(
+                command_text,
+                is_command=is_command,
+                language=detected_lang,
+                language_prob=detected_prob,
+                cancel_check=lambda: self._inference_cancelled(task_id),
+            ),
+            timeout_s=90,
+            label="Refiner processing",
+        )
+        t3 = time.time()
+        log_transcription(f" [Grammar Time: {t3 - t2:.3f}s]")
+        ft_str = str(final_text) if final_text is not None else ""
+        log_transcription(f" [Refined Output: {len(ft_str)} chars]")
+        log_print("Refiner output (%d chars, preview): %r", len(ft_str), privox_logging.Preview(ft_str))
+        _asr_n = " ".join(raw_text.split())
+        _ref_n = " ".join(ft_str.split())
+        if _asr_n == _ref_n:
+            log_print(
+                "Refiner: same as ASR after whitespace normalize — model applied little/no surface edit "
+                "(expected for clean English; rules ask not to invent content)."
+            )
+        else:
+            log_print(
+                f"Refiner: text differs from ASR (ASR {len(raw_text)} chars → refined {len(ft_str)} chars)."
             )
-            t3 = time.time()
-            log_transcription(f" [Grammar Time: {t3 - t2:.3f}s]")
-            ft_str = str(final_text) if final_text is not None else ""
-            log_transcription(f" [Refined Output: {len(ft_str)} chars]")
-            log_transcription(f" [Total Time: {t3 - t0:.3f}s]")
-            _ref_pv = ft_str[:400].replace("\n", " ").strip()
-            if len(ft_str) > 400:
-                _ref_pv += "..."
-            log_print(f"Refiner output ({len(ft_str)} chars, preview): {_ref_pv!r}")
-            _asr_n = " ".join(raw_text.split())
-            _ref_n = " ".join(ft_str.split())
-            if _asr_n == _ref_n:
-                log_print(
-                    "Refiner: same as ASR after whitespace normalize — model applied little/no surface edit "
-                    "(expected for clean English; rules ask not to invent content)."
-                )
-            else:
-                log_print(
-                    f"Refiner: text differs from ASR (ASR {len(raw_text)} chars → refined {len(ft_str)} chars)."
-                )
 
-            return {
-                "ok": True,
-                "raw_text": raw_text,
-                "final_text": ft_str,
-                "asr_time": t1 - t0,
-                "grammar_time": t3 - t2,
-            }
+        return {
+            "ok": True,
+            "raw_text": raw_text,
+            "final_text": ft_str,
+            "grammar_time": t3 - t2,
+        }
 
     def transcribe(self, audio_data, task_id=None):
-        with self.model_lock:
+        self.warmup.cancel("dictation")
+        # Worker-pool mode: the models live in the workers, so main-side jobs may overlap.
+        pool = self._transcribe_concurrency() > 1
+        lock = contextlib.nullcontext() if pool else self.model_lock
+        if pool and task_id is not None:
+            with self._delivery_cond:
+                self._undelivered_tasks.add(task_id)
+        with lock:
             try:
-                if task_id is not None and task_id != getattr(self, "_transcribe_task_id", 0):
+                if self._task_superseded(task_id):
                     log_transcription(" [Skip transcribe: superseded recording session]")
                     return
                 duration = len(audio_data) / SAMPLE_RATE
@@ -4801,6 +6096,7 @@ class VoiceInputApp:
                 if not self.heavy_models_loaded:
                     log_print("Waiting for models to load...")
                     self.load_heavy_models()
+                    self.warmup.cancel("dictation waited on the load")
                     if not self.asr_model:
                          log_print("ASR Model still missing after lazy load attempt.")
                          self.update_status("READY")
@@ -4841,7 +6137,7 @@ class VoiceInputApp:
                         # Clean up emotion/event tags like <|HAPPY|>, <|ENTHUSIASTIC|>, etc.
                         raw_text = re.sub(r'<\|.*?\|>', '', raw_text).strip()
                     
-                    log_transcription(f" SenseVoice Result - Raw: '{raw_text}'")
+                    log_transcription(" SenseVoice Result - Raw: '%s'", raw_text)
                     
     
     
@@ -4870,7 +6166,7 @@ class VoiceInputApp:
                             with torch.no_grad():
                                 return self.asr_model.transcribe(
                                     audio=(c, 16000),
-                                    context="Transcript may mix English and Chinese; keep each language in its usual spelling.",
+                                    context=_qwen_asr_context(self._asr_dictionary()),
                                     language=None, # Auto-detect
                                     return_time_stamps=False # DISABLE forced alignment
                                 )
@@ -4884,10 +6180,10 @@ class VoiceInputApp:
                             if txt: seg_texts.append(txt)
                     
                     raw_text = " ".join(seg_texts).strip()
-                    log_transcription(f" Qwen3-ASR Result: '{raw_text}'")
+                    log_transcription(" Qwen3-ASR Result: '%s'", raw_text)
                     
                 else:
-                    _asr_kw = _build_faster_whisper_transcribe_kwargs(audio_data)
+                    _asr_kw = _build_faster_whisper_transcribe_kwargs(audio_data, self._asr_dictionary())
                     segments, info = self._run_with_timeout(
                         lambda kw=_asr_kw: self.asr_model.transcribe(**kw),
                         timeout_s=120,
@@ -4899,20 +6195,18 @@ class VoiceInputApp:
                     # Collect segments and log each one
                     seg_results = []
                     for segment in segments:
-                        log_transcription(f"  Segment: [{segment.start:.2f}s -> {segment.end:.2f}s] ({len(segment.text)} chars)")
+                        log_transcription("  Segment: [%.2fs -> %.2fs] (%d chars)", segment.start, segment.end, len(segment.text))
                         seg_results.append(segment.text)
                     
                     raw_text = " ".join(seg_results).strip()
 
                 raw_text = _strip_asr_spoken_fillers(raw_text)
+                raw_text = self._apply_custom_dictionary(raw_text)
                 
                 t1 = time.time()
-                log_transcription(f" [ASR Total Time: {t1 - t0:.3f}s] Result: {len(raw_text)} chars")
+                log_transcription(" [ASR Total Time: %.3fs] Result: %d chars", t1 - t0, len(raw_text))
                 # Always log full ASR (preview) via log_print — refiner detail may be off in packaged builds.
-                _asr_pv = raw_text[:400].replace("\n", " ").strip()
-                if len(raw_text) > 400:
-                    _asr_pv += "..."
-                log_print(f"ASR text ({len(raw_text)} chars, preview): {_asr_pv!r}")
+                log_print("ASR text (%d chars, preview): %r", len(raw_text), privox_logging.Preview(raw_text))
                 
                 if not raw_text:
                     log_transcription(" [Empty Transcription Result]")
@@ -4962,10 +6256,7 @@ class VoiceInputApp:
                 log_transcription(f" [Refined Output: {len(final_text)} chars]")
                 log_transcription(f" [Total Time: {t3 - t0:.3f}s]")
                 ft_str = str(final_text) if final_text is not None else ""
-                _ref_pv = ft_str[:400].replace("\n", " ").strip()
-                if len(ft_str) > 400:
-                    _ref_pv += "..."
-                log_print(f"Refiner output ({len(ft_str)} chars, preview): {_ref_pv!r}")
+                log_print("Refiner output (%d chars, preview): %r", len(ft_str), privox_logging.Preview(ft_str))
                 _asr_n = " ".join(raw_text.split())
                 _ref_n = " ".join(ft_str.split())
                 if _asr_n == _ref_n:
@@ -4982,10 +6273,8 @@ class VoiceInputApp:
                     log_transcription(" [Skip paste: empty refined output]")
                 else:
                     ft = str(final_text)
-                    cap = 500
                     log_transcription(
-                        f" [Pasted text preview] ({len(ft)} chars): "
-                        f"'{ft[:cap]}{'...' if len(ft) > cap else ''}'"
+                        " [Pasted text preview] (%d chars): '%s'", len(ft), privox_logging.Preview(ft, 500)
                     )
                     try:
                         self.paste_text(final_text)
@@ -5000,20 +6289,25 @@ class VoiceInputApp:
                 self.loading_status = "ASR Error"
                 self.sound_manager.play_error()
             finally:
-                try:
-                    self._cancel_paste_anchor_timer()
-                except Exception:
-                    pass
-                try:
-                    with self._paste_anchor_lock:
-                        self._paste_anchor_hwnd = None
-                except Exception:
-                    pass
+                is_latest = task_id is None or task_id == getattr(self, "_transcribe_task_id", 0)
+                if pool:
+                    self._task_delivered(task_id)
+                if not pool or is_latest:
+                    # Pool mode: an older recording finishing must not drop the newest one's anchor.
+                    try:
+                        self._cancel_paste_anchor_timer()
+                    except Exception:
+                        pass
+                    try:
+                        with self._paste_anchor_lock:
+                            self._paste_anchor_hwnd = None
+                    except Exception:
+                        pass
                 has_pending_transcribe = self._finish_transcribe_and_maybe_start_next()
                 if has_pending_transcribe:
                     self.update_status("PROCESSING")
                     self.update_tray_tooltip()
-                elif task_id is None or task_id == getattr(self, "_transcribe_task_id", 0):
+                elif (is_latest or pool) and not (pool and self._transcribe_in_progress):
                     # Always leave PROCESSING: on error show ERROR tray state (was: stuck spinner forever).
                     if self.loading_status in ["ASR Error", "Refiner Error"]:
                         self.update_status("ERROR")
@@ -5028,8 +6322,12 @@ class VoiceInputApp:
         except Exception:
             pass
 
-    def paste_text(self, text):
-        """Deliver transcript: clipboard swap + synthetic Ctrl+V (with restore); Win32 compares focus vs end-of-recording."""
+    def paste_text(self, text, task_id=None):
+        """Deliver transcript: clipboard swap + synthetic Ctrl+V (with restore); Win32 compares focus vs end-of-recording.
+
+        task_id (worker-pool mode): compare against that recording's anchor; a newer recording
+        may already be running, so its anchor and timer are left alone.
+        """
         if text is None:
             return
         text = str(text)
@@ -5045,7 +6343,10 @@ class VoiceInputApp:
         guard = sys.platform == "win32"
 
         anchor_hwnd = None
-        if guard:
+        if task_id is not None:
+            if guard:
+                anchor_hwnd = self._wait_paste_anchor_hwnd(0.55, task_id)
+        elif guard:
             anchor_hwnd = self._wait_paste_anchor_hwnd(0.55)
             self._cancel_paste_anchor_timer()
             with self._paste_anchor_lock:
@@ -5182,53 +6483,29 @@ class VoiceInputApp:
 
     def processing_loop(self):
         self.start_audio_stream()
+        threading.Thread(target=self._prewarm_loop, daemon=True, name="privox-prewarm").start()
             
         while self.running:
-            # VRAM Saver Check
-            if (
-                self.vram_timeout > 0
-                and not self.is_listening
-                and not self._transcribe_in_progress
-                and (time.time() - self.last_activity_time) > self.vram_timeout
-            ):
-                if _worker_isolation_enabled():
-                    idle_for = time.time() - self.last_activity_time
-                    worker_alive = self._worker is not None and self._worker.is_alive()
-                    # Tier 1 (at vram_timeout): a LOADED worker is killed (frees ALL VRAM incl.
-                    # CUDA context) and a fresh WARM-FRESH worker is respawned in the background
-                    # (~0 VRAM, spawn+import pre-paid) so the next wake only reloads models.
-                    # Only act on a READY worker — never interrupt an in-progress load.
-                    if worker_alive and self._worker_ready:
-                        log_print("Idle (tier 1): killing LOADED worker; respawning WARM-FRESH (frees VRAM, keeps fast wake).")
-                        self._shutdown_worker()
-                        self.loading_status = "Idle (VRAM Free)"
-                        self.update_tray_tooltip()
-                        self.update_status("SLEEP")
-                        threading.Thread(target=self._respawn_warm_worker, daemon=True).start()
-                    # Tier 2 (optional worker_kill_timeout > 0): kill WARM-FRESH to free system RAM,
-                    # then respawn warm immediately so the next wake still skips spawn+import.
-                    elif (
-                        worker_alive
-                        and not self._worker_ready
-                        and self.worker_kill_timeout > 0
-                        and idle_for > self.worker_kill_timeout
-                    ):
-                        log_print(
-                            f"Idle (tier 2, {idle_for:.0f}s): recycling WARM-FRESH worker "
-                            f"(timeout {self.worker_kill_timeout}s)."
-                        )
-                        self._shutdown_worker()
-                        threading.Thread(target=self._respawn_warm_worker, daemon=True).start()
-                elif self.heavy_models_loaded:
-                    self.unload_heavy_models()
+            if _split_workers_enabled():
+                self._maybe_release_idle_refiner_worker()
+
+            # VRAM Saver: release idle resources in order (engine VRAM -> host-resident ASR -> warm
+            # worker). Thresholds come from privox_idle_policy: the configured timers until enough
+            # dictation gaps are known, then learned from them.
+            if not self.is_listening and not self._transcribe_in_progress:
+                idle_for = time.time() - self.last_activity_time
+                for resource in self._idle_policy().due(idle_for):
+                    if not self._release_idle_resource(resource, idle_for):
+                        break
 
-            # Keep a warm worker ready while sleeping (covers tier-2 recycle + edge-case crashes).
+            # Keep a warm worker ready while sleeping (covers crashes) unless the policy released it.
             if (
                 _worker_isolation_enabled()
                 and self.ui_state == "SLEEP"
                 and not self.is_listening
                 and not self._transcribe_in_progress
                 and not getattr(self, "_warm_respawn_in_progress", False)
+                and not self._idle_policy().is_evicted("warm_process")
             ):
                 worker_alive = self._worker is not None and self._worker.is_alive()
                 if not worker_alive:
@@ -5252,44 +6529,6 @@ class VoiceInputApp:
                         except Exception as e:
                             log_print(f" [Watchdog] Failed to restart Keyboard Listener: {e}")
 
-            # Config Polling (Hot-reload) — skip while heavy ASR/LLM load runs to avoid extra disk/CPU during init.
-            # When not listening, the mic callback still enqueues chunks every block; without throttling we would
-            # stat/read/hash prefs at audio rate (~50–100+/s), which spikes CPU (worse now that load_config is heavier).
-            try:
-                if not getattr(self, "_heavy_model_load_in_progress", False):
-                    poll_interval = 0.35 if self.is_listening else 0.75
-                    now_mono = time.monotonic()
-                    if now_mono - self._last_prefs_poll_mono >= poll_interval:
-                        self._last_prefs_poll_mono = now_mono
-                        prefs_path = os.path.join(BASE_DIR, ".user_prefs.json")
-                        if os.path.exists(prefs_path):
-                            mtime = os.path.getmtime(prefs_path)
-                            if not hasattr(self, '_last_prefs_mtime'):
-                                self._last_prefs_mtime = mtime
-                            elif mtime > self._last_prefs_mtime:
-                                # Use HASH based comparison to avoid metadata "touches" causing loops
-                                with open(prefs_path, "rb") as f:
-                                    current_hash = hashlib.md5(f.read()).hexdigest()
-
-                                if current_hash != self._last_prefs_hash:
-                                    log_print(f"Configuration content change detected. Reloading...")
-                                    self._last_prefs_hash = current_hash
-                                    self._last_prefs_mtime = mtime
-                                    time.sleep(0.1)
-                                    self.load_config()
-                                    log_print(f"Reload complete. Hotkey: {self.hotkey_str}")
-                                    # Push config change to the worker so persona/model/dictionary changes
-                                    # take effect without waiting for the next idle respawn.
-                                    if _worker_isolation_enabled() and self._worker is not None and self._worker.is_alive():
-                                        try:
-                                            self._worker.request({"cmd": "reload_config"}, timeout=10.0)
-                                        except Exception:
-                                            pass
-                                else:
-                                    # Content is same, just metadata was touched. Update mtime to stop polling.
-                                    self._last_prefs_mtime = mtime
-            except: pass
-
             try:
                 try:
                     chunk = self.q.get(timeout=0.5)
@@ -5311,7 +6550,7 @@ class VoiceInputApp:
                 # Check VAD for Manual Toggle Feedback & Auto-Stop
                 # CRITICAL: Suspend Auto-Stop logic while AI models are still loading (Wake up phase)
                 if self.vad_iterator and not self._models_loading_for_session():
-                    if NO_TORCH:
+                    if torch is None:
                         speech_dict = self.vad_iterator(chunk.astype(np.float32), return_seconds=True)
                     else:
                         chunk_tensor = torch.from_numpy(chunk).float()
@@ -5368,7 +6607,8 @@ class VoiceInputApp:
                 self.settings_process.wait()
                 ret_code = self.settings_process.returncode
                 log_print(f"Settings GUI closed (Exit Code: {ret_code}). Reloading config...")
-                self.load_config()
+                # Usually already applied by the watcher; this only publishes what it has not seen.
+                self.config_service.refresh()
                 
                 if ret_code == 10:
                     log_print("Restart requested by Settings GUI. Triggering full app restart...")
@@ -5383,11 +6623,15 @@ class VoiceInputApp:
             try: self.settings_process.terminate()
             except: pass
         try:
+            self.prewarm.save()
+            self.prefs_writer.flush(timeout=2.0)
             self._shutdown_worker()
+            self._shutdown_refiner_worker()
         except Exception:
             pass
         icon.visible = False
         icon.stop() 
+        privox_logging.shutdown()
         os._exit(0)
 
     def restart_app(self, reopen_settings=False):
@@ -5396,7 +6640,9 @@ class VoiceInputApp:
         
         # Cleanup
         try:
+            self.prefs_writer.flush(timeout=2.0)
             self._shutdown_worker()
+            self._shutdown_refiner_worker()
         except Exception:
             pass
         if self.icon:
@@ -5414,6 +6660,7 @@ class VoiceInputApp:
         # But os.execv replaces the process, so it should be fine.
         # However, subprocess is safer for avoiding mutex race conditions on Windows.
         subprocess.Popen(args, cwd=BASE_DIR, shell=False)
+        privox_logging.shutdown()
         os._exit(0)
 
     def reconnect_action(self, icon, item):
@@ -5592,6 +6839,7 @@ class VoiceInputApp:
         # Start Threads
         threading.Thread(target=self.processing_loop, daemon=True).start()
         threading.Thread(target=self.animation_loop, daemon=True).start()
+        self.config_service.start()
         
         # Start Keyboard Listener (Manual Listener for better compatibility)
         log_print("Starting Keyboard Listener...")
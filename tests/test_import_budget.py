@@ -0,0 +1,89 @@
+"""Startup import budget and forbidden modules per process (python -X importtime in a fresh interpreter).
+
+The worker has no microphone / tray / hotkey / clipboard, and neither process needs huggingface_hub
+or torch until a model is fetched or loaded. Budgets (ms) default to the values below; override
+per machine with PRIVOX_IMPORT_BUDGET_MAIN_MS / PRIVOX_IMPORT_BUDGET_WORKER_MS.
+scripts/check_import_budget.py lists the slowest imports when one of these fails.
+"""
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+
+DEFAULT_BUDGET_MS = {"main": 2500.0, "worker": 1500.0}
+
+# Modules that must not be imported at startup (top-level package names).
+FORBIDDEN = {
+    "main": ("huggingface_hub", "torch"),
+    "worker": ("huggingface_hub", "torch", "sounddevice", "pynput", "pystray", "PIL", "pyperclip"),
+}
+
+# The tray process opens the microphone, tray icon, hotkey listener and clipboard at import.
+_GUI_AUDIO = ("sounddevice", "pynput", "pystray", "PIL", "pyperclip")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+
+def _missing(*modules):
+    return [m for m in modules if importlib.util.find_spec(m) is None]
+
+
+def _measure(label: str) -> dict:
+    """{module: self_ms} for one fresh import of the process's module graph."""
+    env = dict(os.environ)
+    env.pop("PRIVOX_ENGINE_MODE", None)
+    env["PRIVOX_PACKAGED_LAUNCH"] = "1"  # no log files from the probe
+    code = f"import sys; sys.path.insert(0, {_SRC!r})\n"
+    if label == "worker":
+        env["PRIVOX_ENGINE_MODE"] = "1"
+        code += "import privox_worker\n"
+    code += "import voice_input\nimport os; os._exit(0)\n"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=_ROOT, env=env, capture_output=True, text=True, timeout=300,
+    )
+    modules = {}
+    for line in (proc.stderr or "").splitlines():
+        m = _LINE.match(line)
+        if m:
+            modules[m.group(3)] = int(m.group(1)) / 1000.0
+    assert proc.returncode == 0 and modules, f"{label} import failed:\n{(proc.stderr or '')[-2000:]}"
+    return modules
+
+
+def _budget_ms(label: str) -> float:
+    env = os.environ.get(f"PRIVOX_IMPORT_BUDGET_{label.upper()}_MS")
+    try:
+        return float(env) if env else DEFAULT_BUDGET_MS[label]
+    except ValueError:
+        return DEFAULT_BUDGET_MS[label]
+
+
+def _check(label: str):
+    # The fastest of three runs is the least disturbed by disk cache and scheduler noise.
+    runs = [_measure(label) for _ in range(3)]
+    loaded = {name.split(".")[0] for name in runs[0]}
+    unexpected = [name for name in FORBIDDEN[label] if name in loaded]
+    assert unexpected == [], f"{label} must not import {', '.join(unexpected)} at startup"
+    total_ms = min(sum(r.values()) for r in runs)
+    budget = _budget_ms(label)
+    assert total_ms <= budget, (
+        f"{label} imports take {total_ms:.0f} ms (budget {budget:.0f} ms); "
+        "see python scripts/check_import_budget.py"
+    )
+
+
+@pytest.mark.skipif(bool(_missing("numpy", *_GUI_AUDIO)), reason="tray process needs its GUI / audio deps")
+def test_main_process_import_budget():
+    _check("main")
+
+
+@pytest.mark.skipif(bool(_missing("numpy")), reason="worker needs numpy")
+def test_worker_import_budget():
+    _check("worker")
@@ -0,0 +1,82 @@
+"""PrefsWriter must not swallow a settings edit it merged into before the service adopted it."""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import privox_config  # noqa: E402
+
+
+def _service(tmp_path, prefs):
+    (tmp_path / privox_config.PREFS_FILE).write_text(json.dumps(prefs, indent=4))
+    service = privox_config.ConfigService(str(tmp_path), log=lambda *_: None)
+    published = []
+    service.subscribe(published.append)
+    service.current  # baseline
+    return service, published
+
+
+def _writer(service):
+    return privox_config.PrefsWriter(service, log=lambda *_: None, delay=0)
+
+
+def test_own_write_is_not_published(tmp_path):
+    service, published = _service(tmp_path, {"tone": "Natural", "usage": 1})
+    writer = _writer(service)
+    writer.update(lambda p: p.update(usage=2))
+    assert writer.flush()
+    service.refresh()
+    assert published == []
+    assert service.current.get("usage") == 2
+
+
+def test_unadopted_gui_edit_is_still_published(tmp_path):
+    service, published = _service(tmp_path, {"tone": "Natural", "usage": 1})
+    # The settings GUI saves; the watcher has not refreshed yet when the writer merges.
+    (tmp_path / privox_config.PREFS_FILE).write_text(json.dumps({"tone": "Formal", "usage": 1}, indent=4))
+    writer = _writer(service)
+    writer.update(lambda p: p.update(usage=2))
+    assert writer.flush()
+    service.refresh()
+    assert [set(d.keys) for d in published] == [{"tone"}]
+    assert service.current.tone == "Formal" and service.current.get("usage") == 2
+
+
+def test_concurrent_saves_do_not_use_up_attempts(tmp_path, monkeypatch):
+    monkeypatch.setattr(privox_config, "RETRY_S", 0.01)
+    service, _published = _service(tmp_path, {"tone": "Natural", "usage": 1})
+    path = tmp_path / privox_config.PREFS_FILE
+    saves = []
+
+    def bump(prefs):
+        prefs.update(usage=2)
+        if len(saves) <= privox_config.PrefsWriter.MAX_ATTEMPTS:
+            # Another process saves while every one of these merges is in flight.
+            saves.append(len(saves))
+            path.write_text(json.dumps({"tone": "Natural", "usage": 1, "saves": len(saves)}, indent=4))
+
+    writer = _writer(service)
+    writer.update(bump)
+    assert writer.flush()
+    assert json.loads(path.read_text()) == {"tone": "Natural", "usage": 2, "saves": len(saves)}
+    assert writer.writes == 1
+
+
+def test_failed_replace_forgets_the_expected_prefs(tmp_path, monkeypatch):
+    service, published = _service(tmp_path, {"tone": "Natural", "usage": 1})
+
+    def locked(*_args):
+        raise PermissionError("locked")
+
+    monkeypatch.setattr(privox_config.os, "replace", locked)
+    monkeypatch.setattr(privox_config.time, "sleep", lambda _s: None)
+    writer = _writer(service)
+    writer.update(lambda p: p.update(usage=2))
+    assert writer.flush()
+    monkeypatch.undo()
+    assert writer.writes == 0
+    # The same content saved later by someone else is a real change and must be published.
+    (tmp_path / privox_config.PREFS_FILE).write_text(json.dumps({"tone": "Natural", "usage": 2}, indent=4))
+    service.refresh()
+    assert [set(d.keys) for d in published] == [{"usage"}]
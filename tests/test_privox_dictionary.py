@@ -0,0 +1,59 @@
+"""Post-ASR dictionary correction must not rewrite ordinary English."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import privox_dictionary  # noqa: E402
+
+TERMS = [
+    "OpenAI", "Redis", "PyTorch", "Kubernetes", "Node.js", "API", "GitHub", "Postgres",
+    "TypeScript", "Docker", "Bank of America",
+]
+
+
+def _correct(text):
+    return privox_dictionary.CustomDictionary(TERMS).correct(text)[0]
+
+
+def test_function_word_not_merged_into_term():
+    assert _correct("can you open a ticket") == "can you open a ticket"
+    assert _correct("I need to read this") == "I need to read this"
+    assert _correct("call a pi from here") == "call a pi from here"
+
+
+def test_multi_token_windows_need_exact_spelling():
+    assert _correct("the type script compiler") == "the TypeScript compiler"
+    assert _correct("open ai released it") == "OpenAI released it"
+    assert _correct("install node js first") == "install Node.js first"
+    assert _correct("pie torch is installed") == "pie torch is installed"
+    assert _correct("read is down") == "read is down"
+
+
+def test_term_may_contain_its_own_function_words():
+    assert _correct("my bank of america card") == "my Bank of America card"
+
+
+def test_phonetic_match_is_single_token_and_close():
+    assert _correct("deploy on kubernetis") == "deploy on Kubernetes"
+    assert _correct("run it in dokker") == "run it in Docker"
+    assert _correct("a reddish color") == "a reddish color"
+    assert _correct("the doctor said so") == "the doctor said so"
+    assert _correct("postures matter") == "postures matter"
+
+
+def test_prompt_terms_are_stable_for_long_lists():
+    long_list = privox_dictionary.CustomDictionary([f"Term{i}" for i in range(40)] + ["Redis"])
+    assert long_list.prompt_terms() == ()
+    assert long_list.transcript_hints("restart redis now") == ("Redis",)
+    short = privox_dictionary.CustomDictionary(TERMS)
+    assert short.prompt_terms() == short.terms
+    assert short.transcript_hints("restart redis now") == ()
+
+
+def test_acronym_terms_leave_common_words_alone():
+    d = privox_dictionary.CustomDictionary(["IT", "US", "AM", "IS", "WHO", "AWS"])
+    assert d.correct("can you send it to us")[0] == "can you send it to us"
+    assert d.correct("I am at home")[0] == "I am at home"
+    assert d.correct("who is there")[0] == "who is there"
+    assert d.correct("deploy it on aws")[0] == "deploy it on AWS"
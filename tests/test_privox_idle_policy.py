@@ -0,0 +1,104 @@
+"""Idle release policy driven by a fake clock: fallback timers, clamping, release order, wake EMA."""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import privox_idle_policy  # noqa: E402
+from privox_idle_policy import IdlePolicy, IdleResource  # noqa: E402
+
+VRAM_TIMEOUT = 60.0
+HOST_TIMEOUT = 600.0
+KILL_TIMEOUT = 1800.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _policy(clock, **kw):
+    resources = [
+        IdleResource("engine_vram", gib=6.0, wake_s=3.0, fallback_after=VRAM_TIMEOUT),
+        IdleResource("asr_host", gib=3.0, wake_s=8.0, fallback_after=VRAM_TIMEOUT + HOST_TIMEOUT, price=0.25),
+        IdleResource("warm_process", gib=0.8, wake_s=12.0, fallback_after=KILL_TIMEOUT, price=0.25),
+    ]
+    return IdlePolicy(resources, clock=clock, **kw)
+
+
+def _use(policy, clock, gaps):
+    for gap in gaps:
+        clock.now += gap
+        policy.note_use(gap)
+
+
+def test_fallback_timers_until_min_samples(monkeypatch):
+    monkeypatch.delenv("PRIVOX_IDLE_MEMORY_WEIGHT", raising=False)
+    clock = FakeClock()
+    policy = _policy(clock, min_samples=8)
+    fallback = {"engine_vram": VRAM_TIMEOUT, "asr_host": VRAM_TIMEOUT + HOST_TIMEOUT, "warm_process": KILL_TIMEOUT}
+    _use(policy, clock, [20.0] * 7)
+    assert policy.thresholds() == fallback
+    _use(policy, clock, [20.0])
+    assert policy.thresholds() != fallback  # eighth gap: learned thresholds take over
+
+
+def test_thresholds_stay_within_quarter_and_four_times_fallback(monkeypatch):
+    monkeypatch.delenv("PRIVOX_IDLE_MEMORY_WEIGHT", raising=False)
+    rng = random.Random(3)
+    for trace in (
+        [10.0] * 40,                                          # only quick follow-ups
+        [50_000.0] * 40,                                      # only overnight gaps
+        [rng.uniform(5, 20_000) for _ in range(120)],         # mixed
+    ):
+        clock = FakeClock()
+        policy = _policy(clock)
+        _use(policy, clock, trace)
+        th = policy.thresholds()
+        prev = 0.0
+        for r in policy.resources:
+            lo = max(privox_idle_policy.MIN_THRESHOLD_S, r.fallback_after / 4.0)
+            assert min(lo, prev) <= th[r.name] <= max(r.fallback_after * 4.0, prev)
+            prev = th[r.name]
+    # Quick follow-ups only: nothing is worth holding past the shortest allowed timer.
+    clock = FakeClock()
+    policy = _policy(clock)
+    _use(policy, clock, [10.0] * 40)
+    assert policy.thresholds()["engine_vram"] == VRAM_TIMEOUT / 4.0
+
+
+def test_release_order_is_nested():
+    clock = FakeClock()
+    policy = _policy(clock)
+    th = policy.thresholds()
+    assert th["engine_vram"] <= th["asr_host"] <= th["warm_process"]
+    assert policy.due(th["engine_vram"] - 1) == []
+    assert policy.due(th["asr_host"] + 1) == ["engine_vram", "asr_host"]
+    policy.mark_evicted("asr_host")  # implies engine_vram
+    assert policy.is_evicted("engine_vram") and not policy.is_evicted("warm_process")
+    assert policy.due(th["warm_process"] + 1) == ["warm_process"]
+
+
+def test_never_release_when_fallback_is_zero():
+    clock = FakeClock()
+    policy = IdlePolicy([IdleResource("engine_vram", gib=6.0, wake_s=3.0, fallback_after=0)], clock=clock)
+    _use(policy, clock, [30.0] * 20)
+    assert policy.thresholds()["engine_vram"] == privox_idle_policy.INF
+    assert policy.due(1e9) == []
+
+
+def test_wake_cost_is_measured_with_the_clock():
+    clock = FakeClock()
+    policy = _policy(clock)
+    policy.mark_evicted("engine_vram")
+    clock.now += 300
+    policy.note_use(300.0)
+    clock.now += 10.0  # wake took 10 s
+    policy.observe_wake()
+    assert abs(policy._get("engine_vram").wake_s - (3.0 + (10.0 - 3.0) * 0.3)) < 1e-9
+    assert not policy.is_evicted("engine_vram")
+    assert policy.gaps() == [300.0]
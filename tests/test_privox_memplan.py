@@ -0,0 +1,138 @@
+"""Placement planner on synthetic GGUF metadata and fake VRAM budgets, plus the measured-ratio EMA."""
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import privox_memplan  # noqa: E402
+from privox_memplan import GIB, MeasurementStore, plan_placement  # noqa: E402
+
+LAYER_GIB = 0.1
+OTHER_GIB = 0.5
+
+
+def _meta(n_layer=32, n_head_kv=8, n_embd=2048):
+    return {
+        "n_layer": n_layer,
+        "n_embd": n_embd,
+        "n_head": 16,
+        "n_head_kv": n_head_kv,
+        "key_length": 128,
+        "value_length": 128,
+        "layer_bytes": [int(LAYER_GIB * GIB)] * n_layer,
+        "other_bytes": int(OTHER_GIB * GIB),
+    }
+
+
+def _compute_gib(n_batch, n_embd=2048):
+    return 0.25 + n_batch * n_embd * 4 * 16 / GIB
+
+
+def _expected_layers(budget_gib, meta, ctx, corr=1.0):
+    per_layer = LAYER_GIB * corr + privox_memplan.kv_bytes_per_token_per_layer(meta) * ctx / GIB
+    return min(meta["n_layer"], int(budget_gib // per_layer))
+
+
+def test_cpu_only_device_offloads_nothing():
+    plan = plan_placement(0, _meta(), asr_bytes=GIB)
+    assert plan["n_gpu_layers"] == 0 and plan["asr_max_gpu_gib"] == 0.0 and plan["reason"] == "cpu"
+
+
+def test_large_gpu_offloads_every_layer_and_the_output():
+    meta = _meta()
+    plan = plan_placement(24.0, meta, asr_bytes=GIB, asr_backend="whisper")
+    assert plan["n_gpu_layers"] == meta["n_layer"] + 1
+    assert (plan["n_ctx"], plan["n_batch"]) == (4096, 512)
+    assert plan["asr_max_gpu_gib"] == 1.1  # 1 GiB CT2 checkpoint: 0.6 x weights + 0.5 workspace
+
+
+def test_small_gpu_shrinks_batch_and_keeps_context_for_a_few_layers():
+    meta = _meta()
+    plan = plan_placement(4.0, meta, asr_bytes=GIB)
+    assert plan["n_batch"] == 128
+    budget = 4.0 - 1.1 - privox_memplan.CUDA_OVERHEAD_GIB - _compute_gib(128)
+    at_4k, at_2k = _expected_layers(budget, meta, 4096), _expected_layers(budget, meta, 2048)
+    assert at_2k - at_4k < 4  # dropping to 2048 is not worth it
+    assert (plan["n_gpu_layers"], plan["n_ctx"]) == (at_4k, 4096)
+
+
+def test_context_drops_to_2048_when_it_buys_four_layers():
+    meta = _meta(n_head_kv=32)  # wide KV cache: 64 MiB per layer at n_ctx=4096
+    plan = plan_placement(6.0, meta, asr_bytes=GIB)
+    budget = 6.0 - 1.1 - privox_memplan.CUDA_OVERHEAD_GIB - _compute_gib(128)
+    at_4k, at_2k = _expected_layers(budget, meta, 4096), _expected_layers(budget, meta, 2048)
+    assert at_2k - at_4k >= 4
+    assert (plan["n_gpu_layers"], plan["n_ctx"], plan["n_batch"]) == (at_2k, 2048, 128)
+
+
+def test_asr_cap_and_refiner_cap():
+    meta = _meta()
+    plan = plan_placement(12.0, meta, asr_bytes=GIB, asr_cap_gib=3.0)
+    assert plan["asr_max_gpu_gib"] == 3.0
+    # Without a checkpoint on disk the legacy share of the device is reserved.
+    assert plan_placement(12.0, {}, asr_backend="qwen_asr")["asr_max_gpu_gib"] == round(12.0 * 0.42, 2)
+    capped = plan_placement(24.0, meta, asr_bytes=GIB, refiner_cap_gib=2.0)
+    assert capped["n_gpu_layers"] == _expected_layers(2.0 - _compute_gib(512), meta, 4096)
+    assert capped["refiner_gpu_gib"] <= 2.0
+
+
+def test_measurement_store_ema_is_persisted_and_clamped(tmp_path):
+    path = str(tmp_path / "memplan.json")
+    store = MeasurementStore(path)
+    assert store.correction("refiner") == 1.0 and store.samples("refiner") == 0
+    store.record("refiner", 2.0, 2.4)      # first sample is taken as-is
+    assert store.correction("refiner") == 1.2
+    store.record("refiner", 2.0, 2.0)      # later samples move halfway
+    assert store.correction("refiner") == 1.1
+    reloaded = MeasurementStore(path)
+    assert reloaded.correction("refiner") == 1.1 and reloaded.samples("refiner") == 2
+    store.record("asr", 1.0, 5.0)
+    assert store.correction("asr") == 1.6  # one bad sample cannot run away
+    store.record("ignored", 0.0, 1.0)
+    assert store.samples("ignored") == 0
+
+
+def test_measured_correction_scales_the_plan(tmp_path):
+    meta = _meta()
+    store = MeasurementStore(str(tmp_path / "memplan.json"))
+    store.record("refiner", 1.0, 1.5)
+    store.record("asr", 1.0, 1.2)
+    plain = plan_placement(4.0, meta, asr_bytes=GIB)
+    plan = plan_placement(4.0, meta, asr_bytes=GIB, store=store, refiner_key="refiner", asr_key="asr")
+    assert (plan["correction"], plan["asr_correction"]) == (1.5, 1.2)
+    assert plan["asr_max_gpu_gib"] == round(1.1 * 1.2, 2)
+    budget = 4.0 - 1.1 * 1.2 - privox_memplan.CUDA_OVERHEAD_GIB - _compute_gib(128)
+    assert plan["n_gpu_layers"] == _expected_layers(budget, meta, 4096, corr=1.5) < plain["n_gpu_layers"]
+
+
+def _gguf_string(s):
+    raw = s.encode()
+    return struct.pack("<Q", len(raw)) + raw
+
+
+def test_read_gguf_metadata_sizes_layers_from_offsets(tmp_path):
+    kvs = [
+        ("general.architecture", 8, _gguf_string("llama")),
+        ("llama.block_count", 4, struct.pack("<I", 2)),
+        ("llama.embedding_length", 4, struct.pack("<I", 64)),
+        ("llama.attention.head_count", 4, struct.pack("<I", 4)),
+        ("llama.attention.head_count_kv", 4, struct.pack("<I", 2)),
+        ("tokenizer.ggml.tokens", 9, struct.pack("<IQ", 8, 2) + _gguf_string("a") + _gguf_string("b")),
+    ]
+    tensors = [("token_embd.weight", 0, 96), ("blk.0.attn_q.weight", 96, 64), ("blk.1.attn_q.weight", 160, 128)]
+    body = b"GGUF" + struct.pack("<IQQ", 3, len(tensors), len(kvs))
+    for key, vtype, value in kvs:
+        body += _gguf_string(key) + struct.pack("<I", vtype) + value
+    for name, offset, _size in tensors:
+        body += _gguf_string(name) + struct.pack("<I", 1) + struct.pack("<Q", 1) + struct.pack("<I", 0)
+        body += struct.pack("<Q", offset)
+    body += b"\0" * (-len(body) % 32)
+    body += b"\0" * sum(size for _name, _offset, size in tensors)
+    path = tmp_path / "tiny.gguf"
+    path.write_bytes(body)
+
+    meta = privox_memplan.read_gguf_metadata(str(path))
+    assert (meta["arch"], meta["n_layer"], meta["n_embd"], meta["n_head_kv"]) == ("llama", 2, 64, 2)
+    assert meta["key_length"] == meta["value_length"] == 16
+    assert meta["layer_bytes"] == [64, 128] and meta["other_bytes"] == 96
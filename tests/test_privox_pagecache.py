@@ -0,0 +1,31 @@
+"""A worker load that follows main's prefetch is tagged from main's snapshot, not "unknown"."""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import privox_pagecache  # noqa: E402
+
+
+def test_snapshot_of_a_finished_prefetch_classifies_the_remote_load(tmp_path, monkeypatch):
+    monkeypatch.delenv("PRIVOX_GGUF_LOAD_MODE", raising=False)
+    path = str(tmp_path / "refiner.gguf")
+    with open(path, "wb") as f:
+        f.write(b"\0" * (4 * 1024 * 1024))
+    assert privox_pagecache.prefetch_snapshot(path) is None
+    job = privox_pagecache.prefetch_async(path)
+    job.thread.join()
+    snapshot = privox_pagecache.prefetch_snapshot(path)
+    assert snapshot["finished"] == job.finished
+    state, detail = privox_pagecache.classify_remote_load(snapshot, time.time())
+    assert state == "warm" and detail.startswith("main process prefetch")
+    assert privox_pagecache.prefetch_snapshot(path, within=0) is None
+
+
+def test_load_that_races_a_disk_bound_prefetch_is_cold():
+    running = {"finished": None, "was_cached": False, "detail": "prefetch running (1.2 GiB so far)"}
+    assert privox_pagecache.classify_remote_load(running, time.time())[0] == "cold"
+    assert privox_pagecache.classify_remote_load(dict(running, was_cached=True), time.time())[0] == "warm"
+    later = dict(running, finished=time.time() + 5)
+    assert privox_pagecache.classify_remote_load(later, time.time())[0] == "cold"
@@ -0,0 +1,18 @@
+"""The prewarm predictor persists every observation it learns from, including speech length."""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from privox_prewarm import PrewarmPredictor  # noqa: E402
+
+
+def test_speech_lead_is_saved(tmp_path):
+    path = str(tmp_path / "prewarm.json")
+    predictor = PrewarmPredictor(path)
+    predictor.note_speech(14.0)
+    predictor.save()
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["speech_lead_s"] == 6.0  # EMA: 4.0 + (14.0 - 4.0) * 0.2
+    assert PrewarmPredictor(path).speech_lead_s == 6.0
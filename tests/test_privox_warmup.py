@@ -0,0 +1,47 @@
+"""A model that finishes loading after the warmup started is warmed too (worker refiner)."""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import privox_warmup  # noqa: E402
+
+
+def _wait(warmup, timeout=2.0):
+    deadline = time.time() + timeout
+    while warmup.state == privox_warmup.WARMING and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_add_joins_running_warmup():
+    warmup = privox_warmup.EngineWarmup(log=lambda *_: None)
+    lock = threading.Lock()
+    gate = threading.Event()
+    ran = []
+    assert warmup.start([("asr", lambda c: (gate.wait(2.0), ran.append("asr")))], lock)
+    assert warmup.add([("refiner", lambda c: ran.append("refiner"))], lock)
+    gate.set()
+    _wait(warmup)
+    assert warmup.warm and ran == ["asr", "refiner"]
+
+
+def test_add_after_finish_runs_on_its_own():
+    warmup = privox_warmup.EngineWarmup(log=lambda *_: None)
+    lock = threading.Lock()
+    ran = []
+    warmup.start([("asr", lambda c: ran.append("asr"))], lock)
+    _wait(warmup)
+    assert warmup.add([("refiner", lambda c: ran.append("refiner"))], lock)
+    _wait(warmup)
+    assert warmup.warm and ran == ["asr", "refiner"]
+
+
+def test_add_before_load_is_noop():
+    warmup = privox_warmup.EngineWarmup(log=lambda *_: None)
+    assert not warmup.add([("refiner", lambda c: None)], threading.Lock())
+    warmup.start([("asr", lambda c: None)], threading.Lock())
+    _wait(warmup)
+    warmup.reset()
+    assert not warmup.add([("refiner", lambda c: None)], threading.Lock())
@@ -0,0 +1,71 @@
+"""Workers forked by the zygote run with the env they were given, or are refused."""
+import importlib.util
+import os
+import socket
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import privox_ipc  # noqa: E402
+import privox_zygote  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux") or not hasattr(socket, "send_fds")
+    or importlib.util.find_spec("numpy") is None,
+    reason="zygote needs Linux fd passing and the engine's imports",
+)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("PRIVOX_PACKAGED_LAUNCH", "1")  # no log files from the test workers
+    monkeypatch.delenv("PRIVOX_NO_TORCH", raising=False)
+    srv = privox_zygote.ForkServer()
+    yield srv
+    srv.stop()
+
+
+def _fork(server, env):
+    parent, child = privox_ipc.child_socketpair()
+    try:
+        proc = server.fork_worker(child.fileno(), env=env, timeout=120.0)
+    finally:
+        child.close()
+    if proc is None:
+        parent.close()
+        return None, None
+    return proc, parent
+
+
+def test_forked_worker_reports_its_role(server):
+    proc, conn = _fork(server, {"PRIVOX_WORKER_ROLE": "refiner"})
+    if proc is None and not server.is_alive():
+        pytest.skip("zygote could not import the engine here")
+    assert proc is not None
+    with conn:
+        conn.settimeout(60.0)
+        privox_ipc.send_message(conn, {"cmd": "ping"})
+        pong, _blob = privox_ipc.recv_message(conn)
+        assert pong["role"] == "refiner"
+        privox_ipc.send_message(conn, {"cmd": "shutdown"})
+    proc.wait(timeout=10.0)
+
+
+def test_import_time_override_is_refused(server):
+    proc, _conn = _fork(server, {"PRIVOX_WORKER_ROLE": "asr"})  # first fork pays the imports
+    if proc is None and not server.is_alive():
+        pytest.skip("zygote could not import the engine here")
+    proc.kill()
+    _conn.close()
+    refused, _ = _fork(server, {"PRIVOX_NO_TORCH": "1"})
+    assert refused is None
+    assert server.is_alive()  # a refusal does not stop the zygote
+
+
+def test_frozen_overrides():
+    current = {"PRIVOX_NO_TORCH": "1"}
+    assert privox_zygote.frozen_overrides({"PRIVOX_NO_TORCH": "1", "PRIVOX_WORKER_ROLE": "asr"}, current) == []
+    assert privox_zygote.frozen_overrides({"PRIVOX_ENGINE_MODE": "0"}, current) == ["PRIVOX_ENGINE_MODE"]
+    assert privox_zygote.frozen_overrides({"CUDA_VISIBLE_DEVICES": ""}, current) == []
@@ -0,0 +1,71 @@
+"""Torch-free presets: neither the tray process nor the inference worker imports PyTorch at startup.
+
+Each probe runs in a fresh interpreter so sys.modules starts clean. A meta-path hook also records
+every attempt to import torch, so the check holds on machines where torch is not installed at all.
+scripts/check_torch_free.py keeps the --load variant and the import time / peak RSS report.
+"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, "src")
+
+# The tray process opens the microphone, tray icon, hotkey listener and clipboard at import.
+_GUI_AUDIO = ("sounddevice", "pynput", "pystray", "PIL", "pyperclip")
+
+_PROBE = r"""
+import json, os, sys
+sys.path.insert(0, {src!r})
+attempts = []
+
+class _TorchWatch:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] == "torch":
+            attempts.append(name)
+        return None
+
+sys.meta_path.insert(0, _TorchWatch())
+if {worker!r}:
+    import privox_worker  # noqa: F401
+import voice_input
+if {worker!r}:
+    voice_input.VoiceInputApp()
+print("PROBE " + json.dumps({{"torch": "torch" in sys.modules, "attempts": sorted(set(attempts))}}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def _missing(*modules):
+    return [m for m in modules if importlib.util.find_spec(m) is None]
+
+
+def _probe(worker: bool) -> dict:
+    env = dict(os.environ)
+    env.pop("PRIVOX_ENGINE_MODE", None)
+    env["PRIVOX_PACKAGED_LAUNCH"] = "1"  # no log files from the probe
+    if worker:
+        env["PRIVOX_ENGINE_MODE"] = "1"
+    code = _PROBE.format(src=_SRC, worker=worker)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=_ROOT, env=env, capture_output=True, text=True, timeout=300)
+    for line in (proc.stdout or "").splitlines():
+        if line.startswith("PROBE "):
+            return json.loads(line[len("PROBE "):])
+    raise AssertionError(f"probe failed (exit {proc.returncode}):\n{(proc.stderr or proc.stdout)[-2000:]}")
+
+
+@pytest.mark.skipif(bool(_missing("numpy", *_GUI_AUDIO)), reason="tray process needs its GUI / audio deps")
+def test_main_process_never_imports_torch():
+    r = _probe(worker=False)
+    assert not r["torch"] and r["attempts"] == []
+
+
+@pytest.mark.skipif(bool(_missing("numpy")), reason="worker needs numpy")
+def test_worker_never_imports_torch():
+    r = _probe(worker=True)
+    assert not r["torch"] and r["attempts"] == []